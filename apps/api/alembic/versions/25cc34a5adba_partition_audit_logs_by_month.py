@@ -0,0 +1,106 @@
+"""partition audit logs by month
+
+Revision ID: 25cc34a5adba
+Revises: ee5dcda36e17
+Create Date: 2026-10-17 01:48:30.102935+00:00
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '25cc34a5adba'
+down_revision = 'ee5dcda36e17'
+branch_labels = None
+depends_on = None
+
+# Mirrors AUDIT_LOG_PARTITIONS_AHEAD's default; the daily maintenance job keeps extending it.
+MONTHS_AHEAD = 3
+
+
+def _month(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _audit_logs_table(*, foreign_keys: bool) -> sa.Table:
+    """``audit_logs`` as the SQLite batch rebuild should leave it."""
+
+    def reference(target: str) -> list:
+        return [sa.ForeignKey(target, ondelete='SET NULL')] if foreign_keys else []
+
+    return sa.Table(
+        'audit_logs',
+        sa.MetaData(),
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True, autoincrement=True),
+        sa.Column('university_id', sa.Integer(), *reference('universities.id'), nullable=True),
+        sa.Column('actor_user_id', sa.Integer(), *reference('users.id'), nullable=True),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('target_entity', sa.String(length=100), nullable=True),
+        sa.Column('target_id', sa.Integer(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Index('idx_audit_action', 'action'),
+        sa.Index('idx_audit_target', 'target_entity', 'target_id'),
+        sa.Index('idx_audit_actor', 'actor_user_id'),
+        sa.Index('idx_audit_timestamp', 'timestamp'),
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # SQLite cannot drop unnamed constraints in place; rebuild the table without them.
+        with op.batch_alter_table('audit_logs', recreate='always', copy_from=_audit_logs_table(foreign_keys=False)):
+            pass
+        return
+
+    # Partitioned InnoDB tables cannot have foreign keys.
+    for foreign_key in sa.inspect(bind).get_foreign_keys('audit_logs'):
+        op.drop_constraint(foreign_key['name'], 'audit_logs', type_='foreignkey')
+    if bind.dialect.name not in ('mysql', 'mariadb'):
+        return
+
+    # Every unique key of a partitioned table must include the partitioning column.
+    op.execute('ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, `timestamp`)')
+    oldest = bind.execute(sa.text('SELECT MIN(`timestamp`) FROM audit_logs')).scalar()
+    current = _month(date.today())
+    month = _month(oldest) if oldest is not None else current
+    definitions = []
+    while month <= _add_months(current, MONTHS_AHEAD):
+        bound = _add_months(month, 1)
+        definitions.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{bound.isoformat()}')")
+        month = bound
+    definitions.append('PARTITION pmax VALUES LESS THAN (MAXVALUE)')
+    op.execute(f"ALTER TABLE audit_logs PARTITION BY RANGE COLUMNS(`timestamp`) ({', '.join(definitions)})")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        with op.batch_alter_table('audit_logs', recreate='always', copy_from=_audit_logs_table(foreign_keys=True)):
+            pass
+        return
+
+    if bind.dialect.name in ('mysql', 'mariadb'):
+        op.execute('ALTER TABLE audit_logs REMOVE PARTITIONING')
+        op.execute('ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)')
+    # Rows may reference users or universities deleted while there was no constraint.
+    op.execute(
+        'UPDATE audit_logs SET university_id = NULL '
+        'WHERE university_id IS NOT NULL AND university_id NOT IN (SELECT id FROM universities)'
+    )
+    op.execute(
+        'UPDATE audit_logs SET actor_user_id = NULL '
+        'WHERE actor_user_id IS NOT NULL AND actor_user_id NOT IN (SELECT id FROM users)'
+    )
+    op.create_foreign_key(None, 'audit_logs', 'universities', ['university_id'], ['id'], ondelete='SET NULL')
+    op.create_foreign_key(None, 'audit_logs', 'users', ['actor_user_id'], ['id'], ondelete='SET NULL')
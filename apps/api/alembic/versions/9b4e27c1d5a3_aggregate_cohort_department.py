@@ -0,0 +1,39 @@
+"""aggregate cohort department
+
+Revision ID: 9b4e27c1d5a3
+Revises: 0e57b4f2e5de
+Create Date: 2026-10-17 09:12:08.417305+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4e27c1d5a3'
+down_revision = '0e57b4f2e5de'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Batch mode so SQLite can add the foreign keys by copying the tables.
+    for table_name in ('numerical_aggregates', 'sentiment_aggregates'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column('cohort_department_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                f'fk_{table_name}_cohort_department',
+                'departments',
+                ['cohort_department_id'],
+                ['id'],
+                ondelete='SET NULL',
+            )
+    # Existing rows stay NULL and are retracted from their currently resolved
+    # department until rebuild_cohort_statistics restamps their period.
+
+
+def downgrade() -> None:
+    for table_name in ('sentiment_aggregates', 'numerical_aggregates'):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_constraint(f'fk_{table_name}_cohort_department', type_='foreignkey')
+            batch_op.drop_column('cohort_department_id')
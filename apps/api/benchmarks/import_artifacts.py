@@ -0,0 +1,74 @@
+"""Reading a validated import from its artifact instead of re-parsing the CSV.
+
+Writes an academic structure file of ``--rows`` subjects for each requested
+size, stores its artifact with ``store_validated_file`` and reports how long it
+takes to read every row through ``open_csv`` and through ``open_artifact``,
+i.e. the parsing the process step no longer repeats. Validating the same file
+again only hashes it, since its artifact is reused::
+
+    python -m benchmarks.import_artifacts --rows 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from src.core.config import settings
+from src.services.bulk_import_service import AcademicStructureImporter
+from src.worker import import_artifacts
+from src.worker.csv_import import SourceOpener, open_csv
+from src.worker.import_artifacts import open_artifact, store_validated_file
+
+COLUMNS = AcademicStructureImporter.required_columns
+
+
+def _write_file(path: Path, rows: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["record_type", "department", "edp_code", "subject_code", "name"])
+        for index in range(rows):
+            writer.writerow(
+                ["subject", "College of Arts and Sciences", f"E{index:07d}", f"AS {index % 900}", "Elective"]
+            )
+
+
+def _timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def _read_all(path: Path, open_source: SourceOpener) -> int:
+    with open_source(path, COLUMNS) as source:
+        return sum(1 for _ in source.rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="file sizes to read")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        import_artifacts.settings = settings.model_copy(update={"storage_root": scratch})
+        for rows in args.rows:
+            path = Path(scratch) / f"structure-{rows}.csv"
+            _write_file(path, rows)
+            validated = store_validated_file(path, COLUMNS, batch_size=args.batch_size)
+            store = _timed(lambda: store_validated_file(path, COLUMNS, batch_size=args.batch_size))
+            parse = _timed(lambda: _read_all(path, open_csv))
+            mapped = _timed(lambda: _read_all(validated.path, open_artifact))
+            print(
+                f"{rows:>9} rows  csv {parse:6.2f} s  artifact {mapped:6.2f} s  "
+                f"revalidate {store:6.2f} s  {validated.path.stat().st_size / path.stat().st_size:4.0%} of csv size"
+            )
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
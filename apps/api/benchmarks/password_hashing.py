@@ -0,0 +1,46 @@
+"""bcrypt throughput for user imports: one core vs. the password hash pool.
+
+Hashes ``--count`` passwords serially and through ``password_hash_pool`` at
+the configured cost factor and prints hashes/s, which bounds the throughput of
+a ``USER_IMPORT`` in ``school_id`` password mode::
+
+    python -m benchmarks.password_hashing --count 200
+    python -m benchmarks.password_hashing --count 200 --rounds 10 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from src.core.config import settings
+from src.core.security import available_cpus, hash_passwords, password_hash_pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=settings.password_bcrypt_rounds)
+    parser.add_argument("--workers", type=int, default=0, help="pool size; 0 uses every available CPU")
+    args = parser.parse_args()
+
+    passwords = [f"2025-{index:06d}" for index in range(args.count)]
+    print(f"{args.count} passwords at {args.rounds} rounds; {available_cpus()} CPUs available")
+
+    started = time.perf_counter()
+    hash_passwords(passwords, rounds=args.rounds)
+    serial = time.perf_counter() - started
+    print(f"  serial   {serial:7.2f} s  {args.count / serial:8.1f} hashes/s")
+
+    workers = args.workers or available_cpus()
+    with password_hash_pool(workers) as pool:
+        # Spawning the workers is a one-off cost per import job; leave it out of the timing.
+        hash_passwords(passwords[: max(2, workers)], executor=pool, rounds=4)
+        started = time.perf_counter()
+        hash_passwords(passwords, executor=pool, rounds=args.rounds)
+        pooled = time.perf_counter() - started
+    print(f"  pool     {pooled:7.2f} s  {args.count / pooled:8.1f} hashes/s  ({serial / pooled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
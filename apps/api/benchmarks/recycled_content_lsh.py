@@ -0,0 +1,121 @@
+"""Recall and latency of the recycled-content LSH lookup vs. a brute-force scan.
+
+Stored answers are synthetic: most are random signatures (unrelated texts have
+independent MinHash values), with lightly edited copies of each query text
+planted among them. The LSH side mirrors the ``answer_lsh_buckets`` index as
+one sorted key array per band, and the whole store is treated as a single
+evaluator scope, which is the worst case for the per-evaluator lookup.
+
+Usage::
+
+    python -m benchmarks.recycled_content_lsh --stored 1000000 --queries 100 --threshold 0.8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.services.recycled_content_service import (
+    BANDS,
+    DEFAULT_SIMILARITY_THRESHOLD,
+    NUM_PERMUTATIONS,
+    band_keys,
+    estimated_similarity,
+    minhash_signature,
+)
+
+_WORDS = (
+    "the teacher explains lessons clearly always prepared class discussions engaging useful projects "
+    "pacing fast examples exams approachable consultation hours feedback helpful strict fair grading "
+    "activities interesting modules late early patient motivates students encourages questions"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> list[str]:
+    return [rng.choice(_WORDS) for _ in range(words)]
+
+
+def _edited(rng: random.Random, words: list[str], edits: int) -> str:
+    copy = list(words)
+    for _ in range(edits):
+        copy[rng.randrange(len(copy))] = rng.choice(_WORDS)
+    return " ".join(copy)
+
+
+class SortedBandIndex:
+    """Per-band sorted bucket keys, the in-memory analogue of the B-tree lookup."""
+
+    def __init__(self, signatures: np.ndarray) -> None:
+        keys = band_keys(signatures)
+        self.order = np.argsort(keys, axis=0, kind="stable").T.copy()
+        self.keys = np.take_along_axis(keys, self.order.T, axis=0).T.copy()
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        query = band_keys(signature)
+        found = []
+        for band in range(BANDS):
+            low = np.searchsorted(self.keys[band], query[band], side="left")
+            high = np.searchsorted(self.keys[band], query[band], side="right")
+            found.append(self.order[band, low:high])
+        return np.unique(np.concatenate(found))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stored", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--copies", type=int, default=8, help="edited copies planted per query")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_SIMILARITY_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    np_rng = np.random.default_rng(args.seed)
+
+    queries = []
+    planted = []
+    for _ in range(args.queries):
+        words = _sentence(rng, rng.randint(12, 40))
+        queries.append(minhash_signature(" ".join(words)))
+        planted.extend(minhash_signature(_edited(rng, words, rng.randint(0, 4))) for _ in range(args.copies))
+
+    stored = np_rng.integers(0, 2**32, size=(args.stored, NUM_PERMUTATIONS), dtype=np.uint32)
+    positions = np_rng.choice(args.stored, size=len(planted), replace=False)
+    stored[positions] = np.stack(planted)
+
+    started = time.perf_counter()
+    index = SortedBandIndex(stored)
+    build_seconds = time.perf_counter() - started
+
+    brute_seconds = lsh_seconds = 0.0
+    expected = found = candidates = 0
+    for query in queries:
+        started = time.perf_counter()
+        brute = set(np.flatnonzero(estimated_similarity(query, stored) >= args.threshold).tolist())
+        brute_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        ids = index.candidates(query)
+        lsh = set(ids[estimated_similarity(query, stored[ids]) >= args.threshold].tolist()) if ids.size else set()
+        lsh_seconds += time.perf_counter() - started
+
+        expected += len(brute)
+        found += len(brute & lsh)
+        candidates += ids.size
+
+    print(f"stored={args.stored} queries={args.queries} threshold={args.threshold} bands={BANDS}")
+    print(f"index build: {build_seconds:.2f}s")
+    print(f"{'method':>12} {'ms/query':>10} {'candidates/query':>17} {'recall':>8}")
+    print(f"{'brute force':>12} {brute_seconds / len(queries) * 1000:>10.2f} {args.stored:>17} {1.0:>8.3f}")
+    print(
+        f"{'lsh':>12} {lsh_seconds / len(queries) * 1000:>10.2f} "
+        f"{candidates / len(queries):>17.1f} {found / expected if expected else 1.0:>8.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""CPU-only sentiment throughput benchmark (answers/sec vs batch size).
+
+Usage::
+
+    python -m benchmarks.sentiment_throughput --answers 2000 --batch-sizes 1 8 16 32 64 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+# Hide any GPU before torch is imported so the numbers reflect CPU inference only.
+os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+from src.core.config import settings  # noqa: E402
+from src.services.sentiment_inference_service import (  # noqa: E402
+    BatchedSentimentPredictor,
+    TransformersSentimentModel,
+)
+
+_PHRASES = [
+    "Good teacher.",
+    "None",
+    "Explains the lessons clearly and is always prepared for class.",
+    "Sometimes late, but the discussions are engaging and useful for our projects.",
+    "The pacing was too fast for most of us and the examples did not match the exams.",
+    "Very approachable during consultation hours and gives helpful feedback on our work.",
+]
+
+
+def synthetic_answers(count: int, seed: int = 7) -> list[str]:
+    """Comments with a realistic mix of very short and multi-sentence answers."""
+
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_PHRASES, k=rng.choice((1, 1, 2, 3, 5)))) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16, 32, 64])
+    parser.add_argument("--threads", type=int, default=settings.torch_intra_op_threads)
+    parser.add_argument("--model", default=settings.sentiment_model_name)
+    args = parser.parse_args()
+
+    model = TransformersSentimentModel(
+        args.model,
+        max_length=settings.sentiment_max_length,
+        intra_op_threads=args.threads,
+    )
+    texts = synthetic_answers(args.answers)
+    BatchedSentimentPredictor(model, batch_size=8).predict_probabilities(texts[:32])  # warm-up
+
+    print(f"model={args.model} threads={model._torch.get_num_threads()} answers={len(texts)}")
+    print(f"{'batch_size':>10} {'seconds':>10} {'answers/sec':>12}")
+    for batch_size in args.batch_sizes:
+        predictor = BatchedSentimentPredictor(model, batch_size=batch_size)
+        started = time.perf_counter()
+        predictor.predict_probabilities(texts)
+        elapsed = time.perf_counter() - started
+        print(f"{batch_size:>10} {elapsed:>10.2f} {len(texts) / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
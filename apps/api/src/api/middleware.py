@@ -0,0 +1,47 @@
+"""HTTP middleware."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+
+from ..core.config import settings
+from ..db.instrumentation import recent_requests, track_queries
+
+logger = logging.getLogger("proficiency.sql")
+
+
+async def sql_instrumentation_middleware(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    """Report each request's query count and DB time.
+
+    Adds a ``Server-Timing: db;dur=...`` header (visible in browser dev tools),
+    logs one JSON line per request, at WARNING when a statement repeats
+    ``SQL_REPEAT_THRESHOLD`` times or more, and keeps the summary for the debug
+    endpoint.
+    """
+
+    started = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    summary = {
+        "method": request.method,
+        "path": request.url.path,
+        "status": response.status_code,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        **stats.summary(repeat_threshold=settings.sql_repeat_threshold),
+    }
+    response.headers.append("Server-Timing", f'db;dur={summary["db_ms"]};desc="{summary["queries"]} queries"')
+    level = logging.WARNING if summary["repeated"] else logging.INFO
+    logger.log(level, json.dumps(summary))
+    recent_requests.append(summary)
+    return response
+
+
+__all__ = ["sql_instrumentation_middleware"]
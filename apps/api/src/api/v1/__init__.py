@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
-from .endpoints import health
+from ...core.config import settings
+from .endpoints import debug, health
 
 router = APIRouter()
 router.include_router(health.router)
+if settings.sql_debug_endpoint:
+    router.include_router(debug.router)
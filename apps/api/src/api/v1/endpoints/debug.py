@@ -0,0 +1,14 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from ....db.instrumentation import recent_requests
+from ....schemas import RequestSqlSummary
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/sql", summary="Recent per-request SQL summaries")
+async def get_recent_sql() -> List[RequestSqlSummary]:
+    """Return query counts, DB time, slowest and repeated statements of the latest requests, newest first."""
+    return [RequestSqlSummary(**summary) for summary in reversed(recent_requests)]
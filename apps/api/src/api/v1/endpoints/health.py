@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-from ....schemas import HealthResponse
+from ....core.config import settings
+from ....db import pool_statistics
+from ....schemas import HealthResponse, PoolStatsResponse
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -9,3 +11,9 @@ router = APIRouter(prefix="/health", tags=["Health"])
 async def get_health() -> HealthResponse:
     """Return a simple payload indicating API health."""
     return HealthResponse(status="ok")
+
+
+@router.get("/db-pool", summary="Database connection pool statistics")
+async def get_db_pool_stats() -> PoolStatsResponse:
+    """Return pool occupancy, overflow and checkout wait telemetry for this process."""
+    return PoolStatsResponse(profile=settings.db_pool_profile, pools=pool_statistics())
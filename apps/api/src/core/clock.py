@@ -0,0 +1,14 @@
+"""Time helpers shared by services and workers."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+
+def utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime, matching the schema."""
+
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+__all__ = ["utcnow"]
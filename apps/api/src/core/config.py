@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
+from typing import List
 
 from pydantic import BaseModel, Field
 
@@ -14,12 +15,118 @@ def _env(key: str, default: str) -> str:
     return value if value else default
 
 
+def _env_flag(key: str, default: bool) -> bool:
+    """Return a boolean environment variable (``1``/``true``/``yes``/``on``)."""
+    return _env(key, "true" if default else "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
 class Settings(BaseModel):
     """Application configuration sourced from environment variables."""
 
     app_name: str = "Proficiency API"
     api_v1_prefix: str = "/api/v1"
     database_url: str = Field(default_factory=lambda: _env("DATABASE_URL", "sqlite:///./dev.db"))
+    # Pool sizing profile of this process: "api" for uvicorn, "worker" for RQ workers.
+    db_pool_profile: str = Field(default_factory=lambda: _env("DB_POOL_PROFILE", "api"))
+    db_api_pool_size: int = Field(default_factory=lambda: int(_env("DB_API_POOL_SIZE", "10")))
+    db_api_max_overflow: int = Field(default_factory=lambda: int(_env("DB_API_MAX_OVERFLOW", "20")))
+    # Fail fast: a request that cannot get a connection within this time has already missed its SLO.
+    db_api_pool_timeout: float = Field(default_factory=lambda: float(_env("DB_API_POOL_TIMEOUT", "2")))
+    db_worker_pool_size: int = Field(default_factory=lambda: int(_env("DB_WORKER_POOL_SIZE", "2")))
+    db_worker_max_overflow: int = Field(default_factory=lambda: int(_env("DB_WORKER_MAX_OVERFLOW", "3")))
+    db_worker_pool_timeout: float = Field(default_factory=lambda: float(_env("DB_WORKER_POOL_TIMEOUT", "30")))
+    # Below MariaDB's wait_timeout so the server never closes a pooled connection first.
+    db_pool_recycle: int = Field(default_factory=lambda: int(_env("DB_POOL_RECYCLE", "1800")))
+    # "always", "idle" (only connections idle past DB_PRE_PING_IDLE_SECONDS) or "never".
+    db_pre_ping: str = Field(default_factory=lambda: _env("DB_PRE_PING", "idle"))
+    db_pre_ping_idle_seconds: float = Field(default_factory=lambda: float(_env("DB_PRE_PING_IDLE_SECONDS", "30")))
+    # Empty derives the async driver URL from DATABASE_URL (see ``src.db.async_url``).
+    async_database_url: str = Field(default_factory=lambda: _env("ASYNC_DATABASE_URL", ""))
+    # Comma-separated read replica URLs; dashboards and report jobs read from them.
+    database_replica_urls: List[str] = Field(
+        default_factory=lambda: [url.strip() for url in _env("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    )
+    replica_balancing: str = Field(default_factory=lambda: _env("REPLICA_BALANCING", "round_robin"))
+    # After a user's write, their reads stay on the primary for this long.
+    replica_read_your_writes_seconds: float = Field(
+        default_factory=lambda: float(_env("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+    )
+    # Per-request query count and DB time (Server-Timing header and a log line per request).
+    # Off by default: the header exposes DB timings to clients, so enable it in development or staging.
+    sql_instrumentation: bool = Field(default_factory=lambda: _env_flag("SQL_INSTRUMENTATION", False))
+    # Serves recent per-request SQL summaries at /api/v1/debug/sql; keep off in production.
+    sql_debug_endpoint: bool = Field(default_factory=lambda: _env_flag("SQL_DEBUG_ENDPOINT", False))
+    # A statement repeated this often within one request is reported as a likely N+1.
+    sql_repeat_threshold: int = Field(default_factory=lambda: int(_env("SQL_REPEAT_THRESHOLD", "5")))
+    # Make every lazy load that would query raise (tests set it per session); see ``repositories.loading``.
+    orm_raiseload: bool = Field(default_factory=lambda: _env_flag("ORM_RAISELOAD", False))
+    redis_url: str = Field(default_factory=lambda: _env("REDIS_URL", "redis://localhost:6379/0"))
+    worker_queue_name: str = Field(default_factory=lambda: _env("WORKER_QUEUE_NAME", "default"))
+    # Local file storage (a Docker volume in deployment) for uploads, reports and snapshots.
+    storage_root: str = Field(default_factory=lambda: _env("STORAGE_ROOT", "./storage"))
+    # Months of audit_logs kept in the database; older months move to Parquet files under STORAGE_ROOT.
+    audit_log_retention_months: int = Field(default_factory=lambda: int(_env("AUDIT_LOG_RETENTION_MONTHS", "24")))
+    # Monthly audit_logs partitions kept created ahead of the current month (MariaDB only).
+    audit_log_partitions_ahead: int = Field(default_factory=lambda: int(_env("AUDIT_LOG_PARTITIONS_AHEAD", "3")))
+    # Rows per transaction of the CSV import jobs; a failed write rolls back only its batch.
+    import_batch_size: int = Field(default_factory=lambda: int(_env("IMPORT_BATCH_SIZE", "1000")))
+    # Hours a validated upload's parsed artifact is kept for the process step after its last validation.
+    import_artifact_ttl_hours: int = Field(default_factory=lambda: int(_env("IMPORT_ARTIFACT_TTL_HOURS", "24")))
+    # Staged answers a HISTORICAL_EVALUATION_IMPORT merges per transaction (and checkpoint).
+    historical_import_chunk_size: int = Field(
+        default_factory=lambda: int(_env("HISTORICAL_IMPORT_CHUNK_SIZE", "20000"))
+    )
+    # Users' school ID to id entries an import job keeps cached (LRU); catalogs are cached whole.
+    import_key_cache_entries: int = Field(default_factory=lambda: int(_env("IMPORT_KEY_CACHE_ENTRIES", "100000")))
+    # bcrypt cost factor for new password hashes (each step doubles the hashing time).
+    password_bcrypt_rounds: int = Field(default_factory=lambda: int(_env("PASSWORD_BCRYPT_ROUNDS", "12")))
+    # Processes hashing passwords during user imports; 0 uses every CPU available to the worker.
+    password_hash_workers: int = Field(default_factory=lambda: int(_env("PASSWORD_HASH_WORKERS", "0")))
+    # Key signing password setup links; required for imports that create unverified accounts.
+    secret_key: str = Field(default_factory=lambda: _env("SECRET_KEY", ""))
+    password_setup_token_hours: int = Field(default_factory=lambda: int(_env("PASSWORD_SETUP_TOKEN_HOURS", "72")))
+    sentiment_model_name: str = Field(
+        default_factory=lambda: _env("SENTIMENT_MODEL_NAME", "cardiffnlp/twitter-xlm-roberta-base-sentiment")
+    )
+    sentiment_batch_size: int = Field(default_factory=lambda: int(_env("SENTIMENT_BATCH_SIZE", "32")))
+    sentiment_max_length: int = Field(default_factory=lambda: int(_env("SENTIMENT_MAX_LENGTH", "256")))
+    # 0 lets torch pick its default (one thread per physical core).
+    torch_intra_op_threads: int = Field(default_factory=lambda: int(_env("TORCH_INTRA_OP_THREADS", "0")))
+    keyword_model_name: str = Field(
+        default_factory=lambda: _env("KEYWORD_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
+    )
+    keyword_top_n: int = Field(default_factory=lambda: int(_env("KEYWORD_TOP_N", "5")))
+    keyword_relevance_threshold: float = Field(
+        default_factory=lambda: float(_env("KEYWORD_RELEVANCE_THRESHOLD", "0.3"))
+    )
+    embedding_batch_size: int = Field(default_factory=lambda: int(_env("EMBEDDING_BATCH_SIZE", "64")))
+    embedding_cache_max_entries: int = Field(
+        default_factory=lambda: int(_env("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+    )
+    # Optional .npz linear head over keyword-model embeddings; empty keeps the transformer classifier.
+    sentiment_head_path: str = Field(default_factory=lambda: _env("SENTIMENT_HEAD_PATH", ""))
+    # Bump to invalidate cached qualitative results without changing model names.
+    analysis_model_version: str = Field(default_factory=lambda: _env("ANALYSIS_MODEL_VERSION", "1"))
+    qualitative_cache_max_entries: int = Field(
+        default_factory=lambda: int(_env("QUALITATIVE_CACHE_MAX_ENTRIES", "50000"))
+    )
+
+    # FINAL_AGGREGATION triggers for a cohort are coalesced: each one delays the run by
+    # the debounce interval, but never past max delay after the window opened.
+    final_aggregation_debounce_seconds: int = Field(
+        default_factory=lambda: int(_env("FINAL_AGGREGATION_DEBOUNCE_SECONDS", "60"))
+    )
+    final_aggregation_max_delay_seconds: int = Field(
+        default_factory=lambda: int(_env("FINAL_AGGREGATION_MAX_DELAY_SECONDS", "600"))
+    )
+    provisional_batch_size: int = Field(default_factory=lambda: int(_env("PROVISIONAL_BATCH_SIZE", "2000")))
+    # Submissions younger than this are left for the next run, so rows whose
+    # transactions commit slightly out of submitted_at order are not skipped.
+    provisional_settle_seconds: int = Field(default_factory=lambda: int(_env("PROVISIONAL_SETTLE_SECONDS", "30")))
+    # Period of the periodic run_provisional_aggregation job.
+    provisional_interval_seconds: int = Field(
+        default_factory=lambda: int(_env("PROVISIONAL_INTERVAL_SECONDS", "180"))
+    )
 
     model_config = {"frozen": True}
 
@@ -0,0 +1,148 @@
+"""Password hashing and signed tokens."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from functools import lru_cache, partial
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+from .clock import utcnow
+from .config import settings
+
+# Prefix of a password hash that no password matches, for accounts that have not set one yet.
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+
+class InvalidTokenError(ValueError):
+    """A signed token that is malformed, tampered with or expired."""
+
+
+@lru_cache
+def _bcrypt(rounds: int) -> Any:
+    from passlib.hash import bcrypt
+
+    return bcrypt.using(rounds=rounds)
+
+
+def hash_password(password: str, *, rounds: Optional[int] = None) -> str:
+    """bcrypt hash of ``password`` at ``rounds`` (default ``PASSWORD_BCRYPT_ROUNDS``)."""
+
+    return _bcrypt(rounds or settings.password_bcrypt_rounds).hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    if password_hash.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
+    from passlib.hash import bcrypt
+
+    return bcrypt.verify(password, password_hash)
+
+
+def unusable_password() -> str:
+    """A unique ``password_hash`` value that ``verify_password`` never accepts."""
+
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(16)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (its affinity mask where the platform has one)."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+@contextmanager
+def password_hash_pool(workers: Optional[int] = None) -> Iterator[Executor]:
+    """Process pool for ``hash_passwords``, sized to ``PASSWORD_HASH_WORKERS`` or the available CPUs.
+
+    Workers are spawned rather than forked, so they never inherit the caller's
+    database connections or threads, and only start when work is first submitted.
+    """
+
+    workers = workers or settings.password_hash_workers or available_cpus()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def hash_passwords(
+    passwords: Sequence[str],
+    *,
+    executor: Optional[Executor] = None,
+    rounds: Optional[int] = None,
+) -> List[str]:
+    """bcrypt hashes of ``passwords``, in order, computed on ``executor`` when one is given.
+
+    bcrypt holds a CPU for its whole run, so a process pool scales hashing with
+    the number of cores where threads would not.
+    """
+
+    hash_one = partial(hash_password, rounds=rounds or settings.password_bcrypt_rounds)
+    if executor is None or len(passwords) < 2:
+        return [hash_one(password) for password in passwords]
+    # A few chunks per worker: fewer round trips than one task per password, still balanced.
+    chunksize = max(1, len(passwords) // ((settings.password_hash_workers or available_cpus()) * 4))
+    return list(executor.map(hash_one, passwords, chunksize=chunksize))
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signature(payload: str) -> bytes:
+    if not settings.secret_key:
+        raise RuntimeError("SECRET_KEY is not configured.")
+    return hmac.new(settings.secret_key.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_token(*parts: Union[int, str], expires_at: datetime) -> str:
+    """URL-safe token carrying ``parts`` (which must not contain ``.``) until the naive-UTC ``expires_at``."""
+
+    payload = ".".join([*(str(part) for part in parts), str(int(expires_at.replace(tzinfo=UTC).timestamp()))])
+    return f"{_b64(payload.encode('utf-8'))}.{_b64(_signature(payload))}"
+
+
+def read_signed_token(token: str, *, now: Optional[datetime] = None) -> List[str]:
+    """The parts of a token made by ``sign_token``; raises ``InvalidTokenError`` unless it is intact and unexpired."""
+
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _unb64(encoded_payload).decode("utf-8")
+        signature = _unb64(encoded_signature)
+    except ValueError as exc:
+        raise InvalidTokenError("Malformed token.") from exc
+    if not hmac.compare_digest(signature, _signature(payload)):
+        raise InvalidTokenError("Invalid token signature.")
+    *parts, expires = payload.split(".")
+    if int(expires) <= (now or utcnow()).replace(tzinfo=UTC).timestamp():
+        raise InvalidTokenError("Token has expired.")
+    return parts
+
+
+__all__ = [
+    "UNUSABLE_PASSWORD_PREFIX",
+    "InvalidTokenError",
+    "hash_password",
+    "verify_password",
+    "unusable_password",
+    "available_cpus",
+    "password_hash_pool",
+    "hash_passwords",
+    "sign_token",
+    "read_signed_token",
+]
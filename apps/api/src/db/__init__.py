@@ -2,24 +2,89 @@
 
 from __future__ import annotations
 
-from typing import Generator
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from ..core.config import settings
+from . import instrumentation  # noqa: F401  # registers the per-request query listeners
+from .pooling import PoolProfile, engine_options, instrument_engine, pool_status
+from .routing import (
+    READ_ONLY_KEY,
+    RedisRecentWriteStore,
+    ReplicaSet,
+    RoutingSession,
+    StalenessGuard,
+    replica_read,
+    replica_reads,
+    set_session_user,
+)
 
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
 
 
+def pool_profile(name: Optional[str] = None) -> PoolProfile:
+    """Pool settings for ``name`` (default ``DB_POOL_PROFILE``): ``api`` or ``worker``."""
+
+    name = name or settings.db_pool_profile
+    if name not in {"api", "worker"}:
+        raise ValueError(f"Unknown database pool profile {name!r}.")
+    return PoolProfile(
+        name=name,
+        pool_size=getattr(settings, f"db_{name}_pool_size"),
+        max_overflow=getattr(settings, f"db_{name}_max_overflow"),
+        pool_timeout=getattr(settings, f"db_{name}_pool_timeout"),
+        pool_recycle=settings.db_pool_recycle,
+        pre_ping=settings.db_pre_ping,
+        pre_ping_idle_seconds=settings.db_pre_ping_idle_seconds,
+    )
+
+
+def build_engine(url: str, profile: Optional[PoolProfile] = None) -> Engine:
+    """Create an instrumented engine sized by ``profile``."""
+
+    profile = profile or pool_profile()
+    return instrument_engine(create_engine(url, future=True, **engine_options(url, profile)), profile)
+
+
 # Engine is created eagerly so Alembic and the API share configuration.
-engine: Engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
+engine: Engine = build_engine(settings.database_url)
+
+# Optional read replicas; without DATABASE_REPLICA_URLS every query uses ``engine``.
+replica_engines = [build_engine(url) for url in settings.database_replica_urls]
+replicas = ReplicaSet(replica_engines, policy=settings.replica_balancing)
+staleness_guard = StalenessGuard(
+    settings.replica_read_your_writes_seconds,
+    # Shared through Redis so the guard holds across API processes and workers.
+    store=RedisRecentWriteStore(settings.redis_url) if replica_engines else None,
+)
 
 # Session factory used across the application.
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    bind=engine,
+    autocommit=False,
+    autoflush=False,
+    replicas=replicas,
+    guard=staleness_guard,
+)
+
+# Sessions for dashboards and report jobs: their SELECTs may be served by a replica.
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    bind=engine,
+    autocommit=False,
+    autoflush=False,
+    replicas=replicas,
+    guard=staleness_guard,
+    info={READ_ONLY_KEY: 1},
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -31,4 +96,102 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
+def pool_statistics() -> Dict[str, Dict[str, Any]]:
+    """Pool gauges and checkout wait telemetry for the primary and each replica."""
+
+    statuses = {"primary": pool_status(engine)}
+    statuses.update((f"replica_{index}", pool_status(replica)) for index, replica in enumerate(replica_engines))
+    if get_async_engine.cache_info().currsize:
+        statuses["primary_async"] = pool_status(get_async_engine().sync_engine)
+    return statuses
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Yield a replica-routed session for read-only endpoints such as dashboards."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Sync driver -> asyncio driver used when ASYNC_DATABASE_URL is not set.
+_ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "postgresql": "asyncpg",
+}
+
+
+def async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart.
+
+    ``mysql+pymysql://...`` becomes ``mysql+aiomysql://...`` and
+    ``sqlite:///./dev.db`` becomes ``sqlite+aiosqlite:///./dev.db``.
+    """
+
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver is configured for {backend!r} URLs.")
+    return parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, created on first use.
+
+    Created lazily so the worker and Alembic, which only use the sync engine,
+    never import the async drivers.
+    """
+
+    url = settings.async_database_url or async_url(settings.database_url)
+    profile = pool_profile()
+    async_engine = create_async_engine(url, **engine_options(url, profile, asyncio=True))
+    instrument_engine(async_engine.sync_engine, profile)
+    return async_engine
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Return the async session factory bound to ``get_async_engine()``."""
+
+    # expire_on_commit=False: attributes cannot lazy-load after an await boundary.
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session for ``async def`` endpoints."""
+
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close the async pool if it was ever created; called on application shutdown."""
+
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
+__all__ = [
+    "Base",
+    "engine",
+    "replica_engines",
+    "pool_profile",
+    "build_engine",
+    "pool_statistics",
+    "SessionLocal",
+    "ReadSessionLocal",
+    "get_db",
+    "get_read_db",
+    "replica_read",
+    "replica_reads",
+    "set_session_user",
+    "async_url",
+    "get_async_engine",
+    "get_async_sessionmaker",
+    "get_async_db",
+    "dispose_async_engine",
+]
@@ -0,0 +1,159 @@
+"""Per-request SQL instrumentation.
+
+Cursor execution events on every ``Engine`` (primary, replicas and the async
+engine's sync core) feed the ``QueryStats`` of whatever is being tracked:
+
+* ``track_queries`` scopes collection to the current context, so concurrent
+  requests each see only their own statements (the API middleware uses it);
+* ``track_all_queries`` collects from every thread, for tests and scripts.
+
+Statements are grouped by a normalized form (whitespace and ``IN`` lists
+collapsed), so one statement issued many times with different parameters, the
+signature of an N+1 lazy-load loop, shows up as a single repeated pattern.
+When nothing is tracked the event handlers return after one context lookup.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_KEPT = 5
+RECENT_REQUESTS_KEPT = 100
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement text with whitespace and bound ``IN (...)`` lists collapsed."""
+
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Query count, DB time, slowest statements and statement repetition of one tracked unit."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.patterns: Counter[str] = Counter()
+        self._slowest: List[Tuple[float, int, str]] = []
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        pattern = normalize_statement(statement)
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.patterns[pattern] += 1
+            entry = (duration_ms, self.count, pattern)
+            if len(self._slowest) < SLOWEST_KEPT:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [(round(duration_ms, 3), pattern) for duration_ms, _, pattern in entries]
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements issued at least ``threshold`` times, most frequent first."""
+
+        with self._lock:
+            return [(pattern, count) for pattern, count in self.patterns.most_common() if count >= threshold]
+
+    def summary(self, *, repeat_threshold: int) -> Dict[str, Any]:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.total_ms, 3),
+            "slowest": [{"ms": duration_ms, "statement": pattern} for duration_ms, pattern in self.slowest()],
+            "repeated": [{"count": count, "statement": pattern} for pattern, count in self.repeated(repeat_threshold)],
+        }
+
+    def report(self) -> str:
+        """Human-readable statement list, most frequent first; used in assertion messages."""
+
+        with self._lock:
+            patterns = self.patterns.most_common()
+        return "\n".join(f"{count:>4} x {pattern}" for pattern, count in patterns)
+
+
+_context_stats: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+_global_stats: List[QueryStats] = []
+_global_lock = threading.Lock()
+
+# Summaries of the latest requests, served by the opt-in debug endpoint.
+recent_requests: Deque[Dict[str, Any]] = deque(maxlen=RECENT_REQUESTS_KEPT)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in this context (and tasks or threads it starts)."""
+
+    stats = QueryStats()
+    token = _context_stats.set(_context_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _context_stats.reset(token)
+
+
+@contextmanager
+def track_all_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed by any thread while the block runs."""
+
+    stats = QueryStats()
+    with _global_lock:
+        _global_stats.append(stats)
+    try:
+        yield stats
+    finally:
+        with _global_lock:
+            _global_stats.remove(stats)
+
+
+def _active_stats() -> Tuple[QueryStats, ...]:
+    stats = _context_stats.get()
+    return stats + tuple(_global_stats) if _global_stats else stats
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if context is not None and _active_stats():
+        # Kept on the execution context, so a failed statement leaves nothing behind.
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    for stats in _active_stats():
+        stats.record(statement, duration_ms)
+
+
+__all__ = [
+    "SLOWEST_KEPT",
+    "QueryStats",
+    "normalize_statement",
+    "recent_requests",
+    "track_queries",
+    "track_all_queries",
+]
@@ -0,0 +1,235 @@
+"""Connection pool profiles and pool telemetry.
+
+The API process and the RQ worker use different pool profiles: the API holds
+more connections for concurrent requests and fails fast when they run out,
+while a worker runs one job at a time and can afford to wait. Every queue pool
+is an ``InstrumentedQueuePool`` that records how long checkouts wait, so pool
+sizes can be set from measured contention rather than guessed.
+
+Pre-ping strategies:
+
+* ``always``: ping on every checkout (SQLAlchemy's ``pool_pre_ping``);
+* ``idle``: ping only connections idle for ``pre_ping_idle_seconds`` or more,
+  which avoids a round trip on every checkout under load;
+* ``never``: rely on ``pool_recycle`` and invalidation after a disconnect error.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+# Upper bounds of the checkout wait histogram, in milliseconds.
+WAIT_BUCKETS_MS: Tuple[float, ...] = (1, 5, 10, 25, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """Pool sizing for one kind of process."""
+
+    name: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pre_ping: str
+    pre_ping_idle_seconds: float
+
+    def __post_init__(self) -> None:
+        if self.pre_ping not in PRE_PING_STRATEGIES:
+            raise ValueError(f"Unknown pre-ping strategy {self.pre_ping!r}.")
+
+
+class PoolTelemetry:
+    """Thread-safe counters and checkout wait histogram for one pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.connects = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+
+    def record_wait(self, wait_ms: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._bucket_counts[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def wait_percentile_ms(self, percentile: float) -> Optional[float]:
+        """Smallest bucket bound covering ``percentile`` of checkouts; ``None`` if empty or past the last bucket."""
+
+        with self._lock:
+            counts = list(self._bucket_counts)
+        total = sum(counts)
+        if total == 0:
+            return None
+        target = total * percentile / 100.0
+        seen = 0
+        for bound, count in zip(WAIT_BUCKETS_MS, counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._bucket_counts)
+            values = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "average_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+            }
+        labels = [f"le_{bound:g}ms" for bound in WAIT_BUCKETS_MS] + ["gt_last"]
+        values["wait_histogram"] = dict(zip(labels, counts))
+        values["p95_wait_ms"] = self.wait_percentile_ms(95)
+        return values
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that times each checkout, including waits for a free slot."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.telemetry.record_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.telemetry.record_wait((time.perf_counter() - started) * 1000)
+        return record
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Instrumented pool for ``create_async_engine``."""
+
+
+def engine_options(url: str, profile: PoolProfile, *, asyncio: bool = False) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for ``url`` under ``profile``.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {"pool_pre_ping": profile.pre_ping == "always"}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if asyncio else InstrumentedQueuePool,
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": profile.pre_ping == "always",
+    }
+
+
+def _ping(dbapi_connection: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: Engine, profile: PoolProfile) -> Engine:
+    """Attach connect/invalidate counters and the idle pre-ping strategy to ``engine``."""
+
+    telemetry = getattr(engine.pool, "telemetry", None)
+
+    if telemetry is not None:
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            telemetry.increment("connects")
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+            telemetry.increment("invalidations")
+
+    if profile.pre_ping == "idle":
+
+        @event.listens_for(engine, "checkin")
+        def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+            connection_record.info["checked_in_at"] = time.monotonic()
+
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+            checked_in_at = connection_record.info.get("checked_in_at")
+            if checked_in_at is None or time.monotonic() - checked_in_at < profile.pre_ping_idle_seconds:
+                return
+            try:
+                _ping(dbapi_connection)
+            except Exception as error:
+                if telemetry is not None:
+                    telemetry.increment("pre_ping_failures")
+                # The pool discards this connection and retries the checkout.
+                raise exc.DisconnectionError() from error
+
+    return engine
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Live gauges and accumulated telemetry for ``engine``'s pool."""
+
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    telemetry = getattr(pool, "telemetry", None)
+    if telemetry is not None:
+        status.update(telemetry.snapshot())
+    return status
+
+
+__all__ = [
+    "PRE_PING_STRATEGIES",
+    "WAIT_BUCKETS_MS",
+    "PoolProfile",
+    "PoolTelemetry",
+    "InstrumentedQueuePool",
+    "InstrumentedAsyncQueuePool",
+    "engine_options",
+    "instrument_engine",
+    "pool_status",
+]
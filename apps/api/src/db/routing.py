@@ -0,0 +1,216 @@
+"""Read-replica routing for the synchronous session.
+
+``RoutingSession`` sends a SELECT to a replica only when all of these hold:
+
+* replicas are configured (``DATABASE_REPLICA_URLS``);
+* the session was opened for reads (``ReadSessionLocal``, ``get_read_db``) or
+  the statement runs inside ``replica_reads`` / a ``@replica_read`` method;
+* the session has not written in its current transaction;
+* the session's user has not written within the read-your-writes window;
+* the statement is not ``SELECT ... FOR UPDATE``.
+
+Everything else, including every flush and Core DML statement, goes to the
+primary. A session keeps the replica it first picked so its reads see one
+consistent copy.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, Protocol, Sequence, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+READ_ONLY_KEY = "replica_reads"
+WROTE_KEY = "wrote_in_transaction"
+USER_KEY = "user_id"
+BALANCING_POLICIES = ("round_robin", "random")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ReplicaSet:
+    """Replica engines and the policy used to spread sessions over them."""
+
+    def __init__(self, engines: Sequence[Engine], *, policy: str = "round_robin") -> None:
+        if policy not in BALANCING_POLICIES:
+            raise ValueError(f"Unknown replica balancing policy {policy!r}.")
+        self.engines = list(engines)
+        self.policy = policy
+        self._next = itertools.cycle(range(len(self.engines))) if self.engines else None
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Engine:
+        if self.policy == "random":
+            return random.choice(self.engines)
+        with self._lock:
+            return self.engines[next(self._next)]
+
+
+class RecentWriteStore(Protocol):
+    def mark(self, key: str, ttl_seconds: float) -> None: ...
+
+    def contains(self, key: str) -> bool: ...
+
+
+class LocalRecentWriteStore:
+    """Per-process expiring keys; enough for a single API process and for tests."""
+
+    def __init__(self) -> None:
+        self._expiry: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._expiry[key] = time.monotonic() + ttl_seconds
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            expires = self._expiry.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._expiry[key]
+                return False
+            return True
+
+
+class RedisRecentWriteStore:
+    """Expiring keys in Redis, shared by every API and worker process."""
+
+    def __init__(self, url: str, *, prefix: str = "replica:recent-write:") -> None:
+        from redis import Redis
+
+        self._redis = Redis.from_url(url)
+        self._prefix = prefix
+
+    def mark(self, key: str, ttl_seconds: float) -> None:
+        self._redis.set(self._prefix + key, 1, px=max(1, int(ttl_seconds * 1000)))
+
+    def contains(self, key: str) -> bool:
+        return bool(self._redis.exists(self._prefix + key))
+
+
+class StalenessGuard:
+    """Forces primary reads for a user for a short window after their own write."""
+
+    def __init__(self, window_seconds: float, store: Optional[RecentWriteStore] = None) -> None:
+        self.window_seconds = window_seconds
+        self.store = store or LocalRecentWriteStore()
+
+    def record_write(self, user_id: int) -> None:
+        if self.window_seconds > 0:
+            self.store.mark(str(user_id), self.window_seconds)
+
+    def is_recent(self, user_id: int) -> bool:
+        return self.window_seconds > 0 and self.store.contains(str(user_id))
+
+
+class RoutingSession(Session):
+    """Session that may serve eligible SELECTs from a read replica."""
+
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Optional[ReplicaSet] = None,
+        guard: Optional[StalenessGuard] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.guard = guard
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        if clause is not None and getattr(clause, "is_dml", False):
+            self.info[WROTE_KEY] = True
+        elif self._reads_from_replica(clause):
+            if self._replica is None:
+                self._replica = self.replicas.choose()
+            return self._replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _reads_from_replica(self, clause: Any) -> bool:
+        if not self.replicas or not self.info.get(READ_ONLY_KEY) or self.info.get(WROTE_KEY):
+            return False
+        if clause is None or not getattr(clause, "is_select", False):
+            return False
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        user_id = self.info.get(USER_KEY)
+        return not (self.guard is not None and user_id is not None and self.guard.is_recent(user_id))
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _flag_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.info[WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_committed_write(session: Session) -> None:
+    user_id = session.info.get(USER_KEY)
+    guard = getattr(session, "guard", None)
+    if session.info.get(WROTE_KEY) and guard is not None and user_id is not None:
+        guard.record_write(user_id)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_transaction_state(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop(WROTE_KEY, None)
+
+
+def set_session_user(db: Session, user_id: Optional[int]) -> None:
+    """Attach the acting user so their writes and reads use the staleness guard."""
+
+    db.info[USER_KEY] = user_id
+
+
+@contextmanager
+def replica_reads(db: Session) -> Iterator[Session]:
+    """Allow eligible SELECTs issued inside the block to go to a replica.
+
+    Only wrap reads whose results are displayed or exported, never reads that
+    a write in the same unit of work depends on.
+    """
+
+    db.info[READ_ONLY_KEY] = db.info.get(READ_ONLY_KEY, 0) + 1
+    try:
+        yield db
+    finally:
+        db.info[READ_ONLY_KEY] -= 1
+
+
+def replica_read(method: F) -> F:
+    """Mark a repository method ``(self, db, ...)`` as safe to serve from a replica."""
+
+    @wraps(method)
+    def wrapper(self: Any, db: Session, *args: Any, **kwargs: Any) -> Any:
+        with replica_reads(db):
+            return method(self, db, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+__all__ = [
+    "BALANCING_POLICIES",
+    "ReplicaSet",
+    "LocalRecentWriteStore",
+    "RedisRecentWriteStore",
+    "StalenessGuard",
+    "RoutingSession",
+    "set_session_user",
+    "replica_reads",
+    "replica_read",
+]
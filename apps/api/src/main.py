@@ -1,13 +1,28 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from .api import router as api_router
+from .api.middleware import sql_instrumentation_middleware
+from .core.config import settings
+from .db import dispose_async_engine
 from .schemas import HealthResponse
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Release pooled async connections when the server stops."""
+    yield
+    await dispose_async_engine()
+
+
 app = FastAPI(
     title="Proficiency API",
     version="0.0.1",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 
@@ -17,4 +32,7 @@ async def read_health() -> HealthResponse:
     return HealthResponse(status="ok")
 
 
+if settings.sql_instrumentation:
+    app.middleware("http")(sql_instrumentation_middleware)
+
 app.include_router(api_router, prefix="/api")
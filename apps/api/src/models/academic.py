@@ -60,6 +60,30 @@ class Department(TimestampMixin, Base):
     )
 
 
+class DepartmentClosure(Base):
+    """Transitive closure of the department tree.
+
+    One row per (ancestor, descendant) pair, including each department paired
+    with itself at depth 0, so a subtree filter is a single indexed join.
+    Maintained by ``department_hierarchy_service``.
+    """
+
+    __tablename__ = "department_closure"
+    __table_args__ = (
+        Index("idx_department_closure_descendant", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("departments.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("departments.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    depth: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
 class Program(TimestampMixin, Base):
     """Specific academic program or degree."""
 
@@ -318,6 +342,7 @@ class Enrollment(TimestampMixin, Base):
 
 __all__ = [
     "Department",
+    "DepartmentClosure",
     "Program",
     "Subject",
     "SchoolYear",
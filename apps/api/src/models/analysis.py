@@ -3,13 +3,19 @@
 from __future__ import annotations
 
 
+from datetime import datetime
+from typing import List, Optional
+
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    DateTime,
     Float,
     ForeignKey,
     Index,
     Integer,
     JSON,
+    LargeBinary,
     Numeric,
     String,
     UniqueConstraint,
@@ -17,8 +23,8 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db import Base
-from .common import TimestampMixin, enum_column
-from .enums import SentimentLabel
+from .common import CreatedAtMixin, TimestampMixin, enum_column
+from .enums import AggregateItemType, CohortGrouping, CohortMetric, SentimentLabel
 
 
 class NumericalAggregate(TimestampMixin, Base):
@@ -41,11 +47,48 @@ class NumericalAggregate(TimestampMixin, Base):
     cohort_mean: Mapped[float] = mapped_column(Numeric(10, 4), nullable=False)
     cohort_std_dev: Mapped[float] = mapped_column(Numeric(10, 4), nullable=False)
     is_final_snapshot: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Department cohort ``quant_score_raw`` was last added to, so it is retracted from the same one.
+    cohort_department_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("departments.id", ondelete="SET NULL")
+    )
 
     submission: Mapped["EvaluationSubmission"] = relationship(
         "EvaluationSubmission",
         back_populates="numerical_aggregate",
     )
+    items: Mapped[List["NumericalAggregateItem"]] = relationship(
+        "NumericalAggregateItem",
+        back_populates="aggregate",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class NumericalAggregateItem(Base):
+    """One per-question median or per-criterion average of a ``NumericalAggregate``.
+
+    The same scores as the aggregate's JSON maps, one row each, so question-level
+    drilldowns are indexed ``GROUP BY`` queries instead of JSON decoding. The
+    item index is covering on InnoDB (the primary key rides along), so such
+    queries never touch the clustered rows.
+    """
+
+    __tablename__ = "numerical_aggregate_items"
+    __table_args__ = (Index("idx_aggregate_items_item", "item_type", "item_id", "value"),)
+
+    aggregate_id: Mapped[int] = mapped_column(
+        ForeignKey("numerical_aggregates.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    item_type: Mapped[AggregateItemType] = mapped_column(
+        enum_column(AggregateItemType, "aggregate_item_type"),
+        primary_key=True,
+    )
+    # ``evaluation_questions.id`` or ``evaluation_criteria.id`` depending on ``item_type``.
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[float] = mapped_column(Numeric(10, 4), nullable=False)
+
+    aggregate: Mapped[NumericalAggregate] = relationship("NumericalAggregate", back_populates="items")
 
 
 class OpenEndedSentiment(TimestampMixin, Base):
@@ -116,6 +159,10 @@ class SentimentAggregate(TimestampMixin, Base):
     qual_score_raw: Mapped[float] = mapped_column(Numeric(10, 4), nullable=False)
     z_qual: Mapped[float] = mapped_column(Numeric(10, 4), nullable=False)
     is_final_snapshot: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Department cohort ``qual_score_raw`` was last added to, so it is retracted from the same one.
+    cohort_department_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("departments.id", ondelete="SET NULL")
+    )
 
     submission: Mapped["EvaluationSubmission"] = relationship(
         "EvaluationSubmission",
@@ -123,9 +170,145 @@ class SentimentAggregate(TimestampMixin, Base):
     )
 
 
+class CohortStatistic(TimestampMixin, Base):
+    """Running mean/variance of raw scores for one normalization cohort.
+
+    ``n``, ``mean`` and ``m2`` (sum of squared deviations) are maintained with
+    Welford updates so adding, retracting or merging scores never rescans the cohort.
+    """
+
+    __tablename__ = "cohort_statistics"
+    __table_args__ = (
+        UniqueConstraint(
+            "evaluation_period_id",
+            "grouping",
+            "group_id",
+            "metric",
+            name="uk_cohort_statistic_key",
+        ),
+        Index("idx_cohort_statistics_university", "university_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    university_id: Mapped[int] = mapped_column(
+        ForeignKey("universities.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    evaluation_period_id: Mapped[int] = mapped_column(
+        ForeignKey("evaluation_periods.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    grouping: Mapped[CohortGrouping] = mapped_column(
+        enum_column(CohortGrouping, "cohort_grouping"),
+        nullable=False,
+    )
+    group_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    metric: Mapped[CohortMetric] = mapped_column(
+        enum_column(CohortMetric, "cohort_metric"),
+        nullable=False,
+    )
+    n: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    mean: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    m2: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class QualitativeResultCacheEntry(CreatedAtMixin, Base):
+    """Persisted sentiment and keyword results keyed by normalized answer text."""
+
+    __tablename__ = "qualitative_result_cache"
+    __table_args__ = (
+        UniqueConstraint("content_hash", "model_version", name="uk_qualitative_cache_key"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_version: Mapped[str] = mapped_column(String(255), nullable=False)
+    positive_score: Mapped[float] = mapped_column(Float, nullable=False)
+    neutral_score: Mapped[float] = mapped_column(Float, nullable=False)
+    negative_score: Mapped[float] = mapped_column(Float, nullable=False)
+    keywords: Mapped[list] = mapped_column(JSON, nullable=False)
+
+
+class AnswerMinHashSignature(CreatedAtMixin, Base):
+    """MinHash signature of an open-ended answer, used for recycled-content checks."""
+
+    __tablename__ = "answer_minhash_signatures"
+
+    open_ended_answer_id: Mapped[int] = mapped_column(
+        ForeignKey("evaluation_open_ended_answers.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    submission_id: Mapped[int] = mapped_column(
+        ForeignKey("evaluation_submissions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class AnswerLSHBucket(Base):
+    """One LSH band bucket of an answer signature, scoped to its evaluator."""
+
+    __tablename__ = "answer_lsh_buckets"
+    __table_args__ = (
+        Index("idx_lsh_scope_bucket", "university_id", "evaluator_id", "bucket_key"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    university_id: Mapped[int] = mapped_column(
+        ForeignKey("universities.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    evaluator_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    bucket_key: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    open_ended_answer_id: Mapped[int] = mapped_column(
+        ForeignKey("answer_minhash_signatures.open_ended_answer_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+
+class ProvisionalAggregate(TimestampMixin, Base):
+    """Running per-evaluatee totals for an active period, refreshed by micro-batches."""
+
+    __tablename__ = "provisional_aggregates"
+    __table_args__ = (
+        UniqueConstraint("evaluation_period_id", "evaluatee_id", name="uk_provisional_aggregate_key"),
+        Index("idx_provisional_aggregates_university", "university_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    university_id: Mapped[int] = mapped_column(
+        ForeignKey("universities.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    evaluation_period_id: Mapped[int] = mapped_column(
+        ForeignKey("evaluation_periods.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    evaluatee_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    submission_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    likert_answer_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    likert_value_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    average_likert_score: Mapped[Optional[float]] = mapped_column(Numeric(10, 4))
+    scored_submission_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    average_quant_score: Mapped[Optional[float]] = mapped_column(Numeric(10, 4))
+    last_submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
+
+
 __all__ = [
     "NumericalAggregate",
+    "NumericalAggregateItem",
     "OpenEndedSentiment",
     "OpenEndedKeyword",
     "SentimentAggregate",
+    "CohortStatistic",
+    "QualitativeResultCacheEntry",
+    "AnswerMinHashSignature",
+    "AnswerLSHBucket",
+    "ProvisionalAggregate",
 ]
@@ -87,6 +87,14 @@ class EvaluationSubmissionStatus(StrEnum):
     CANCELLED = "cancelled"
 
 
+# Submissions in these statuses count towards scores, cohort statistics and provisional aggregates.
+SCORABLE_SUBMISSION_STATUSES = (
+    EvaluationSubmissionStatus.SUBMITTED,
+    EvaluationSubmissionStatus.PROCESSING,
+    EvaluationSubmissionStatus.PROCESSED,
+)
+
+
 class IntegrityCheckStatus(StrEnum):
     PENDING = "pending"
     COMPLETED = "completed"
@@ -123,6 +131,22 @@ class SentimentLabel(StrEnum):
     NEGATIVE = "negative"
 
 
+class CohortGrouping(StrEnum):
+    UNIVERSITY = "university"
+    DEPARTMENT = "department"
+    EVALUATEE = "evaluatee"
+
+
+class CohortMetric(StrEnum):
+    QUANTITATIVE = "quantitative"
+    QUALITATIVE = "qualitative"
+
+
+class AggregateItemType(StrEnum):
+    QUESTION_MEDIAN = "question_median"
+    CRITERION_AVERAGE = "criterion_average"
+
+
 class GeneratedReportStatus(StrEnum):
     QUEUED = "queued"
     GENERATING = "generating"
@@ -178,12 +202,16 @@ __all__ = [
     "EvaluationPeriodStatus",
     "QuestionType",
     "EvaluationSubmissionStatus",
+    "SCORABLE_SUBMISSION_STATUSES",
     "IntegrityCheckStatus",
     "AnalysisPipelineStatus",
     "FlagReason",
     "FlagStatus",
     "FlagResolution",
     "SentimentLabel",
+    "CohortGrouping",
+    "CohortMetric",
+    "AggregateItemType",
     "GeneratedReportStatus",
     "ReportFileFormat",
     "BackgroundJobType",
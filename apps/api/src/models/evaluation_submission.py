@@ -47,6 +47,7 @@ class EvaluationSubmission(TimestampMixin, Base):
         Index("idx_submissions_integrity_status", "integrity_check_status"),
         Index("idx_submissions_analysis_status", "analysis_status"),
         Index("idx_evaluatee_period", "evaluatee_id", "evaluation_period_id"),
+        Index("idx_submissions_submitted_at_id", "submitted_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -98,7 +98,11 @@ class University(TimestampMixin, Base):
         "BackgroundTask",
         back_populates="university",
     )
-    audit_logs: Mapped[List["AuditLog"]] = relationship("AuditLog", back_populates="university")
+    audit_logs: Mapped[List["AuditLog"]] = relationship(
+        "AuditLog",
+        primaryjoin="University.id == foreign(AuditLog.university_id)",
+        back_populates="university",
+    )
     notifications: Mapped[List["Notification"]] = relationship(
         "Notification",
         back_populates="university",
@@ -332,7 +336,11 @@ class User(TimestampMixin, Base):
         "GeneratedReport",
         back_populates="requested_by",
     )
-    audit_events: Mapped[List["AuditLog"]] = relationship("AuditLog", back_populates="actor")
+    audit_events: Mapped[List["AuditLog"]] = relationship(
+        "AuditLog",
+        primaryjoin="User.id == foreign(AuditLog.actor_user_id)",
+        back_populates="actor",
+    )
 
 
 class UserRole(TimestampMixin, Base):
@@ -7,6 +7,7 @@ from typing import List, Optional
 
 from sqlalchemy import (
     BigInteger,
+    Boolean,
     DateTime,
     ForeignKey,
     Index,
@@ -73,22 +74,28 @@ class BackgroundTask(TimestampMixin, Base):
 
 
 class AuditLog(Base):
-    """Security and operations audit trail."""
+    """Security and operations audit trail.
+
+    On MariaDB the table is range-partitioned by month on ``timestamp`` (see
+    ``audit_log_archive_service``). Partitioned InnoDB tables cannot hold foreign
+    keys and every unique key must include the partitioning column, so
+    ``university_id``/``actor_user_id`` are plain columns there and the primary
+    key is ``(id, timestamp)``; ``id`` alone is still unique in practice.
+    """
 
     __tablename__ = "audit_logs"
     __table_args__ = (
         Index("idx_audit_action", "action"),
         Index("idx_audit_target", "target_entity", "target_id"),
         Index("idx_audit_actor", "actor_user_id"),
+        Index("idx_audit_timestamp", "timestamp"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
-    university_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("universities.id", ondelete="SET NULL")
-    )
-    actor_user_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("users.id", ondelete="SET NULL")
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
     )
+    university_id: Mapped[Optional[int]] = mapped_column(Integer)
+    actor_user_id: Mapped[Optional[int]] = mapped_column(Integer)
     action: Mapped[str] = mapped_column(String(100), nullable=False)
     target_entity: Mapped[Optional[str]] = mapped_column(String(100))
     target_id: Mapped[Optional[int]] = mapped_column(Integer)
@@ -100,8 +107,16 @@ class AuditLog(Base):
         server_default=func.now(),
     )
 
-    university: Mapped[Optional["University"]] = relationship("University", back_populates="audit_logs")
-    actor: Mapped[Optional["User"]] = relationship("User", back_populates="audit_events")
+    university: Mapped[Optional["University"]] = relationship(
+        "University",
+        primaryjoin="foreign(AuditLog.university_id) == University.id",
+        back_populates="audit_logs",
+    )
+    actor: Mapped[Optional["User"]] = relationship(
+        "User",
+        primaryjoin="foreign(AuditLog.actor_user_id) == User.id",
+        back_populates="audit_events",
+    )
 
 
 class Notification(TimestampMixin, Base):
@@ -156,4 +171,66 @@ class UniversitySetting(TimestampMixin, Base):
     university: Mapped["University"] = relationship("University", back_populates="settings")
 
 
-__all__ = ["BackgroundTask", "AuditLog", "Notification", "UniversitySetting"]
+class BatchWatermark(TimestampMixin, Base):
+    """High-water mark of an incremental batch job over an ordered source table."""
+
+    __tablename__ = "batch_watermarks"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    watermark_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False))
+    watermark_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class HistoricalEvaluationStagingRow(Base):
+    """One answer of a ``HISTORICAL_EVALUATION_IMPORT`` file, staged until it is merged.
+
+    The file's values are kept as text, next to the ids they resolve to and
+    the reason the row was rejected, if any. Rows of one submission share
+    ``group_id``; merged rows are deleted with the chunk that merged them.
+    There are no foreign keys besides the task's, to keep bulk loading cheap.
+    """
+
+    __tablename__ = "historical_evaluation_staging"
+    __table_args__ = (
+        Index("idx_historical_staging_task_line", "task_id", "line"),
+        Index("idx_historical_staging_task_group", "task_id", "group_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("background_tasks.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    line: Mapped[int] = mapped_column(Integer, nullable=False)
+    school_year: Mapped[str] = mapped_column(String(20), nullable=False)
+    semester: Mapped[str] = mapped_column(String(20), nullable=False)
+    assessment_period: Mapped[str] = mapped_column(String(20), nullable=False)
+    evaluator_school_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    evaluatee_school_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    edp_code: Mapped[str] = mapped_column(String(50), nullable=False)
+    form: Mapped[str] = mapped_column(String(20), nullable=False)
+    question: Mapped[str] = mapped_column(String(20), nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    submitted_at: Mapped[Optional[str]] = mapped_column(String(40))
+    school_term_id: Mapped[Optional[int]] = mapped_column(Integer)
+    is_department_head: Mapped[Optional[bool]] = mapped_column(Boolean)
+    question_order: Mapped[Optional[int]] = mapped_column(Integer)
+    answer_value: Mapped[Optional[int]] = mapped_column(Integer)
+    submitted_on: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False))
+    evaluation_period_id: Mapped[Optional[int]] = mapped_column(Integer)
+    evaluator_id: Mapped[Optional[int]] = mapped_column(Integer)
+    evaluatee_id: Mapped[Optional[int]] = mapped_column(Integer)
+    subject_offering_id: Mapped[Optional[int]] = mapped_column(Integer)
+    question_id: Mapped[Optional[int]] = mapped_column(Integer)
+    group_id: Mapped[Optional[int]] = mapped_column(Integer)
+    error: Mapped[Optional[str]] = mapped_column(String(255))
+
+
+__all__ = [
+    "BackgroundTask",
+    "AuditLog",
+    "Notification",
+    "UniversitySetting",
+    "BatchWatermark",
+    "HistoricalEvaluationStagingRow",
+]
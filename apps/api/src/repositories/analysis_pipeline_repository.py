@@ -0,0 +1,173 @@
+"""Data access for analysis pipeline state and final aggregation inputs."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, exists, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models.analysis import NumericalAggregate, OpenEndedSentiment, SentimentAggregate
+from ..models.enums import AnalysisPipelineStatus, EvaluationSubmissionStatus
+from ..models.evaluation_config import EvaluationPeriod
+from ..models.evaluation_submission import EvaluationOpenEndedAnswer, EvaluationSubmission
+
+
+class AnalysisPipelineRepository:
+    """Set-based reads and writes used by the pipeline orchestrator and FINAL_AGGREGATION."""
+
+    def fetch_stage_complete_submission_ids(
+        self,
+        db: Session,
+        *,
+        statuses: Iterable[EvaluationSubmissionStatus],
+        evaluation_period_id: Optional[int] = None,
+    ) -> List[int]:
+        """PENDING submissions that have a numerical aggregate and sentiment for every answer."""
+
+        unanalyzed_answer = (
+            select(EvaluationOpenEndedAnswer.id)
+            .outerjoin(OpenEndedSentiment, OpenEndedSentiment.open_ended_answer_id == EvaluationOpenEndedAnswer.id)
+            .where(
+                EvaluationOpenEndedAnswer.submission_id == EvaluationSubmission.id,
+                OpenEndedSentiment.id.is_(None),
+            )
+        )
+        stmt = (
+            select(EvaluationSubmission.id)
+            .join(NumericalAggregate, NumericalAggregate.submission_id == EvaluationSubmission.id)
+            .where(
+                EvaluationSubmission.analysis_status == AnalysisPipelineStatus.PENDING,
+                EvaluationSubmission.status.in_(list(statuses)),
+                ~exists(unanalyzed_answer),
+            )
+            .order_by(EvaluationSubmission.id)
+        )
+        if evaluation_period_id is not None:
+            stmt = stmt.where(EvaluationSubmission.evaluation_period_id == evaluation_period_id)
+        return list(db.scalars(stmt))
+
+    def fetch_submission_ids_by_status(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        analysis_statuses: Iterable[AnalysisPipelineStatus],
+    ) -> List[int]:
+        stmt = (
+            select(EvaluationSubmission.id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.analysis_status.in_(list(analysis_statuses)),
+            )
+            .order_by(EvaluationSubmission.id)
+        )
+        return list(db.scalars(stmt))
+
+    def set_analysis_status(
+        self,
+        db: Session,
+        *,
+        submission_ids: Sequence[int],
+        status: AnalysisPipelineStatus,
+    ) -> None:
+        if submission_ids:
+            db.execute(
+                update(EvaluationSubmission)
+                .where(EvaluationSubmission.id.in_(list(submission_ids)))
+                .values(analysis_status=status)
+                .execution_options(synchronize_session=False)
+            )
+
+    def lock_period(self, db: Session, *, evaluation_period_id: int) -> Optional[EvaluationPeriod]:
+        """Lock the period row; used as the mutex for scheduling its aggregation runs."""
+
+        stmt = select(EvaluationPeriod).where(EvaluationPeriod.id == evaluation_period_id).with_for_update()
+        return db.scalars(stmt).one_or_none()
+
+    def fetch_numerical_inputs(
+        self,
+        db: Session,
+        *,
+        submission_ids: Sequence[int],
+    ) -> Sequence[Row[Tuple[int, int, float, bool]]]:
+        """Return ``(submission_id, aggregate_id, quant_score_raw, is_final_snapshot)``."""
+
+        if not submission_ids:
+            return []
+        stmt = select(
+            NumericalAggregate.submission_id,
+            NumericalAggregate.id,
+            NumericalAggregate.quant_score_raw,
+            NumericalAggregate.is_final_snapshot,
+        ).where(NumericalAggregate.submission_id.in_(list(submission_ids)))
+        return db.execute(stmt).all()
+
+    def fetch_sentiment_averages(
+        self,
+        db: Session,
+        *,
+        submission_ids: Sequence[int],
+        statuses: Optional[Iterable[EvaluationSubmissionStatus]] = None,
+    ) -> Sequence[Row[Tuple[int, float, float, float]]]:
+        """Return ``(submission_id, avg_positive, avg_neutral, avg_negative)`` per submission.
+
+        With ``statuses``, only submissions in one of them are returned.
+        """
+
+        if not submission_ids:
+            return []
+        stmt = (
+            select(
+                EvaluationOpenEndedAnswer.submission_id,
+                func.avg(OpenEndedSentiment.positive_score),
+                func.avg(OpenEndedSentiment.neutral_score),
+                func.avg(OpenEndedSentiment.negative_score),
+            )
+            .join(OpenEndedSentiment, OpenEndedSentiment.open_ended_answer_id == EvaluationOpenEndedAnswer.id)
+            .where(EvaluationOpenEndedAnswer.submission_id.in_(list(submission_ids)))
+            .group_by(EvaluationOpenEndedAnswer.submission_id)
+        )
+        if statuses is not None:
+            stmt = stmt.join(
+                EvaluationSubmission,
+                EvaluationSubmission.id == EvaluationOpenEndedAnswer.submission_id,
+            ).where(EvaluationSubmission.status.in_(list(statuses)))
+        return db.execute(stmt).all()
+
+    def get_sentiment_aggregate_states(
+        self,
+        db: Session,
+        *,
+        submission_ids: Sequence[int],
+    ) -> Dict[int, Tuple[int, bool, float]]:
+        """Map submission id to ``(aggregate_id, is_final_snapshot, qual_score_raw)``."""
+
+        if not submission_ids:
+            return {}
+        stmt = select(
+            SentimentAggregate.submission_id,
+            SentimentAggregate.id,
+            SentimentAggregate.is_final_snapshot,
+            SentimentAggregate.qual_score_raw,
+        ).where(SentimentAggregate.submission_id.in_(list(submission_ids)))
+        return {
+            submission_id: (aggregate_id, is_final, float(raw))
+            for submission_id, aggregate_id, is_final, raw in db.execute(stmt)
+        }
+
+    def bulk_insert_sentiment_aggregates(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            db.execute(insert(SentimentAggregate), rows)
+
+    def bulk_update_sentiment_aggregates(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """Update sentiment aggregates by primary key; each row must carry ``id``."""
+
+        if rows:
+            db.execute(update(SentimentAggregate), rows)
+
+
+analysis_pipeline_repository = AnalysisPipelineRepository()
+
+
+__all__ = ["AnalysisPipelineRepository", "analysis_pipeline_repository"]
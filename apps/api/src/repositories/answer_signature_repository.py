@@ -0,0 +1,113 @@
+"""Persistent MinHash signatures and LSH buckets of open-ended answers."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.analysis import AnswerLSHBucket, AnswerMinHashSignature
+from ..models.evaluation_submission import EvaluationOpenEndedAnswer, EvaluationSubmission
+
+
+class AnswerSignatureRepository:
+    """Reads and writes used by the recycled-content index."""
+
+    def fetch_submission_answers(
+        self,
+        db: Session,
+        *,
+        submission_ids: Iterable[int],
+    ) -> Sequence[Row[Tuple[int, int, int, int, str]]]:
+        """Return ``(answer_id, submission_id, university_id, evaluator_id, answer_text)`` by answer id."""
+
+        ids = list(submission_ids)
+        if not ids:
+            return []
+        stmt = (
+            select(
+                EvaluationOpenEndedAnswer.id,
+                EvaluationOpenEndedAnswer.submission_id,
+                EvaluationSubmission.university_id,
+                EvaluationSubmission.evaluator_id,
+                EvaluationOpenEndedAnswer.answer_text,
+            )
+            .join(EvaluationSubmission, EvaluationSubmission.id == EvaluationOpenEndedAnswer.submission_id)
+            .where(EvaluationOpenEndedAnswer.submission_id.in_(ids))
+            .order_by(EvaluationOpenEndedAnswer.id)
+        )
+        return db.execute(stmt).all()
+
+    def fetch_period_submission_ids(self, db: Session, *, evaluation_period_id: int) -> List[int]:
+        stmt = (
+            select(EvaluationSubmission.id)
+            .where(EvaluationSubmission.evaluation_period_id == evaluation_period_id)
+            .order_by(EvaluationSubmission.id)
+        )
+        return list(db.scalars(stmt))
+
+    def get_signatures(self, db: Session, *, answer_ids: Iterable[int]) -> Dict[int, bytes]:
+        ids = list(answer_ids)
+        if not ids:
+            return {}
+        stmt = select(AnswerMinHashSignature.open_ended_answer_id, AnswerMinHashSignature.signature).where(
+            AnswerMinHashSignature.open_ended_answer_id.in_(ids)
+        )
+        return {answer_id: signature for answer_id, signature in db.execute(stmt)}
+
+    def insert(
+        self,
+        db: Session,
+        *,
+        signatures: List[Dict[str, Any]],
+        buckets: List[Dict[str, Any]],
+    ) -> None:
+        """Insert signature rows and their band buckets with executemany batching.
+
+        Both go through Core table inserts: there are ``BANDS`` buckets per answer
+        on the submission write path, and the ORM bulk insert's per-row
+        bookkeeping costs several times the statement itself at that volume.
+        """
+
+        if signatures:
+            db.execute(insert(AnswerMinHashSignature.__table__), signatures)
+        if buckets:
+            db.execute(insert(AnswerLSHBucket.__table__), buckets)
+
+    def find_candidates(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        evaluator_id: int,
+        bucket_keys: Sequence[int],
+        before_answer_id: Optional[int] = None,
+    ) -> Sequence[Row[Tuple[int, int, bytes]]]:
+        """Return ``(answer_id, submission_id, signature)`` sharing any bucket in the evaluator's scope."""
+
+        if not bucket_keys:
+            return []
+        matches = (
+            select(AnswerLSHBucket.open_ended_answer_id)
+            .where(
+                AnswerLSHBucket.university_id == university_id,
+                AnswerLSHBucket.evaluator_id == evaluator_id,
+                AnswerLSHBucket.bucket_key.in_(list(bucket_keys)),
+            )
+            .distinct()
+        )
+        if before_answer_id is not None:
+            matches = matches.where(AnswerLSHBucket.open_ended_answer_id < before_answer_id)
+        stmt = select(
+            AnswerMinHashSignature.open_ended_answer_id,
+            AnswerMinHashSignature.submission_id,
+            AnswerMinHashSignature.signature,
+        ).where(AnswerMinHashSignature.open_ended_answer_id.in_(matches.scalar_subquery()))
+        return db.execute(stmt).all()
+
+
+answer_signature_repository = AnswerSignatureRepository()
+
+
+__all__ = ["AnswerSignatureRepository", "answer_signature_repository"]
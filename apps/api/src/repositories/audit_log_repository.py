@@ -0,0 +1,116 @@
+"""Data access for the audit trail, including its MariaDB partitions."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, delete, func, select, text
+from sqlalchemy.orm import Session
+
+from ..models.operations import AuditLog
+from .keyset import DEFAULT_PAGE_SIZE, KeysetRepository, Page
+
+
+class AuditLogRepository(KeysetRepository[AuditLog]):
+    """Lists ``audit_logs`` rows newest first, one keyset page at a time."""
+
+    model = AuditLog
+    default_sort = "timestamp"
+
+    def list_page(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        action: Optional[str] = None,
+        actor_user_id: Optional[int] = None,
+        target_entity: Optional[str] = None,
+        target_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[AuditLog]:
+        filters = [AuditLog.university_id == university_id]
+        if action is not None:
+            filters.append(AuditLog.action == action)
+        if actor_user_id is not None:
+            filters.append(AuditLog.actor_user_id == actor_user_id)
+        if target_entity is not None:
+            filters.append(AuditLog.target_entity == target_entity)
+        if target_id is not None:
+            filters.append(AuditLog.target_id == target_id)
+        if since is not None:
+            filters.append(AuditLog.timestamp >= since)
+        if until is not None:
+            filters.append(AuditLog.timestamp < until)
+        return self.paginate(db, filters=filters, cursor=cursor, limit=limit)
+
+    def oldest_timestamp(self, db: Session, *, before: datetime) -> Optional[datetime]:
+        return db.scalar(select(func.min(AuditLog.timestamp)).where(AuditLog.timestamp < before))
+
+    def iter_before(self, db: Session, *, end: datetime, batch_size: int = 5000) -> Iterator[Sequence[Row]]:
+        """Stream every row older than ``end`` in ``(university_id, timestamp)`` order, ``batch_size`` at a time."""
+
+        stmt = (
+            select(
+                AuditLog.id,
+                AuditLog.university_id,
+                AuditLog.actor_user_id,
+                AuditLog.action,
+                AuditLog.target_entity,
+                AuditLog.target_id,
+                AuditLog.details,
+                AuditLog.ip_address,
+                AuditLog.timestamp,
+            )
+            .where(AuditLog.timestamp < end)
+            .order_by(AuditLog.university_id, AuditLog.timestamp, AuditLog.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from db.execute(stmt).partitions()
+
+    def delete_before(self, db: Session, *, end: datetime) -> int:
+        stmt = delete(AuditLog).where(AuditLog.timestamp < end).execution_options(synchronize_session=False)
+        result = db.execute(stmt)
+        return result.rowcount
+
+    # MariaDB partition maintenance. Partition ``pYYYYMM`` holds the rows of that month;
+    # the last partition, ``pmax``, catches anything beyond the newest month.
+
+    def partitions(self, db: Session) -> List[Tuple[str, str]]:
+        """``(name, upper bound)`` of each partition in order; empty when the table is not partitioned."""
+
+        rows = db.execute(
+            text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION"
+            ),
+            {"table": AuditLog.__tablename__},
+        )
+        return [(name, description) for name, description in rows]
+
+    def split_catch_all_partition(self, db: Session, *, months: Sequence[Tuple[str, date]]) -> None:
+        """Carve ``(name, exclusive upper bound)`` monthly partitions out of ``pmax``."""
+
+        if not months:
+            return
+        definitions = ", ".join(f"PARTITION {name} VALUES LESS THAN ('{bound.isoformat()}')" for name, bound in months)
+        db.execute(
+            text(
+                f"ALTER TABLE {AuditLog.__tablename__} REORGANIZE PARTITION pmax INTO "
+                f"({definitions}, PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+            )
+        )
+
+    def drop_partition(self, db: Session, *, name: str) -> None:
+        # DDL: MariaDB commits implicitly, and the rows are gone without an undo log.
+        db.execute(text(f"ALTER TABLE {AuditLog.__tablename__} DROP PARTITION {name}"))
+
+
+audit_log_repository = AuditLogRepository()
+
+
+__all__ = ["AuditLogRepository", "audit_log_repository"]
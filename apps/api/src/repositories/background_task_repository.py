@@ -0,0 +1,95 @@
+"""Data access for background task records."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.enums import BackgroundJobStatus, BackgroundJobType
+from ..models.operations import BackgroundTask
+from .keyset import DEFAULT_PAGE_SIZE, KeysetRepository, Page
+
+
+class BackgroundTaskRepository(KeysetRepository[BackgroundTask]):
+    """Creates and queries ``background_tasks`` rows."""
+
+    model = BackgroundTask
+
+    def get(self, db: Session, task_id: int) -> Optional[BackgroundTask]:
+        return db.get(BackgroundTask, task_id)
+
+    def get_for_update(self, db: Session, task_id: int) -> Optional[BackgroundTask]:
+        """Re-read the task with a row lock, bypassing any stale identity-map state."""
+
+        stmt = (
+            select(BackgroundTask)
+            .where(BackgroundTask.id == task_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return db.scalars(stmt).one_or_none()
+
+    def list_by_status(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        job_type: BackgroundJobType,
+        status: BackgroundJobStatus,
+    ) -> List[BackgroundTask]:
+        stmt = (
+            select(BackgroundTask)
+            .where(
+                BackgroundTask.university_id == university_id,
+                BackgroundTask.job_type == job_type,
+                BackgroundTask.status == status,
+            )
+            .order_by(BackgroundTask.id)
+        )
+        return list(db.scalars(stmt))
+
+    def list_page(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        job_type: Optional[BackgroundJobType] = None,
+        status: Optional[BackgroundJobStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[BackgroundTask]:
+        """Newest tasks first for the job history views."""
+
+        filters = [BackgroundTask.university_id == university_id]
+        if job_type is not None:
+            filters.append(BackgroundTask.job_type == job_type)
+        if status is not None:
+            filters.append(BackgroundTask.status == status)
+        return self.paginate(db, filters=filters, cursor=cursor, limit=limit)
+
+    def create(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        job_type: BackgroundJobType,
+        submitted_by_user_id: int,
+        job_parameters: Optional[Dict[str, Any]] = None,
+    ) -> BackgroundTask:
+        task = BackgroundTask(
+            university_id=university_id,
+            job_type=job_type,
+            submitted_by_user_id=submitted_by_user_id,
+            job_parameters=job_parameters,
+        )
+        db.add(task)
+        db.flush()
+        return task
+
+
+background_task_repository = BackgroundTaskRepository()
+
+
+__all__ = ["BackgroundTaskRepository", "background_task_repository"]
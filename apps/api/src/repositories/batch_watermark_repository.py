@@ -0,0 +1,36 @@
+"""Persistent high-water marks for incremental batch jobs."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.operations import BatchWatermark
+
+
+class BatchWatermarkRepository:
+    """Row-locked access to ``batch_watermarks``."""
+
+    def get_for_update(self, db: Session, *, job_name: str) -> BatchWatermark:
+        """Return the job's watermark locked for the transaction, creating it at the origin."""
+
+        stmt = select(BatchWatermark).where(BatchWatermark.job_name == job_name).with_for_update()
+        row = db.scalars(stmt).one_or_none()
+        if row is not None:
+            return row
+
+        row = BatchWatermark(job_name=job_name, watermark_at=None, watermark_id=0)
+        try:
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            # Another run created it concurrently; wait for its lock instead.
+            return db.scalars(stmt).one()
+        return row
+
+
+batch_watermark_repository = BatchWatermarkRepository()
+
+
+__all__ = ["BatchWatermarkRepository", "batch_watermark_repository"]
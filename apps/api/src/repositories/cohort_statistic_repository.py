@@ -0,0 +1,233 @@
+"""Data access for running cohort statistics."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Type, Union
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.academic import FacultyDepartmentAffiliation, Subject, SubjectOffering
+from ..models.analysis import CohortStatistic, NumericalAggregate, SentimentAggregate
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES, CohortGrouping, CohortMetric
+from ..models.evaluation_config import EvaluationPeriod
+from ..models.evaluation_submission import EvaluationSubmission
+
+
+_AGGREGATE_MODELS: Dict[CohortMetric, Type[Union[NumericalAggregate, SentimentAggregate]]] = {
+    CohortMetric.QUANTITATIVE: NumericalAggregate,
+    CohortMetric.QUALITATIVE: SentimentAggregate,
+}
+
+
+def _raw_score_column(metric: CohortMetric):
+    if metric == CohortMetric.QUANTITATIVE:
+        return NumericalAggregate.quant_score_raw
+    return SentimentAggregate.qual_score_raw
+
+
+class CohortStatisticRepository:
+    """Row-locked access to ``cohort_statistics`` keyed by cohort."""
+
+    def _key_filter(
+        self,
+        *,
+        evaluation_period_id: int,
+        grouping: CohortGrouping,
+        group_id: int,
+        metric: CohortMetric,
+    ):
+        return (
+            CohortStatistic.evaluation_period_id == evaluation_period_id,
+            CohortStatistic.grouping == grouping,
+            CohortStatistic.group_id == group_id,
+            CohortStatistic.metric == metric,
+        )
+
+    def get(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        grouping: CohortGrouping,
+        group_id: int,
+        metric: CohortMetric,
+    ) -> Optional[CohortStatistic]:
+        """Return the statistics row for a cohort without locking it."""
+
+        stmt = select(CohortStatistic).where(
+            *self._key_filter(
+                evaluation_period_id=evaluation_period_id,
+                grouping=grouping,
+                group_id=group_id,
+                metric=metric,
+            )
+        )
+        return db.scalars(stmt).one_or_none()
+
+    def get_or_create_for_update(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        evaluation_period_id: int,
+        grouping: CohortGrouping,
+        group_id: int,
+        metric: CohortMetric,
+    ) -> CohortStatistic:
+        """Return the cohort row locked with ``SELECT ... FOR UPDATE``, creating it if needed."""
+
+        key = {
+            "evaluation_period_id": evaluation_period_id,
+            "grouping": grouping,
+            "group_id": group_id,
+            "metric": metric,
+        }
+        stmt = select(CohortStatistic).where(*self._key_filter(**key)).with_for_update()
+        row = db.scalars(stmt).one_or_none()
+        if row is not None:
+            return row
+
+        row = CohortStatistic(university_id=university_id, n=0, mean=0.0, m2=0.0, **key)
+        try:
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            # Another worker created the row concurrently; lock theirs instead.
+            return db.scalars(stmt).one()
+        return row
+
+    def list_period(self, db: Session, *, evaluation_period_id: int) -> List[CohortStatistic]:
+        """Return every cohort row of a period without locking them."""
+
+        stmt = select(CohortStatistic).where(CohortStatistic.evaluation_period_id == evaluation_period_id)
+        return list(db.scalars(stmt))
+
+    def fetch_counted_scores(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        metric: CohortMetric,
+    ) -> List[Tuple[int, float]]:
+        """Return ``(submission_id, raw_score)`` for every scorable submission of a period with an aggregate."""
+
+        model = _AGGREGATE_MODELS[metric]
+        stmt = (
+            select(model.submission_id, _raw_score_column(metric))
+            .join(EvaluationSubmission, EvaluationSubmission.id == model.submission_id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES),
+            )
+            .order_by(model.submission_id)
+        )
+        return [(submission_id, float(raw_score)) for submission_id, raw_score in db.execute(stmt)]
+
+    def get_counted_departments(
+        self,
+        db: Session,
+        *,
+        metric: CohortMetric,
+        submission_ids: Iterable[int],
+    ) -> Dict[int, Optional[int]]:
+        """Return the department cohort each submission's ``metric`` score was last added to.
+
+        Submissions without an aggregate are absent; aggregates scored before
+        the department was recorded map to ``None``.
+        """
+
+        ids = list(submission_ids)
+        if not ids:
+            return {}
+        model = _AGGREGATE_MODELS[metric]
+        stmt = select(model.submission_id, model.cohort_department_id).where(model.submission_id.in_(ids))
+        return {submission_id: department_id for submission_id, department_id in db.execute(stmt)}
+
+    def set_counted_departments(
+        self,
+        db: Session,
+        *,
+        metric: CohortMetric,
+        departments: Mapping[int, Optional[int]],
+    ) -> None:
+        """Record the department cohort each submission's ``metric`` score was added to."""
+
+        if not departments:
+            return
+        table = _AGGREGATE_MODELS[metric].__table__
+        stmt = (
+            update(table)
+            .where(table.c.submission_id == bindparam("b_submission_id"))
+            .values(cohort_department_id=bindparam("b_department_id"))
+        )
+        db.execute(
+            stmt,
+            [
+                {"b_submission_id": submission_id, "b_department_id": department_id}
+                for submission_id, department_id in departments.items()
+            ],
+        )
+
+    def get_submission_cohort_groups(
+        self,
+        db: Session,
+        *,
+        submission_id: int,
+    ) -> Optional[Tuple[int, int, int, Optional[int]]]:
+        """Return ``(university_id, evaluation_period_id, evaluatee_id, department_id)``.
+
+        The department is the evaluatee's home department for the period's term,
+        falling back to the department owning the evaluated subject.
+        """
+
+        return self.get_cohort_groups_for_submissions(db, submission_ids=[submission_id]).get(submission_id)
+
+    def get_cohort_groups_for_submissions(
+        self,
+        db: Session,
+        *,
+        submission_ids: Iterable[int],
+    ) -> Dict[int, Tuple[int, int, int, Optional[int]]]:
+        """Bulk form of ``get_submission_cohort_groups`` keyed by submission id."""
+
+        ids = list(submission_ids)
+        if not ids:
+            return {}
+        home_department = (
+            select(FacultyDepartmentAffiliation.department_id)
+            .where(
+                FacultyDepartmentAffiliation.faculty_id == EvaluationSubmission.evaluatee_id,
+                FacultyDepartmentAffiliation.school_term_id == EvaluationPeriod.school_term_id,
+                FacultyDepartmentAffiliation.is_home_department.is_(True),
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                EvaluationSubmission.id,
+                EvaluationSubmission.university_id,
+                EvaluationSubmission.evaluation_period_id,
+                EvaluationSubmission.evaluatee_id,
+                home_department,
+                Subject.department_id,
+            )
+            .join(EvaluationPeriod, EvaluationPeriod.id == EvaluationSubmission.evaluation_period_id)
+            .join(SubjectOffering, SubjectOffering.id == EvaluationSubmission.subject_offering_id)
+            .join(Subject, Subject.id == SubjectOffering.subject_id)
+            .where(EvaluationSubmission.id.in_(ids))
+        )
+        return {
+            submission_id: (university_id, period_id, evaluatee_id, home_department_id or subject_department_id)
+            for submission_id, university_id, period_id, evaluatee_id, home_department_id, subject_department_id in (
+                db.execute(stmt)
+            )
+        }
+
+
+cohort_statistic_repository = CohortStatisticRepository()
+
+
+__all__ = ["CohortStatisticRepository", "cohort_statistic_repository"]
@@ -0,0 +1,189 @@
+"""Data access for the department closure table and subtree rollups."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, Select, and_, delete, func, insert, literal, select, true
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import ColumnElement
+
+from ..db import replica_read
+from ..models.academic import Department, DepartmentClosure, FacultyDepartmentAffiliation
+from ..models.analysis import NumericalAggregate
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES
+from ..models.evaluation_config import EvaluationPeriod
+from ..models.evaluation_submission import EvaluationSubmission
+
+
+class DepartmentHierarchyRepository:
+    """Maintenance of ``department_closure`` and joins against it.
+
+    MariaDB cannot delete from a table while selecting from it in a subquery,
+    so subtree and ancestor ids are read first and deletes use literal id lists.
+    """
+
+    def subtree_ids(self, db: Session, *, department_id: int) -> List[int]:
+        """``department_id`` and every department below it."""
+
+        stmt = select(DepartmentClosure.descendant_id).where(DepartmentClosure.ancestor_id == department_id)
+        return list(db.scalars(stmt))
+
+    def ancestor_ids(self, db: Session, *, department_id: int) -> List[int]:
+        """Strict ancestors of ``department_id``, nearest first."""
+
+        stmt = (
+            select(DepartmentClosure.ancestor_id)
+            .where(DepartmentClosure.descendant_id == department_id, DepartmentClosure.depth > 0)
+            .order_by(DepartmentClosure.depth)
+        )
+        return list(db.scalars(stmt))
+
+    def insert_leaf(self, db: Session, *, department_id: int, parent_department_id: Optional[int]) -> None:
+        """Add closure rows for a new department with no children."""
+
+        rows = select(literal(department_id), literal(department_id), literal(0))
+        if parent_department_id is not None:
+            rows = rows.union_all(
+                select(
+                    DepartmentClosure.ancestor_id,
+                    literal(department_id),
+                    DepartmentClosure.depth + 1,
+                ).where(DepartmentClosure.descendant_id == parent_department_id)
+            )
+        db.execute(
+            insert(DepartmentClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                rows,
+            )
+        )
+
+    def detach_subtree(self, db: Session, *, department_id: int) -> None:
+        """Remove the links between a subtree and the departments above it."""
+
+        ancestors = self.ancestor_ids(db, department_id=department_id)
+        if not ancestors:
+            return
+        db.execute(
+            delete(DepartmentClosure).where(
+                DepartmentClosure.ancestor_id.in_(ancestors),
+                DepartmentClosure.descendant_id.in_(self.subtree_ids(db, department_id=department_id)),
+            )
+        )
+
+    def attach_subtree(self, db: Session, *, department_id: int, parent_department_id: int) -> None:
+        """Link a detached subtree below ``parent_department_id``."""
+
+        above = aliased(DepartmentClosure)
+        below = aliased(DepartmentClosure)
+        rows = (
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .select_from(above)
+            .join(below, true())
+            .where(above.descendant_id == parent_department_id, below.ancestor_id == department_id)
+        )
+        db.execute(insert(DepartmentClosure).from_select(["ancestor_id", "descendant_id", "depth"], rows))
+
+    def delete_department_rows(self, db: Session, *, department_id: int) -> None:
+        """Remove every closure row that mentions the department."""
+
+        db.execute(
+            delete(DepartmentClosure).where(
+                (DepartmentClosure.ancestor_id == department_id) | (DepartmentClosure.descendant_id == department_id)
+            )
+        )
+
+    def fetch_parent_map(self, db: Session, *, university_id: int) -> Dict[int, Optional[int]]:
+        """Map each department of the university to its parent."""
+
+        stmt = select(Department.id, Department.parent_department_id).where(Department.university_id == university_id)
+        return {department_id: parent_id for department_id, parent_id in db.execute(stmt)}
+
+    def replace_rows(
+        self,
+        db: Session,
+        *,
+        department_ids: Sequence[int],
+        rows: Iterable[Tuple[int, int, int]],
+    ) -> None:
+        """Replace the closure rows of the given departments."""
+
+        if department_ids:
+            db.execute(delete(DepartmentClosure).where(DepartmentClosure.descendant_id.in_(list(department_ids))))
+        values = [{"ancestor_id": a, "descendant_id": d, "depth": depth} for a, d, depth in rows]
+        if values:
+            db.execute(insert(DepartmentClosure), values)
+
+    def join_subtree(
+        self,
+        stmt: Select,
+        department_column: ColumnElement[int],
+        *,
+        ancestor_id: int,
+    ) -> Select:
+        """Restrict ``stmt`` to rows whose ``department_column`` lies in the subtree of ``ancestor_id``.
+
+        Resolves to a primary-key range scan on ``(ancestor_id, descendant_id)``.
+        """
+
+        return stmt.join(
+            DepartmentClosure,
+            and_(
+                DepartmentClosure.descendant_id == department_column,
+                DepartmentClosure.ancestor_id == ancestor_id,
+            ),
+        )
+
+    @replica_read
+    def aggregate_numerical_by_ancestor(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        ancestor_ids: Sequence[int],
+    ) -> Sequence[Row[Tuple[int, int, int, float, float, float]]]:
+        """Roll numerical aggregates up to each ancestor in one query.
+
+        Returns ``(ancestor_id, submission_count, evaluatee_count, avg_quant_score_raw,
+        avg_z_quant, avg_final_score)``. Only submissions in a scorable status
+        count, and evaluatees are attributed to their home department for the
+        period's school term.
+        """
+
+        if not ancestor_ids:
+            return []
+        stmt = (
+            select(
+                DepartmentClosure.ancestor_id,
+                func.count(NumericalAggregate.id),
+                func.count(func.distinct(EvaluationSubmission.evaluatee_id)),
+                func.avg(NumericalAggregate.quant_score_raw),
+                func.avg(NumericalAggregate.z_quant),
+                func.avg(NumericalAggregate.final_score_60_40),
+            )
+            .select_from(NumericalAggregate)
+            .join(EvaluationSubmission, EvaluationSubmission.id == NumericalAggregate.submission_id)
+            .join(EvaluationPeriod, EvaluationPeriod.id == EvaluationSubmission.evaluation_period_id)
+            .join(
+                FacultyDepartmentAffiliation,
+                and_(
+                    FacultyDepartmentAffiliation.faculty_id == EvaluationSubmission.evaluatee_id,
+                    FacultyDepartmentAffiliation.school_term_id == EvaluationPeriod.school_term_id,
+                    FacultyDepartmentAffiliation.is_home_department.is_(True),
+                ),
+            )
+            .join(DepartmentClosure, DepartmentClosure.descendant_id == FacultyDepartmentAffiliation.department_id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES),
+                DepartmentClosure.ancestor_id.in_(list(ancestor_ids)),
+            )
+            .group_by(DepartmentClosure.ancestor_id)
+        )
+        return db.execute(stmt).all()
+
+
+department_hierarchy_repository = DepartmentHierarchyRepository()
+
+
+__all__ = ["DepartmentHierarchyRepository", "department_hierarchy_repository"]
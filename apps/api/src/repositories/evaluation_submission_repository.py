@@ -0,0 +1,159 @@
+"""Core bulk writes and profiled reads for evaluation submissions and their answers."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models.analysis import NumericalAggregate, SentimentAggregate
+from ..models.enums import EvaluationSubmissionStatus
+from ..models.evaluation_submission import (
+    EvaluationLikertAnswer,
+    EvaluationOpenEndedAnswer,
+    EvaluationSubmission,
+)
+from .loading import with_profile
+
+_UNIQUE_KEY = (
+    EvaluationSubmission.evaluation_period_id,
+    EvaluationSubmission.evaluator_id,
+    EvaluationSubmission.evaluatee_id,
+    EvaluationSubmission.subject_offering_id,
+)
+
+
+class EvaluationSubmissionRepository:
+    """Set-based inserts that bypass the ORM unit of work, and profiled reads.
+
+    Each insert method issues one ``executemany``; SQLAlchemy's insertmanyvalues
+    folds it into multi-row ``INSERT ... VALUES`` batches, so a whole burst of
+    submissions costs a handful of round trips instead of one per row. Reads
+    take a loading profile name from ``repositories.loading``.
+    """
+
+    def get(
+        self,
+        db: Session,
+        submission_id: int,
+        *,
+        profile: str = "submission_detail",
+    ) -> Optional[EvaluationSubmission]:
+        stmt = select(EvaluationSubmission).where(EvaluationSubmission.id == submission_id)
+        return db.scalars(with_profile(stmt, EvaluationSubmission, profile)).unique().one_or_none()
+
+    def list_for_evaluatee(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        evaluatee_id: int,
+        profile: str = "dashboard_list",
+    ) -> List[EvaluationSubmission]:
+        stmt = (
+            select(EvaluationSubmission)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.evaluatee_id == evaluatee_id,
+            )
+            .order_by(EvaluationSubmission.id)
+        )
+        return list(db.scalars(with_profile(stmt, EvaluationSubmission, profile)).unique())
+
+    def insert_submissions(self, db: Session, *, rows: Sequence[Dict[str, Any]]) -> List[int]:
+        """Insert submission rows and return their ids in input order.
+
+        Uses ``INSERT ... RETURNING`` (SQLite 3.35+, MariaDB 10.5+, PostgreSQL);
+        other backends fall back to one statement per row. Batched RETURNING
+        does not promise row order, so ids are matched back to the input via
+        the ``uk_submission_uniqueness`` columns rather than by position.
+        """
+
+        if not rows:
+            return []
+        if not db.get_bind().dialect.insert_executemany_returning:
+            return [db.execute(insert(EvaluationSubmission), row).inserted_primary_key[0] for row in rows]
+
+        stmt = insert(EvaluationSubmission).returning(EvaluationSubmission.id, *_UNIQUE_KEY)
+        ids = {tuple(key): submission_id for submission_id, *key in db.execute(stmt, list(rows))}
+        return [ids[tuple(row[column.key] for column in _UNIQUE_KEY)] for row in rows]
+
+    def insert_likert_answers(self, db: Session, *, rows: Sequence[Dict[str, Any]]) -> None:
+        """Insert ``{submission_id, question_id, answer_value}`` rows."""
+
+        if rows:
+            db.execute(insert(EvaluationLikertAnswer), list(rows))
+
+    def insert_open_ended_answers(self, db: Session, *, rows: Sequence[Dict[str, Any]]) -> List[int]:
+        """Insert ``{submission_id, question_id, answer_text}`` rows and return their ids in input order.
+
+        Ids are matched back via ``uk_open_answer_uniqueness``, as in ``insert_submissions``.
+        """
+
+        if not rows:
+            return []
+        if not db.get_bind().dialect.insert_executemany_returning:
+            return [db.execute(insert(EvaluationOpenEndedAnswer), row).inserted_primary_key[0] for row in rows]
+
+        stmt = insert(EvaluationOpenEndedAnswer).returning(
+            EvaluationOpenEndedAnswer.id,
+            EvaluationOpenEndedAnswer.submission_id,
+            EvaluationOpenEndedAnswer.question_id,
+        )
+        ids = {
+            (submission_id, question_id): answer_id
+            for answer_id, submission_id, question_id in db.execute(stmt, list(rows))
+        }
+        return [ids[(row["submission_id"], row["question_id"])] for row in rows]
+
+    def get_statuses_and_raw_scores(
+        self,
+        db: Session,
+        *,
+        submission_ids: Sequence[int],
+    ) -> Dict[int, Tuple[EvaluationSubmissionStatus, Optional[float], Optional[float]]]:
+        """Map submission id to ``(status, quant_score_raw, qual_score_raw)``; a score is ``None`` until written."""
+
+        if not submission_ids:
+            return {}
+        stmt = (
+            select(
+                EvaluationSubmission.id,
+                EvaluationSubmission.status,
+                NumericalAggregate.quant_score_raw,
+                SentimentAggregate.qual_score_raw,
+            )
+            .outerjoin(NumericalAggregate, NumericalAggregate.submission_id == EvaluationSubmission.id)
+            .outerjoin(SentimentAggregate, SentimentAggregate.submission_id == EvaluationSubmission.id)
+            .where(EvaluationSubmission.id.in_(list(submission_ids)))
+        )
+        return {
+            submission_id: (
+                status,
+                float(quant) if quant is not None else None,
+                float(qual) if qual is not None else None,
+            )
+            for submission_id, status, quant, qual in db.execute(stmt)
+        }
+
+    def set_status(
+        self,
+        db: Session,
+        *,
+        submission_ids: Sequence[int],
+        status: EvaluationSubmissionStatus,
+    ) -> None:
+        if submission_ids:
+            db.execute(
+                update(EvaluationSubmission)
+                .where(EvaluationSubmission.id.in_(list(submission_ids)))
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            )
+
+
+evaluation_submission_repository = EvaluationSubmissionRepository()
+
+
+__all__ = ["EvaluationSubmissionRepository", "evaluation_submission_repository"]
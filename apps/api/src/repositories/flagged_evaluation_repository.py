@@ -0,0 +1,63 @@
+"""Data access for flagged evaluations."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.enums import FlagReason, FlagStatus
+from ..models.evaluation_submission import EvaluationSubmission, FlaggedEvaluation
+from .keyset import DEFAULT_PAGE_SIZE, KeysetRepository, Page
+
+
+class FlaggedEvaluationRepository(KeysetRepository[FlaggedEvaluation]):
+    """Creates and looks up ``flagged_evaluations`` rows."""
+
+    model = FlaggedEvaluation
+
+    def get_flagged_submission_ids(self, db: Session, *, submission_ids: Iterable[int]) -> Set[int]:
+        ids = list(submission_ids)
+        if not ids:
+            return set()
+        stmt = select(FlaggedEvaluation.submission_id).where(FlaggedEvaluation.submission_id.in_(ids))
+        return set(db.scalars(stmt))
+
+    def list_page(
+        self,
+        db: Session,
+        *,
+        university_id: int,
+        status: Optional[FlagStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[FlaggedEvaluation]:
+        """Newest flags first for the review queue."""
+
+        filters = [
+            FlaggedEvaluation.submission_id.in_(
+                select(EvaluationSubmission.id).where(EvaluationSubmission.university_id == university_id)
+            )
+        ]
+        if status is not None:
+            filters.append(FlaggedEvaluation.status == status)
+        return self.paginate(db, filters=filters, cursor=cursor, limit=limit)
+
+    def create(
+        self,
+        db: Session,
+        *,
+        submission_id: int,
+        flag_reason: FlagReason,
+        flag_details: Optional[Dict[str, Any]] = None,
+    ) -> FlaggedEvaluation:
+        flag = FlaggedEvaluation(submission_id=submission_id, flag_reason=flag_reason, flag_details=flag_details)
+        db.add(flag)
+        return flag
+
+
+flagged_evaluation_repository = FlaggedEvaluationRepository()
+
+
+__all__ = ["FlaggedEvaluationRepository", "flagged_evaluation_repository"]
@@ -0,0 +1,289 @@
+"""Set-based validation and merge of staged historical evaluation rows."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, and_, case, delete, exists, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from ..models.academic import AssessmentPeriod, Subject, SubjectOffering
+from ..models.enums import QuestionType
+from ..models.evaluation_config import (
+    EvaluationFormTemplate,
+    EvaluationPeriod,
+    EvaluationQuestion,
+    LikertScaleTemplate,
+)
+from ..models.evaluation_submission import (
+    EvaluationLikertAnswer,
+    EvaluationOpenEndedAnswer,
+    EvaluationSubmission,
+)
+from ..models.identity import User
+from ..models.operations import HistoricalEvaluationStagingRow as Staged
+
+# Columns identifying one submission, as written in the file and once resolved.
+_RAW_SUBMISSION_KEY = (
+    Staged.school_year,
+    Staged.semester,
+    Staged.assessment_period,
+    Staged.evaluator_school_id,
+    Staged.evaluatee_school_id,
+    Staged.edp_code,
+)
+_SUBMISSION_KEY = (
+    Staged.evaluation_period_id,
+    Staged.evaluator_id,
+    Staged.evaluatee_id,
+    Staged.subject_offering_id,
+)
+
+REPORT_COLUMNS = (
+    "school_year",
+    "semester",
+    "assessment_period",
+    "evaluator_school_id",
+    "evaluatee_school_id",
+    "edp_code",
+    "form",
+    "question",
+    "answer",
+    "submitted_at",
+)
+
+
+class HistoricalImportStagingRepository:
+    """Statements over one task's rows of ``historical_evaluation_staging``.
+
+    Validation is a fixed sequence of ``UPDATE`` statements, each resolving a
+    key or rejecting the rows that fail one check, so its cost does not depend
+    on round trips per row. MariaDB cannot update a table while reading it in
+    a subquery unless the subquery is materialized, so checks that compare
+    staged rows with each other read them through a grouped derived table.
+    """
+
+    def insert_rows(self, db: Session, *, rows: Sequence[Dict[str, Any]]) -> None:
+        if rows:
+            db.execute(insert(Staged), list(rows))
+
+    def counts(self, db: Session, *, task_id: int) -> Tuple[int, int]:
+        """``(staged, rejected)`` rows of the task."""
+
+        stmt = select(func.count(), func.count(Staged.error)).where(Staged.task_id == task_id)
+        total, rejected = db.execute(stmt).one()
+        return total, rejected
+
+    def validate(self, db: Session, *, task_id: int, university_id: int) -> None:
+        """Resolve the staged keys to ids, reject the rows that cannot be imported and group the rest.
+
+        A submission with any rejected answer is rejected whole. Running it
+        again over the same rows gives the same result.
+        """
+
+        pending = (Staged.task_id == task_id, Staged.error.is_(None))
+
+        def resolve(column: ColumnElement[Any], value: Any, error: str) -> None:
+            db.execute(update(Staged).where(*pending).values({column: value.scalar_subquery()}))
+            self._reject(db, task_id, error, column.is_(None))
+
+        resolve(
+            Staged.evaluation_period_id,
+            select(EvaluationPeriod.id)
+            .join(AssessmentPeriod, AssessmentPeriod.id == EvaluationPeriod.assessment_period_id)
+            .where(
+                EvaluationPeriod.university_id == university_id,
+                EvaluationPeriod.school_term_id == Staged.school_term_id,
+                AssessmentPeriod.name == Staged.assessment_period,
+            ),
+            "No evaluation period exists for this school term and assessment period.",
+        )
+        for column, school_id, role in (
+            (Staged.evaluator_id, Staged.evaluator_school_id, "evaluator"),
+            (Staged.evaluatee_id, Staged.evaluatee_school_id, "evaluatee"),
+        ):
+            resolve(
+                column,
+                select(User.id).where(User.university_id == university_id, User.school_id == school_id),
+                f"The {role}'s school ID does not exist.",
+            )
+        resolve(
+            Staged.subject_offering_id,
+            select(func.min(SubjectOffering.id))
+            .join(Subject, Subject.id == SubjectOffering.subject_id)
+            .where(
+                Subject.university_id == university_id,
+                Subject.edp_code == Staged.edp_code,
+                SubjectOffering.faculty_id == Staged.evaluatee_id,
+                SubjectOffering.school_term_id == Staged.school_term_id,
+            ),
+            "The evaluatee does not teach this subject in this school term.",
+        )
+        form_id = case(
+            (Staged.is_department_head, EvaluationPeriod.dept_head_form_template_id),
+            else_=EvaluationPeriod.student_form_template_id,
+        )
+        resolve(
+            Staged.question_id,
+            select(func.min(EvaluationQuestion.id))
+            .join(EvaluationPeriod, EvaluationPeriod.id == Staged.evaluation_period_id)
+            .where(EvaluationQuestion.form_template_id == form_id, EvaluationQuestion.order == Staged.question_order),
+            "The question does not exist on the evaluation period's form.",
+        )
+
+        question = select(EvaluationQuestion.id).where(EvaluationQuestion.id == Staged.question_id)
+        db.execute(
+            update(Staged)
+            .where(*pending, exists(question.where(EvaluationQuestion.question_type == QuestionType.OPEN_ENDED)))
+            .values(answer_value=None)
+        )
+        scale = (
+            question.join(EvaluationFormTemplate, EvaluationFormTemplate.id == EvaluationQuestion.form_template_id)
+            .join(LikertScaleTemplate, LikertScaleTemplate.id == EvaluationFormTemplate.likert_scale_template_id)
+            .where(EvaluationQuestion.question_type == QuestionType.LIKERT)
+        )
+        outside = or_(
+            Staged.answer_value.is_(None),
+            Staged.answer_value < LikertScaleTemplate.min_value,
+            Staged.answer_value > LikertScaleTemplate.max_value,
+        )
+        error = "The answer is not a value of the question's Likert scale."
+        self._reject(db, task_id, error, exists(scale.where(outside)))
+
+        submitted = select(EvaluationSubmission.id).where(
+            *(getattr(EvaluationSubmission, column.key) == column for column in _SUBMISSION_KEY)
+        )
+        self._reject(db, task_id, "This submission already exists.", exists(submitted))
+
+        answer_key = (*_SUBMISSION_KEY, Staged.question_id)
+        first = (
+            select(*answer_key, func.min(Staged.id).label("first_id"))
+            .where(*pending)
+            .group_by(*answer_key)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        self._reject(
+            db,
+            task_id,
+            "The question is answered more than once for this submission.",
+            tuple_(*answer_key).in_(select(*(first.c[column.key] for column in answer_key))),
+            Staged.id.not_in(select(first.c.first_id)),
+        )
+
+        rejected = select(*_RAW_SUBMISSION_KEY).where(Staged.task_id == task_id, Staged.error.is_not(None))
+        rejected = rejected.group_by(*_RAW_SUBMISSION_KEY).subquery()
+        self._reject(
+            db,
+            task_id,
+            "Another answer of this submission was rejected.",
+            tuple_(*_RAW_SUBMISSION_KEY).in_(select(*rejected.c)),
+        )
+
+        groups = select(*_SUBMISSION_KEY, func.min(Staged.id).label("group_id")).where(*pending)
+        groups = groups.group_by(*_SUBMISSION_KEY).subquery()
+        group_id = select(groups.c.group_id).where(*(groups.c[column.key] == column for column in _SUBMISSION_KEY))
+        db.execute(update(Staged).where(*pending).values(group_id=group_id.scalar_subquery()))
+
+    def _reject(self, db: Session, task_id: int, error: str, *conditions: ColumnElement[bool]) -> None:
+        stmt = update(Staged).where(Staged.task_id == task_id, Staged.error.is_(None), *conditions)
+        db.execute(stmt.values(error=error))
+
+    def iter_rejected(self, db: Session, *, task_id: int) -> Iterator[Row]:
+        """``(line, *REPORT_COLUMNS, error)`` of the rejected rows, in file order."""
+
+        columns = (getattr(Staged, column) for column in REPORT_COLUMNS)
+        stmt = (
+            select(Staged.line, *columns, Staged.error)
+            .where(Staged.task_id == task_id, Staged.error.is_not(None))
+            .order_by(Staged.line)
+        )
+        return iter(db.execute(stmt.execution_options(yield_per=1000)))
+
+    def chunk_end(self, db: Session, *, task_id: int, after_group_id: int, rows: int) -> Optional[int]:
+        """Last ``group_id`` of the next chunk of about ``rows`` valid rows, or ``None`` when none remain.
+
+        A chunk always ends with a whole submission, so it may hold a few
+        more than ``rows`` rows.
+        """
+
+        head = (
+            select(Staged.group_id)
+            .where(Staged.task_id == task_id, Staged.error.is_(None), Staged.group_id > after_group_id)
+            .order_by(Staged.group_id)
+            .limit(rows)
+            .subquery()
+        )
+        return db.scalar(select(func.max(head.c.group_id)))
+
+    def merge_chunk(
+        self,
+        db: Session,
+        *,
+        task_id: int,
+        university_id: int,
+        after_group_id: int,
+        last_group_id: int,
+    ) -> Tuple[int, int]:
+        """Insert the submissions and answers of groups ``(after_group_id, last_group_id]`` and unstage them.
+
+        Submissions without a ``submitted_at`` get their period's end. Returns
+        ``(submissions, answers)`` inserted.
+        """
+
+        in_chunk = (
+            Staged.task_id == task_id,
+            Staged.error.is_(None),
+            Staged.group_id > after_group_id,
+            Staged.group_id <= last_group_id,
+        )
+        submissions = (
+            select(
+                literal(university_id),
+                *_SUBMISSION_KEY,
+                func.coalesce(func.min(Staged.submitted_on), func.min(EvaluationPeriod.end_date_time)),
+            )
+            .join(EvaluationPeriod, EvaluationPeriod.id == Staged.evaluation_period_id)
+            .where(*in_chunk)
+            .group_by(Staged.group_id, *_SUBMISSION_KEY)
+        )
+        created = db.execute(
+            insert(EvaluationSubmission).from_select(
+                ["university_id", *(column.key for column in _SUBMISSION_KEY), "submitted_at"],
+                submissions,
+            )
+        ).rowcount
+
+        submission = and_(*(getattr(EvaluationSubmission, column.key) == column for column in _SUBMISSION_KEY))
+        answers = 0
+        # Validation cleared ``answer_value`` on open-ended answers and rejected Likert answers without one.
+        for model, target, value, condition in (
+            (EvaluationLikertAnswer, "answer_value", Staged.answer_value, Staged.answer_value.is_not(None)),
+            (EvaluationOpenEndedAnswer, "answer_text", Staged.answer, Staged.answer_value.is_(None)),
+        ):
+            rows = (
+                select(EvaluationSubmission.id, Staged.question_id, value)
+                .select_from(Staged)
+                .join(EvaluationSubmission, submission)
+                .where(*in_chunk, condition)
+            )
+            stmt = insert(model).from_select(["submission_id", "question_id", target], rows)
+            answers += db.execute(stmt).rowcount
+        db.execute(
+            delete(Staged).where(
+                Staged.task_id == task_id,
+                Staged.group_id > after_group_id,
+                Staged.group_id <= last_group_id,
+            )
+        )
+        return created, answers
+
+    def delete_task_rows(self, db: Session, *, task_id: int) -> None:
+        db.execute(delete(Staged).where(Staged.task_id == task_id))
+
+
+historical_import_staging_repository = HistoricalImportStagingRepository()
+
+
+__all__ = ["REPORT_COLUMNS", "HistoricalImportStagingRepository", "historical_import_staging_repository"]
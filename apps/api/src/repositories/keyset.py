@@ -0,0 +1,186 @@
+"""Keyset (cursor) pagination shared by repositories of large tables.
+
+A page is ``ORDER BY sort_key, id LIMIT n`` continued from the last row seen,
+so every page is an index range scan that costs the same however deep it is.
+The position travels to the client as an opaque cursor token; it also pins the
+sort and a fingerprint of the filters, so a token cannot be replayed against a
+different listing. Only non-nullable columns that lead an index (or the primary
+key) may be used as sort keys; anything else is refused instead of silently
+falling back to a filesort.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from sqlalchemy import Column, ColumnElement, and_, or_, select
+from sqlalchemy.orm import Session
+
+from ..db import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a malformed cursor or one issued for a different listing."""
+
+
+class UnindexedSortError(ValueError):
+    """Raised when asked to page on a column that no index leads with."""
+
+
+@dataclass(frozen=True)
+class Page(Generic[ModelT]):
+    """One page of rows and the cursor for the next one (``None`` on the last page)."""
+
+    items: List[ModelT]
+    next_cursor: Optional[str]
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column: Column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(python_type, date):
+        return date.fromisoformat(value)
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    return value
+
+
+def _filters_fingerprint(filters: Sequence[ColumnElement[bool]]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for criterion in filters:
+        compiled = criterion.compile()
+        digest.update(str(compiled).encode())
+        digest.update(repr(sorted((key, _encode_value(v)) for key, v in compiled.params.items())).encode())
+    return digest.hexdigest()
+
+
+class KeysetRepository(Generic[ModelT]):
+    """Base for repositories that list ``model`` rows page by page.
+
+    Subclasses set ``model`` and optionally ``default_sort``; ``paginate``
+    composes the caller's filters with the keyset predicate.
+    """
+
+    model: Type[ModelT]
+    default_sort: str = "id"
+
+    def __init__(self) -> None:
+        # Fail at import time rather than on the first request.
+        self._sort_column(self.default_sort)
+
+    def _id_column(self) -> Column:
+        (primary_key,) = self.model.__table__.primary_key.columns
+        return primary_key
+
+    def _sort_column(self, sort: str) -> Column:
+        table = self.model.__table__
+        column = table.columns.get(sort)
+        if column is None:
+            raise UnindexedSortError(f"{table.name} has no column {sort!r}.")
+        if column.primary_key:
+            return column
+        if column.nullable:
+            raise UnindexedSortError(f"{table.name}.{sort} is nullable and cannot be used as a keyset.")
+        leading = {next(iter(index.columns)).name for index in table.indexes if index.columns}
+        if sort not in leading:
+            raise UnindexedSortError(f"{table.name}.{sort} does not lead any index; add one before paging on it.")
+        return column
+
+    def encode_cursor(self, *, sort: str, descending: bool, fingerprint: str, key: Tuple[Any, Any]) -> str:
+        payload = {"s": sort, "d": descending, "f": fingerprint, "k": [_encode_value(part) for part in key]}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode_cursor(self, cursor: str, *, sort: str, descending: bool, fingerprint: str) -> Tuple[Any, Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            sort_value, row_id = payload["k"]
+            matches = (payload["s"], payload["d"], payload["f"]) == (sort, descending, fingerprint)
+        except (binascii.Error, ValueError, KeyError, TypeError) as error:
+            raise InvalidCursorError("Malformed pagination cursor.") from error
+        if not matches:
+            raise InvalidCursorError("Pagination cursor belongs to a different sort or filter.")
+        return _decode_value(self._sort_column(sort), sort_value), row_id
+
+    def paginate(
+        self,
+        db: Session,
+        *,
+        filters: Sequence[ColumnElement[bool]] = (),
+        sort: Optional[str] = None,
+        descending: bool = True,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[ModelT]:
+        """Return the page after ``cursor`` (the first page when ``None``)."""
+
+        sort = sort or self.default_sort
+        sort_column = self._sort_column(sort)
+        id_column = self._id_column()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        fingerprint = _filters_fingerprint(filters)
+
+        stmt = select(self.model).where(*filters)
+        if cursor is not None:
+            sort_value, row_id = self.decode_cursor(cursor, sort=sort, descending=descending, fingerprint=fingerprint)
+            if sort_column is id_column:
+                stmt = stmt.where(id_column < row_id if descending else id_column > row_id)
+            elif descending:
+                stmt = stmt.where(
+                    or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+                )
+            else:
+                stmt = stmt.where(
+                    or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+                )
+        order = [sort_column] if sort_column is id_column else [sort_column, id_column]
+        stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in order))
+        rows = list(db.scalars(stmt.limit(limit + 1)))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self.encode_cursor(
+                sort=sort,
+                descending=descending,
+                fingerprint=fingerprint,
+                key=(getattr(last, sort_column.key), getattr(last, id_column.key)),
+            )
+        return Page(items=rows, next_cursor=next_cursor)
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "InvalidCursorError",
+    "UnindexedSortError",
+    "Page",
+    "KeysetRepository",
+]
@@ -0,0 +1,116 @@
+"""Named relationship-loading profiles for the heavily related models.
+
+``User`` and ``EvaluationSubmission`` each have a dozen relationships, all lazy
+by default, so walking them from a list of rows quietly issues one query per
+row. Repositories instead pick a profile by name: every profile states which
+relationships are eager-loaded (``selectinload`` for collections,
+``joinedload`` for many-to-ones) and ends with ``raiseload("*")``, so anything
+the caller was not promised raises instead of querying.
+
+Strict sessions (``ORM_RAISELOAD=true``, or ``info={RAISELOAD_KEY: True}`` on
+one session, as the test fixtures do) add ``raiseload("*")`` to every ORM
+SELECT that has no profile, so an accidental lazy load fails immediately. The
+wildcard never overrides a relationship a statement loads explicitly, and
+loads that would be answered from the identity map are still allowed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Tuple, Type, TypeVar
+
+from sqlalchemy import Select, event
+from sqlalchemy.orm import ORMExecuteState, Session, joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from ..core.config import settings
+from ..models.academic import SubjectOffering
+from ..models.evaluation_submission import EvaluationOpenEndedAnswer, EvaluationSubmission
+from ..models.identity import User, UserRole
+
+RAISELOAD_KEY = "raiseload"
+
+SelectT = TypeVar("SelectT", bound=Select)
+
+_RAISE_REST = raiseload("*", sql_only=True)
+
+_PROFILES: Dict[Tuple[type, str], Callable[[], Tuple[ORMOption, ...]]] = {
+    # One submission with everything its detail view shows. The evaluator stays
+    # unloaded: submissions are anonymous to everyone who reads them.
+    (EvaluationSubmission, "submission_detail"): lambda: (
+        joinedload(EvaluationSubmission.evaluatee),
+        joinedload(EvaluationSubmission.evaluation_period),
+        joinedload(EvaluationSubmission.subject_offering).joinedload(SubjectOffering.subject),
+        selectinload(EvaluationSubmission.likert_answers),
+        selectinload(EvaluationSubmission.open_ended_answers).options(
+            joinedload(EvaluationOpenEndedAnswer.sentiment),
+            selectinload(EvaluationOpenEndedAnswer.keywords),
+        ),
+        joinedload(EvaluationSubmission.flag),
+        joinedload(EvaluationSubmission.numerical_aggregate),
+        joinedload(EvaluationSubmission.sentiment_aggregate),
+        _RAISE_REST,
+    ),
+    # Rows of a dashboard table: the evaluatee and the scores, no answers.
+    (EvaluationSubmission, "dashboard_list"): lambda: (
+        joinedload(EvaluationSubmission.evaluatee),
+        joinedload(EvaluationSubmission.numerical_aggregate),
+        joinedload(EvaluationSubmission.sentiment_aggregate),
+        joinedload(EvaluationSubmission.flag),
+        _RAISE_REST,
+    ),
+    # Scoring and integrity jobs read the answers only.
+    (EvaluationSubmission, "answers"): lambda: (
+        selectinload(EvaluationSubmission.likert_answers),
+        selectinload(EvaluationSubmission.open_ended_answers),
+        _RAISE_REST,
+    ),
+    # Session user: roles (for authorization), university and program.
+    (User, "user_profile"): lambda: (
+        joinedload(User.university),
+        joinedload(User.program),
+        selectinload(User.user_roles).joinedload(UserRole.role),
+        _RAISE_REST,
+    ),
+    # Rows of a user administration table.
+    (User, "dashboard_list"): lambda: (
+        selectinload(User.user_roles).joinedload(UserRole.role),
+        _RAISE_REST,
+    ),
+    # Faculty page: home departments and teaching load.
+    (User, "faculty_detail"): lambda: (
+        selectinload(User.faculty_affiliations),
+        selectinload(User.subject_offerings).joinedload(SubjectOffering.subject),
+        _RAISE_REST,
+    ),
+}
+
+
+def load_options(model: Type[Any], profile: str) -> Tuple[ORMOption, ...]:
+    """Loader options of ``profile`` for ``model``; raises ``ValueError`` for an unknown profile."""
+
+    factory = _PROFILES.get((model, profile))
+    if factory is None:
+        known = sorted(name for registered, name in _PROFILES if registered is model)
+        raise ValueError(f"Unknown loading profile {profile!r} for {model.__name__}; expected one of {known}.")
+    return factory()
+
+
+def with_profile(stmt: SelectT, model: Type[Any], profile: str) -> SelectT:
+    """Apply ``profile``'s loader options to a SELECT of ``model``."""
+
+    return stmt.options(*load_options(model, profile))
+
+
+def profiles(model: Type[Any]) -> Tuple[str, ...]:
+    return tuple(sorted(name for registered, name in _PROFILES if registered is model))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _raise_on_lazy_load(state: ORMExecuteState) -> None:
+    if not (settings.orm_raiseload or state.session.info.get(RAISELOAD_KEY)):
+        return
+    if state.is_select and not state.is_relationship_load and not state.is_column_load:
+        state.statement = state.statement.options(_RAISE_REST)
+
+
+__all__ = ["RAISELOAD_KEY", "load_options", "with_profile", "profiles"]
@@ -0,0 +1,38 @@
+"""Data access for notifications."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.enums import NotificationStatus
+from ..models.operations import Notification
+from .keyset import DEFAULT_PAGE_SIZE, KeysetRepository, Page
+
+
+class NotificationRepository(KeysetRepository[Notification]):
+    """Lists a recipient's ``notifications`` newest first, one keyset page at a time."""
+
+    model = Notification
+
+    def list_for_recipient(
+        self,
+        db: Session,
+        *,
+        recipient_id: int,
+        recipient_type: str,
+        status: Optional[NotificationStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page[Notification]:
+        filters = [Notification.recipient_id == recipient_id, Notification.recipient_type == recipient_type]
+        if status is not None:
+            filters.append(Notification.status == status)
+        return self.paginate(db, filters=filters, cursor=cursor, limit=limit)
+
+
+notification_repository = NotificationRepository()
+
+
+__all__ = ["NotificationRepository", "notification_repository"]
@@ -0,0 +1,220 @@
+"""Data access for quantitative analysis inputs and numerical aggregates."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, and_, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..db.routing import replica_read
+from ..models.academic import DepartmentClosure, FacultyDepartmentAffiliation
+from ..models.analysis import NumericalAggregate, NumericalAggregateItem
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES, AggregateItemType, EvaluationSubmissionStatus, QuestionType
+from ..models.evaluation_config import EvaluationCriterion, EvaluationPeriod, EvaluationQuestion
+from ..models.evaluation_submission import EvaluationLikertAnswer, EvaluationSubmission
+
+
+class NumericalAggregateRepository:
+    """Set-based reads and writes used by the quantitative analysis job."""
+
+    def fetch_period_likert_answers(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        statuses: Iterable[EvaluationSubmissionStatus],
+    ) -> Sequence[Row[Tuple[int, int, int]]]:
+        """Return ``(submission_id, question_id, answer_value)`` for every answer in a period."""
+
+        stmt = (
+            select(
+                EvaluationLikertAnswer.submission_id,
+                EvaluationLikertAnswer.question_id,
+                EvaluationLikertAnswer.answer_value,
+            )
+            .join(EvaluationSubmission, EvaluationSubmission.id == EvaluationLikertAnswer.submission_id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.status.in_(list(statuses)),
+            )
+        )
+        return db.execute(stmt).all()
+
+    def fetch_period_question_layout(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+    ) -> Sequence[Row[Tuple[int, int | None, Any]]]:
+        """Return ``(question_id, criterion_id, criterion_weight)`` for the period's Likert questions."""
+
+        period = db.get(EvaluationPeriod, evaluation_period_id)
+        if period is None:
+            return []
+
+        form_template_ids = [period.student_form_template_id]
+        if period.dept_head_form_template_id is not None:
+            form_template_ids.append(period.dept_head_form_template_id)
+
+        stmt = (
+            select(EvaluationQuestion.id, EvaluationQuestion.criterion_id, EvaluationCriterion.weight)
+            .outerjoin(EvaluationCriterion, EvaluationCriterion.id == EvaluationQuestion.criterion_id)
+            .where(
+                EvaluationQuestion.form_template_id.in_(form_template_ids),
+                EvaluationQuestion.question_type == QuestionType.LIKERT,
+            )
+        )
+        return db.execute(stmt).all()
+
+    def get_period_aggregate_states(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+    ) -> Dict[int, Tuple[int, bool, float]]:
+        """Map submission id to ``(aggregate_id, is_final_snapshot, quant_score_raw)`` for a period."""
+
+        stmt = (
+            select(
+                NumericalAggregate.submission_id,
+                NumericalAggregate.id,
+                NumericalAggregate.is_final_snapshot,
+                NumericalAggregate.quant_score_raw,
+            )
+            .join(EvaluationSubmission, EvaluationSubmission.id == NumericalAggregate.submission_id)
+            .where(EvaluationSubmission.evaluation_period_id == evaluation_period_id)
+        )
+        return {
+            submission_id: (aggregate_id, is_final, float(raw))
+            for submission_id, aggregate_id, is_final, raw in db.execute(stmt)
+        }
+
+    def bulk_insert(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """Insert aggregate rows using executemany batching."""
+
+        if rows:
+            db.execute(insert(NumericalAggregate), rows)
+
+    def bulk_update(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """Update aggregate rows by primary key; each row must carry ``id``."""
+
+        if rows:
+            db.execute(update(NumericalAggregate), rows)
+
+    def replace_items(
+        self,
+        db: Session,
+        *,
+        items: Dict[int, List[Tuple[AggregateItemType, int, float]]],
+    ) -> None:
+        """Rewrite the ``(item_type, item_id, value)`` rows of each aggregate id in ``items``."""
+
+        if not items:
+            return
+        db.execute(delete(NumericalAggregateItem).where(NumericalAggregateItem.aggregate_id.in_(list(items))))
+        rows = [
+            {"aggregate_id": aggregate_id, "item_type": item_type, "item_id": item_id, "value": value}
+            for aggregate_id, entries in items.items()
+            for item_type, item_id, value in entries
+        ]
+        if rows:
+            db.execute(insert(NumericalAggregateItem), rows)
+
+    @replica_read
+    def summarize_items(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        item_type: AggregateItemType,
+        item_ids: Optional[Sequence[int]] = None,
+        evaluatee_id: Optional[int] = None,
+    ) -> Sequence[Row[Tuple[int, int, float, float, float]]]:
+        """Return ``(item_id, submission_count, avg, min, max)`` per question or criterion of a period.
+
+        Only submissions in a scorable status count; ``evaluatee_id`` narrows
+        the drilldown to one faculty member.
+        """
+
+        stmt = (
+            select(
+                NumericalAggregateItem.item_id,
+                func.count(),
+                func.avg(NumericalAggregateItem.value),
+                func.min(NumericalAggregateItem.value),
+                func.max(NumericalAggregateItem.value),
+            )
+            .join(NumericalAggregate, NumericalAggregate.id == NumericalAggregateItem.aggregate_id)
+            .join(EvaluationSubmission, EvaluationSubmission.id == NumericalAggregate.submission_id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES),
+                NumericalAggregateItem.item_type == item_type,
+            )
+            .group_by(NumericalAggregateItem.item_id)
+            .order_by(NumericalAggregateItem.item_id)
+        )
+        if item_ids is not None:
+            stmt = stmt.where(NumericalAggregateItem.item_id.in_(list(item_ids)))
+        if evaluatee_id is not None:
+            stmt = stmt.where(EvaluationSubmission.evaluatee_id == evaluatee_id)
+        return db.execute(stmt).all()
+
+    @replica_read
+    def summarize_items_by_department(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        item_type: AggregateItemType,
+        department_ids: Sequence[int],
+        item_ids: Optional[Sequence[int]] = None,
+    ) -> Sequence[Row[Tuple[int, int, int, float]]]:
+        """Return ``(department_id, item_id, submission_count, avg)`` rolled up over each department's subtree.
+
+        Only submissions in a scorable status count, and evaluatees are
+        attributed to their home department for the period's school term, as
+        in the department score rollups.
+        """
+
+        if not department_ids:
+            return []
+        stmt = (
+            select(
+                DepartmentClosure.ancestor_id,
+                NumericalAggregateItem.item_id,
+                func.count(),
+                func.avg(NumericalAggregateItem.value),
+            )
+            .select_from(NumericalAggregateItem)
+            .join(NumericalAggregate, NumericalAggregate.id == NumericalAggregateItem.aggregate_id)
+            .join(EvaluationSubmission, EvaluationSubmission.id == NumericalAggregate.submission_id)
+            .join(EvaluationPeriod, EvaluationPeriod.id == EvaluationSubmission.evaluation_period_id)
+            .join(
+                FacultyDepartmentAffiliation,
+                and_(
+                    FacultyDepartmentAffiliation.faculty_id == EvaluationSubmission.evaluatee_id,
+                    FacultyDepartmentAffiliation.school_term_id == EvaluationPeriod.school_term_id,
+                    FacultyDepartmentAffiliation.is_home_department.is_(True),
+                ),
+            )
+            .join(DepartmentClosure, DepartmentClosure.descendant_id == FacultyDepartmentAffiliation.department_id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES),
+                NumericalAggregateItem.item_type == item_type,
+                DepartmentClosure.ancestor_id.in_(list(department_ids)),
+            )
+            .group_by(DepartmentClosure.ancestor_id, NumericalAggregateItem.item_id)
+            .order_by(DepartmentClosure.ancestor_id, NumericalAggregateItem.item_id)
+        )
+        if item_ids is not None:
+            stmt = stmt.where(NumericalAggregateItem.item_id.in_(list(item_ids)))
+        return db.execute(stmt).all()
+
+
+numerical_aggregate_repository = NumericalAggregateRepository()
+
+
+__all__ = ["NumericalAggregateRepository", "numerical_aggregate_repository"]
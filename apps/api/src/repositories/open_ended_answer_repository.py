@@ -0,0 +1,61 @@
+"""Data access for open-ended answers and their qualitative analysis results."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.analysis import OpenEndedKeyword, OpenEndedSentiment
+from ..models.evaluation_submission import EvaluationOpenEndedAnswer, EvaluationSubmission
+
+
+class OpenEndedAnswerRepository:
+    """Batch-oriented reads and writes used by the qualitative analysis job."""
+
+    def fetch_pending_sentiment(
+        self,
+        db: Session,
+        *,
+        after_id: int = 0,
+        limit: int,
+        evaluation_period_id: Optional[int] = None,
+    ) -> Sequence[Row[Tuple[int, str, int]]]:
+        """Return ``(answer_id, answer_text, submission_id)`` for answers without a sentiment row, by id."""
+
+        stmt = (
+            select(
+                EvaluationOpenEndedAnswer.id,
+                EvaluationOpenEndedAnswer.answer_text,
+                EvaluationOpenEndedAnswer.submission_id,
+            )
+            .outerjoin(OpenEndedSentiment, OpenEndedSentiment.open_ended_answer_id == EvaluationOpenEndedAnswer.id)
+            .where(OpenEndedSentiment.id.is_(None), EvaluationOpenEndedAnswer.id > after_id)
+            .order_by(EvaluationOpenEndedAnswer.id)
+            .limit(limit)
+        )
+        if evaluation_period_id is not None:
+            stmt = stmt.join(
+                EvaluationSubmission,
+                EvaluationSubmission.id == EvaluationOpenEndedAnswer.submission_id,
+            ).where(EvaluationSubmission.evaluation_period_id == evaluation_period_id)
+        return db.execute(stmt).all()
+
+    def bulk_insert_sentiments(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """Insert sentiment rows using executemany batching."""
+
+        if rows:
+            db.execute(insert(OpenEndedSentiment), rows)
+
+    def bulk_insert_keywords(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """Insert keyword rows using executemany batching."""
+
+        if rows:
+            db.execute(insert(OpenEndedKeyword), rows)
+
+
+open_ended_answer_repository = OpenEndedAnswerRepository()
+
+
+__all__ = ["OpenEndedAnswerRepository", "open_ended_answer_repository"]
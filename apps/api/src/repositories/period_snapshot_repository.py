@@ -0,0 +1,108 @@
+"""Data access for columnar snapshots of finalized period results."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Row, case, func, select
+from sqlalchemy.orm import Session
+
+from ..models.analysis import NumericalAggregate, SentimentAggregate
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES
+from ..models.evaluation_submission import EvaluationSubmission
+
+
+class PeriodSnapshotRepository:
+    """Reads of final-snapshot aggregates for one evaluation period.
+
+    Only submissions in a scorable status count: aggregates of invalidated or
+    cancelled submissions are neither exported nor required to be final.
+    """
+
+    def count_unfinalized(self, db: Session, *, evaluation_period_id: int) -> Tuple[int, int]:
+        """Return ``(aggregates, not_final)`` over the period's numerical and sentiment aggregates."""
+
+        total = 0
+        open_rows = 0
+        for model in (NumericalAggregate, SentimentAggregate):
+            stmt = (
+                select(
+                    func.count(model.id),
+                    func.coalesce(func.sum(case((model.is_final_snapshot.is_(False), 1), else_=0)), 0),
+                )
+                .join(EvaluationSubmission, EvaluationSubmission.id == model.submission_id)
+                .where(
+                    EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                    EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES),
+                )
+            )
+            count, not_final = db.execute(stmt).one()
+            total += int(count)
+            open_rows += int(not_final)
+        return total, open_rows
+
+    def list_finalized_periods(self, db: Session) -> List[Tuple[int, int]]:
+        """Return ``(university_id, evaluation_period_id)`` of periods whose aggregates are all final."""
+
+        period = (EvaluationSubmission.university_id, EvaluationSubmission.evaluation_period_id)
+        totals: Dict[Tuple[int, int], int] = {}
+        for model in (NumericalAggregate, SentimentAggregate):
+            stmt = (
+                select(*period, func.sum(case((model.is_final_snapshot.is_(False), 1), else_=0)))
+                .join(EvaluationSubmission, EvaluationSubmission.id == model.submission_id)
+                .where(EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES))
+                .group_by(*period)
+            )
+            for university_id, period_id, not_final in db.execute(stmt):
+                totals[(university_id, period_id)] = totals.get((university_id, period_id), 0) + int(not_final)
+        return sorted(key for key, not_final in totals.items() if not not_final)
+
+    def fetch_submission_results(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+    ) -> Sequence[Row[Tuple[Any, ...]]]:
+        """One row per scored, scorable submission of the period, with its sentiment aggregate if any.
+
+        Columns: ``submission_id, university_id, evaluatee_id, subject_offering_id,
+        submitted_at, per_criterion_average_scores, quant_score_raw, z_quant,
+        final_score_60_40, cohort_n, cohort_mean, cohort_std_dev,
+        average_positive_score, average_neutral_score, average_negative_score,
+        qual_score_raw, z_qual``. Evaluator ids are deliberately not exported.
+        """
+
+        stmt = (
+            select(
+                EvaluationSubmission.id,
+                EvaluationSubmission.university_id,
+                EvaluationSubmission.evaluatee_id,
+                EvaluationSubmission.subject_offering_id,
+                EvaluationSubmission.submitted_at,
+                NumericalAggregate.per_criterion_average_scores,
+                NumericalAggregate.quant_score_raw,
+                NumericalAggregate.z_quant,
+                NumericalAggregate.final_score_60_40,
+                NumericalAggregate.cohort_n,
+                NumericalAggregate.cohort_mean,
+                NumericalAggregate.cohort_std_dev,
+                SentimentAggregate.average_positive_score,
+                SentimentAggregate.average_neutral_score,
+                SentimentAggregate.average_negative_score,
+                SentimentAggregate.qual_score_raw,
+                SentimentAggregate.z_qual,
+            )
+            .join(NumericalAggregate, NumericalAggregate.submission_id == EvaluationSubmission.id)
+            .outerjoin(SentimentAggregate, SentimentAggregate.submission_id == EvaluationSubmission.id)
+            .where(
+                EvaluationSubmission.evaluation_period_id == evaluation_period_id,
+                EvaluationSubmission.status.in_(SCORABLE_SUBMISSION_STATUSES),
+            )
+            .order_by(EvaluationSubmission.evaluatee_id, EvaluationSubmission.id)
+        )
+        return db.execute(stmt).all()
+
+
+period_snapshot_repository = PeriodSnapshotRepository()
+
+__all__ = ["PeriodSnapshotRepository", "period_snapshot_repository"]
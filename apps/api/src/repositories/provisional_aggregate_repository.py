@@ -0,0 +1,168 @@
+"""Data access for the provisional aggregates micro-batch job."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, and_, delete, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from ..db import replica_read
+from ..models.analysis import NumericalAggregate, ProvisionalAggregate
+from ..models.enums import EvaluationSubmissionStatus
+from ..models.evaluation_submission import EvaluationLikertAnswer, EvaluationSubmission
+from .sql_helpers import upsert
+
+GroupKey = Tuple[int, int]
+
+_TOTAL_COLUMNS = (
+    "university_id",
+    "submission_count",
+    "likert_answer_count",
+    "likert_value_sum",
+    "average_likert_score",
+    "scored_submission_count",
+    "average_quant_score",
+    "last_submitted_at",
+)
+
+
+class ProvisionalAggregateRepository:
+    """Keyset reads of new submissions and per-group recomputation of totals."""
+
+    def fetch_submissions_after(
+        self,
+        db: Session,
+        *,
+        after_at: Optional[datetime],
+        after_id: int,
+        until: datetime,
+        limit: int,
+    ) -> Sequence[Row[Tuple[int, datetime, int, int]]]:
+        """Return ``(id, submitted_at, evaluation_period_id, evaluatee_id)`` past the mark, in mark order."""
+
+        stmt = (
+            select(
+                EvaluationSubmission.id,
+                EvaluationSubmission.submitted_at,
+                EvaluationSubmission.evaluation_period_id,
+                EvaluationSubmission.evaluatee_id,
+            )
+            .where(EvaluationSubmission.submitted_at <= until)
+            .order_by(EvaluationSubmission.submitted_at, EvaluationSubmission.id)
+            .limit(limit)
+        )
+        if after_at is not None:
+            stmt = stmt.where(
+                or_(
+                    EvaluationSubmission.submitted_at > after_at,
+                    and_(EvaluationSubmission.submitted_at == after_at, EvaluationSubmission.id > after_id),
+                )
+            )
+        return db.execute(stmt).all()
+
+    def fetch_submission_groups(self, db: Session, *, submission_ids: Sequence[int]) -> List[GroupKey]:
+        """Return the distinct ``(period_id, evaluatee_id)`` groups of the given submissions."""
+
+        if not submission_ids:
+            return []
+        stmt = (
+            select(EvaluationSubmission.evaluation_period_id, EvaluationSubmission.evaluatee_id)
+            .where(EvaluationSubmission.id.in_(list(submission_ids)))
+            .distinct()
+        )
+        return [(period_id, evaluatee_id) for period_id, evaluatee_id in db.execute(stmt)]
+
+    def compute_group_totals(
+        self,
+        db: Session,
+        *,
+        groups: Iterable[GroupKey],
+        statuses: Iterable[EvaluationSubmissionStatus],
+    ) -> Dict[GroupKey, Dict[str, Any]]:
+        """Recompute totals from source rows for the given ``(period_id, evaluatee_id)`` groups."""
+
+        keys = list(groups)
+        if not keys:
+            return {}
+        group_columns = (EvaluationSubmission.evaluation_period_id, EvaluationSubmission.evaluatee_id)
+        scope = (
+            tuple_(*group_columns).in_(keys),
+            EvaluationSubmission.status.in_(list(statuses)),
+        )
+
+        submissions = (
+            select(
+                *group_columns,
+                func.min(EvaluationSubmission.university_id),
+                func.count(EvaluationSubmission.id),
+                func.count(NumericalAggregate.id),
+                func.avg(NumericalAggregate.quant_score_raw),
+                func.max(EvaluationSubmission.submitted_at),
+            )
+            .outerjoin(NumericalAggregate, NumericalAggregate.submission_id == EvaluationSubmission.id)
+            .where(*scope)
+            .group_by(*group_columns)
+        )
+        answers = (
+            select(
+                *group_columns,
+                func.count(EvaluationLikertAnswer.id),
+                func.coalesce(func.sum(EvaluationLikertAnswer.answer_value), 0),
+            )
+            .join(EvaluationLikertAnswer, EvaluationLikertAnswer.submission_id == EvaluationSubmission.id)
+            .where(*scope)
+            .group_by(*group_columns)
+        )
+        answer_totals = {
+            (period_id, evaluatee_id): (count, total) for period_id, evaluatee_id, count, total in db.execute(answers)
+        }
+
+        totals: Dict[GroupKey, Dict[str, Any]] = {}
+        for period_id, evaluatee_id, university_id, count, scored, avg_quant, last_at in db.execute(submissions):
+            answer_count, answer_sum = answer_totals.get((period_id, evaluatee_id), (0, 0))
+            totals[(period_id, evaluatee_id)] = {
+                "university_id": university_id,
+                "submission_count": count,
+                "likert_answer_count": answer_count,
+                "likert_value_sum": int(answer_sum),
+                "average_likert_score": round(answer_sum / answer_count, 4) if answer_count else None,
+                "scored_submission_count": scored,
+                "average_quant_score": round(float(avg_quant), 4) if avg_quant is not None else None,
+                "last_submitted_at": last_at,
+            }
+        return totals
+
+    def upsert_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        upsert(
+            db,
+            ProvisionalAggregate,
+            rows,
+            conflict_columns=("evaluation_period_id", "evaluatee_id"),
+            update_columns=_TOTAL_COLUMNS,
+        )
+
+    def delete_groups(self, db: Session, *, groups: Iterable[GroupKey]) -> None:
+        keys = list(groups)
+        if keys:
+            db.execute(
+                delete(ProvisionalAggregate).where(
+                    tuple_(ProvisionalAggregate.evaluation_period_id, ProvisionalAggregate.evaluatee_id).in_(keys)
+                )
+            )
+
+    @replica_read
+    def list_for_period(self, db: Session, *, evaluation_period_id: int) -> List[ProvisionalAggregate]:
+        stmt = (
+            select(ProvisionalAggregate)
+            .where(ProvisionalAggregate.evaluation_period_id == evaluation_period_id)
+            .order_by(ProvisionalAggregate.evaluatee_id)
+        )
+        return list(db.scalars(stmt))
+
+
+provisional_aggregate_repository = ProvisionalAggregateRepository()
+
+
+__all__ = ["GroupKey", "ProvisionalAggregateRepository", "provisional_aggregate_repository"]
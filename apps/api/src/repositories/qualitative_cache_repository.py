@@ -0,0 +1,42 @@
+"""Persistent tier of the qualitative result cache."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.analysis import QualitativeResultCacheEntry
+from .sql_helpers import insert_ignore_duplicates
+
+
+class QualitativeCacheRepository:
+    """Lookups and inserts on ``qualitative_result_cache``."""
+
+    def get_many(
+        self,
+        db: Session,
+        *,
+        model_version: str,
+        content_hashes: Iterable[str],
+    ) -> List[QualitativeResultCacheEntry]:
+        hashes = list(content_hashes)
+        if not hashes:
+            return []
+        stmt = select(QualitativeResultCacheEntry).where(
+            QualitativeResultCacheEntry.model_version == model_version,
+            QualitativeResultCacheEntry.content_hash.in_(hashes),
+        )
+        return list(db.scalars(stmt))
+
+    def insert_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """Insert new entries; rows already written by a concurrent worker are skipped."""
+
+        insert_ignore_duplicates(db, QualitativeResultCacheEntry, rows)
+
+
+qualitative_cache_repository = QualitativeCacheRepository()
+
+
+__all__ = ["QualitativeCacheRepository", "qualitative_cache_repository"]
@@ -0,0 +1,188 @@
+"""Flat read models for dashboard and export queries.
+
+Dashboards and reports only need column values, yet loading ORM objects pays
+for identity-map bookkeeping, attribute instrumentation and ``Decimal``
+construction for every ``Numeric(10, 4)`` column of every row. These queries
+are Core SELECTs mapped straight onto ``__slots__`` dataclasses, and the
+numeric columns are read as ``float`` by the result processor. See
+``benchmarks/read_models.py`` for the difference at 100k rows.
+
+The dataclasses are deliberately not frozen: a frozen dataclass assigns each
+field through ``object.__setattr__``, which makes construction several times
+slower. Treat them as read-only all the same.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import starmap
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import Numeric, Select, select, type_coerce
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import Session
+
+from ..db.routing import replica_read
+from ..models.analysis import NumericalAggregate, SentimentAggregate
+from ..models.enums import AnalysisPipelineStatus, EvaluationSubmissionStatus
+from ..models.evaluation_submission import EvaluationSubmission
+
+
+@dataclass(slots=True)
+class SubmissionRow:
+    """An evaluation submission without its answers or evaluator."""
+
+    id: int
+    evaluation_period_id: int
+    evaluatee_id: int
+    subject_offering_id: int
+    status: EvaluationSubmissionStatus
+    analysis_status: AnalysisPipelineStatus
+    submitted_at: datetime
+    is_resubmission: bool
+
+
+@dataclass(slots=True)
+class NumericalAggregateRow:
+    """Quantitative scores of one submission."""
+
+    submission_id: int
+    evaluatee_id: int
+    quant_score_raw: float
+    z_quant: float
+    final_score_60_40: float
+    cohort_n: int
+    cohort_mean: float
+    cohort_std_dev: float
+    is_final_snapshot: bool
+
+
+@dataclass(slots=True)
+class SentimentAggregateRow:
+    """Qualitative scores of one submission."""
+
+    submission_id: int
+    evaluatee_id: int
+    average_positive_score: float
+    average_neutral_score: float
+    average_negative_score: float
+    qual_score_raw: float
+    z_qual: float
+    is_final_snapshot: bool
+
+
+class _FloatResult(TypeDecorator):
+    """``Numeric`` whose (non-null) values are returned as ``float``.
+
+    ``Numeric(asdecimal=False)`` alone leaves whole numbers as ``int`` on
+    SQLite; the builtin ``float`` converts ``Decimal``, ``int`` and ``float``
+    alike without a Python-level wrapper per value.
+    """
+
+    impl = Numeric
+    cache_ok = True
+
+    def result_processor(self, dialect: Any, coltype: Any) -> Any:
+        return float
+
+
+def _as_float(column: Any) -> Any:
+    """Read a NOT NULL ``Numeric`` column as ``float`` without changing the SQL."""
+
+    return type_coerce(column, _FloatResult()).label(column.key)
+
+
+def _period_filter(stmt: Select, evaluation_period_id: int, evaluatee_ids: Optional[Sequence[int]]) -> Select:
+    stmt = stmt.where(EvaluationSubmission.evaluation_period_id == evaluation_period_id)
+    if evaluatee_ids is not None:
+        stmt = stmt.where(EvaluationSubmission.evaluatee_id.in_(list(evaluatee_ids)))
+    return stmt
+
+
+class ReadModelRepository:
+    """Period-scoped reads returning flat rows instead of ORM objects."""
+
+    @replica_read
+    def list_submissions(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        evaluatee_ids: Optional[Sequence[int]] = None,
+    ) -> List[SubmissionRow]:
+        stmt = select(
+            EvaluationSubmission.id,
+            EvaluationSubmission.evaluation_period_id,
+            EvaluationSubmission.evaluatee_id,
+            EvaluationSubmission.subject_offering_id,
+            EvaluationSubmission.status,
+            EvaluationSubmission.analysis_status,
+            EvaluationSubmission.submitted_at,
+            EvaluationSubmission.is_resubmission,
+        ).order_by(EvaluationSubmission.id)
+        stmt = _period_filter(stmt, evaluation_period_id, evaluatee_ids)
+        return list(starmap(SubmissionRow, db.execute(stmt)))
+
+    @replica_read
+    def list_numerical_aggregates(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        evaluatee_ids: Optional[Sequence[int]] = None,
+    ) -> List[NumericalAggregateRow]:
+        stmt = (
+            select(
+                NumericalAggregate.submission_id,
+                EvaluationSubmission.evaluatee_id,
+                _as_float(NumericalAggregate.quant_score_raw),
+                _as_float(NumericalAggregate.z_quant),
+                _as_float(NumericalAggregate.final_score_60_40),
+                NumericalAggregate.cohort_n,
+                _as_float(NumericalAggregate.cohort_mean),
+                _as_float(NumericalAggregate.cohort_std_dev),
+                NumericalAggregate.is_final_snapshot,
+            )
+            .join(EvaluationSubmission, EvaluationSubmission.id == NumericalAggregate.submission_id)
+            .order_by(NumericalAggregate.submission_id)
+        )
+        stmt = _period_filter(stmt, evaluation_period_id, evaluatee_ids)
+        return list(starmap(NumericalAggregateRow, db.execute(stmt)))
+
+    @replica_read
+    def list_sentiment_aggregates(
+        self,
+        db: Session,
+        *,
+        evaluation_period_id: int,
+        evaluatee_ids: Optional[Sequence[int]] = None,
+    ) -> List[SentimentAggregateRow]:
+        stmt = (
+            select(
+                SentimentAggregate.submission_id,
+                EvaluationSubmission.evaluatee_id,
+                _as_float(SentimentAggregate.average_positive_score),
+                _as_float(SentimentAggregate.average_neutral_score),
+                _as_float(SentimentAggregate.average_negative_score),
+                _as_float(SentimentAggregate.qual_score_raw),
+                _as_float(SentimentAggregate.z_qual),
+                SentimentAggregate.is_final_snapshot,
+            )
+            .join(EvaluationSubmission, EvaluationSubmission.id == SentimentAggregate.submission_id)
+            .order_by(SentimentAggregate.submission_id)
+        )
+        stmt = _period_filter(stmt, evaluation_period_id, evaluatee_ids)
+        return list(starmap(SentimentAggregateRow, db.execute(stmt)))
+
+
+read_model_repository = ReadModelRepository()
+
+
+__all__ = [
+    "SubmissionRow",
+    "NumericalAggregateRow",
+    "SentimentAggregateRow",
+    "ReadModelRepository",
+    "read_model_repository",
+]
@@ -0,0 +1,68 @@
+"""Dialect-aware statement builders shared by repositories."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence, Type
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..db import Base
+
+
+def _dialect_name(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def insert_ignore_duplicates(db: Session, model: Type[Base], rows: List[Dict[str, Any]]) -> None:
+    """Insert rows, silently skipping any that violate a unique constraint."""
+
+    if not rows:
+        return
+
+    dialect = _dialect_name(db)
+    if dialect == "sqlite":
+        stmt = sqlite.insert(model).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(model).on_conflict_do_nothing()
+    elif dialect in {"mysql", "mariadb"}:
+        stmt = mysql.insert(model).prefix_with("IGNORE")
+    else:
+        stmt = insert(model)
+    db.execute(stmt, rows)
+
+
+def upsert(
+    db: Session,
+    model: Type[Base],
+    rows: List[Dict[str, Any]],
+    *,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> None:
+    """Insert rows, overwriting ``update_columns`` of rows that hit the unique key.
+
+    ``conflict_columns`` names the unique key (used by SQLite and PostgreSQL;
+    MySQL/MariaDB resolve it from the table's unique indexes).
+    """
+
+    if not rows:
+        return
+
+    dialect = _dialect_name(db)
+    if dialect in {"sqlite", "postgresql"}:
+        base = sqlite.insert(model) if dialect == "sqlite" else postgresql.insert(model)
+        stmt = base.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: base.excluded[column] for column in update_columns},
+        )
+    elif dialect in {"mysql", "mariadb"}:
+        base = mysql.insert(model)
+        stmt = base.on_duplicate_key_update({column: base.inserted[column] for column in update_columns})
+    else:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}.")
+    db.execute(stmt, rows)
+
+
+__all__ = ["insert_ignore_duplicates", "upsert"]
@@ -0,0 +1,36 @@
+"""Tenant configuration lookups."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.operations import UniversitySetting
+
+
+class UniversitySettingRepository:
+    """Reads ``university_settings`` values by name."""
+
+    def get_value(self, db: Session, *, university_id: int, setting_name: str) -> Optional[str]:
+        stmt = select(UniversitySetting.setting_value).where(
+            UniversitySetting.university_id == university_id,
+            UniversitySetting.setting_name == setting_name,
+        )
+        return db.scalar(stmt)
+
+    def get_float(self, db: Session, *, university_id: int, setting_name: str, default: float) -> float:
+        """Return a numeric setting, falling back to ``default`` when unset or malformed."""
+
+        value = self.get_value(db, university_id=university_id, setting_name=setting_name)
+        try:
+            return float(value) if value is not None else default
+        except ValueError:
+            return default
+
+
+university_setting_repository = UniversitySettingRepository()
+
+
+__all__ = ["UniversitySettingRepository", "university_setting_repository"]
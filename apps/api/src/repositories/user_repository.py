@@ -0,0 +1,32 @@
+"""Profiled reads of users."""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.identity import User
+from .loading import with_profile
+
+
+class UserRepository:
+    """Loads ``users`` rows with a named loading profile from ``repositories.loading``."""
+
+    def get(self, db: Session, user_id: int, *, profile: str = "user_profile") -> Optional[User]:
+        stmt = select(User).where(User.id == user_id)
+        return db.scalars(with_profile(stmt, User, profile)).unique().one_or_none()
+
+    def list_by_ids(self, db: Session, *, user_ids: Iterable[int], profile: str = "dashboard_list") -> List[User]:
+        ids = list(user_ids)
+        if not ids:
+            return []
+        stmt = select(User).where(User.id.in_(ids)).order_by(User.id)
+        return list(db.scalars(with_profile(stmt, User, profile)).unique())
+
+
+user_repository = UserRepository()
+
+
+__all__ = ["UserRepository", "user_repository"]
@@ -1,4 +1,5 @@
 """Pydantic schema definitions."""
-from .health import HealthResponse
+from .debug import RepeatedStatement, RequestSqlSummary, SlowStatement
+from .health import HealthResponse, PoolStatsResponse
 
-__all__ = ["HealthResponse"]
+__all__ = ["HealthResponse", "PoolStatsResponse", "RequestSqlSummary", "SlowStatement", "RepeatedStatement"]
@@ -0,0 +1,26 @@
+"""Response models for debug endpoints."""
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class SlowStatement(BaseModel):
+    ms: float
+    statement: str
+
+
+class RepeatedStatement(BaseModel):
+    count: int
+    statement: str
+
+
+class RequestSqlSummary(BaseModel):
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    queries: int
+    db_ms: float
+    slowest: List[SlowStatement]
+    repeated: List[RepeatedStatement]
@@ -1,7 +1,14 @@
 """Shared response models for health endpoints."""
 
+from typing import Any, Dict
+
 from pydantic import BaseModel
 
 
 class HealthResponse(BaseModel):
     status: str
+
+
+class PoolStatsResponse(BaseModel):
+    profile: str
+    pools: Dict[str, Dict[str, Any]]
@@ -0,0 +1,56 @@
+"""Password setup links for accounts created without a password.
+
+A ``USER_IMPORT`` in the default ``unverified`` password mode skips bcrypt entirely:
+its users are ``unverified`` with an unusable password hash, and each one sets
+a password through a signed link. The link carries the user's id and
+``token_version`` and expires after ``PASSWORD_SETUP_TOKEN_HOURS``; setting a
+password activates the account and bumps ``token_version``, so every link
+issued for it stops working. Nothing is stored per link, so one can be issued
+again at any time, for instance when the first email expired.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.clock import utcnow
+from ..core.config import settings
+from ..core.security import InvalidTokenError, hash_password, read_signed_token, sign_token
+from ..models.enums import UserStatus
+from ..models.identity import User
+
+PASSWORD_SETUP_PURPOSE = "password-setup"
+
+
+def password_setup_token(user: User, *, now: Optional[datetime] = None) -> str:
+    """Signed token letting an ``unverified`` user choose their password."""
+
+    if user.status != UserStatus.UNVERIFIED:
+        raise ValueError(f"User {user.id} is not awaiting a password.")
+    expires_at = (now or utcnow()) + timedelta(hours=settings.password_setup_token_hours)
+    return sign_token(PASSWORD_SETUP_PURPOSE, user.id, user.token_version, expires_at=expires_at)
+
+
+def complete_password_setup(db: Session, *, token: str, password: str, now: Optional[datetime] = None) -> User:
+    """Set the password of the token's user and activate the account; flushes, leaving the commit to the caller.
+
+    Raises ``InvalidTokenError`` for a bad, expired or already used token.
+    """
+
+    parts = read_signed_token(token, now=now)
+    if len(parts) != 3 or parts[0] != PASSWORD_SETUP_PURPOSE:
+        raise InvalidTokenError("Not a password setup token.")
+    user = db.get(User, int(parts[1]))
+    if user is None or user.status != UserStatus.UNVERIFIED or user.token_version != int(parts[2]):
+        raise InvalidTokenError("This password setup link has already been used.")
+    user.password_hash = hash_password(password)
+    user.status = UserStatus.ACTIVE
+    user.token_version += 1
+    db.flush()
+    return user
+
+
+__all__ = ["PASSWORD_SETUP_PURPOSE", "password_setup_token", "complete_password_setup"]
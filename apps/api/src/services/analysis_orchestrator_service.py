@@ -0,0 +1,204 @@
+"""Fan-in of the analysis DAG: QUANTITATIVE + QUALITATIVE -> FINAL_AGGREGATION.
+
+Whenever an upstream job finishes, submissions whose two stages are both done
+move to ``QUANT_QUAL_COMPLETE`` and their cohort (department within a period)
+gets a FINAL_AGGREGATION trigger. Triggers for a cohort are coalesced into the
+single queued aggregation task of its current window: each trigger pushes the
+run back by the debounce interval, capped at the window's maximum delay, and
+appends the upstream task to the lineage kept in ``job_parameters``. The period
+row is locked while scheduling and claiming, so a trigger never lands on a run
+that has already started.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.clock import utcnow
+from ..core.config import settings
+from ..models.enums import (
+    SCORABLE_SUBMISSION_STATUSES,
+    AnalysisPipelineStatus,
+    BackgroundJobStatus,
+    BackgroundJobType,
+)
+from ..models.operations import BackgroundTask
+from ..repositories.analysis_pipeline_repository import analysis_pipeline_repository
+from ..repositories.background_task_repository import background_task_repository
+from ..repositories.cohort_statistic_repository import cohort_statistic_repository
+
+
+@dataclass(frozen=True)
+class AggregationCohort:
+    """Unit of work for one FINAL_AGGREGATION run."""
+
+    university_id: int
+    evaluation_period_id: int
+    department_id: Optional[int]
+
+    @classmethod
+    def from_parameters(cls, university_id: int, parameters: Dict[str, Any]) -> "AggregationCohort":
+        return cls(university_id, int(parameters["evaluation_period_id"]), parameters.get("department_id"))
+
+
+@dataclass(frozen=True)
+class AggregationClaim:
+    """Whether a FINAL_AGGREGATION task may start now, or when to look again."""
+
+    run_now: bool
+    defer_until: Optional[datetime] = None
+
+
+def _find_open_task(db: Session, cohort: AggregationCohort) -> Optional[BackgroundTask]:
+    queued = background_task_repository.list_by_status(
+        db,
+        university_id=cohort.university_id,
+        job_type=BackgroundJobType.FINAL_AGGREGATION,
+        status=BackgroundJobStatus.QUEUED,
+    )
+    for task in queued:
+        if AggregationCohort.from_parameters(task.university_id, task.job_parameters or {}) == cohort:
+            return task
+    return None
+
+
+def schedule_final_aggregation(
+    db: Session,
+    cohort: AggregationCohort,
+    *,
+    upstream_task: BackgroundTask,
+    submissions_ready: int,
+    now: Optional[datetime] = None,
+) -> Tuple[BackgroundTask, bool]:
+    """Coalesce a trigger into the cohort's queued run, creating one if needed.
+
+    Returns the task and whether it was newly created (and so still needs enqueueing).
+    The caller owns the transaction; the period lock is held until it commits.
+    """
+
+    now = now or utcnow()
+    debounce = timedelta(seconds=settings.final_aggregation_debounce_seconds)
+    max_delay = timedelta(seconds=settings.final_aggregation_max_delay_seconds)
+    lineage = {"task_id": upstream_task.id, "job_type": upstream_task.job_type.value}
+
+    analysis_pipeline_repository.lock_period(db, evaluation_period_id=cohort.evaluation_period_id)
+    task = _find_open_task(db, cohort)
+    if task is not None:
+        parameters = dict(task.job_parameters or {})
+        upstream = list(parameters.get("upstream_tasks", []))
+        if lineage not in upstream:
+            upstream.append(lineage)
+        window_opened_at = datetime.fromisoformat(parameters["window_opened_at"])
+        parameters.update(
+            upstream_tasks=upstream,
+            trigger_count=parameters.get("trigger_count", 0) + 1,
+            submissions_ready=parameters.get("submissions_ready", 0) + submissions_ready,
+            run_after=min(now + debounce, window_opened_at + max_delay).isoformat(),
+        )
+        # Reassign so the JSON column is flagged as modified.
+        task.job_parameters = parameters
+        return task, False
+
+    task = background_task_repository.create(
+        db,
+        university_id=cohort.university_id,
+        job_type=BackgroundJobType.FINAL_AGGREGATION,
+        submitted_by_user_id=upstream_task.submitted_by_user_id,
+        job_parameters={
+            "evaluation_period_id": cohort.evaluation_period_id,
+            "department_id": cohort.department_id,
+            "window_opened_at": now.isoformat(),
+            "run_after": (now + debounce).isoformat(),
+            "upstream_tasks": [lineage],
+            "trigger_count": 1,
+            "submissions_ready": submissions_ready,
+        },
+    )
+    return task, True
+
+
+def record_stage_completion(
+    db: Session,
+    *,
+    upstream_task: BackgroundTask,
+    now: Optional[datetime] = None,
+) -> List[BackgroundTask]:
+    """Advance submissions whose quantitative and qualitative stages are both done.
+
+    Called at the end of a QUANTITATIVE_ANALYSIS or QUALITATIVE_ANALYSIS job.
+    Commits, and returns the FINAL_AGGREGATION tasks created by this call so the
+    caller can enqueue them.
+    """
+
+    period_id = (upstream_task.job_parameters or {}).get("evaluation_period_id")
+    ready = analysis_pipeline_repository.fetch_stage_complete_submission_ids(
+        db,
+        statuses=SCORABLE_SUBMISSION_STATUSES,
+        evaluation_period_id=int(period_id) if period_id is not None else None,
+    )
+    if not ready:
+        return []
+
+    analysis_pipeline_repository.set_analysis_status(
+        db,
+        submission_ids=ready,
+        status=AnalysisPipelineStatus.QUANT_QUAL_COMPLETE,
+    )
+    groups = cohort_statistic_repository.get_cohort_groups_for_submissions(db, submission_ids=ready)
+    cohorts = Counter(
+        AggregationCohort(university_id, evaluation_period_id, department_id)
+        for university_id, evaluation_period_id, _, department_id in groups.values()
+    )
+
+    created: List[BackgroundTask] = []
+    # Lock periods in a stable order so concurrent upstream jobs cannot deadlock.
+    ordered = sorted(cohorts.items(), key=lambda item: (item[0].evaluation_period_id, item[0].department_id or 0))
+    for cohort, count in ordered:
+        task, is_new = schedule_final_aggregation(
+            db,
+            cohort,
+            upstream_task=upstream_task,
+            submissions_ready=count,
+            now=now,
+        )
+        if is_new:
+            created.append(task)
+    db.commit()
+    return created
+
+
+def claim_final_aggregation(db: Session, task_id: int, *, now: Optional[datetime] = None) -> AggregationClaim:
+    """Decide whether a queued aggregation task runs now.
+
+    Holds the period lock when ``run_now`` is true; the caller releases it by
+    committing the task's move to PROCESSING.
+    """
+
+    task = background_task_repository.get(db, task_id)
+    if task is None or task.status != BackgroundJobStatus.QUEUED:
+        return AggregationClaim(run_now=False)
+
+    cohort = AggregationCohort.from_parameters(task.university_id, task.job_parameters or {})
+    analysis_pipeline_repository.lock_period(db, evaluation_period_id=cohort.evaluation_period_id)
+    task = background_task_repository.get_for_update(db, task_id)
+    if task is None or task.status != BackgroundJobStatus.QUEUED:
+        return AggregationClaim(run_now=False)
+
+    run_after = datetime.fromisoformat(task.job_parameters["run_after"])
+    if run_after > (now or utcnow()):
+        return AggregationClaim(run_now=False, defer_until=run_after)
+    return AggregationClaim(run_now=True)
+
+
+__all__ = [
+    "AggregationCohort",
+    "AggregationClaim",
+    "schedule_final_aggregation",
+    "record_stage_completion",
+    "claim_final_aggregation",
+]
@@ -0,0 +1,276 @@
+"""Monthly partitions and cold archival for ``audit_logs``.
+
+On MariaDB ``audit_logs`` is range-partitioned by month on ``timestamp``:
+partition ``pYYYYMM`` holds that month and ``pmax`` catches anything newer. New
+rows only ever land in the newest partitions, so inserts touch small, hot index
+trees however long the log grows, and removing a month is a metadata-only
+``DROP PARTITION`` instead of a large ``DELETE``.
+
+Two system jobs keep it that way:
+
+* ``ensure_audit_partitions`` creates the partitions of the coming months
+  (``AUDIT_LOG_PARTITIONS_AHEAD``) before any row needs them;
+* ``archive_audit_logs`` moves each month older than
+  ``AUDIT_LOG_RETENTION_MONTHS`` to a zstd-compressed Parquet file under
+  ``STORAGE_ROOT`` and then drops its partition.
+
+``read_archived_audit_logs`` queries the archive files with column and row
+group pruning. On other databases (SQLite in development and tests) there are no
+partitions and archival deletes the archived rows instead. ``pyarrow`` is
+imported lazily so the API does not need it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..core.clock import utcnow
+from ..core.config import settings
+from ..repositories.audit_log_repository import audit_log_repository
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow as pa
+
+PARTITIONED_DIALECTS = ("mysql", "mariadb")
+ARCHIVE_FORMAT_VERSION = 1
+COMPRESSION = "zstd"
+_BATCH_SIZE = 5000
+
+
+class ArchiveVerificationError(RuntimeError):
+    """Raised when an archive file does not hold every row about to be removed."""
+
+
+@dataclass(frozen=True)
+class AuditArchiveSummary:
+    """Months moved out of the database by one archival run."""
+
+    months_archived: List[str] = field(default_factory=list)
+    rows_archived: int = 0
+    paths: List[Path] = field(default_factory=list)
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def archive_path(month: date) -> Path:
+    """Archive file of one month of audit logs."""
+
+    return Path(settings.storage_root) / "audit_archive" / f"{month:%Y}" / f"{month:%Y-%m}.parquet"
+
+
+def _month_start_at(month: date) -> datetime:
+    return datetime.combine(month, datetime.min.time())
+
+
+def _is_partitioned(db: Session) -> bool:
+    return db.get_bind().dialect.name in PARTITIONED_DIALECTS
+
+
+def _partition_month(name: str) -> Optional[date]:
+    if len(name) != 7 or not name.startswith("p") or not name[1:].isdigit():
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def ensure_audit_partitions(db: Session, *, now: Optional[datetime] = None) -> List[str]:
+    """Create the monthly partitions up to ``AUDIT_LOG_PARTITIONS_AHEAD`` months ahead.
+
+    Returns the names of the partitions created; a no-op off MariaDB or before
+    the partitioning migration has run.
+    """
+
+    if not _is_partitioned(db):
+        return []
+    names = [name for name, _ in audit_log_repository.partitions(db)]
+    if "pmax" not in names:
+        return []
+    newest = max(filter(None, map(_partition_month, names)), default=None)
+    current = month_start(now or utcnow())
+    missing = [
+        month
+        for month in (add_months(current, offset) for offset in range(settings.audit_log_partitions_ahead + 1))
+        if newest is None or month > newest
+    ]
+    audit_log_repository.split_catch_all_partition(
+        db, months=[(partition_name(month), add_months(month, 1)) for month in missing]
+    )
+    return [partition_name(month) for month in missing]
+
+
+def _archive_schema(pa: Any) -> "pa.Schema":
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("university_id", pa.int32()),
+            ("actor_user_id", pa.int32()),
+            ("action", pa.string()),
+            ("target_entity", pa.string()),
+            ("target_id", pa.int64()),
+            ("details", pa.string()),
+            ("ip_address", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+        ]
+    )
+
+
+def _write_month(db: Session, *, month: date, path: Path, now: datetime) -> int:
+    """Stream the rows of ``month`` (and anything older still present) into ``path``."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _archive_schema(pa).with_metadata(
+        {
+            "archive_format_version": str(ARCHIVE_FORMAT_VERSION),
+            "month": f"{month:%Y-%m}",
+            "archived_at": now.isoformat(),
+        }
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".parquet.partial")
+    written = 0
+    end = _month_start_at(add_months(month, 1))
+    with pq.ParquetWriter(partial, schema, compression=COMPRESSION) as writer:
+        for rows in audit_log_repository.iter_before(db, end=end, batch_size=_BATCH_SIZE):
+            columns = {name: list(values) for name, values in zip(schema.names, zip(*rows))}
+            columns["details"] = [None if value is None else json.dumps(value) for value in columns["details"]]
+            writer.write_table(pa.table(columns, schema=schema))
+            written += len(rows)
+    if not written:
+        partial.unlink()
+        return 0
+    if pq.read_metadata(partial).num_rows != written:
+        raise ArchiveVerificationError(f"Archive of {month:%Y-%m} does not hold all {written} rows.")
+    # Readers only ever see a complete file.
+    os.replace(partial, path)
+    return written
+
+
+def archive_audit_logs(db: Session, *, now: Optional[datetime] = None) -> AuditArchiveSummary:
+    """Move every month older than the retention window to its archive file.
+
+    Months are processed oldest first and each is removed from the database only
+    after its file is complete, so a crashed run is finished by the next one.
+    """
+
+    now = now or utcnow()
+    cutoff = add_months(month_start(now), -settings.audit_log_retention_months)
+    cutoff_at = _month_start_at(cutoff)
+    oldest = audit_log_repository.oldest_timestamp(db, before=cutoff_at)
+    if oldest is None:
+        return AuditArchiveSummary()
+    partitions = {name for name, _ in audit_log_repository.partitions(db)} if _is_partitioned(db) else set()
+
+    months: List[str] = []
+    paths: List[Path] = []
+    total = 0
+    month = month_start(oldest)
+    while month < cutoff:
+        path = archive_path(month)
+        written = _write_month(db, month=month, path=path, now=now)
+        if partition_name(month) in partitions:
+            audit_log_repository.drop_partition(db, name=partition_name(month))
+        elif written:
+            audit_log_repository.delete_before(db, end=_month_start_at(add_months(month, 1)))
+        db.commit()
+        if written:
+            months.append(f"{month:%Y-%m}")
+            paths.append(path)
+            total += written
+        month = add_months(month, 1)
+    return AuditArchiveSummary(months_archived=months, rows_archived=total, paths=paths)
+
+
+def archived_months() -> List[date]:
+    """Months that have an archive file, oldest first."""
+
+    root = Path(settings.storage_root) / "audit_archive"
+    months = []
+    for path in root.glob("*/*.parquet"):
+        year, _, month = path.stem.partition("-")
+        months.append(date(int(year), int(month), 1))
+    return sorted(months)
+
+
+def read_archived_audit_logs(
+    *,
+    university_id: int,
+    since: datetime,
+    until: datetime,
+    action: Optional[str] = None,
+    actor_user_id: Optional[int] = None,
+    target_entity: Optional[str] = None,
+    target_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Optional["pa.Table"]:
+    """Archived audit logs of one university in ``[since, until)``, newest first.
+
+    Only the archive files of the months in range are opened, through a memory
+    map; the filters are pushed down to row groups. Returns ``None`` when no
+    month in range has been archived.
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    expression = (
+        (pc.field("university_id") == university_id)
+        & (pc.field("timestamp") >= pa.scalar(since, pa.timestamp("us")))
+        & (pc.field("timestamp") < pa.scalar(until, pa.timestamp("us")))
+    )
+    for name, value in (
+        ("action", action),
+        ("actor_user_id", actor_user_id),
+        ("target_entity", target_entity),
+        ("target_id", target_id),
+    ):
+        if value is not None:
+            expression &= pc.field(name) == value
+
+    read_columns = None if columns is None else list(dict.fromkeys([*columns, "timestamp", "id"]))
+    tables = []
+    month = month_start(since)
+    while _month_start_at(month) < until:
+        path = archive_path(month)
+        if path.exists():
+            tables.append(pq.read_table(path, columns=read_columns, filters=expression, memory_map=True))
+        month = add_months(month, 1)
+    if not tables:
+        return None
+    table = pa.concat_tables(tables).sort_by([("timestamp", "descending"), ("id", "descending")])
+    return table.select(list(columns)) if columns is not None else table
+
+
+__all__ = [
+    "PARTITIONED_DIALECTS",
+    "ARCHIVE_FORMAT_VERSION",
+    "ArchiveVerificationError",
+    "AuditArchiveSummary",
+    "month_start",
+    "add_months",
+    "partition_name",
+    "archive_path",
+    "ensure_audit_partitions",
+    "archive_audit_logs",
+    "archived_months",
+    "read_archived_audit_logs",
+]
@@ -0,0 +1,357 @@
+"""Importers for the academic structure and user CSV uploads.
+
+Each importer validates one batch of rows from ``worker.csv_import`` against
+the constraints of the tables it writes (required values, column lengths,
+natural keys unique per university), resolves the batch's references through
+the job's ``NaturalKeyResolver`` and writes the valid rows with bulk
+statements. Rows are matched on their natural keys, so importing a file again
+updates or skips the rows it already created instead of duplicating them.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from ..core.security import hash_passwords, unusable_password
+from ..models.academic import Department, Program, Subject
+from ..models.enums import UserStatus
+from ..models.identity import Role, User, UserRole
+from ..worker.csv_import import BatchResult, ImportRow
+from ..worker.key_resolver import DEPARTMENT, PROGRAM, SUBJECT, USER, NaturalKeyResolver
+from . import department_hierarchy_service
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# How a user import sets passwords: none until the user follows a setup link (see
+# ``account_setup_service``, the default), or the school ID as initial password.
+# School IDs are printed on cards and rosters, so that mode is opt-in only.
+PASSWORD_MODE_SCHOOL_ID = "school_id"
+PASSWORD_MODE_UNVERIFIED = "unverified"
+PASSWORD_MODES = (PASSWORD_MODE_SCHOOL_ID, PASSWORD_MODE_UNVERIFIED)
+
+
+class _RowError(ValueError):
+    """A row that cannot be imported; the message goes to the error report."""
+
+
+@lru_cache(maxsize=None)
+def _max_length(target: Any) -> int:
+    return target.type.length
+
+
+def _value(row: ImportRow, column: str, target: Any, *, required: bool = True) -> Optional[str]:
+    """The stripped ``column`` of ``row``, checked against the length of model column ``target``."""
+
+    value = row.values.get(column) or None
+    if value is None:
+        if required:
+            raise _RowError(f"{column} is required.")
+        return None
+    max_length = _max_length(target)
+    if len(value) > max_length:
+        raise _RowError(f"{column} is longer than {max_length} characters.")
+    return value
+
+
+def _upsert(
+    db: Session,
+    model: Type[Any],
+    *,
+    keys: NaturalKeyResolver,
+    kind: str,
+    key: str,
+    records: Sequence[Dict[str, Any]],
+) -> Tuple[int, int, int]:
+    """Insert ``records`` whose ``key`` is new to the university and update the changed ones.
+
+    New rows are registered with ``keys``. Returns ``(created, updated, unchanged)``.
+    """
+
+    if not records:
+        return 0, 0, 0
+    fields = [name for name in records[0] if name != key]
+    known = keys.resolve(db, kind, [record[key] for record in records])
+    current: Dict[int, Tuple[Any, ...]] = {}
+    if known:
+        stmt = select(model.id, *(getattr(model, name) for name in fields)).where(model.id.in_(known.values()))
+        current = {row[0]: tuple(row[1:]) for row in db.execute(stmt)}
+
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    for record in records:
+        row_id = known.get(record[key])
+        if row_id is None:
+            inserts.append({"university_id": keys.university_id, **record})
+        elif current[row_id] != tuple(record[name] for name in fields):
+            updates.append({"id": row_id, **{name: record[name] for name in fields}})
+    if inserts:
+        db.execute(insert(model), inserts)
+        keys.refresh(db, kind, [record[key] for record in inserts])
+    if updates:
+        db.execute(update(model), updates)
+    return len(inserts), len(updates), len(records) - len(inserts) - len(updates)
+
+
+class AcademicStructureImporter:
+    """Departments, programs and subjects, one record per row.
+
+    ``record_type`` is ``department``, ``program`` or ``subject`` and
+    ``department`` names the department itself or the one owning the program or
+    subject. The other columns depend on the type:
+
+    * department: ``parent_department`` and ``short_name`` (both optional);
+    * program: ``program_code`` and ``name``;
+    * subject: ``edp_code``, ``subject_code`` and ``name``.
+
+    Departments are matched by name, programs by code and subjects by EDP code.
+    A department must be listed before the rows that reference it.
+    """
+
+    required_columns = ("record_type", "department")
+
+    def __init__(self, *, university_id: int) -> None:
+        self.university_id = university_id
+        self.keys = NaturalKeyResolver(university_id=university_id, preload=(DEPARTMENT, PROGRAM, SUBJECT))
+
+    def import_batch(self, db: Session, rows: Sequence[ImportRow]) -> BatchResult:
+        errors: Dict[int, str] = {}
+        departments: List[Tuple[ImportRow, Dict[str, Optional[str]]]] = []
+        programs: List[Tuple[ImportRow, Dict[str, Optional[str]]]] = []
+        subjects: List[Tuple[ImportRow, Dict[str, Optional[str]]]] = []
+        targets = {"department": departments, "program": programs, "subject": subjects}
+        seen: Set[Tuple[str, str]] = set()
+        for row in rows:
+            try:
+                record_type = (row.values.get("record_type") or "").lower()
+                if record_type not in targets:
+                    raise _RowError("record_type must be department, program or subject.")
+                department = _value(row, "department", Department.name)
+                if record_type == "department":
+                    key = department
+                    record = {
+                        "name": department,
+                        "parent": _value(row, "parent_department", Department.name, required=False),
+                        "short_name": _value(row, "short_name", Department.short_name, required=False),
+                    }
+                elif record_type == "program":
+                    key = _value(row, "program_code", Program.program_code)
+                    record = {"department": department, "program_code": key, "name": _value(row, "name", Program.name)}
+                else:
+                    key = _value(row, "edp_code", Subject.edp_code)
+                    record = {
+                        "department": department,
+                        "edp_code": key,
+                        "subject_code": _value(row, "subject_code", Subject.subject_code),
+                        "name": _value(row, "name", Subject.name),
+                    }
+                if (record_type, key) in seen:
+                    raise _RowError(f"Duplicate {record_type} '{key}': it is listed earlier in the file.")
+            except _RowError as exc:
+                errors[row.line] = str(exc)
+                continue
+            seen.add((record_type, key))
+            targets[record_type].append((row, record))
+
+        names = {record["name"] for _, record in departments}
+        names |= {record["parent"] for _, record in departments if record["parent"]}
+        names |= {record["department"] for _, record in (*programs, *subjects)}
+        department_ids = self.keys.resolve(db, DEPARTMENT, names)
+
+        created, updated, unchanged = self._write_departments(db, departments, department_ids, errors)
+        upserts = ((Program, PROGRAM, "program_code", programs), (Subject, SUBJECT, "edp_code", subjects))
+        for model, kind, key, items in upserts:
+            records = []
+            for row, record in items:
+                department_id = department_ids.get(record["department"])
+                if department_id is None:
+                    errors[row.line] = f"Department '{record['department']}' does not exist; list it before this row."
+                    continue
+                records.append({key: record[key], "department_id": department_id, **_fields(record, key)})
+            counts = _upsert(db, model, keys=self.keys, kind=kind, key=key, records=records)
+            created, updated, unchanged = created + counts[0], updated + counts[1], unchanged + counts[2]
+        return BatchResult(created=created, updated=updated, unchanged=unchanged, errors=errors)
+
+    def _write_departments(
+        self,
+        db: Session,
+        departments: Sequence[Tuple[ImportRow, Dict[str, Optional[str]]]],
+        department_ids: Dict[str, int],
+        errors: Dict[int, str],
+    ) -> Tuple[int, int, int]:
+        """Create or update departments in file order, through the closure-maintaining service."""
+
+        created = updated = unchanged = 0
+        for row, record in departments:
+            parent_id = None
+            if record["parent"]:
+                parent_id = department_ids.get(record["parent"])
+                if parent_id is None:
+                    parent = record["parent"]
+                    errors[row.line] = f"Parent department '{parent}' does not exist; list it before this row."
+                    continue
+            department_id = department_ids.get(record["name"])
+            if department_id is None:
+                department = department_hierarchy_service.create_department(
+                    db,
+                    university_id=self.university_id,
+                    name=record["name"],
+                    parent_department_id=parent_id,
+                    short_name=record["short_name"],
+                )
+                department_ids[department.name] = department.id
+                self.keys.add(DEPARTMENT, department.name, department.id)
+                created += 1
+                continue
+            department = db.get(Department, department_id)
+            if (department.parent_department_id, department.short_name) == (parent_id, record["short_name"]):
+                unchanged += 1
+                continue
+            try:
+                department_hierarchy_service.move_department(
+                    db,
+                    department_id=department_id,
+                    parent_department_id=parent_id,
+                )
+            except ValueError as exc:
+                errors[row.line] = str(exc)
+                continue
+            department.short_name = record["short_name"]
+            updated += 1
+        return created, updated, unchanged
+
+
+def _fields(record: Dict[str, Optional[str]], key: str) -> Dict[str, Optional[str]]:
+    return {name: value for name, value in record.items() if name not in (key, "department")}
+
+
+class UserImporter:
+    """Users with one role each.
+
+    Columns: ``school_id``, ``first_name``, ``last_name``, ``email``, ``role``
+    (a name from the role catalog) and optionally ``program_code``. Users whose
+    school ID already exists in the university are left unchanged.
+
+    In ``unverified`` password mode (the default) nothing is hashed: users are
+    created ``unverified`` and set their password through a setup link. In the
+    opt-in ``school_id`` mode new users are active and their initial password
+    is their school ID. Hashing dominates such an import (bcrypt is
+    deliberately slow), so each batch's passwords are hashed together on
+    ``hash_executor`` when one is given.
+    """
+
+    required_columns = ("school_id", "first_name", "last_name", "email", "role")
+
+    def __init__(
+        self,
+        *,
+        university_id: int,
+        password_mode: str = PASSWORD_MODE_UNVERIFIED,
+        hash_executor: Optional[Executor] = None,
+    ) -> None:
+        if password_mode not in PASSWORD_MODES:
+            raise ValueError(f"Unknown password mode {password_mode!r}; expected one of {PASSWORD_MODES}.")
+        self.university_id = university_id
+        self.password_mode = password_mode
+        self.hash_executor = hash_executor
+        self.keys = NaturalKeyResolver(university_id=university_id, preload=(PROGRAM,))
+        self._role_ids: Optional[Dict[str, int]] = None
+
+    def _roles(self, db: Session) -> Dict[str, int]:
+        if self._role_ids is None:
+            self._role_ids = {name.lower(): role_id for name, role_id in db.execute(select(Role.name, Role.id))}
+        return self._role_ids
+
+    def import_batch(self, db: Session, rows: Sequence[ImportRow]) -> BatchResult:
+        role_ids = self._roles(db)
+        errors: Dict[int, str] = {}
+        candidates: List[Tuple[ImportRow, Dict[str, Any]]] = []
+        school_ids: Set[str] = set()
+        emails: Set[str] = set()
+        for row in rows:
+            try:
+                record = {
+                    "school_id": _value(row, "school_id", User.school_id),
+                    "first_name": _value(row, "first_name", User.first_name),
+                    "last_name": _value(row, "last_name", User.last_name),
+                    "email": _value(row, "email", User.email).lower(),
+                    "program_code": _value(row, "program_code", Program.program_code, required=False),
+                }
+                if not _EMAIL.match(record["email"]):
+                    raise _RowError(f"'{record['email']}' is not a valid email address.")
+                role = (row.values.get("role") or "").lower()
+                if role not in role_ids:
+                    raise _RowError(f"Unknown role '{row.values.get('role', '')}'.")
+                record["role_id"] = role_ids[role]
+                if record["school_id"] in school_ids:
+                    raise _RowError(f"Duplicate school ID '{record['school_id']}': it is listed earlier in the file.")
+                if record["email"] in emails:
+                    raise _RowError(f"Duplicate email '{record['email']}': it is listed earlier in the file.")
+            except _RowError as exc:
+                errors[row.line] = str(exc)
+                continue
+            school_ids.add(record["school_id"])
+            emails.add(record["email"])
+            candidates.append((row, record))
+        if not candidates:
+            return BatchResult(errors=errors)
+
+        existing = self.keys.resolve(db, USER, school_ids)
+        new = [(row, record) for row, record in candidates if record["school_id"] not in existing]
+        taken = set(db.scalars(select(User.email).where(User.email.in_([record["email"] for _, record in new]))))
+        program_ids = self.keys.resolve(db, PROGRAM, (record["program_code"] for _, record in new))
+
+        users: List[Dict[str, Any]] = []
+        role_by_school_id: Dict[str, int] = {}
+        for row, record in new:
+            if record["email"] in taken:
+                errors[row.line] = f"Email '{record['email']}' is already used by another account."
+                continue
+            program_id = None
+            if record["program_code"]:
+                program_id = program_ids.get(record["program_code"])
+                if program_id is None:
+                    errors[row.line] = f"Program '{record['program_code']}' does not exist."
+                    continue
+            users.append(
+                {
+                    "university_id": self.university_id,
+                    "school_id": record["school_id"],
+                    "first_name": record["first_name"],
+                    "last_name": record["last_name"],
+                    "email": record["email"],
+                    "program_id": program_id,
+                }
+            )
+            role_by_school_id[record["school_id"]] = record["role_id"]
+        if self.password_mode == PASSWORD_MODE_UNVERIFIED:
+            for user in users:
+                user["password_hash"] = unusable_password()
+                user["status"] = UserStatus.UNVERIFIED
+        else:
+            hashes = hash_passwords([user["school_id"] for user in users], executor=self.hash_executor)
+            for user, password_hash in zip(users, hashes):
+                user["password_hash"] = password_hash
+                user["status"] = UserStatus.ACTIVE
+        if users:
+            db.execute(insert(User), users)
+            user_ids = self.keys.refresh(db, USER, role_by_school_id)
+            user_roles = [
+                {"user_id": user_id, "role_id": role_by_school_id[school_id]} for school_id, user_id in user_ids.items()
+            ]
+            db.execute(insert(UserRole), user_roles)
+        return BatchResult(created=len(users), unchanged=len(candidates) - len(new), errors=errors)
+
+
+__all__ = [
+    "PASSWORD_MODE_SCHOOL_ID",
+    "PASSWORD_MODE_UNVERIFIED",
+    "PASSWORD_MODES",
+    "AcademicStructureImporter",
+    "UserImporter",
+]
@@ -0,0 +1,326 @@
+"""Incremental cohort statistics used for z-score normalization.
+
+Each cohort keeps ``(n, mean, m2)`` updated with Welford's algorithm, so a new
+or invalidated submission adjusts the cohort mean and variance in O(1), and
+partial states computed by parallel workers combine with Chan's merge formula.
+
+Quantitative scoring, qualitative analysis and submission status changes keep
+the store current through ``apply_score_changes``; a cohort counts the latest
+raw score of each scorable submission. Each aggregate records the department
+cohort its score was added to, so a retraction reaches that cohort even if the
+evaluatee's home department changed in between. FINAL_AGGREGATION and
+provisional z-scores read a cohort's row instead of rescanning its submissions;
+``rebuild_cohort_statistics`` recomputes a period's rows when they need repair.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.analysis import CohortStatistic
+from ..models.enums import CohortGrouping, CohortMetric
+from ..repositories.cohort_statistic_repository import cohort_statistic_repository
+
+
+@dataclass(frozen=True)
+class RunningStats:
+    """Immutable Welford accumulator; ``m2`` is the sum of squared deviations."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        stats = cls()
+        for value in values:
+            stats = stats.add(value)
+        return stats
+
+    def add(self, value: float) -> "RunningStats":
+        n = self.n + 1
+        delta = value - self.mean
+        mean = self.mean + delta / n
+        return RunningStats(n=n, mean=mean, m2=self.m2 + delta * (value - mean))
+
+    def remove(self, value: float) -> "RunningStats":
+        """Reverse a previous ``add`` of ``value``."""
+
+        if self.n <= 1:
+            return RunningStats()
+        n = self.n - 1
+        mean = (self.n * self.mean - value) / n
+        m2 = self.m2 - (value - self.mean) * (value - mean)
+        return RunningStats(n=n, mean=mean, m2=max(m2, 0.0))
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.n / n
+        m2 = self.m2 + other.m2 + delta * delta * self.n * other.n / n
+        return RunningStats(n=n, mean=mean, m2=m2)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance; zero for cohorts smaller than two."""
+
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def z_score(self, value: float) -> float:
+        """Standardize ``value``; degenerate cohorts (n < 2 or zero spread) yield 0."""
+
+        std_dev = self.std_dev
+        if self.n < 2 or std_dev == 0.0:
+            return 0.0
+        return (value - self.mean) / std_dev
+
+
+@dataclass(frozen=True)
+class CohortKey:
+    """Identifies one normalization cohort."""
+
+    university_id: int
+    evaluation_period_id: int
+    grouping: CohortGrouping
+    group_id: int
+    metric: CohortMetric
+
+
+def _as_stats(row: CohortStatistic) -> RunningStats:
+    return RunningStats(n=row.n, mean=row.mean, m2=row.m2)
+
+
+def _store(row: CohortStatistic, stats: RunningStats) -> None:
+    row.n, row.mean, row.m2 = stats.n, stats.mean, stats.m2
+
+
+def _locked_row(db: Session, key: CohortKey) -> CohortStatistic:
+    return cohort_statistic_repository.get_or_create_for_update(
+        db,
+        university_id=key.university_id,
+        evaluation_period_id=key.evaluation_period_id,
+        grouping=key.grouping,
+        group_id=key.group_id,
+        metric=key.metric,
+    )
+
+
+def get_cohort_stats(db: Session, key: CohortKey) -> RunningStats:
+    """Return the current statistics for a cohort (empty if never recorded)."""
+
+    row = cohort_statistic_repository.get(
+        db,
+        evaluation_period_id=key.evaluation_period_id,
+        grouping=key.grouping,
+        group_id=key.group_id,
+        metric=key.metric,
+    )
+    return _as_stats(row) if row is not None else RunningStats()
+
+
+def add_score(db: Session, key: CohortKey, value: float) -> RunningStats:
+    """Fold one raw score into a cohort. The caller owns the transaction."""
+
+    row = _locked_row(db, key)
+    stats = _as_stats(row).add(value)
+    _store(row, stats)
+    return stats
+
+
+def retract_score(db: Session, key: CohortKey, value: float) -> RunningStats:
+    """Remove a previously added raw score, e.g. for an invalidated submission."""
+
+    row = _locked_row(db, key)
+    stats = _as_stats(row).remove(value)
+    _store(row, stats)
+    return stats
+
+
+def _lock_order(key: CohortKey) -> Tuple[int, str, int, str]:
+    return key.evaluation_period_id, key.grouping, key.group_id, key.metric
+
+
+def merge_partial_states(db: Session, partials: Mapping[CohortKey, RunningStats]) -> None:
+    """Merge per-cohort partial states produced by parallel workers into the store."""
+
+    # Lock rows in a stable order so concurrent mergers cannot deadlock.
+    for key, partial in sorted(partials.items(), key=lambda item: _lock_order(item[0])):
+        if partial.n == 0:
+            continue
+        row = _locked_row(db, key)
+        _store(row, _as_stats(row).merge(partial))
+
+
+def _cohort_keys(groups: Tuple[int, int, int, Optional[int]], metric: CohortMetric) -> List[CohortKey]:
+    university_id, period_id, evaluatee_id, department_id = groups
+    group_ids = {
+        CohortGrouping.UNIVERSITY: university_id,
+        CohortGrouping.DEPARTMENT: department_id,
+        CohortGrouping.EVALUATEE: evaluatee_id,
+    }
+    return [
+        CohortKey(university_id, period_id, grouping, group_id, metric)
+        for grouping, group_id in group_ids.items()
+        if group_id is not None
+    ]
+
+
+def cohort_keys_for_submission(db: Session, *, submission_id: int, metric: CohortMetric) -> List[CohortKey]:
+    """Return every cohort a submission's raw score contributes to."""
+
+    groups = cohort_statistic_repository.get_submission_cohort_groups(db, submission_id=submission_id)
+    return _cohort_keys(groups, metric) if groups is not None else []
+
+
+ScoreChange = Tuple[Optional[float], Optional[float]]
+
+
+def apply_score_changes(db: Session, *, metric: CohortMetric, changes: Mapping[int, ScoreChange]) -> None:
+    """Swap submissions' raw scores in all of their cohorts.
+
+    ``changes`` maps a submission id to ``(old, new)``, where ``None`` means the
+    submission is not counted: ``(None, x)`` records a first score, ``(x, y)``
+    replaces one and ``(x, None)`` retracts it. Old scores leave the department
+    cohort stored on the aggregate; new ones join the current home department,
+    which is then stored. Each affected cohort row is locked once, in a stable
+    order. The caller owns the transaction.
+    """
+
+    changed = {submission_id: change for submission_id, change in changes.items() if change[0] != change[1]}
+    groups = cohort_statistic_repository.get_cohort_groups_for_submissions(db, submission_ids=changed)
+    counted = cohort_statistic_repository.get_counted_departments(
+        db,
+        metric=metric,
+        submission_ids=[submission_id for submission_id, (old, _) in changed.items() if old is not None],
+    )
+    per_cohort: Dict[CohortKey, List[ScoreChange]] = defaultdict(list)
+    stamped: Dict[int, Optional[int]] = {}
+    for submission_id, (old, new) in changed.items():
+        if submission_id not in groups:
+            continue
+        university_id, period_id, evaluatee_id, department_id = groups[submission_id]
+        if old is not None:
+            # Aggregates scored before departments were recorded fall back to the current one.
+            counted_groups = (university_id, period_id, evaluatee_id, counted.get(submission_id) or department_id)
+            for key in _cohort_keys(counted_groups, metric):
+                per_cohort[key].append((old, None))
+        if new is not None:
+            for key in _cohort_keys(groups[submission_id], metric):
+                per_cohort[key].append((None, new))
+            stamped[submission_id] = department_id
+
+    for key in sorted(per_cohort, key=_lock_order):
+        row = _locked_row(db, key)
+        stats = _as_stats(row)
+        for old, new in per_cohort[key]:
+            if old is not None:
+                stats = stats.remove(old)
+            if new is not None:
+                stats = stats.add(new)
+        _store(row, stats)
+    cohort_statistic_repository.set_counted_departments(db, metric=metric, departments=stamped)
+
+
+def record_submission_score(db: Session, *, submission_id: int, metric: CohortMetric, value: float) -> None:
+    """Add a submission's raw score to all of its cohorts."""
+
+    apply_score_changes(db, metric=metric, changes={submission_id: (None, value)})
+
+
+def retract_submission_score(db: Session, *, submission_id: int, metric: CohortMetric, value: float) -> None:
+    """Remove an invalidated submission's raw score from all of its cohorts."""
+
+    apply_score_changes(db, metric=metric, changes={submission_id: (value, None)})
+
+
+@dataclass(frozen=True)
+class CohortRebuildSummary:
+    """Outcome of ``rebuild_cohort_statistics``."""
+
+    cohorts_rebuilt: int
+    scores_counted: int
+
+
+def rebuild_cohort_statistics(
+    db: Session,
+    *,
+    evaluation_period_id: int,
+    commit: bool = True,
+) -> CohortRebuildSummary:
+    """Recompute a period's cohort statistics from the raw scores of its scorable submissions.
+
+    A repair for running statistics that drifted from their submissions: every
+    cohort row of the period is overwritten (and emptied if nothing counts
+    towards it any more), and each counted aggregate's department is restamped
+    from the current home affiliation. Rows are locked in the same order as
+    ``apply_score_changes``. With ``commit=False`` the caller owns the transaction.
+    """
+
+    values: Dict[CohortKey, List[float]] = defaultdict(list)
+    scores_counted = 0
+    for metric in CohortMetric:
+        scores = cohort_statistic_repository.fetch_counted_scores(
+            db,
+            evaluation_period_id=evaluation_period_id,
+            metric=metric,
+        )
+        groups = cohort_statistic_repository.get_cohort_groups_for_submissions(
+            db,
+            submission_ids=[submission_id for submission_id, _ in scores],
+        )
+        for submission_id, raw_score in scores:
+            for key in _cohort_keys(groups[submission_id], metric):
+                values[key].append(raw_score)
+        cohort_statistic_repository.set_counted_departments(
+            db,
+            metric=metric,
+            departments={submission_id: groups[submission_id][3] for submission_id, _ in scores},
+        )
+        scores_counted += len(scores)
+
+    stored = {
+        CohortKey(row.university_id, row.evaluation_period_id, row.grouping, row.group_id, row.metric)
+        for row in cohort_statistic_repository.list_period(db, evaluation_period_id=evaluation_period_id)
+    }
+    for key in sorted(stored | set(values), key=_lock_order):
+        _store(_locked_row(db, key), RunningStats.from_values(values.get(key, ())))
+    if commit:
+        db.commit()
+    return CohortRebuildSummary(cohorts_rebuilt=len(values), scores_counted=scores_counted)
+
+
+def provisional_z_score(db: Session, key: CohortKey, value: float) -> float:
+    """Z-score of ``value`` against the cohort's current running statistics."""
+
+    return get_cohort_stats(db, key).z_score(value)
+
+
+__all__ = [
+    "RunningStats",
+    "CohortKey",
+    "get_cohort_stats",
+    "add_score",
+    "retract_score",
+    "merge_partial_states",
+    "cohort_keys_for_submission",
+    "ScoreChange",
+    "apply_score_changes",
+    "record_submission_score",
+    "retract_submission_score",
+    "CohortRebuildSummary",
+    "rebuild_cohort_statistics",
+    "provisional_z_score",
+]
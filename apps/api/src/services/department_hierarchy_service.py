@@ -0,0 +1,188 @@
+"""Department tree maintenance backed by the ``department_closure`` table.
+
+Every write to ``Department.parent_department_id`` goes through this module so
+the closure rows stay in step with the tree: creating a department adds its
+ancestor links, moving one re-links its whole subtree, and deleting one
+re-roots its children the way the ``ON DELETE SET NULL`` foreign key does.
+Subtree rollups then need a single join on the closure table whatever the
+depth of the tree. Functions here flush but leave the commit to the caller.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.academic import Department
+from ..repositories.department_hierarchy_repository import department_hierarchy_repository
+
+
+@dataclass(frozen=True)
+class SubtreeScoreSummary:
+    """Numerical results of every evaluatee homed in a department's subtree."""
+
+    department_id: int
+    submission_count: int
+    evaluatee_count: int
+    average_quant_score_raw: Optional[float]
+    average_z_quant: Optional[float]
+    average_final_score: Optional[float]
+
+
+def _get_department(db: Session, department_id: int) -> Department:
+    department = db.get(Department, department_id)
+    if department is None:
+        raise ValueError(f"Department {department_id} does not exist.")
+    return department
+
+
+def create_department(
+    db: Session,
+    *,
+    university_id: int,
+    name: str,
+    parent_department_id: Optional[int] = None,
+    **fields: Any,
+) -> Department:
+    """Insert a department and its closure rows."""
+
+    if parent_department_id is not None:
+        parent = _get_department(db, parent_department_id)
+        if parent.university_id != university_id:
+            raise ValueError("A department's parent must belong to the same university.")
+
+    department = Department(
+        university_id=university_id,
+        name=name,
+        parent_department_id=parent_department_id,
+        **fields,
+    )
+    db.add(department)
+    db.flush()
+    department_hierarchy_repository.insert_leaf(
+        db,
+        department_id=department.id,
+        parent_department_id=parent_department_id,
+    )
+    return department
+
+
+def move_department(db: Session, *, department_id: int, parent_department_id: Optional[int]) -> Department:
+    """Reparent a department together with its subtree; ``None`` makes it a root."""
+
+    department = _get_department(db, department_id)
+    if department.parent_department_id == parent_department_id:
+        return department
+    if parent_department_id is not None:
+        parent = _get_department(db, parent_department_id)
+        if parent.university_id != department.university_id:
+            raise ValueError("A department's parent must belong to the same university.")
+        if parent_department_id in department_hierarchy_repository.subtree_ids(db, department_id=department_id):
+            raise ValueError("A department cannot be moved below itself or one of its descendants.")
+
+    department_hierarchy_repository.detach_subtree(db, department_id=department_id)
+    if parent_department_id is not None:
+        department_hierarchy_repository.attach_subtree(
+            db,
+            department_id=department_id,
+            parent_department_id=parent_department_id,
+        )
+    department.parent_department_id = parent_department_id
+    db.flush()
+    return department
+
+
+def delete_department(db: Session, *, department_id: int) -> None:
+    """Delete a department; its children become roots, as the foreign key would leave them."""
+
+    department = _get_department(db, department_id)
+    for child in list(department.child_departments):
+        move_department(db, department_id=child.id, parent_department_id=None)
+    department_hierarchy_repository.delete_department_rows(db, department_id=department_id)
+    db.delete(department)
+    db.flush()
+
+
+def closure_rows(parents: Dict[int, Optional[int]]) -> Iterator[Tuple[int, int, int]]:
+    """Yield ``(ancestor, descendant, depth)`` for a ``{department: parent}`` map.
+
+    A parent outside the map ends the walk; a cycle raises ``ValueError``.
+    """
+
+    for department_id in parents:
+        seen = set()
+        node: Optional[int] = department_id
+        depth = 0
+        while node is not None and node in parents:
+            if node in seen:
+                raise ValueError(f"Department {department_id} is part of a parent cycle.")
+            seen.add(node)
+            yield node, department_id, depth
+            node = parents[node]
+            depth += 1
+
+
+def rebuild_hierarchy(db: Session, *, university_id: int) -> int:
+    """Recompute a university's closure rows from ``parent_department_id``.
+
+    Used to backfill and to repair the table after writes that bypassed this
+    module. Returns the number of rows written.
+    """
+
+    parents = department_hierarchy_repository.fetch_parent_map(db, university_id=university_id)
+    rows = list(closure_rows(parents))
+    department_hierarchy_repository.replace_rows(db, department_ids=list(parents), rows=rows)
+    db.flush()
+    return len(rows)
+
+
+def summarize_subtrees(
+    db: Session,
+    *,
+    evaluation_period_id: int,
+    department_ids: Sequence[int],
+) -> List[SubtreeScoreSummary]:
+    """Roll a period's numerical aggregates up to each requested department, in one query.
+
+    Departments whose subtree has no scored submission get a zero-count summary.
+    """
+
+    rows = {
+        row[0]: row
+        for row in department_hierarchy_repository.aggregate_numerical_by_ancestor(
+            db,
+            evaluation_period_id=evaluation_period_id,
+            ancestor_ids=department_ids,
+        )
+    }
+    summaries: List[SubtreeScoreSummary] = []
+    for department_id in department_ids:
+        row = rows.get(department_id)
+        if row is None:
+            summaries.append(SubtreeScoreSummary(department_id, 0, 0, None, None, None))
+            continue
+        _, submissions, evaluatees, quant_raw, z_quant, final = row
+        summaries.append(
+            SubtreeScoreSummary(
+                department_id=department_id,
+                submission_count=int(submissions),
+                evaluatee_count=int(evaluatees),
+                average_quant_score_raw=round(float(quant_raw), 4),
+                average_z_quant=round(float(z_quant), 4),
+                average_final_score=round(float(final), 4),
+            )
+        )
+    return summaries
+
+
+__all__ = [
+    "SubtreeScoreSummary",
+    "create_department",
+    "move_department",
+    "delete_department",
+    "closure_rows",
+    "rebuild_hierarchy",
+    "summarize_subtrees",
+]
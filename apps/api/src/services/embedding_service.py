@@ -0,0 +1,109 @@
+"""Job-scoped sentence embeddings shared by the qualitative analysis stages.
+
+Keyword scoring needs an embedding of every answer and of every candidate
+n-gram; the embedding sentiment head needs the same answer embeddings. An
+``EmbeddingStage`` encodes each distinct string once, in length-sorted batches,
+and keeps the vectors (up to a bounded LRU) for the rest of the job so both
+consumers read from it instead of running the encoder again.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Optional, Protocol, Sequence
+
+import numpy as np
+
+from ..core.config import settings
+from .qualitative_cache_service import LRUCache
+from .sentiment_inference_service import length_buckets
+
+
+class TextEncoder(Protocol):
+    """Turns texts into L2-normalized embedding rows."""
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``(len(texts), dim)`` float matrix."""
+
+
+class SentenceTransformerEncoder:
+    """sentence-transformers model pinned to the CPU."""
+
+    def __init__(self, model_name: str, *, intra_op_threads: int = 0) -> None:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if intra_op_threads > 0:
+            torch.set_num_threads(intra_op_threads)
+        self._model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        return self._model.encode(
+            list(texts),
+            batch_size=max(len(texts), 1),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+
+class EmbeddingStage:
+    """Encodes each distinct string once and keeps the vectors for the job."""
+
+    def __init__(self, encoder: TextEncoder, *, batch_size: int, max_entries: Optional[int] = None) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+        self.encoder = encoder
+        self.batch_size = batch_size
+        self.texts_encoded = 0
+        self._vectors: LRUCache[str, np.ndarray] = LRUCache(
+            settings.embedding_cache_max_entries if max_entries is None else max_entries
+        )
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeddings for ``texts`` in input order, encoding only unseen strings."""
+
+        vectors: Dict[str, np.ndarray] = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            cached = self._vectors.get(text)
+            if cached is None:
+                missing.append(text)
+            else:
+                vectors[text] = cached
+
+        for batch in length_buckets([len(text) for text in missing], self.batch_size):
+            batch_texts = [missing[i] for i in batch.tolist()]
+            for text, vector in zip(batch_texts, self.encoder.encode(batch_texts)):
+                vectors[text] = np.asarray(vector, dtype=np.float32)
+                self._vectors.put(text, vectors[text])
+            self.texts_encoded += len(batch_texts)
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([vectors[text] for text in texts])
+
+
+@lru_cache
+def get_text_encoder() -> SentenceTransformerEncoder:
+    """Return the process-wide encoder, loading the model on first use."""
+
+    return SentenceTransformerEncoder(settings.keyword_model_name, intra_op_threads=settings.torch_intra_op_threads)
+
+
+def new_embedding_stage() -> EmbeddingStage:
+    """A fresh stage for one job run, backed by the shared encoder."""
+
+    return EmbeddingStage(get_text_encoder(), batch_size=settings.embedding_batch_size)
+
+
+__all__ = [
+    "TextEncoder",
+    "SentenceTransformerEncoder",
+    "EmbeddingStage",
+    "get_text_encoder",
+    "new_embedding_stage",
+]
@@ -0,0 +1,189 @@
+"""FINAL_AGGREGATION: cohort z-scores and the weighted final score.
+
+One run normalizes a whole cohort (a department within an evaluation period):
+it reads the cohort baselines for ``quant_score_raw`` and ``qual_score_raw``
+from the running ``cohort_statistics`` rows that scoring keeps current, rather
+than rescanning every submission of the period, and writes ``z_quant``,
+``z_qual`` and ``final_score_60_40`` using the university's score weights.
+Rows locked as final snapshots are left untouched.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.enums import AnalysisPipelineStatus, CohortGrouping, CohortMetric
+from ..repositories.analysis_pipeline_repository import analysis_pipeline_repository
+from ..repositories.cohort_statistic_repository import cohort_statistic_repository
+from ..repositories.numerical_aggregate_repository import numerical_aggregate_repository
+from ..repositories.university_setting_repository import university_setting_repository
+from .cohort_statistics_service import CohortKey, RunningStats, get_cohort_stats
+from .qualitative_analysis_service import refresh_sentiment_aggregates
+
+QUANT_WEIGHT_SETTING = "score_weight_quantitative"
+QUAL_WEIGHT_SETTING = "score_weight_qualitative"
+DEFAULT_QUANT_WEIGHT = 0.6
+
+AGGREGATABLE_STATUSES = (
+    AnalysisPipelineStatus.QUANT_QUAL_COMPLETE,
+    AnalysisPipelineStatus.AGGREGATION_COMPLETE,
+)
+
+
+@dataclass(frozen=True)
+class FinalAggregationSummary:
+    """Outcome of one cohort aggregation run."""
+
+    submissions_aggregated: int
+    submissions_skipped: int
+
+
+def score_weights(db: Session, *, university_id: int) -> Tuple[float, float]:
+    """``(quantitative, qualitative)`` weights; the qualitative one defaults to the complement."""
+
+    quant = university_setting_repository.get_float(
+        db,
+        university_id=university_id,
+        setting_name=QUANT_WEIGHT_SETTING,
+        default=DEFAULT_QUANT_WEIGHT,
+    )
+    qual = university_setting_repository.get_float(
+        db,
+        university_id=university_id,
+        setting_name=QUAL_WEIGHT_SETTING,
+        default=1.0 - quant,
+    )
+    return quant, qual
+
+
+def cohort_submission_ids(
+    db: Session,
+    *,
+    evaluation_period_id: int,
+    department_id: Optional[int],
+) -> List[int]:
+    """Submissions of the period ready for aggregation whose cohort department is ``department_id``."""
+
+    ids = analysis_pipeline_repository.fetch_submission_ids_by_status(
+        db,
+        evaluation_period_id=evaluation_period_id,
+        analysis_statuses=AGGREGATABLE_STATUSES,
+    )
+    groups = cohort_statistic_repository.get_cohort_groups_for_submissions(db, submission_ids=ids)
+    return [submission_id for submission_id in ids if groups[submission_id][3] == department_id]
+
+
+def cohort_stats(
+    db: Session,
+    *,
+    university_id: int,
+    evaluation_period_id: int,
+    department_id: Optional[int],
+    metric: CohortMetric,
+    members: Iterable[float],
+) -> RunningStats:
+    """The department cohort's running statistics for ``metric``.
+
+    Submissions without a department have no stored cohort, so theirs is
+    built from ``members``, the raw scores of the run.
+    """
+
+    if department_id is None:
+        return RunningStats.from_values(members)
+    key = CohortKey(university_id, evaluation_period_id, CohortGrouping.DEPARTMENT, department_id, metric)
+    return get_cohort_stats(db, key)
+
+
+def aggregate_cohort(
+    db: Session,
+    *,
+    university_id: int,
+    evaluation_period_id: int,
+    department_id: Optional[int],
+) -> FinalAggregationSummary:
+    """Normalize every ready submission of one cohort and commit the results.
+
+    Submissions without open-ended answers get ``z_qual = 0``, i.e. the cohort
+    mean, so their final score is driven by the quantitative part alone.
+    """
+
+    members = cohort_submission_ids(db, evaluation_period_id=evaluation_period_id, department_id=department_id)
+    if not members:
+        return FinalAggregationSummary(submissions_aggregated=0, submissions_skipped=0)
+
+    numerical = analysis_pipeline_repository.fetch_numerical_inputs(db, submission_ids=members)
+    # Normally a no-op: qualitative analysis already wrote these aggregates.
+    refresh_sentiment_aggregates(db, submission_ids=members)
+    sentiment_states = analysis_pipeline_repository.get_sentiment_aggregate_states(db, submission_ids=members)
+
+    cohort = {
+        "university_id": university_id,
+        "evaluation_period_id": evaluation_period_id,
+        "department_id": department_id,
+    }
+    quant_stats = cohort_stats(
+        db,
+        **cohort,
+        metric=CohortMetric.QUANTITATIVE,
+        members=(float(row[2]) for row in numerical),
+    )
+    qual_stats = cohort_stats(
+        db,
+        **cohort,
+        metric=CohortMetric.QUALITATIVE,
+        members=(state[2] for state in sentiment_states.values()),
+    )
+    quant_weight, qual_weight = score_weights(db, university_id=university_id)
+
+    numerical_updates: List[Dict[str, Any]] = []
+    sentiment_updates: List[Dict[str, Any]] = []
+    aggregated: List[int] = []
+    skipped = 0
+    for submission_id, aggregate_id, raw_score, is_final in numerical:
+        sentiment_state = sentiment_states.get(submission_id)
+        if is_final or (sentiment_state is not None and sentiment_state[1]):
+            skipped += 1
+            continue
+
+        z_quant = quant_stats.z_score(float(raw_score))
+        z_qual = qual_stats.z_score(sentiment_state[2]) if sentiment_state is not None else 0.0
+        numerical_updates.append(
+            {
+                "id": aggregate_id,
+                "z_quant": round(z_quant, 4),
+                "final_score_60_40": round(quant_weight * z_quant + qual_weight * z_qual, 4),
+                "cohort_n": quant_stats.n,
+                "cohort_mean": round(quant_stats.mean, 4),
+                "cohort_std_dev": round(quant_stats.std_dev, 4),
+            }
+        )
+        if sentiment_state is not None:
+            sentiment_updates.append({"id": sentiment_state[0], "z_qual": round(z_qual, 4)})
+        aggregated.append(submission_id)
+
+    numerical_aggregate_repository.bulk_update(db, rows=numerical_updates)
+    analysis_pipeline_repository.bulk_update_sentiment_aggregates(db, rows=sentiment_updates)
+    analysis_pipeline_repository.set_analysis_status(
+        db,
+        submission_ids=aggregated,
+        status=AnalysisPipelineStatus.AGGREGATION_COMPLETE,
+    )
+    db.commit()
+
+    return FinalAggregationSummary(submissions_aggregated=len(aggregated), submissions_skipped=skipped)
+
+
+__all__ = [
+    "QUANT_WEIGHT_SETTING",
+    "QUAL_WEIGHT_SETTING",
+    "DEFAULT_QUANT_WEIGHT",
+    "AGGREGATABLE_STATUSES",
+    "FinalAggregationSummary",
+    "score_weights",
+    "cohort_submission_ids",
+    "cohort_stats",
+    "aggregate_cohort",
+]
@@ -0,0 +1,293 @@
+"""Staged, resumable import of historical evaluation records.
+
+A ``HISTORICAL_EVALUATION_IMPORT`` file holds one answer per row::
+
+    school_year,semester,assessment_period,evaluator_school_id,evaluatee_school_id,edp_code,question,answer
+    2023-2024,1st Semester,Finals,2021-0001,F-0042,E-101,3,4
+
+``question`` is the question's ``order`` on the period's student form, or on
+its department head form when the optional ``form`` column says
+``department_head``; an optional ``submitted_at`` (ISO 8601) defaults to the
+end of the period. Files of past terms can hold millions of answers, so
+instead of validating and writing row by row the job runs in three steps:
+
+1. load: the file is streamed into ``historical_evaluation_staging`` in
+   batches of ``IMPORT_BATCH_SIZE`` rows, checking only each row's format;
+2. validate: set-based ``UPDATE`` statements resolve the keys to ids and
+   reject what cannot be imported, a submission with any rejected answer as a
+   whole; the rejected rows go to the task's CSV error report;
+3. merge: ``INSERT ... SELECT`` statements copy about
+   ``HISTORICAL_IMPORT_CHUNK_SIZE`` answers (whole submissions) at a time into
+   the submission and answer tables and unstage them.
+
+Each batch and chunk commits together with a checkpoint in the task's
+``job_parameters["checkpoint"]``, so running a job again after it crashed or
+was cancelled resumes from the last committed step instead of starting over.
+Imported submissions are ``pending`` analysis, like live ones.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.enums import AssessmentPeriodName
+from ..models.operations import BackgroundTask, HistoricalEvaluationStagingRow
+from ..repositories.historical_import_staging_repository import (
+    REPORT_COLUMNS,
+    historical_import_staging_repository,
+)
+from ..worker.csv_import import ImportRow, SourceOpener, batches, error_report_path, open_csv
+from ..worker.job_tracking import cancellation_requested
+from ..worker.key_resolver import SCHOOL_TERM, NaturalKeyResolver, school_term_key
+
+logger = logging.getLogger("proficiency.import")
+
+REQUIRED_COLUMNS = (
+    "school_year",
+    "semester",
+    "assessment_period",
+    "evaluator_school_id",
+    "evaluatee_school_id",
+    "edp_code",
+    "question",
+    "answer",
+)
+
+LOAD = "load"
+MERGE = "merge"
+DONE = "done"
+
+_FORMS = {"": False, "student": False, "department_head": True}
+_ASSESSMENT_PERIODS = {name.value.lower(): name.value for name in AssessmentPeriodName}
+_STAGED = HistoricalEvaluationStagingRow.__table__.c
+
+
+@dataclass(frozen=True)
+class HistoricalImportSummary:
+    """Outcome of one run of the job; ``resumed_from`` is the step it picked up, if any."""
+
+    rows_total: int
+    rows_failed: int
+    submissions_created: int
+    answers_merged: int
+    seconds: float
+    cancelled: bool
+    resumed_from: Optional[str]
+    error_report: Optional[Path]
+
+
+def _checkpoint(task: BackgroundTask) -> Dict[str, Any]:
+    return dict((task.job_parameters or {}).get("checkpoint") or {"phase": LOAD, "line": 0})
+
+
+def _save_checkpoint(task: BackgroundTask, **checkpoint: Any) -> None:
+    # A new dict, so the JSON column is seen as changed.
+    task.job_parameters = {**(task.job_parameters or {}), "checkpoint": checkpoint}
+
+
+def _stage(db: Session, keys: NaturalKeyResolver, task_id: int, row: ImportRow) -> Dict[str, Any]:
+    """The staging record of one row; format errors are recorded on it rather than raised."""
+
+    errors = []
+    record: Dict[str, Any] = {"task_id": task_id, "line": row.line}
+    for column in REPORT_COLUMNS:
+        value = row.values.get(column, "")
+        length = getattr(_STAGED[column].type, "length", None)
+        if column in REQUIRED_COLUMNS and not value:
+            errors.append(f"{column} is required.")
+        elif length is not None and len(value) > length:
+            errors.append(f"{column} is longer than {length} characters.")
+            value = value[:length]
+        record[column] = value
+    record["submitted_at"] = record["submitted_at"] or None
+
+    try:
+        record["school_term_id"] = keys.get(db, SCHOOL_TERM, school_term_key(record["school_year"], record["semester"]))
+        if record["school_term_id"] is None:
+            errors.append(f"School term {record['semester']} {record['school_year']} does not exist.")
+    except ValueError as exc:
+        errors.append(str(exc))
+    assessment_period = _ASSESSMENT_PERIODS.get(record["assessment_period"].lower())
+    if assessment_period is None:
+        errors.append(f"assessment_period must be one of: {', '.join(_ASSESSMENT_PERIODS.values())}.")
+    else:
+        record["assessment_period"] = assessment_period
+    record["is_department_head"] = _FORMS.get(record["form"].lower())
+    if record["is_department_head"] is None:
+        errors.append("form must be student or department_head.")
+    record["question_order"] = int(record["question"]) if record["question"].isdigit() else None
+    if record["question_order"] is None:
+        errors.append("question must be the question's number on the form.")
+    answer = record["answer"]
+    record["answer_value"] = int(answer) if answer.lstrip("-").isdigit() and len(answer) < 10 else None
+    try:
+        record["submitted_on"] = datetime.fromisoformat(record["submitted_at"]) if record["submitted_at"] else None
+    except ValueError:
+        record["submitted_on"] = None
+        errors.append("submitted_at must be an ISO 8601 date and time.")
+    record["error"] = errors[0][:255] if errors else None
+    return record
+
+
+def _load(
+    db: Session,
+    task: BackgroundTask,
+    path: Path,
+    *,
+    after_line: int,
+    batch_size: int,
+    open_source: SourceOpener,
+) -> bool:
+    """Stage the rows after ``after_line``; ``False`` if the job was cancelled first."""
+
+    keys = NaturalKeyResolver(university_id=task.university_id, preload=())
+    with open_source(path, REQUIRED_COLUMNS) as source:
+        rows = (row for row in source.rows if row.line > after_line)
+        for batch in batches(rows, batch_size):
+            if cancellation_requested(db, task):
+                db.commit()
+                return False
+            records = [_stage(db, keys, task.id, row) for row in batch]
+            historical_import_staging_repository.insert_rows(db, rows=records)
+            _save_checkpoint(task, phase=LOAD, line=batch[-1].line)
+            task.progress = min(40, source.progress() * 40 // 100)
+            db.commit()
+    return True
+
+
+def _write_error_report(db: Session, task: BackgroundTask) -> Optional[Path]:
+    path = error_report_path(task.id)
+    rows = historical_import_staging_repository.iter_rejected(db, task_id=task.id)
+    first = next(rows, None)
+    if first is None:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as report:
+        writer = csv.writer(report)
+        writer.writerow(["line", *REPORT_COLUMNS, "error"])
+        writer.writerow(first)
+        writer.writerows(rows)
+    return path
+
+
+def import_historical_evaluations(
+    db: Session,
+    task: BackgroundTask,
+    path: Path,
+    *,
+    batch_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    open_source: SourceOpener = open_csv,
+) -> HistoricalImportSummary:
+    """Run, or resume, the staged import of ``path`` (read with ``open_source``) for ``task``.
+
+    Commits as it goes and leaves the result message to the caller. Raises
+    ``ImportFileError`` before staging anything when the header is unusable.
+    """
+
+    started = time.perf_counter()
+    checkpoint = _checkpoint(task)
+    resumed_from = None if checkpoint == {"phase": LOAD, "line": 0} else checkpoint["phase"]
+    created = merged = 0
+    cancelled = False
+
+    if checkpoint["phase"] == LOAD:
+        batch_size = batch_size or settings.import_batch_size
+        loaded = _load(
+            db,
+            task,
+            path,
+            after_line=checkpoint["line"],
+            batch_size=batch_size,
+            open_source=open_source,
+        )
+        if not loaded:
+            cancelled = True
+        else:
+            historical_import_staging_repository.validate(db, task_id=task.id, university_id=task.university_id)
+            task.rows_total, task.rows_failed = historical_import_staging_repository.counts(db, task_id=task.id)
+            task.rows_processed = 0
+            report = _write_error_report(db, task)
+            task.result_storage_path = str(report) if report else None
+            checkpoint = {"phase": MERGE, "group_id": 0}
+            _save_checkpoint(task, **checkpoint)
+            task.progress = 50
+            db.commit()
+
+    if checkpoint["phase"] == MERGE and not cancelled:
+        chunk_size = chunk_size or settings.historical_import_chunk_size
+        group_id = checkpoint["group_id"]
+        valid = max(1, (task.rows_total or 0) - (task.rows_failed or 0))
+        while True:
+            if cancellation_requested(db, task):
+                db.commit()
+                cancelled = True
+                break
+            last = historical_import_staging_repository.chunk_end(
+                db,
+                task_id=task.id,
+                after_group_id=group_id,
+                rows=chunk_size,
+            )
+            if last is None:
+                break
+            submissions, answers = historical_import_staging_repository.merge_chunk(
+                db,
+                task_id=task.id,
+                university_id=task.university_id,
+                after_group_id=group_id,
+                last_group_id=last,
+            )
+            created += submissions
+            merged += answers
+            group_id = last
+            task.rows_processed = (task.rows_processed or 0) + answers
+            _save_checkpoint(task, phase=MERGE, group_id=group_id)
+            task.progress = 50 + min(49, task.rows_processed * 50 // valid)
+            db.commit()
+        if not cancelled:
+            # Only rejected rows are left; the error report already lists them.
+            historical_import_staging_repository.delete_task_rows(db, task_id=task.id)
+            _save_checkpoint(task, phase=DONE)
+            db.commit()
+
+    seconds = time.perf_counter() - started
+    summary = HistoricalImportSummary(
+        rows_total=task.rows_total or 0,
+        rows_failed=task.rows_failed or 0,
+        submissions_created=created,
+        answers_merged=merged,
+        seconds=seconds,
+        cancelled=cancelled,
+        resumed_from=resumed_from,
+        error_report=Path(task.result_storage_path) if task.result_storage_path else None,
+    )
+    logger.info(
+        "Historical import task %s: %s submissions, %s answers merged in %.1fs%s%s",
+        task.id,
+        created,
+        merged,
+        seconds,
+        f", resumed from {resumed_from}" if resumed_from else "",
+        ", cancelled" if cancelled else "",
+    )
+    return summary
+
+
+__all__ = [
+    "REQUIRED_COLUMNS",
+    "LOAD",
+    "MERGE",
+    "DONE",
+    "HistoricalImportSummary",
+    "import_historical_evaluations",
+]
@@ -0,0 +1,98 @@
+"""KeyBERT-style keyword extraction for open-ended answers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+
+if TYPE_CHECKING:
+    from .embedding_service import EmbeddingStage
+
+Keyword = Tuple[str, float]
+
+# Matches OpenEndedKeyword.keyword (String(255)).
+_MAX_KEYWORD_LENGTH = 255
+
+
+class KeywordExtractor(Protocol):
+    """Returns ``(keyword, relevance_score)`` pairs for each input text."""
+
+    def extract(self, texts: Sequence[str]) -> List[List[Keyword]]:
+        """Extract keywords for every text, preserving input order."""
+
+
+class EmbeddingKeywordExtractor:
+    """KeyBERT-style keyword scoring on embeddings from a shared ``EmbeddingStage``.
+
+    Candidates are the stop-word-filtered 1-2 grams KeyBERT would generate, and
+    ``relevance_score`` is their cosine similarity to the answer embedding, so
+    results match KeyBERT's default ranking without a second encoder pass.
+    """
+
+    def __init__(
+        self,
+        stage: "EmbeddingStage",
+        *,
+        top_n: int,
+        threshold: float,
+        analyzer: Optional[Callable[[str], List[str]]] = None,
+    ) -> None:
+        if analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+
+            analyzer = CountVectorizer(ngram_range=(1, 2), stop_words="english").build_analyzer()
+        self.stage = stage
+        self.top_n = top_n
+        self.threshold = threshold
+        self._analyzer = analyzer
+
+    def extract(self, texts: Sequence[str]) -> List[List[Keyword]]:
+        if not texts:
+            return []
+        candidates = [list(dict.fromkeys(self._analyzer(text))) for text in texts]
+        documents = self.stage.embed(texts)
+        self.stage.embed(sorted({candidate for text_candidates in candidates for candidate in text_candidates}))
+
+        results: List[List[Keyword]] = []
+        for document, text_candidates in zip(documents, candidates):
+            if not text_candidates:
+                results.append([])
+                continue
+            scores = self.stage.embed(text_candidates) @ document
+            best = np.argsort(-scores, kind="stable")[: self.top_n]
+            keywords = [(text_candidates[i], round(float(scores[i]), 4)) for i in best.tolist()]
+            results.append(filter_keywords(keywords, self.threshold))
+        return results
+
+
+def filter_keywords(keywords: Sequence[Keyword], threshold: float) -> List[Keyword]:
+    """Drop low-relevance and duplicate keywords, keeping the best score of each."""
+
+    best: dict[str, float] = {}
+    for keyword, score in keywords:
+        keyword = keyword.strip()[:_MAX_KEYWORD_LENGTH]
+        if keyword and score >= threshold and score > best.get(keyword, float("-inf")):
+            best[keyword] = float(score)
+    return sorted(best.items(), key=lambda item: item[1], reverse=True)
+
+
+def build_keyword_extractor(stage: "EmbeddingStage") -> EmbeddingKeywordExtractor:
+    """Keyword extractor for one job, reading embeddings from ``stage``."""
+
+    return EmbeddingKeywordExtractor(
+        stage,
+        top_n=settings.keyword_top_n,
+        threshold=settings.keyword_relevance_threshold,
+    )
+
+
+__all__ = [
+    "Keyword",
+    "KeywordExtractor",
+    "EmbeddingKeywordExtractor",
+    "filter_keywords",
+    "build_keyword_extractor",
+]
@@ -0,0 +1,287 @@
+"""Columnar snapshots of finalized evaluation period results.
+
+Once every aggregate of a period is locked with ``is_final_snapshot`` its
+results never change, so they are exported once to two zstd-compressed Parquet
+files under ``STORAGE_ROOT``: one row per submission and one row per evaluatee.
+Dashboards, cross-term comparisons and CSV reports read those files through a
+memory map (projecting only the columns they need) instead of querying the
+live database. ``pyarrow`` is imported lazily so the API does not need it.
+
+The hourly ``run_pending_period_snapshots`` job exports every period that has
+become final and has no snapshot yet; ``run_period_snapshot`` rewrites one
+period on demand.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..core.clock import utcnow
+from ..core.config import settings
+from ..repositories.cohort_statistic_repository import cohort_statistic_repository
+from ..repositories.period_snapshot_repository import period_snapshot_repository
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow as pa
+
+SNAPSHOT_FORMAT_VERSION = 1
+SUBMISSIONS_TABLE = "submissions"
+EVALUATEES_TABLE = "evaluatees"
+SNAPSHOT_TABLES = (SUBMISSIONS_TABLE, EVALUATEES_TABLE)
+COMPRESSION = "zstd"
+_GROUP_CHUNK_SIZE = 1000
+# Repository columns after the submission identity, in ``fetch_submission_results`` order.
+_SCORE_COLUMNS = (
+    "quant_score_raw",
+    "z_quant",
+    "final_score_60_40",
+    "cohort_n",
+    "cohort_mean",
+    "cohort_std_dev",
+    "average_positive_score",
+    "average_neutral_score",
+    "average_negative_score",
+    "qual_score_raw",
+    "z_qual",
+)
+
+
+class PeriodNotFinalizedError(ValueError):
+    """Raised when a snapshot is requested for a period whose results can still change."""
+
+
+@dataclass(frozen=True)
+class PeriodSnapshotSummary:
+    """Files written for one period."""
+
+    evaluation_period_id: int
+    submissions_written: int
+    evaluatees_written: int
+    paths: Dict[str, Path]
+
+
+def snapshot_directory(*, university_id: int, evaluation_period_id: int) -> Path:
+    """Directory holding the snapshot files of one period."""
+
+    return Path(settings.storage_root) / "period_snapshots" / str(university_id) / str(evaluation_period_id)
+
+
+def snapshot_path(*, university_id: int, evaluation_period_id: int, table: str) -> Path:
+    """Path of one snapshot table (``submissions`` or ``evaluatees``)."""
+
+    if table not in SNAPSHOT_TABLES:
+        raise ValueError(f"Unknown snapshot table {table!r}.")
+    directory = snapshot_directory(university_id=university_id, evaluation_period_id=evaluation_period_id)
+    return directory / f"{table}.parquet"
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _submission_schema(pa: Any) -> "pa.Schema":
+    score = pa.float64()
+    return pa.schema(
+        [
+            ("submission_id", pa.int64()),
+            ("evaluation_period_id", pa.int64()),
+            ("evaluatee_id", pa.int64()),
+            ("department_id", pa.int64()),
+            ("subject_offering_id", pa.int64()),
+            ("submitted_at", pa.timestamp("us")),
+            ("per_criterion_average_scores", pa.map_(pa.int64(), score)),
+            ("quant_score_raw", score),
+            ("z_quant", score),
+            ("final_score_60_40", score),
+            ("cohort_n", pa.int32()),
+            ("cohort_mean", score),
+            ("cohort_std_dev", score),
+            ("average_positive_score", score),
+            ("average_neutral_score", score),
+            ("average_negative_score", score),
+            ("qual_score_raw", score),
+            ("z_qual", score),
+        ]
+    )
+
+
+def _departments(db: Session, submission_ids: Sequence[int]) -> Dict[int, Optional[int]]:
+    departments: Dict[int, Optional[int]] = {}
+    for start in range(0, len(submission_ids), _GROUP_CHUNK_SIZE):
+        groups = cohort_statistic_repository.get_cohort_groups_for_submissions(
+            db,
+            submission_ids=submission_ids[start : start + _GROUP_CHUNK_SIZE],
+        )
+        departments.update((submission_id, group[3]) for submission_id, group in groups.items())
+    return departments
+
+
+def build_submission_table(db: Session, *, evaluation_period_id: int) -> "pa.Table":
+    """Per-submission results of a period as an Arrow table, ordered by evaluatee."""
+
+    import pyarrow as pa
+
+    rows = period_snapshot_repository.fetch_submission_results(db, evaluation_period_id=evaluation_period_id)
+    departments = _departments(db, [row[0] for row in rows])
+    columns: Dict[str, List[Any]] = {name: [] for name in _submission_schema(pa).names}
+    for submission_id, _, evaluatee_id, subject_offering_id, submitted_at, criterion_scores, *scores in rows:
+        columns["submission_id"].append(submission_id)
+        columns["evaluation_period_id"].append(evaluation_period_id)
+        columns["evaluatee_id"].append(evaluatee_id)
+        columns["department_id"].append(departments.get(submission_id))
+        columns["subject_offering_id"].append(subject_offering_id)
+        columns["submitted_at"].append(submitted_at)
+        columns["per_criterion_average_scores"].append(
+            [(int(criterion_id), float(value)) for criterion_id, value in (criterion_scores or {}).items()]
+        )
+        for name, value in zip(_SCORE_COLUMNS, scores):
+            columns[name].append(value if name == "cohort_n" else _optional_float(value))
+    return pa.Table.from_pydict(columns, schema=_submission_schema(pa))
+
+
+_EVALUATEE_AGGREGATES = (
+    ("submission_id", "count", "submission_count"),
+    ("department_id", "min", "department_id"),
+    ("quant_score_raw", "mean", "average_quant_score_raw"),
+    ("z_quant", "mean", "average_z_quant"),
+    ("qual_score_raw", "count", "qualitative_submission_count"),
+    ("qual_score_raw", "mean", "average_qual_score_raw"),
+    ("z_qual", "mean", "average_z_qual"),
+    ("final_score_60_40", "mean", "average_final_score"),
+    ("final_score_60_40", "min", "min_final_score"),
+    ("final_score_60_40", "max", "max_final_score"),
+)
+
+
+def build_evaluatee_table(submissions: "pa.Table") -> "pa.Table":
+    """Roll the per-submission table up to one row per evaluatee.
+
+    Averages skip nulls, so ``average_qual_score_raw`` covers only submissions
+    that had open-ended answers.
+    """
+
+    keys = ["evaluation_period_id", "evaluatee_id"]
+    grouped = submissions.group_by(keys).aggregate(
+        [(column, function) for column, function, _ in _EVALUATEE_AGGREGATES]
+    )
+    table = grouped.select(keys + [f"{column}_{function}" for column, function, _ in _EVALUATEE_AGGREGATES])
+    table = table.rename_columns(keys + [name for _, _, name in _EVALUATEE_AGGREGATES])
+    return table.sort_by("evaluatee_id")
+
+
+def _write_parquet(table: "pa.Table", path: Path, metadata: Dict[str, str]) -> None:
+    import pyarrow.parquet as pq
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), **{key.encode(): value.encode() for key, value in metadata.items()}}
+    )
+    partial = path.with_suffix(".parquet.partial")
+    pq.write_table(table, partial, compression=COMPRESSION)
+    # Readers only ever see a complete file.
+    os.replace(partial, path)
+
+
+def write_period_snapshot(
+    db: Session,
+    *,
+    university_id: int,
+    evaluation_period_id: int,
+    now: Optional[datetime] = None,
+) -> PeriodSnapshotSummary:
+    """Export a finalized period's results, replacing any earlier snapshot.
+
+    Raises ``PeriodNotFinalizedError`` when the period has no aggregates or any
+    of them is not yet a final snapshot.
+    """
+
+    total, not_final = period_snapshot_repository.count_unfinalized(db, evaluation_period_id=evaluation_period_id)
+    if total == 0 or not_final:
+        raise PeriodNotFinalizedError(
+            f"Evaluation period {evaluation_period_id} has {not_final} of {total} aggregates not finalized."
+        )
+
+    submissions = build_submission_table(db, evaluation_period_id=evaluation_period_id)
+    evaluatees = build_evaluatee_table(submissions)
+    metadata = {
+        "snapshot_format_version": str(SNAPSHOT_FORMAT_VERSION),
+        "university_id": str(university_id),
+        "evaluation_period_id": str(evaluation_period_id),
+        "generated_at": (now or utcnow()).isoformat(),
+    }
+    paths: Dict[str, Path] = {}
+    for name, table in ((SUBMISSIONS_TABLE, submissions), (EVALUATEES_TABLE, evaluatees)):
+        paths[name] = snapshot_path(university_id=university_id, evaluation_period_id=evaluation_period_id, table=name)
+        _write_parquet(table, paths[name], metadata)
+
+    return PeriodSnapshotSummary(
+        evaluation_period_id=evaluation_period_id,
+        submissions_written=submissions.num_rows,
+        evaluatees_written=evaluatees.num_rows,
+        paths=paths,
+    )
+
+
+def write_pending_snapshots(db: Session, *, now: Optional[datetime] = None) -> List[PeriodSnapshotSummary]:
+    """Export every finalized period that has no snapshot yet.
+
+    The evaluatees file is written last, so a period whose evaluatees file
+    exists has a complete snapshot.
+    """
+
+    written: List[PeriodSnapshotSummary] = []
+    for university_id, evaluation_period_id in period_snapshot_repository.list_finalized_periods(db):
+        ids = {"university_id": university_id, "evaluation_period_id": evaluation_period_id}
+        if not snapshot_path(**ids, table=EVALUATEES_TABLE).exists():
+            written.append(write_period_snapshot(db, **ids, now=now))
+    return written
+
+
+def read_period_snapshot(
+    *,
+    university_id: int,
+    evaluation_period_id: int,
+    table: str = EVALUATEES_TABLE,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Any] = None,
+) -> Optional["pa.Table"]:
+    """Memory-map a snapshot table, or return ``None`` when the period has none.
+
+    ``columns`` and ``filters`` (pyarrow filter expressions or DNF tuples) are
+    pushed down, so only the needed column chunks and row groups are read.
+    """
+
+    import pyarrow.parquet as pq
+
+    path = snapshot_path(university_id=university_id, evaluation_period_id=evaluation_period_id, table=table)
+    if not path.exists():
+        return None
+    return pq.read_table(
+        path,
+        columns=list(columns) if columns is not None else None,
+        filters=filters,
+        memory_map=True,
+    )
+
+
+__all__ = [
+    "SNAPSHOT_FORMAT_VERSION",
+    "SUBMISSIONS_TABLE",
+    "EVALUATEES_TABLE",
+    "SNAPSHOT_TABLES",
+    "PeriodNotFinalizedError",
+    "PeriodSnapshotSummary",
+    "snapshot_directory",
+    "snapshot_path",
+    "build_submission_table",
+    "build_evaluatee_table",
+    "write_period_snapshot",
+    "write_pending_snapshots",
+    "read_period_snapshot",
+]
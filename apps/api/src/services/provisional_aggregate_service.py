@@ -0,0 +1,121 @@
+"""Micro-batch refresh of ``provisional_aggregates`` for live dashboards.
+
+Each run reads only submissions past a persisted ``(submitted_at, id)``
+high-water mark, recomputes the totals of the ``(period, evaluatee)`` groups
+they touch from source rows, upserts those groups and advances the mark in the
+same transaction. Recomputing whole groups (rather than adding deltas) makes a
+rerun harmless, and the work per run is bounded by the new submissions and
+the groups they belong to.
+
+The mark only sees new submissions. Writes that change a submission already
+behind it push their groups through ``refresh_submission_groups`` in their own
+transaction: scoring (a ``NumericalAggregate`` written or rescored) and
+``change_submission_status`` (invalidation on flag resolution or
+resubmission, cancellation, restoration).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..core.clock import utcnow
+from ..core.config import settings
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES
+from ..repositories.batch_watermark_repository import batch_watermark_repository
+from ..repositories.provisional_aggregate_repository import GroupKey, provisional_aggregate_repository
+
+WATERMARK_JOB_NAME = "provisional_aggregates"
+
+
+@dataclass(frozen=True)
+class ProvisionalRefreshSummary:
+    """Outcome of one micro-batch run."""
+
+    submissions_read: int
+    groups_refreshed: int
+
+
+def refresh_groups(db: Session, groups: Iterable[GroupKey]) -> int:
+    """Recompute and upsert the given ``(period_id, evaluatee_id)`` groups.
+
+    Groups left without any counted submission are removed. The caller owns
+    the transaction.
+    """
+
+    keys = sorted(set(groups))
+    totals = provisional_aggregate_repository.compute_group_totals(
+        db,
+        groups=keys,
+        statuses=SCORABLE_SUBMISSION_STATUSES,
+    )
+    provisional_aggregate_repository.upsert_many(
+        db,
+        rows=[
+            {"evaluation_period_id": period_id, "evaluatee_id": evaluatee_id, **values}
+            for (period_id, evaluatee_id), values in totals.items()
+        ],
+    )
+    provisional_aggregate_repository.delete_groups(db, groups=[key for key in keys if key not in totals])
+    return len(keys)
+
+
+def refresh_submission_groups(db: Session, *, submission_ids: Sequence[int]) -> int:
+    """Recompute the groups of submissions that changed after the mark passed them.
+
+    The caller owns the transaction.
+    """
+
+    groups = provisional_aggregate_repository.fetch_submission_groups(db, submission_ids=submission_ids)
+    return refresh_groups(db, groups)
+
+
+def refresh_provisional_aggregates(
+    db: Session,
+    *,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> ProvisionalRefreshSummary:
+    """Fold every submission past the high-water mark into ``provisional_aggregates``.
+
+    Submissions newer than the settle lag are left for the next run so rows
+    committed slightly out of ``submitted_at`` order are not skipped. Each batch
+    commits its upserts together with the advanced mark.
+    """
+
+    batch_size = batch_size or settings.provisional_batch_size
+    until = (now or utcnow()) - timedelta(seconds=settings.provisional_settle_seconds)
+
+    read = 0
+    refreshed = 0
+    while True:
+        mark = batch_watermark_repository.get_for_update(db, job_name=WATERMARK_JOB_NAME)
+        rows = provisional_aggregate_repository.fetch_submissions_after(
+            db,
+            after_at=mark.watermark_at,
+            after_id=mark.watermark_id,
+            until=until,
+            limit=batch_size,
+        )
+        if not rows:
+            db.commit()
+            break
+
+        refreshed += refresh_groups(db, ((period_id, evaluatee_id) for _, _, period_id, evaluatee_id in rows))
+        mark.watermark_id, mark.watermark_at = rows[-1][0], rows[-1][1]
+        db.commit()
+        read += len(rows)
+
+    return ProvisionalRefreshSummary(submissions_read=read, groups_refreshed=refreshed)
+
+
+__all__ = [
+    "WATERMARK_JOB_NAME",
+    "ProvisionalRefreshSummary",
+    "refresh_groups",
+    "refresh_submission_groups",
+    "refresh_provisional_aggregates",
+]
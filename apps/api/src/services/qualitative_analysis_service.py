@@ -0,0 +1,181 @@
+"""QUALITATIVE_ANALYSIS pipeline: sentiment and keywords for open-ended answers.
+
+Pending answers are collected across submissions in chunks. Each chunk is
+deduplicated by normalized-text hash and resolved against the result cache;
+only texts never seen under the current model version go through sentiment
+inference and keyword extraction, which share one job-scoped embedding stage.
+Sentiment, keyword and cache rows are then written with bulk inserts and
+committed per chunk, together with the refreshed sentiment aggregates (and
+qualitative cohort statistics) of the submissions the chunk touched.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES, CohortMetric
+from ..repositories.analysis_pipeline_repository import analysis_pipeline_repository
+from ..repositories.open_ended_answer_repository import open_ended_answer_repository
+from .cohort_statistics_service import ScoreChange, apply_score_changes
+from .embedding_service import EmbeddingStage, new_embedding_stage
+from .keyword_extraction_service import KeywordExtractor, build_keyword_extractor
+from .qualitative_cache_service import (
+    CachedResult,
+    QualitativeResultCache,
+    content_hash,
+    get_qualitative_cache,
+)
+from .sentiment_inference_service import SentimentPredictor, build_sentiment_predictor, sentiment_rows
+
+
+@dataclass(frozen=True)
+class QualitativeAnalysisSummary:
+    """Outcome of one qualitative analysis run."""
+
+    answers_processed: int
+    texts_inferred: int
+    cache_metrics: Dict[str, float]
+
+
+def _infer(
+    texts: List[str],
+    predictor: SentimentPredictor,
+    extractor: KeywordExtractor,
+) -> List[CachedResult]:
+    probabilities = predictor.predict_probabilities(texts)
+    keywords = extractor.extract(texts)
+    return [
+        CachedResult(
+            negative_score=negative,
+            neutral_score=neutral,
+            positive_score=positive,
+            keywords=tuple(text_keywords),
+        )
+        for (negative, neutral, positive), text_keywords in zip(probabilities.tolist(), keywords)
+    ]
+
+
+def refresh_sentiment_aggregates(db: Session, *, submission_ids: Sequence[int]) -> None:
+    """Recompute the sentiment averages and ``qual_score_raw`` of scorable submissions.
+
+    The raw score is the average positive minus the average negative
+    probability of the submission's analyzed answers, in [-1, 1]. Changed raw
+    scores move in the qualitative cohort statistics; ``z_qual`` is left to
+    FINAL_AGGREGATION and final snapshots are not touched. The caller owns the
+    transaction.
+    """
+
+    averages = analysis_pipeline_repository.fetch_sentiment_averages(
+        db,
+        submission_ids=submission_ids,
+        statuses=SCORABLE_SUBMISSION_STATUSES,
+    )
+    states = analysis_pipeline_repository.get_sentiment_aggregate_states(
+        db,
+        submission_ids=[row[0] for row in averages],
+    )
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    changes: Dict[int, ScoreChange] = {}
+    for submission_id, positive, neutral, negative in averages:
+        state = states.get(submission_id)
+        if state is not None and state[1]:
+            continue
+        values = {
+            "average_positive_score": round(float(positive), 4),
+            "average_neutral_score": round(float(neutral), 4),
+            "average_negative_score": round(float(negative), 4),
+            "qual_score_raw": round(float(positive) - float(negative), 4),
+        }
+        if state is None:
+            inserts.append({"submission_id": submission_id, **values, "z_qual": 0})
+        else:
+            updates.append({"id": state[0], **values})
+        changes[submission_id] = (state[2] if state is not None else None, values["qual_score_raw"])
+
+    analysis_pipeline_repository.bulk_insert_sentiment_aggregates(db, rows=inserts)
+    analysis_pipeline_repository.bulk_update_sentiment_aggregates(db, rows=updates)
+    apply_score_changes(db, metric=CohortMetric.QUALITATIVE, changes=changes)
+
+
+def analyze_pending_answers(
+    db: Session,
+    *,
+    predictor: Optional[SentimentPredictor] = None,
+    extractor: Optional[KeywordExtractor] = None,
+    cache: Optional[QualitativeResultCache] = None,
+    stage: Optional[EmbeddingStage] = None,
+    evaluation_period_id: Optional[int] = None,
+    collect_size: Optional[int] = None,
+) -> QualitativeAnalysisSummary:
+    """Analyze every open-ended answer that has no sentiment yet.
+
+    Each chunk is committed on its own, so an interrupted run resumes where it stopped.
+    Embeddings are kept in ``stage`` for the whole run.
+    """
+
+    if predictor is None or extractor is None:
+        stage = stage or new_embedding_stage()
+    predictor = predictor or build_sentiment_predictor(stage)
+    extractor = extractor or build_keyword_extractor(stage)
+    cache = cache or get_qualitative_cache()
+    collect_size = collect_size or predictor.batch_size * 16
+
+    metrics_at_start = cache.metrics.copy()
+    processed = 0
+    inferred = 0
+    after_id = 0
+    while True:
+        pending = open_ended_answer_repository.fetch_pending_sentiment(
+            db,
+            after_id=after_id,
+            limit=collect_size,
+            evaluation_period_id=evaluation_period_id,
+        )
+        if not pending:
+            break
+
+        answer_ids = [row[0] for row in pending]
+        hashes = [content_hash(row[1]) for row in pending]
+        results = cache.get_many(db, hashes)
+
+        miss_texts: Dict[str, str] = {}
+        for key, (_, text, _) in zip(hashes, pending):
+            if key not in results:
+                miss_texts.setdefault(key, text)
+        if miss_texts:
+            fresh = dict(zip(miss_texts, _infer(list(miss_texts.values()), predictor, extractor)))
+            cache.put_many(db, fresh)
+            results.update(fresh)
+            inferred += len(fresh)
+
+        answer_results = [results[key] for key in hashes]
+        probabilities = np.array(
+            [[r.negative_score, r.neutral_score, r.positive_score] for r in answer_results],
+            dtype=np.float64,
+        )
+        keyword_rows: List[Dict[str, Any]] = [
+            {"open_ended_answer_id": answer_id, "keyword": keyword, "relevance_score": score}
+            for answer_id, result in zip(answer_ids, answer_results)
+            for keyword, score in result.keywords
+        ]
+        open_ended_answer_repository.bulk_insert_sentiments(db, rows=sentiment_rows(answer_ids, probabilities))
+        open_ended_answer_repository.bulk_insert_keywords(db, rows=keyword_rows)
+        refresh_sentiment_aggregates(db, submission_ids=sorted({row[2] for row in pending}))
+        db.commit()
+
+        processed += len(answer_ids)
+        after_id = answer_ids[-1]
+
+    return QualitativeAnalysisSummary(
+        answers_processed=processed,
+        texts_inferred=inferred,
+        cache_metrics=cache.metrics.since(metrics_at_start).as_dict(),
+    )
+
+
+__all__ = ["QualitativeAnalysisSummary", "refresh_sentiment_aggregates", "analyze_pending_answers"]
@@ -0,0 +1,222 @@
+"""Two-tier cache of qualitative results keyed by normalized answer text.
+
+Students frequently submit the same short comments ("Good teacher", "None"),
+so sentiment and keyword results are cached by a hash of the text, with case,
+width and whitespace folded, plus the model version. Punctuation stays in the
+key: ":)" and ":(" or "A+" and "A-" differ only in punctuation and carry
+opposite sentiment. A bounded in-process LRU sits in front of the
+``qualitative_result_cache`` table; hit counters for both tiers are kept so the
+job can report its hit rate.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import string
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Generic, Hashable, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..repositories.qualitative_cache_repository import qualitative_cache_repository
+from .keyword_extraction_service import Keyword
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = str.maketrans({char: " " for char in string.punctuation})
+# Part of the version tag; bumped when ``content_hash`` changes, so entries keyed
+# the old way are never served for texts that now get a different key.
+CACHE_KEY_SCHEME = "2"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def fold_answer_text(text: str) -> str:
+    """Fold case, width and whitespace; punctuation is kept."""
+
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", folded).strip()
+
+
+def normalize_answer_text(text: str) -> str:
+    """``fold_answer_text`` with punctuation folded too, for near-duplicate matching."""
+
+    return _WHITESPACE.sub(" ", fold_answer_text(text).translate(_PUNCTUATION)).strip()
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the folded answer text, the cache key."""
+
+    return hashlib.sha256(fold_answer_text(text).encode("utf-8")).hexdigest()
+
+
+def current_model_version() -> str:
+    """Version tag for cached results; changes whenever a model, the key scheme or the manual version changes."""
+
+    sentiment = settings.sentiment_head_path or settings.sentiment_model_name
+    return f"k{CACHE_KEY_SCHEME}|{sentiment}|{settings.keyword_model_name}|{settings.analysis_model_version}"[:255]
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    """Sentiment distribution and keywords for one normalized text."""
+
+    negative_score: float
+    neutral_score: float
+    positive_score: float
+    keywords: Tuple[Keyword, ...] = ()
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe, size-bounded least-recently-used mapping."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@dataclass
+class CacheMetrics:
+    """Lookup counters for both cache tiers."""
+
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.persistent_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.memory_hits + self.persistent_hits) / self.lookups if self.lookups else 0.0
+
+    def copy(self) -> "CacheMetrics":
+        return CacheMetrics(self.memory_hits, self.persistent_hits, self.misses)
+
+    def since(self, earlier: "CacheMetrics") -> "CacheMetrics":
+        """Counters accumulated after ``earlier`` was copied."""
+
+        return CacheMetrics(
+            self.memory_hits - earlier.memory_hits,
+            self.persistent_hits - earlier.persistent_hits,
+            self.misses - earlier.misses,
+        )
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+@dataclass
+class QualitativeResultCache:
+    """LRU tier backed by the persistent ``qualitative_result_cache`` table."""
+
+    max_entries: int = field(default_factory=lambda: settings.qualitative_cache_max_entries)
+    model_version: str = field(default_factory=current_model_version)
+    metrics: CacheMetrics = field(default_factory=CacheMetrics)
+
+    def __post_init__(self) -> None:
+        self._memory: LRUCache[str, CachedResult] = LRUCache(self.max_entries)
+
+    def get_many(self, db: Session, hashes: Iterable[str]) -> Dict[str, CachedResult]:
+        """Resolve hashes from memory first, then from the table in one query."""
+
+        found: Dict[str, CachedResult] = {}
+        remaining: List[str] = []
+        for key in dict.fromkeys(hashes):
+            cached = self._memory.get(key)
+            if cached is None:
+                remaining.append(key)
+            else:
+                found[key] = cached
+        self.metrics.memory_hits += len(found)
+
+        persistent_hits = 0
+        for entry in qualitative_cache_repository.get_many(
+            db,
+            model_version=self.model_version,
+            content_hashes=remaining,
+        ):
+            result = CachedResult(
+                negative_score=entry.negative_score,
+                neutral_score=entry.neutral_score,
+                positive_score=entry.positive_score,
+                keywords=tuple((keyword, score) for keyword, score in entry.keywords),
+            )
+            self._memory.put(entry.content_hash, result)
+            found[entry.content_hash] = result
+            persistent_hits += 1
+
+        self.metrics.persistent_hits += persistent_hits
+        self.metrics.misses += len(remaining) - persistent_hits
+        return found
+
+    def put_many(self, db: Session, results: Mapping[str, CachedResult]) -> None:
+        """Store freshly inferred results in both tiers. The caller owns the transaction."""
+
+        rows = []
+        for key, result in results.items():
+            self._memory.put(key, result)
+            rows.append(
+                {
+                    "content_hash": key,
+                    "model_version": self.model_version,
+                    "negative_score": result.negative_score,
+                    "neutral_score": result.neutral_score,
+                    "positive_score": result.positive_score,
+                    "keywords": [list(keyword) for keyword in result.keywords],
+                }
+            )
+        qualitative_cache_repository.insert_many(db, rows=rows)
+
+
+@lru_cache
+def get_qualitative_cache() -> QualitativeResultCache:
+    """Return the process-wide cache so the LRU tier survives across jobs."""
+
+    return QualitativeResultCache()
+
+
+__all__ = [
+    "CACHE_KEY_SCHEME",
+    "fold_answer_text",
+    "normalize_answer_text",
+    "content_hash",
+    "current_model_version",
+    "CachedResult",
+    "LRUCache",
+    "CacheMetrics",
+    "QualitativeResultCache",
+    "get_qualitative_cache",
+]
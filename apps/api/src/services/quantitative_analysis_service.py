@@ -0,0 +1,228 @@
+"""Period-wide quantitative scoring of Likert answers.
+
+All Likert answers of an evaluation period are loaded in a single query and laid
+out as a dense submission x question matrix, so per-question medians,
+per-criterion averages and ``quant_score_raw`` are computed for every submission
+with a handful of NumPy operations instead of one ORM walk per submission.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES, AggregateItemType, CohortMetric
+from ..repositories.numerical_aggregate_repository import numerical_aggregate_repository
+from .cohort_statistics_service import ScoreChange, apply_score_changes
+from .provisional_aggregate_service import refresh_submission_groups
+
+# Placeholder values for the normalization columns; FINAL_AGGREGATION overwrites them.
+_PENDING_NORMALIZATION = {
+    "z_quant": 0,
+    "final_score_60_40": 0,
+    "cohort_n": 0,
+    "cohort_mean": 0,
+    "cohort_std_dev": 0,
+}
+
+
+@dataclass(frozen=True)
+class LikertMatrix:
+    """Dense Likert answers for a period, NaN where a question was not answered."""
+
+    submission_ids: np.ndarray
+    question_ids: np.ndarray
+    values: np.ndarray
+    question_criterion: np.ndarray
+    criterion_ids: np.ndarray
+    criterion_weights: np.ndarray
+
+    @classmethod
+    def from_rows(
+        cls,
+        answer_rows: Sequence[Tuple[int, int, int]],
+        question_rows: Sequence[Tuple[int, int | None, Any]],
+    ) -> "LikertMatrix":
+        """Build the matrix from ``(submission, question, value)`` and question layout rows."""
+
+        answers = np.fromiter(chain.from_iterable(answer_rows), dtype=np.int64, count=3 * len(answer_rows))
+        answers = answers.reshape(-1, 3)
+
+        layout_question_ids = np.array([row[0] for row in question_rows], dtype=np.int64)
+        question_ids = np.union1d(layout_question_ids, answers[:, 1])
+        submission_ids, submission_index = np.unique(answers[:, 0], return_inverse=True)
+        question_index = np.searchsorted(question_ids, answers[:, 1])
+
+        values = np.full((submission_ids.size, question_ids.size), np.nan, dtype=np.float64)
+        values[submission_index, question_index] = answers[:, 2]
+
+        weights_by_criterion = {
+            criterion_id: float(weight) for _, criterion_id, weight in question_rows if criterion_id is not None
+        }
+        criterion_ids = np.array(sorted(weights_by_criterion), dtype=np.int64)
+        criterion_weights = np.array([weights_by_criterion[cid] for cid in criterion_ids.tolist()], dtype=np.float64)
+
+        question_criterion = np.full(question_ids.size, -1, dtype=np.int64)
+        for question_id, criterion_id, _ in question_rows:
+            if criterion_id is not None:
+                question_criterion[np.searchsorted(question_ids, question_id)] = np.searchsorted(
+                    criterion_ids, criterion_id
+                )
+
+        return cls(
+            submission_ids=submission_ids,
+            question_ids=question_ids,
+            values=values,
+            question_criterion=question_criterion,
+            criterion_ids=criterion_ids,
+            criterion_weights=criterion_weights,
+        )
+
+
+@dataclass(frozen=True)
+class QuantitativeScores:
+    """Per-submission results aligned with the rows of a ``LikertMatrix``."""
+
+    question_medians: np.ndarray
+    criterion_averages: np.ndarray
+    quant_score_raw: np.ndarray
+
+
+@dataclass(frozen=True)
+class PeriodScoringSummary:
+    """Outcome of scoring one evaluation period."""
+
+    submissions_scored: int
+    submissions_skipped: int
+
+
+def compute_quantitative_scores(matrix: LikertMatrix) -> QuantitativeScores:
+    """Compute medians, criterion averages and weighted raw scores for all submissions."""
+
+    # A submission holds at most one answer per question (uk_likert_answer_uniqueness),
+    # so the per-question median of a single submission is the answer itself.
+    medians = matrix.values
+    answered = ~np.isnan(medians)
+
+    membership = np.zeros((matrix.question_ids.size, matrix.criterion_ids.size), dtype=np.float64)
+    has_criterion = matrix.question_criterion >= 0
+    membership[np.flatnonzero(has_criterion), matrix.question_criterion[has_criterion]] = 1.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        criterion_sums = np.where(answered, medians, 0.0) @ membership
+        criterion_counts = answered.astype(np.float64) @ membership
+        averages = criterion_sums / criterion_counts
+
+        scored = ~np.isnan(averages)
+        weighted_sum = np.where(scored, averages, 0.0) @ matrix.criterion_weights
+        weight_total = scored.astype(np.float64) @ matrix.criterion_weights
+        raw = weighted_sum / weight_total
+
+    raw[weight_total == 0] = np.nan
+    return QuantitativeScores(question_medians=medians, criterion_averages=averages, quant_score_raw=raw)
+
+
+def _score_map(ids: List[str], row: np.ndarray) -> Dict[str, float]:
+    mask = ~np.isnan(row)
+    return {key: round(value, 4) for key, value, keep in zip(ids, row.tolist(), mask.tolist()) if keep}
+
+
+def aggregate_items(values: Dict[str, Any]) -> List[Tuple[AggregateItemType, int, float]]:
+    """``numerical_aggregate_items`` entries mirroring an aggregate's JSON score maps."""
+
+    return [
+        (item_type, int(key), value)
+        for item_type, column in (
+            (AggregateItemType.QUESTION_MEDIAN, "per_question_median_scores"),
+            (AggregateItemType.CRITERION_AVERAGE, "per_criterion_average_scores"),
+        )
+        for key, value in values[column].items()
+    ]
+
+
+def score_evaluation_period(db: Session, *, evaluation_period_id: int) -> PeriodScoringSummary:
+    """Score every submission of a period and upsert its ``NumericalAggregate`` row.
+
+    Aggregates already locked with ``is_final_snapshot`` are left untouched, and
+    submissions without any weighted criterion answer are skipped. New and
+    changed raw scores are folded into the quantitative cohort statistics, and
+    the provisional aggregates of their groups are recomputed, in the same
+    transaction.
+    """
+
+    answer_rows = numerical_aggregate_repository.fetch_period_likert_answers(
+        db,
+        evaluation_period_id=evaluation_period_id,
+        statuses=SCORABLE_SUBMISSION_STATUSES,
+    )
+    if not answer_rows:
+        return PeriodScoringSummary(submissions_scored=0, submissions_skipped=0)
+
+    question_rows = numerical_aggregate_repository.fetch_period_question_layout(
+        db,
+        evaluation_period_id=evaluation_period_id,
+    )
+    matrix = LikertMatrix.from_rows(answer_rows, question_rows)
+    scores = compute_quantitative_scores(matrix)
+
+    existing = numerical_aggregate_repository.get_period_aggregate_states(
+        db,
+        evaluation_period_id=evaluation_period_id,
+    )
+    question_keys = [str(qid) for qid in matrix.question_ids.tolist()]
+    criterion_keys = [str(cid) for cid in matrix.criterion_ids.tolist()]
+
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    changes: Dict[int, ScoreChange] = {}
+    skipped = 0
+    for row_index, submission_id in enumerate(matrix.submission_ids.tolist()):
+        raw_score = scores.quant_score_raw[row_index]
+        state = existing.get(submission_id)
+        if np.isnan(raw_score) or (state is not None and state[1]):
+            skipped += 1
+            continue
+
+        values = {
+            "per_question_median_scores": _score_map(question_keys, scores.question_medians[row_index]),
+            "per_criterion_average_scores": _score_map(criterion_keys, scores.criterion_averages[row_index]),
+            "quant_score_raw": round(float(raw_score), 4),
+        }
+        if state is None:
+            inserts.append({"submission_id": submission_id, **values, **_PENDING_NORMALIZATION})
+        else:
+            updates.append({"id": state[0], **values})
+        changes[submission_id] = (state[2] if state is not None else None, values["quant_score_raw"])
+
+    numerical_aggregate_repository.bulk_insert(db, rows=inserts)
+    numerical_aggregate_repository.bulk_update(db, rows=updates)
+    if inserts:
+        existing = numerical_aggregate_repository.get_period_aggregate_states(
+            db,
+            evaluation_period_id=evaluation_period_id,
+        )
+    items = {row["id"]: aggregate_items(row) for row in updates}
+    items.update({existing[row["submission_id"]][0]: aggregate_items(row) for row in inserts})
+    numerical_aggregate_repository.replace_items(db, items=items)
+    apply_score_changes(db, metric=CohortMetric.QUANTITATIVE, changes=changes)
+    refresh_submission_groups(db, submission_ids=list(changes))
+    db.commit()
+
+    return PeriodScoringSummary(
+        submissions_scored=len(inserts) + len(updates),
+        submissions_skipped=skipped,
+    )
+
+
+__all__ = [
+    "LikertMatrix",
+    "QuantitativeScores",
+    "PeriodScoringSummary",
+    "compute_quantitative_scores",
+    "aggregate_items",
+    "score_evaluation_period",
+]
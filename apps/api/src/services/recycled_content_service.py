@@ -0,0 +1,296 @@
+"""RECYCLED_CONTENT_CHECK: MinHash/LSH lookup of near-duplicate answers.
+
+Every open-ended answer gets a MinHash signature over character shingles of its
+normalized text. The signature is split into bands and each band is stored as a
+bucket key scoped to the answer's university and evaluator, so finding earlier
+answers the same evaluator may have pasted again is an indexed lookup on a
+handful of keys instead of a scan over everything they ever wrote. Candidates
+are then verified against the university's similarity threshold using the
+estimated Jaccard similarity of the full signatures.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.enums import FlagReason
+from ..repositories.answer_signature_repository import answer_signature_repository
+from ..repositories.flagged_evaluation_repository import flagged_evaluation_repository
+from ..repositories.university_setting_repository import university_setting_repository
+from .qualitative_cache_service import normalize_answer_text
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 128
+# 32 bands of 4 rows put the LSH S-curve midpoint near 0.42 Jaccard, well below
+# any sensible threshold, so recall stays high and verification filters the rest.
+BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+# Short stock replies ("None", "Good teacher") are expected to repeat.
+MIN_WORDS = 4
+
+SIMILARITY_THRESHOLD_SETTING = "recycled_content_similarity_threshold"
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+# Smallest prime above 2**32: 32-bit coefficients times 32-bit hashes fit in uint64.
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def _coefficients(label: str) -> np.ndarray:
+    # Derived from a fixed digest rather than an RNG so stored signatures stay
+    # comparable across processes and numpy versions.
+    return np.array(
+        [
+            int.from_bytes(hashlib.blake2b(f"{label}{i}".encode(), digest_size=4).digest(), "little") | 1
+            for i in range(NUM_PERMUTATIONS)
+        ],
+        dtype=np.uint64,
+    )
+
+
+_A = _coefficients("minhash-a")
+_B = _coefficients("minhash-b")
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """CRC32 of each distinct character shingle of the normalized text."""
+
+    normalized = normalize_answer_text(text)
+    if len(normalized.split()) < MIN_WORDS:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(max(len(normalized) - SHINGLE_SIZE, 0) + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """``NUM_PERMUTATIONS`` uint32 minimums, or ``None`` for texts too short to compare."""
+
+    hashes = shingle_hashes(text)
+    if hashes.size == 0:
+        return None
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME
+    return (permuted.min(axis=1) & _MAX_HASH).astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """Signed 64-bit bucket key per band (FNV-1a over the band's rows and its index).
+
+    Accepts one signature or a ``(n, NUM_PERMUTATIONS)`` matrix; returns ``(BANDS,)``
+    or ``(n, BANDS)`` respectively.
+    """
+
+    matrix = np.atleast_2d(signatures).astype(np.uint64).reshape(-1, BANDS, ROWS_PER_BAND)
+    keys = np.broadcast_to(_FNV_OFFSET ^ np.arange(BANDS, dtype=np.uint64), matrix.shape[:2]).copy()
+    for row in range(ROWS_PER_BAND):
+        keys ^= matrix[:, :, row]
+        keys *= _FNV_PRIME
+    keys = keys.view(np.int64)
+    return keys[0] if np.ndim(signatures) == 1 else keys
+
+
+def estimated_similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity between one signature and each row of ``others``."""
+
+    return (np.atleast_2d(others) == signature).mean(axis=1)
+
+
+def _decode(signature: bytes) -> np.ndarray:
+    return np.frombuffer(signature, dtype=np.uint32)
+
+
+@dataclass(frozen=True)
+class IndexedAnswer:
+    """An answer with its scope and signature."""
+
+    answer_id: int
+    submission_id: int
+    university_id: int
+    evaluator_id: int
+    signature: np.ndarray
+
+
+AnswerRow = Tuple[int, int, int, int, str]
+
+
+def index_new_answers(db: Session, answers: Sequence[AnswerRow]) -> List[IndexedAnswer]:
+    """Store signatures and buckets for answers that are known not to be indexed yet.
+
+    Takes ``(answer_id, submission_id, university_id, evaluator_id, answer_text)``,
+    so ``write_submissions`` indexes the answers it just inserted from memory,
+    with one insert for the signatures and one for the buckets. Texts too short
+    to compare are skipped. The caller owns the transaction.
+    """
+
+    indexed: List[IndexedAnswer] = []
+    for answer_id, submission_id, university_id, evaluator_id, text in answers:
+        signature = minhash_signature(text)
+        if signature is not None:
+            indexed.append(IndexedAnswer(answer_id, submission_id, university_id, evaluator_id, signature))
+    if not indexed:
+        return []
+
+    keys = band_keys(np.stack([answer.signature for answer in indexed])).tolist()
+    answer_signature_repository.insert(
+        db,
+        signatures=[
+            {
+                "open_ended_answer_id": answer.answer_id,
+                "submission_id": answer.submission_id,
+                "signature": answer.signature.tobytes(),
+            }
+            for answer in indexed
+        ],
+        buckets=[
+            {
+                "university_id": answer.university_id,
+                "evaluator_id": answer.evaluator_id,
+                "bucket_key": key,
+                "open_ended_answer_id": answer.answer_id,
+            }
+            for answer, answer_keys in zip(indexed, keys)
+            for key in answer_keys
+        ],
+    )
+    return indexed
+
+
+def index_submission_answers(db: Session, *, submission_ids: Sequence[int]) -> List[IndexedAnswer]:
+    """Return the indexed answers of the submissions, indexing those not indexed yet.
+
+    The check job calls this, so answers written another way than
+    ``write_submissions`` (e.g. imported) are picked up. The caller owns the
+    transaction.
+    """
+
+    rows = answer_signature_repository.fetch_submission_answers(db, submission_ids=submission_ids)
+    stored = answer_signature_repository.get_signatures(db, answer_ids=[row[0] for row in rows])
+
+    indexed = [
+        IndexedAnswer(answer_id, submission_id, university_id, evaluator_id, _decode(stored[answer_id]))
+        for answer_id, submission_id, university_id, evaluator_id, _ in rows
+        if answer_id in stored
+    ]
+    indexed.extend(index_new_answers(db, [tuple(row) for row in rows if row[0] not in stored]))
+    return sorted(indexed, key=lambda answer: answer.answer_id)
+
+
+def find_recycled_matches(db: Session, answer: IndexedAnswer, threshold: float) -> List[Dict[str, Any]]:
+    """Earlier answers by the same evaluator whose estimated similarity reaches ``threshold``."""
+
+    candidates = answer_signature_repository.find_candidates(
+        db,
+        university_id=answer.university_id,
+        evaluator_id=answer.evaluator_id,
+        bucket_keys=band_keys(answer.signature).tolist(),
+        before_answer_id=answer.answer_id,
+    )
+    candidates = [row for row in candidates if row[1] != answer.submission_id]
+    if not candidates:
+        return []
+
+    similarities = estimated_similarity(answer.signature, np.stack([_decode(row[2]) for row in candidates]))
+    return [
+        {
+            "answer_id": answer.answer_id,
+            "matched_answer_id": matched_answer_id,
+            "matched_submission_id": matched_submission_id,
+            "similarity": round(similarity, 4),
+        }
+        for (matched_answer_id, matched_submission_id, _), similarity in zip(candidates, similarities.tolist())
+        if similarity >= threshold
+    ]
+
+
+@dataclass(frozen=True)
+class RecycledContentSummary:
+    """Outcome of one recycled-content check run."""
+
+    submissions_checked: int
+    submissions_flagged: int
+
+
+def check_submissions(
+    db: Session,
+    *,
+    submission_ids: Sequence[int],
+    chunk_size: int = 500,
+) -> RecycledContentSummary:
+    """Index and check the given submissions, flagging those with recycled answers.
+
+    Submissions that already carry a flag are left untouched. Each chunk is committed.
+    """
+
+    thresholds: Dict[int, float] = {}
+    flagged = 0
+    for start in range(0, len(submission_ids), chunk_size):
+        chunk = list(submission_ids[start:start + chunk_size])
+        answers = index_submission_answers(db, submission_ids=chunk)
+        already_flagged = flagged_evaluation_repository.get_flagged_submission_ids(db, submission_ids=chunk)
+
+        matches: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+        for answer in answers:
+            if answer.submission_id in already_flagged:
+                continue
+            if answer.university_id not in thresholds:
+                thresholds[answer.university_id] = university_setting_repository.get_float(
+                    db,
+                    university_id=answer.university_id,
+                    setting_name=SIMILARITY_THRESHOLD_SETTING,
+                    default=DEFAULT_SIMILARITY_THRESHOLD,
+                )
+            threshold = thresholds[answer.university_id]
+            found = find_recycled_matches(db, answer, threshold)
+            if found:
+                matches.setdefault(answer.submission_id, (threshold, []))[1].extend(found)
+
+        for submission_id, (threshold, details) in matches.items():
+            flagged_evaluation_repository.create(
+                db,
+                submission_id=submission_id,
+                flag_reason=FlagReason.RECYCLED_CONTENT,
+                flag_details={"threshold": threshold, "matches": details},
+            )
+        flagged += len(matches)
+        db.commit()
+
+    return RecycledContentSummary(submissions_checked=len(submission_ids), submissions_flagged=flagged)
+
+
+def check_evaluation_period(db: Session, *, evaluation_period_id: int) -> RecycledContentSummary:
+    """Check every submission of a period in submission order."""
+
+    submission_ids = answer_signature_repository.fetch_period_submission_ids(
+        db,
+        evaluation_period_id=evaluation_period_id,
+    )
+    return check_submissions(db, submission_ids=submission_ids)
+
+
+__all__ = [
+    "SHINGLE_SIZE",
+    "NUM_PERMUTATIONS",
+    "BANDS",
+    "ROWS_PER_BAND",
+    "SIMILARITY_THRESHOLD_SETTING",
+    "DEFAULT_SIMILARITY_THRESHOLD",
+    "shingle_hashes",
+    "minhash_signature",
+    "band_keys",
+    "estimated_similarity",
+    "IndexedAnswer",
+    "AnswerRow",
+    "index_new_answers",
+    "index_submission_answers",
+    "find_recycled_matches",
+    "RecycledContentSummary",
+    "check_submissions",
+    "check_evaluation_period",
+]
@@ -0,0 +1,219 @@
+"""Micro-batched CPU sentiment inference for open-ended answers.
+
+Texts collected across submissions are tokenized once, grouped into fixed-size
+batches of similar token length (so padding stays small) and scored with the
+transformers model under ``torch.inference_mode``. When a trained embedding
+head is configured, sentiment is instead read off the answer embeddings the
+keyword stage already computed, skipping the second encoder entirely.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Protocol, Sequence
+
+import numpy as np
+
+from ..core.config import settings
+from ..models.enums import SentimentLabel
+
+if TYPE_CHECKING:
+    from .embedding_service import EmbeddingStage
+
+# Column order of every probability matrix produced in this module.
+SENTIMENT_COLUMNS = (SentimentLabel.NEGATIVE, SentimentLabel.NEUTRAL, SentimentLabel.POSITIVE)
+
+
+class SentimentPredictor(Protocol):
+    """Anything that scores a list of texts in one call."""
+
+    batch_size: int
+
+    def predict_probabilities(self, texts: Sequence[str]) -> np.ndarray:
+        """Return ``(len(texts), 3)`` probabilities ordered as ``SENTIMENT_COLUMNS``."""
+
+
+class SentimentModel(Protocol):
+    """Minimal interface the batching predictor needs from a classifier."""
+
+    def encode(self, texts: Sequence[str]) -> List[List[int]]:
+        """Tokenize texts without padding."""
+
+    def predict_encoded(self, input_ids: Sequence[Sequence[int]]) -> np.ndarray:
+        """Return ``(len(input_ids), 3)`` probabilities ordered as ``SENTIMENT_COLUMNS``."""
+
+
+class TransformersSentimentModel:
+    """Sequence-classification model pinned to the CPU."""
+
+    def __init__(self, model_name: str, *, max_length: int, intra_op_threads: int = 0) -> None:
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        if intra_op_threads > 0:
+            torch.set_num_threads(intra_op_threads)
+        self._torch = torch
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name).to("cpu").eval()
+
+        labels = {str(label).lower(): index for index, label in self.model.config.id2label.items()}
+        if all(label.value in labels for label in SENTIMENT_COLUMNS):
+            self._column_order = [labels[label.value] for label in SENTIMENT_COLUMNS]
+        else:
+            # Fine-tuned checkpoints often keep LABEL_0..2, trained as negative/neutral/positive.
+            self._column_order = [0, 1, 2]
+
+    def encode(self, texts: Sequence[str]) -> List[List[int]]:
+        return self.tokenizer(list(texts), truncation=True, max_length=self.max_length)["input_ids"]
+
+    def predict_encoded(self, input_ids: Sequence[Sequence[int]]) -> np.ndarray:
+        batch = self.tokenizer.pad({"input_ids": list(input_ids)}, padding=True, return_tensors="pt")
+        with self._torch.inference_mode():
+            logits = self.model(**batch).logits
+        probabilities = self._torch.softmax(logits.float(), dim=-1).numpy()
+        return probabilities[:, self._column_order]
+
+
+def length_buckets(lengths: Sequence[int], batch_size: int) -> List[np.ndarray]:
+    """Split indices into ``batch_size`` chunks of neighbouring token lengths."""
+
+    order = np.argsort(np.asarray(lengths, dtype=np.int64), kind="stable")
+    return [order[start:start + batch_size] for start in range(0, order.size, batch_size)]
+
+
+class BatchedSentimentPredictor:
+    """Runs a ``SentimentModel`` over many texts in length-bucketed batches."""
+
+    def __init__(self, model: SentimentModel, *, batch_size: int) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+        self.model = model
+        self.batch_size = batch_size
+
+    def predict_probabilities(self, texts: Sequence[str]) -> np.ndarray:
+        probabilities = np.empty((len(texts), len(SENTIMENT_COLUMNS)), dtype=np.float64)
+        if not texts:
+            return probabilities
+
+        encoded = self.model.encode(texts)
+        for batch in length_buckets([len(ids) for ids in encoded], self.batch_size):
+            probabilities[batch] = self.model.predict_encoded([encoded[i] for i in batch.tolist()])
+        return probabilities
+
+
+class EmbeddingSentimentHead:
+    """Linear softmax classifier over sentence embeddings.
+
+    Loaded from an ``.npz`` file holding ``weights`` of shape ``(dim, 3)`` and
+    ``bias`` of shape ``(3,)``, with columns ordered as ``SENTIMENT_COLUMNS``.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray) -> None:
+        if weights.ndim != 2 or weights.shape[1] != len(SENTIMENT_COLUMNS) or bias.shape != (len(SENTIMENT_COLUMNS),):
+            raise ValueError("Sentiment head must map embeddings to three classes.")
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+
+    @classmethod
+    def from_file(cls, path: str) -> "EmbeddingSentimentHead":
+        with np.load(path) as data:
+            return cls(data["weights"], data["bias"])
+
+    def predict(self, embeddings: np.ndarray) -> np.ndarray:
+        logits = embeddings @ self.weights + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float64)
+
+
+class EmbeddingSentimentPredictor:
+    """Scores texts with an ``EmbeddingSentimentHead`` on a shared ``EmbeddingStage``."""
+
+    def __init__(self, stage: "EmbeddingStage", head: EmbeddingSentimentHead) -> None:
+        self.stage = stage
+        self.head = head
+
+    @property
+    def batch_size(self) -> int:
+        return self.stage.batch_size
+
+    def predict_probabilities(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, len(SENTIMENT_COLUMNS)), dtype=np.float64)
+        return self.head.predict(self.stage.embed(texts))
+
+
+@lru_cache
+def get_sentiment_head() -> EmbeddingSentimentHead:
+    return EmbeddingSentimentHead.from_file(settings.sentiment_head_path)
+
+
+def build_sentiment_predictor(stage: "EmbeddingStage") -> SentimentPredictor:
+    """The embedding head on ``stage`` when configured, else the transformer classifier."""
+
+    if settings.sentiment_head_path:
+        return EmbeddingSentimentPredictor(stage, get_sentiment_head())
+    return get_sentiment_predictor()
+
+
+@lru_cache
+def get_sentiment_predictor() -> BatchedSentimentPredictor:
+    """Return the process-wide predictor, loading the model on first use."""
+
+    model = TransformersSentimentModel(
+        settings.sentiment_model_name,
+        max_length=settings.sentiment_max_length,
+        intra_op_threads=settings.torch_intra_op_threads,
+    )
+    return BatchedSentimentPredictor(model, batch_size=settings.sentiment_batch_size)
+
+
+def sentiment_rows(answer_ids: Sequence[int], probabilities: np.ndarray) -> List[Dict[str, Any]]:
+    """Convert a probability matrix into ``OpenEndedSentiment`` insert rows.
+
+    ``confidence`` is one minus the normalized entropy of the distribution, so a
+    uniform prediction scores 0 and a one-hot prediction scores 1.
+    """
+
+    clipped = np.clip(probabilities, 1e-12, 1.0)
+    entropy = -(clipped * np.log(clipped)).sum(axis=1)
+    confidence = 1.0 - entropy / math.log(len(SENTIMENT_COLUMNS))
+    winners = probabilities.argmax(axis=1)
+
+    rows: List[Dict[str, Any]] = []
+    for answer_id, (negative, neutral, positive), winner, conf in zip(
+        answer_ids,
+        probabilities.tolist(),
+        winners.tolist(),
+        confidence.tolist(),
+    ):
+        rows.append(
+            {
+                "open_ended_answer_id": answer_id,
+                "predicted_sentiment_label": SENTIMENT_COLUMNS[winner],
+                "predicted_sentiment_label_score": (negative, neutral, positive)[winner],
+                "positive_score": positive,
+                "neutral_score": neutral,
+                "negative_score": negative,
+                "confidence": conf,
+            }
+        )
+    return rows
+
+
+__all__ = [
+    "SENTIMENT_COLUMNS",
+    "SentimentPredictor",
+    "SentimentModel",
+    "TransformersSentimentModel",
+    "BatchedSentimentPredictor",
+    "EmbeddingSentimentHead",
+    "EmbeddingSentimentPredictor",
+    "length_buckets",
+    "get_sentiment_head",
+    "build_sentiment_predictor",
+    "get_sentiment_predictor",
+    "sentiment_rows",
+]
@@ -0,0 +1,155 @@
+"""Bulk write path for evaluation submissions.
+
+Saving a submission through relationship cascades flushes the submission and
+each answer as separate INSERTs. The writer instead inserts the submissions of
+a call with one ``INSERT ... RETURNING`` per batch (drafts with an explicit
+``submitted_at`` and drafts left to the server default are separate batches,
+so at most two) and then all their Likert and open-ended answers with one
+multi-row insert each, so a burst of submissions near a deadline costs a few
+statements in total, all in one transaction. The new open-ended answers are
+indexed for the recycled-content check in the same transaction, from the texts
+already in memory: their MinHash signatures and LSH buckets add one insert each
+and nothing is read back.
+
+Status changes go through ``change_submission_status``, which keeps the cohort
+statistics and provisional aggregates in step with the submissions that count
+towards them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..models.enums import SCORABLE_SUBMISSION_STATUSES, CohortMetric, EvaluationSubmissionStatus
+from ..repositories.evaluation_submission_repository import evaluation_submission_repository
+from .cohort_statistics_service import ScoreChange, apply_score_changes
+from .provisional_aggregate_service import refresh_submission_groups
+from .recycled_content_service import AnswerRow, index_new_answers
+
+
+@dataclass(frozen=True)
+class SubmissionDraft:
+    """A validated submission and its answers, keyed by question id."""
+
+    university_id: int
+    evaluation_period_id: int
+    evaluator_id: int
+    evaluatee_id: int
+    subject_offering_id: int
+    likert_answers: Mapping[int, int]
+    open_ended_answers: Mapping[int, str] = field(default_factory=dict)
+    status: EvaluationSubmissionStatus = EvaluationSubmissionStatus.SUBMITTED
+    submitted_at: Optional[datetime] = None
+    is_resubmission: bool = False
+    original_submission_id: Optional[int] = None
+
+    def submission_row(self) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "university_id": self.university_id,
+            "evaluation_period_id": self.evaluation_period_id,
+            "evaluator_id": self.evaluator_id,
+            "evaluatee_id": self.evaluatee_id,
+            "subject_offering_id": self.subject_offering_id,
+            "status": self.status,
+            "is_resubmission": self.is_resubmission,
+            "original_submission_id": self.original_submission_id,
+        }
+        if self.submitted_at is not None:
+            row["submitted_at"] = self.submitted_at
+        return row
+
+
+def write_submissions(db: Session, drafts: Sequence[SubmissionDraft], *, commit: bool = True) -> List[int]:
+    """Insert submissions with their answers and return the new ids in draft order.
+
+    With ``commit=False`` the caller owns the transaction, e.g. to write a
+    resubmission together with the flag update that allowed it.
+    """
+
+    if not drafts:
+        return []
+    # Parameter sets of one executemany must share their keys, so drafts that
+    # leave submitted_at to the server default are inserted as a second batch.
+    submission_ids: List[int] = [0] * len(drafts)
+    for uses_server_time in (False, True):
+        positions = [i for i, draft in enumerate(drafts) if (draft.submitted_at is None) is uses_server_time]
+        ids = evaluation_submission_repository.insert_submissions(
+            db,
+            rows=[drafts[i].submission_row() for i in positions],
+        )
+        for position, submission_id in zip(positions, ids):
+            submission_ids[position] = submission_id
+
+    likert_rows: List[Dict[str, Any]] = []
+    open_ended_rows: List[Dict[str, Any]] = []
+    open_ended_drafts: List[SubmissionDraft] = []
+    for draft, submission_id in zip(drafts, submission_ids):
+        likert_rows.extend(
+            {"submission_id": submission_id, "question_id": question_id, "answer_value": value}
+            for question_id, value in draft.likert_answers.items()
+        )
+        open_ended_rows.extend(
+            {"submission_id": submission_id, "question_id": question_id, "answer_text": text}
+            for question_id, text in draft.open_ended_answers.items()
+        )
+        open_ended_drafts.extend([draft] * len(draft.open_ended_answers))
+    evaluation_submission_repository.insert_likert_answers(db, rows=likert_rows)
+    answer_ids = evaluation_submission_repository.insert_open_ended_answers(db, rows=open_ended_rows)
+    answers: List[AnswerRow] = [
+        (answer_id, row["submission_id"], draft.university_id, draft.evaluator_id, row["answer_text"])
+        for answer_id, row, draft in zip(answer_ids, open_ended_rows, open_ended_drafts)
+    ]
+    index_new_answers(db, answers)
+
+    if commit:
+        db.commit()
+    return submission_ids
+
+
+def write_submission(db: Session, draft: SubmissionDraft, *, commit: bool = True) -> int:
+    """Single-submission form of ``write_submissions``."""
+
+    return write_submissions(db, [draft], commit=commit)[0]
+
+
+def change_submission_status(
+    db: Session,
+    submission_ids: Sequence[int],
+    status: EvaluationSubmissionStatus,
+    *,
+    commit: bool = True,
+) -> None:
+    """Move submissions to ``status``, e.g. ``INVALIDATED_FOR_RESUBMISSION`` when a flag is resolved.
+
+    Raw scores of submissions leaving the scorable statuses are retracted from
+    their cohort statistics, and those of submissions returning to them are
+    added back; the provisional aggregates of their groups are recomputed, all
+    in the same transaction. With ``commit=False`` the caller owns the
+    transaction.
+    """
+
+    current = evaluation_submission_repository.get_statuses_and_raw_scores(db, submission_ids=submission_ids)
+    counted_after = status in SCORABLE_SUBMISSION_STATUSES
+    changes: Dict[CohortMetric, Dict[int, ScoreChange]] = {metric: {} for metric in CohortMetric}
+    crossed: List[int] = []
+    for submission_id, (old_status, quant, qual) in current.items():
+        if (old_status in SCORABLE_SUBMISSION_STATUSES) == counted_after:
+            continue
+        crossed.append(submission_id)
+        for metric, value in ((CohortMetric.QUANTITATIVE, quant), (CohortMetric.QUALITATIVE, qual)):
+            if value is not None:
+                changes[metric][submission_id] = (None, value) if counted_after else (value, None)
+
+    evaluation_submission_repository.set_status(db, submission_ids=list(current), status=status)
+    for metric, metric_changes in changes.items():
+        apply_score_changes(db, metric=metric, changes=metric_changes)
+    refresh_submission_groups(db, submission_ids=crossed)
+    if commit:
+        db.commit()
+
+
+__all__ = ["SubmissionDraft", "write_submissions", "write_submission", "change_submission_status"]
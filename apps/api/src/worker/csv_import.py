@@ -0,0 +1,278 @@
+"""Streaming CSV import engine shared by the bulk import jobs.
+
+The uploaded file is read row by row and handed to an importer in batches of
+``IMPORT_BATCH_SIZE`` rows. Each batch is validated, written and committed
+together with the task's ``rows_processed``/``rows_failed``/``progress``, so
+memory is bounded by one batch whatever the size of the file, and the job
+monitor sees progress as it happens.
+
+The rows come from the uploaded CSV, or from the artifact the validate step
+stored for it (see ``import_artifacts``), through the same ``ImportSource``
+interface. A batch whose write fails is rolled back on its own and the job
+moves on to the next one. Its rows, and the rows an importer rejects, are
+written to a CSV error report (the original columns plus the line number and reason) stored at
+the task's ``result_storage_path``, so an admin can fix and re-upload only
+those rows. A task set to ``cancellation_requested`` stops at the next batch
+boundary as ``cancelled``.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.operations import BackgroundTask
+from .job_tracking import cancellation_requested
+
+logger = logging.getLogger("proficiency.import")
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all: it is empty or lacks required columns."""
+
+
+@dataclass(slots=True)
+class ImportRow:
+    """One data row; ``line`` is its line number in the file, for the error report."""
+
+    line: int
+    values: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """What an importer did with one batch; ``errors`` maps rejected rows' lines to reasons."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
+class CsvImporter(Protocol):
+    """Validates and writes one kind of record."""
+
+    required_columns: Tuple[str, ...]
+
+    def import_batch(self, db: Session, rows: Sequence[ImportRow]) -> BatchResult:
+        """Write the valid ``rows`` (flushed, not committed) and report the others."""
+
+
+@dataclass(frozen=True)
+class ImportSummary:
+    """Outcome of one import job."""
+
+    rows_processed: int
+    rows_failed: int
+    created: int
+    updated: int
+    unchanged: int
+    batches_failed: int
+    seconds: float
+    cancelled: bool
+    error_report: Optional[Path]
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.rows_processed + self.rows_failed
+        return rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def upload_path(job_parameters: Mapping[str, Any]) -> Path:
+    """The uploaded file of an import task; ``file_path`` is relative to ``STORAGE_ROOT``."""
+
+    return Path(settings.storage_root) / str(job_parameters["file_path"])
+
+
+def error_report_path(task_id: int) -> Path:
+    return Path(settings.storage_root) / "import_reports" / f"{task_id}.csv"
+
+
+class _ErrorReport:
+    """Failed rows, written as they occur; the file is only created for the first one."""
+
+    def __init__(self, path: Path, columns: Sequence[str]) -> None:
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        self._file: Optional[io.TextIOWrapper] = None
+        self._writer: Any = None
+
+    def add(self, row: ImportRow, reason: str) -> None:
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", *self.columns, "error"])
+        self._writer.writerow([row.line, *(row.values.get(column, "") for column in self.columns), reason])
+        self.rows += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def read_header(reader: Any, required_columns: Sequence[str]) -> List[str]:
+    """Normalized column names of a ``csv.reader``'s header; raises ``ImportFileError`` if any is missing."""
+
+    header = next(reader, None)
+    if header is None:
+        raise ImportFileError("The file is empty.")
+    columns = [column.strip().lower() for column in header]
+    missing = [column for column in required_columns if column not in columns]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}.")
+    return columns
+
+
+def read_rows(reader: Any, columns: Sequence[str]) -> Iterator[ImportRow]:
+    """The non-blank rows after the header, values stripped."""
+
+    for record in reader:
+        if not any(value.strip() for value in record):
+            continue
+        yield ImportRow(reader.line_num, {column: value.strip() for column, value in zip(columns, record)})
+
+
+def batches(rows: Iterator[ImportRow], batch_size: int) -> Iterator[List[ImportRow]]:
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+@dataclass
+class ImportSource:
+    """The rows of an upload; ``progress()`` is the percentage of the source read so far."""
+
+    columns: List[str]
+    rows: Iterator[ImportRow]
+    progress: Callable[[], int]
+
+
+SourceOpener = Callable[[Path, Sequence[str]], ContextManager[ImportSource]]
+
+
+@contextmanager
+def open_csv(path: Path, required_columns: Sequence[str]) -> Iterator[ImportSource]:
+    """Parse the CSV at ``path`` as it is read; raises ``ImportFileError`` if its header is unusable."""
+
+    size = os.path.getsize(path)
+    with open(path, "rb") as raw, io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as text:
+        reader = csv.reader(text)
+        columns = read_header(reader, required_columns)
+        # Bytes handed to the text decoder so far: ahead by at most one read buffer.
+        yield ImportSource(columns, read_rows(reader, columns), lambda: raw.tell() * 100 // size)
+
+
+def run_csv_import(
+    db: Session,
+    task: BackgroundTask,
+    importer: CsvImporter,
+    path: Path,
+    *,
+    batch_size: Optional[int] = None,
+    open_source: SourceOpener = open_csv,
+) -> ImportSummary:
+    """Stream ``path`` through ``importer``, committing one batch at a time.
+
+    ``open_source`` reads ``path``: ``open_csv`` for an upload, or
+    ``import_artifacts.open_artifact`` for a validated file's artifact. Updates
+    ``task`` as it goes and commits its final counts; the caller sets the
+    result message. Raises ``ImportFileError`` before writing anything when the
+    header is unusable.
+    """
+
+    batch_size = batch_size or settings.import_batch_size
+    started = time.perf_counter()
+    processed = failed = created = updated = unchanged = batches_failed = 0
+    cancelled = False
+
+    with open_source(path, importer.required_columns) as source:
+        report = _ErrorReport(error_report_path(task.id), source.columns)
+        try:
+            for batch in batches(source.rows, batch_size):
+                if cancellation_requested(db, task):
+                    cancelled = True
+                    break
+                try:
+                    result = importer.import_batch(db, batch)
+                    db.flush()
+                except SQLAlchemyError as exc:
+                    db.rollback()
+                    batches_failed += 1
+                    reason = f"Batch not imported: {getattr(exc, 'orig', None) or exc}"
+                    logger.warning("Import task %s: batch at line %s failed: %s", task.id, batch[0].line, reason)
+                    result = BatchResult(errors=dict.fromkeys((row.line for row in batch), reason))
+
+                for row in batch:
+                    reason = result.errors.get(row.line)
+                    if reason is not None:
+                        report.add(row, reason)
+                failed += len(result.errors)
+                processed += len(batch) - len(result.errors)
+                created += result.created
+                updated += result.updated
+                unchanged += result.unchanged
+                task.rows_processed = processed
+                task.rows_failed = failed
+                task.progress = min(99, source.progress())
+                db.commit()
+        finally:
+            report.close()
+
+    seconds = time.perf_counter() - started
+    task.rows_total = processed + failed
+    task.rows_processed = processed
+    task.rows_failed = failed
+    task.result_storage_path = str(report.path) if report.rows else None
+    db.commit()
+    summary = ImportSummary(
+        rows_processed=processed,
+        rows_failed=failed,
+        created=created,
+        updated=updated,
+        unchanged=unchanged,
+        batches_failed=batches_failed,
+        seconds=seconds,
+        cancelled=cancelled,
+        error_report=report.path if report.rows else None,
+    )
+    logger.info(
+        "Import task %s: %s rows in %.1fs (%.0f rows/s), %s failed%s",
+        task.id,
+        processed + failed,
+        seconds,
+        summary.rows_per_second,
+        failed,
+        ", cancelled" if cancelled else "",
+    )
+    return summary
+
+
+__all__ = [
+    "ImportFileError",
+    "ImportRow",
+    "BatchResult",
+    "CsvImporter",
+    "ImportSummary",
+    "upload_path",
+    "error_report_path",
+    "read_header",
+    "read_rows",
+    "batches",
+    "ImportSource",
+    "SourceOpener",
+    "open_csv",
+    "run_csv_import",
+]
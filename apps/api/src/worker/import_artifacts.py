@@ -0,0 +1,260 @@
+"""Parsed artifacts of validated import files.
+
+Validating an upload and processing it are two steps: validation checks the
+CSV and returns a ``validatedFileId``, and processing queues the job that
+writes it with ``validated_file_id`` in its ``job_parameters``. Instead of
+parsing the CSV a second time, ``store_validated_file`` saves the
+parsed rows once, as an Arrow IPC stream under
+``STORAGE_ROOT/import_artifacts``: per batch of ``IMPORT_BATCH_SIZE`` rows, the
+file line numbers as an ``int32`` array and every column as ``int32`` codes
+into a string table of the batch's distinct values. The id is the SHA-256 of
+the uploaded bytes, so uploading the same file again reuses its artifact.
+
+``open_artifact`` memory-maps the artifact and hands its rows to
+``run_csv_import`` (or the historical import) as an ``ImportSource``: no
+decoding, CSV parsing or header checks happen again, and the process step
+only needs the id to exist. Rows are still checked against the database when
+they are written, since it may have changed since validation.
+
+An artifact lives for ``IMPORT_ARTIFACT_TTL_HOURS`` after it was last
+validated; ``purge_expired_artifacts`` deletes older ones. ``pyarrow`` is
+imported lazily so the API only needs it to validate and process imports.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..core.clock import utcnow
+from ..core.config import settings
+from .csv_import import ImportFileError, ImportRow, ImportSource, SourceOpener, batches, open_csv, upload_path
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow as pa
+
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = ".arrows"
+MANIFEST_SUFFIX = ".json"
+_FILE_ID = re.compile(r"^[0-9a-f]{64}$")
+_HASH_BLOCK = 1 << 20
+
+
+@dataclass(frozen=True)
+class ValidatedFile:
+    """An upload that passed validation; ``file_id`` is its ``validatedFileId``."""
+
+    file_id: str
+    columns: Tuple[str, ...]
+    rows: int
+    path: Path
+    reused: bool
+
+
+def artifact_directory() -> Path:
+    return Path(settings.storage_root) / "import_artifacts"
+
+
+def artifact_path(file_id: str) -> Path:
+    """Artifact of a ``validatedFileId``; raises ``ImportFileError`` for anything but a SHA-256 hex digest."""
+
+    if not _FILE_ID.match(file_id):
+        raise ImportFileError("Unknown validated file.")
+    return artifact_directory() / f"{file_id}{ARTIFACT_SUFFIX}"
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes, read in 1 MiB blocks."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as upload:
+        while block := upload.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _schema(pa: Any, columns: Sequence[str]) -> "pa.Schema":
+    strings = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([("line", pa.int32()), *((column, strings) for column in columns)])
+
+
+def _record_batch(pa: Any, schema: "pa.Schema", rows: Sequence[ImportRow]) -> "pa.RecordBatch":
+    arrays = [pa.array([row.line for row in rows], pa.int32())]
+    for column in schema.names[1:]:
+        # Short rows lack trailing values; importers treat an empty value like a missing one.
+        values = pa.array([row.values.get(column, "") for row in rows], pa.string())
+        arrays.append(values.dictionary_encode())
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _check_columns(columns: Sequence[str], required_columns: Sequence[str]) -> None:
+    missing = [column for column in required_columns if column not in columns]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}.")
+
+
+def _manifest(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.with_suffix(MANIFEST_SUFFIX).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomically(path: Path, write: Any) -> None:
+    partial = path.with_name(path.name + ".partial")
+    write(partial)
+    # Readers only ever see a complete file.
+    os.replace(partial, path)
+
+
+def store_validated_file(
+    path: Path,
+    required_columns: Sequence[str],
+    *,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> ValidatedFile:
+    """Parse the CSV at ``path`` into its artifact, unless one exists for the same bytes.
+
+    Raises ``ImportFileError`` when the header is unusable. Validating a file
+    again renews its artifact's lifetime.
+    """
+
+    import pyarrow as pa
+
+    file_id = file_digest(path)
+    target = artifact_path(file_id)
+    manifest = _manifest(target)
+    if manifest is not None:
+        _check_columns(manifest["columns"], required_columns)
+        os.utime(target.with_suffix(MANIFEST_SUFFIX))
+        return ValidatedFile(file_id, tuple(manifest["columns"]), manifest["rows"], target, reused=True)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    with open_csv(path, required_columns) as source:
+        schema = _schema(pa, source.columns)
+
+        def write(partial: Path) -> None:
+            nonlocal rows
+            with pa.OSFile(str(partial), "wb") as sink, pa.ipc.new_stream(sink, schema) as writer:
+                for batch in batches(source.rows, batch_size or settings.import_batch_size):
+                    writer.write_batch(_record_batch(pa, schema, batch))
+                    rows += len(batch)
+
+        _write_atomically(target, write)
+
+    # The manifest is written last: an artifact without one is incomplete and never read.
+    manifest = {
+        "artifact_format_version": ARTIFACT_FORMAT_VERSION,
+        "file_id": file_id,
+        "columns": source.columns,
+        "rows": rows,
+        "source_bytes": os.path.getsize(path),
+        "created_at": (now or utcnow()).isoformat(),
+    }
+    _write_atomically(
+        target.with_suffix(MANIFEST_SUFFIX),
+        lambda partial: partial.write_text(json.dumps(manifest), encoding="utf-8"),
+    )
+    return ValidatedFile(file_id, tuple(source.columns), rows, target, reused=False)
+
+
+def _int32s(array: Any) -> List[int]:
+    # Straight from the mapped buffer: ``to_pylist`` boxes every value in a scalar first.
+    values = memoryview(array.buffers()[1]).cast("i")
+    return values[array.offset : array.offset + len(array)].tolist()
+
+
+def _decode(array: Any) -> List[str]:
+    table = array.dictionary
+    offsets = memoryview(table.buffers()[1]).cast("i")[table.offset : table.offset + len(table) + 1].tolist()
+    data = table.buffers()[2]
+    data = data.to_pybytes() if data is not None else b""
+    strings = [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+    return [strings[code] for code in _int32s(array.indices)]
+
+
+@contextmanager
+def open_artifact(path: Path, required_columns: Sequence[str]) -> Iterator[ImportSource]:
+    """Memory-map the artifact at ``path`` as an ``ImportSource``.
+
+    Raises ``ImportFileError`` when it expired, or lacks a required column.
+    """
+
+    import pyarrow as pa
+
+    manifest = _manifest(path)
+    if manifest is None or not path.exists():
+        raise ImportFileError("The validated file has expired; upload and validate it again.")
+    columns: List[str] = manifest["columns"]
+    _check_columns(columns, required_columns)
+
+    total = max(1, manifest["rows"])
+    read = 0
+
+    def rows(reader: Any) -> Iterator[ImportRow]:
+        nonlocal read
+        for batch in reader:
+            # By position: a CSV column may itself be called "line".
+            values = [_decode(batch.column(index)) for index in range(1, batch.num_columns)]
+            for line, record in zip(_int32s(batch.column(0)), zip(*values)):
+                yield ImportRow(line, dict(zip(columns, record)))
+            read += batch.num_rows
+
+    with pa.memory_map(str(path)) as mapped, pa.ipc.open_stream(mapped) as reader:
+        yield ImportSource(list(columns), rows(reader), lambda: read * 100 // total)
+
+
+def import_source(job_parameters: Mapping[str, Any]) -> Tuple[Path, SourceOpener]:
+    """Where an import task reads its rows: the artifact of ``validated_file_id``, else the CSV at ``file_path``."""
+
+    file_id = job_parameters.get("validated_file_id")
+    if file_id:
+        return artifact_path(str(file_id)), open_artifact
+    return upload_path(job_parameters), open_csv
+
+
+def purge_expired_artifacts(*, now: Optional[datetime] = None) -> int:
+    """Delete artifacts not validated for ``IMPORT_ARTIFACT_TTL_HOURS``, and abandoned partial files."""
+
+    directory = artifact_directory()
+    if not directory.exists():
+        return 0
+    cutoff = ((now or utcnow()) - timedelta(hours=settings.import_artifact_ttl_hours)).replace(tzinfo=UTC).timestamp()
+    removed = 0
+    for entry in directory.iterdir():
+        if entry.suffix == ARTIFACT_SUFFIX:
+            # An artifact's age is its manifest's, which validation renews.
+            manifest = entry.with_suffix(MANIFEST_SUFFIX)
+            clock = manifest if manifest.exists() else entry
+        elif entry.suffix == MANIFEST_SUFFIX and entry.with_suffix(ARTIFACT_SUFFIX).exists():
+            continue
+        else:
+            manifest = clock = entry
+        if clock.stat().st_mtime < cutoff:
+            manifest.unlink(missing_ok=True)
+            entry.unlink(missing_ok=True)
+            removed += entry.suffix == ARTIFACT_SUFFIX
+    return removed
+
+
+__all__ = [
+    "ARTIFACT_FORMAT_VERSION",
+    "ARTIFACT_SUFFIX",
+    "ValidatedFile",
+    "artifact_directory",
+    "artifact_path",
+    "file_digest",
+    "store_validated_file",
+    "open_artifact",
+    "import_source",
+    "purge_expired_artifacts",
+]
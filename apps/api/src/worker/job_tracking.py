@@ -0,0 +1,67 @@
+"""Lifecycle bookkeeping shared by all background jobs."""
+
+from __future__ import annotations
+
+import traceback
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from ..core.clock import utcnow
+from ..models.enums import BackgroundJobStatus
+from ..models.operations import BackgroundTask
+
+
+@contextmanager
+def tracked_task(db: Session, task_id: int) -> Iterator[BackgroundTask]:
+    """Mark a ``BackgroundTask`` as processing and record its final outcome.
+
+    Any exception raised inside the block rolls back pending work, stores the
+    traceback on the task record and is re-raised so RQ also marks the job failed.
+    """
+
+    task = db.get(BackgroundTask, task_id)
+    if task is None:
+        raise LookupError(f"Background task {task_id} does not exist.")
+
+    task.status = BackgroundJobStatus.PROCESSING
+    task.started_at = utcnow()
+    db.commit()
+
+    try:
+        yield task
+    except Exception as exc:
+        db.rollback()
+        task.status = BackgroundJobStatus.FAILED
+        task.result_message = f"Job {task_id} failed: {exc}"
+        task.log_output = traceback.format_exc()
+        task.completed_at = utcnow()
+        db.commit()
+        raise
+
+    if task.status == BackgroundJobStatus.PROCESSING:
+        task.status = (
+            BackgroundJobStatus.COMPLETED_PARTIAL_FAILURE
+            if task.rows_failed
+            else BackgroundJobStatus.COMPLETED_SUCCESS
+        )
+    task.progress = 100
+    task.completed_at = utcnow()
+    db.commit()
+
+
+def cancellation_requested(db: Session, task: BackgroundTask) -> bool:
+    """Reload the task's status; if an admin asked to cancel it, mark it ``cancelled`` and return ``True``.
+
+    Long jobs call this between units of work they have committed.
+    """
+
+    db.refresh(task, ["status"])
+    if task.status != BackgroundJobStatus.CANCELLATION_REQUESTED:
+        return False
+    task.status = BackgroundJobStatus.CANCELLED
+    return True
+
+
+__all__ = ["tracked_task", "cancellation_requested", "utcnow"]
@@ -0,0 +1,208 @@
+"""Import-scoped resolution of natural keys to row ids.
+
+Import files reference entities by the keys people know them by: department
+names, program codes, EDP codes, school IDs and school year/semester.
+Resolving them row by row costs one SELECT per reference, so an importer keeps
+one ``NaturalKeyResolver`` for the whole job instead:
+
+* small catalogs (departments, programs, subjects of the university, and the
+  global school terms) are loaded whole on first use, after which a lookup
+  never queries;
+* users are resolved on demand, the keys of a batch that are not cached
+  yet in one ``IN`` query per ``chunk_size`` keys, and kept in an LRU cache of
+  ``IMPORT_KEY_CACHE_ENTRIES`` so a large import stays bounded in memory;
+* rows the job inserts are registered with ``add`` or ``refresh``, so later
+  batches see them without asking the database again.
+
+A rollback of the session (a failed batch) empties every cache, since it may
+hold ids of rows that no longer exist; the next lookup loads them again.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Select, event, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.academic import Department, Program, SchoolTerm, SchoolYear, Subject
+from ..models.enums import SemesterTerm
+from ..models.identity import User
+from ..services.qualitative_cache_service import LRUCache
+
+DEPARTMENT = "department"
+PROGRAM = "program"
+SUBJECT = "subject"
+USER = "user"
+SCHOOL_TERM = "school_term"
+
+# Kinds keyed by one column unique within a university.
+_UNIVERSITY_KEYS: Dict[str, Tuple[Type[Any], str]] = {
+    DEPARTMENT: (Department, "name"),
+    PROGRAM: (Program, "program_code"),
+    SUBJECT: (Subject, "edp_code"),
+    USER: (User, "school_id"),
+}
+KINDS = (*_UNIVERSITY_KEYS, SCHOOL_TERM)
+PRELOADED_KINDS = (DEPARTMENT, PROGRAM, SUBJECT, SCHOOL_TERM)
+
+SchoolTermKey = Tuple[int, int, SemesterTerm]
+
+_SCHOOL_YEAR = re.compile(r"^\s*(\d{4})\s*-\s*(\d{4})\s*$")
+
+
+def school_term_key(school_year: str, semester: str) -> SchoolTermKey:
+    """Key of a school term written as ``2024-2025`` and ``1st Semester``; raises ``ValueError``."""
+
+    match = _SCHOOL_YEAR.match(school_year)
+    if match is None:
+        raise ValueError(f"School year '{school_year}' is not in the form 2024-2025.")
+    try:
+        term = SemesterTerm(semester.strip())
+    except ValueError:
+        allowed = ", ".join(term.value for term in SemesterTerm)
+        raise ValueError(f"Semester '{semester}' is not one of: {allowed}.") from None
+    return int(match.group(1)), int(match.group(2)), term
+
+
+class NaturalKeyResolver:
+    """Natural key to id maps of one university, filled in bulk and kept for one import job."""
+
+    def __init__(
+        self,
+        *,
+        university_id: int,
+        preload: Sequence[str] = PRELOADED_KINDS,
+        chunk_size: int = 1000,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        unknown = set(preload) - set(KINDS)
+        if unknown:
+            raise ValueError(f"Unknown key kinds {sorted(unknown)}; expected some of {KINDS}.")
+        self.university_id = university_id
+        self.chunk_size = chunk_size
+        # School terms are a small global table keyed by three columns: always loaded whole.
+        self._preload = {*preload, SCHOOL_TERM}
+        self._max_entries = max_entries or settings.import_key_cache_entries
+        self._sessions: List[Session] = []
+        self.queries = 0
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every cached key."""
+
+        self._complete: Dict[str, Dict[Hashable, int]] = {}
+        self._cached: Dict[str, LRUCache[Hashable, int]] = {
+            kind: LRUCache(self._max_entries) for kind in _UNIVERSITY_KEYS if kind not in self._preload
+        }
+
+    def _watch(self, db: Session) -> None:
+        if not any(session is db for session in self._sessions):
+            event.listen(db, "after_rollback", lambda session: self.clear())
+            self._sessions.append(db)
+
+    def _select(self, kind: str) -> Tuple[Select, Any]:
+        if kind == SCHOOL_TERM:
+            stmt = select(SchoolYear.year_start, SchoolYear.year_end, SchoolTerm.semester, SchoolTerm.id).join(
+                SchoolTerm.school_year
+            )
+            return stmt, None
+        model, column = _UNIVERSITY_KEYS[kind]
+        key = getattr(model, column)
+        return select(key, model.id).where(model.university_id == self.university_id), key
+
+    @staticmethod
+    def _pairs(kind: str, rows: Iterable[Any]) -> Iterable[Tuple[Hashable, int]]:
+        if kind == SCHOOL_TERM:
+            return (((year_start, year_end, semester), term_id) for year_start, year_end, semester, term_id in rows)
+        return ((key, row_id) for key, row_id in rows)
+
+    def _catalog(self, db: Session, kind: str) -> Dict[Hashable, int]:
+        catalog = self._complete.get(kind)
+        if catalog is None:
+            stmt, _ = self._select(kind)
+            catalog = self._complete[kind] = dict(self._pairs(kind, db.execute(stmt)))
+            self.queries += 1
+        return catalog
+
+    def _query(self, db: Session, kind: str, keys: Sequence[Hashable]) -> Dict[Hashable, int]:
+        stmt, column = self._select(kind)
+        found: Dict[Hashable, int] = {}
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start : start + self.chunk_size]
+            found.update(self._pairs(kind, db.execute(stmt.where(column.in_(chunk)))))
+            self.queries += 1
+        return found
+
+    def resolve(self, db: Session, kind: str, keys: Iterable[Hashable]) -> Dict[Hashable, int]:
+        """Ids of those ``keys`` that exist; only keys not cached yet are looked up."""
+
+        self._watch(db)
+        wanted = set(keys)
+        wanted.discard(None)
+        if kind in self._preload:
+            catalog = self._catalog(db, kind)
+            self.hits += len(wanted)
+            return {key: catalog[key] for key in wanted if key in catalog}
+
+        cache = self._cached[kind]
+        resolved: Dict[Hashable, int] = {}
+        misses: List[Hashable] = []
+        for key in wanted:
+            row_id = cache.get(key)
+            if row_id is None:
+                misses.append(key)
+            else:
+                resolved[key] = row_id
+        self.hits += len(resolved)
+        self.misses += len(misses)
+        if misses:
+            found = self._query(db, kind, misses)
+            for key, row_id in found.items():
+                cache.put(key, row_id)
+            resolved.update(found)
+        return resolved
+
+    def get(self, db: Session, kind: str, key: Hashable) -> Optional[int]:
+        return self.resolve(db, kind, (key,)).get(key)
+
+    def add(self, kind: str, key: Hashable, row_id: int) -> None:
+        """Register a row inserted by this job."""
+
+        if kind in self._complete:
+            self._complete[kind][key] = row_id
+        elif kind in self._cached:
+            self._cached[kind].put(key, row_id)
+
+    def refresh(self, db: Session, kind: str, keys: Iterable[Hashable]) -> Dict[Hashable, int]:
+        """Look ``keys`` up again, e.g. after bulk-inserting them without their ids, and register them."""
+
+        self._watch(db)
+        if kind == SCHOOL_TERM:
+            self._complete.pop(SCHOOL_TERM, None)
+            return self.resolve(db, kind, keys)
+        found = self._query(db, kind, sorted(set(keys)))
+        for key, row_id in found.items():
+            self.add(kind, key, row_id)
+        return found
+
+    def stats(self) -> Dict[str, int]:
+        return {"queries": self.queries, "hits": self.hits, "misses": self.misses}
+
+
+__all__ = [
+    "DEPARTMENT",
+    "PROGRAM",
+    "SUBJECT",
+    "USER",
+    "SCHOOL_TERM",
+    "KINDS",
+    "PRELOADED_KINDS",
+    "SchoolTermKey",
+    "school_term_key",
+    "NaturalKeyResolver",
+]
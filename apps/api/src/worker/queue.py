@@ -0,0 +1,52 @@
+"""RQ queue access for scheduling follow-up and periodic jobs from inside workers."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from ..core.clock import utcnow
+from ..core.config import settings
+
+
+@lru_cache
+def get_queue() -> Any:
+    """Return the worker queue, connecting to Redis on first use."""
+
+    from redis import Redis
+    from rq import Queue
+
+    return Queue(settings.worker_queue_name, connection=Redis.from_url(settings.redis_url))
+
+
+def enqueue_task(func: Callable[[int], None], task_id: int, *, at: Optional[datetime] = None) -> None:
+    """Enqueue ``func(task_id)``, optionally not before the naive-UTC time ``at``.
+
+    Delayed jobs need the worker to run with ``--with-scheduler``.
+    """
+
+    queue = get_queue()
+    if at is None:
+        queue.enqueue(func, task_id)
+    else:
+        queue.enqueue_at(at.replace(tzinfo=UTC), func, task_id)
+
+
+def schedule_periodic(func: Callable[[], None], every: timedelta, *, now: Optional[datetime] = None) -> datetime:
+    """Enqueue the system job ``func()`` for the first multiple of ``every`` after ``now``.
+
+    Runs land on fixed boundaries counted from the Unix epoch, and the job id is
+    the function name plus the boundary. A job that schedules its next run and a
+    worker that seeds the same job at startup therefore write the same RQ job
+    instead of starting a second chain. Returns the boundary as naive UTC.
+    """
+
+    step = every.total_seconds()
+    elapsed = (now or utcnow()).replace(tzinfo=UTC).timestamp()
+    at = datetime.fromtimestamp((elapsed // step + 1) * step, UTC)
+    get_queue().enqueue_at(at, func, job_id=f"{func.__name__}-{at:%Y%m%d%H%M%S}")
+    return at.replace(tzinfo=None)
+
+
+__all__ = ["get_queue", "enqueue_task", "schedule_periodic"]
@@ -0,0 +1,8 @@
+"""Seed the periodic system jobs: ``python -m src.worker.schedule``, run before the worker starts."""
+
+from __future__ import annotations
+
+from .tasks import schedule_periodic_jobs
+
+if __name__ == "__main__":
+    schedule_periodic_jobs()
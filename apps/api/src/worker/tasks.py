@@ -0,0 +1,391 @@
+"""RQ job entry points.
+
+Each job receives the id of its ``BackgroundTask`` record, opens its own
+session and delegates the work to the service layer. System jobs take no
+task id; the periodic ones schedule their own next run, and
+``schedule_periodic_jobs`` starts the chains when a worker starts.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Callable, List, Tuple
+
+from ..core.config import settings
+from ..core.security import password_hash_pool
+from ..db import ReadSessionLocal, SessionLocal
+from ..models.operations import BackgroundTask
+from ..services import (
+    analysis_orchestrator_service,
+    audit_log_archive_service,
+    bulk_import_service,
+    cohort_statistics_service,
+    final_aggregation_service,
+    historical_evaluation_import_service,
+    period_snapshot_service,
+    provisional_aggregate_service,
+    qualitative_analysis_service,
+    quantitative_analysis_service,
+    recycled_content_service,
+)
+from .csv_import import CsvImporter, run_csv_import
+from .import_artifacts import import_source, purge_expired_artifacts
+from .job_tracking import tracked_task
+from .queue import enqueue_task, schedule_periodic
+
+SystemJob = Callable[[], None]
+
+_PERIODIC_JOBS: List[Tuple[SystemJob, Callable[[], timedelta]]] = []
+
+
+def _periodic(every: Callable[[], timedelta]) -> Callable[[SystemJob], SystemJob]:
+    """Register a system job that schedules its next run after each run, failed or not."""
+
+    def register(func: SystemJob) -> SystemJob:
+        @wraps(func)
+        def run() -> None:
+            try:
+                func()
+            finally:
+                schedule_periodic(run, every())
+
+        _PERIODIC_JOBS.append((run, every))
+        return run
+
+    return register
+
+
+def schedule_periodic_jobs() -> None:
+    """Schedule the next run of every periodic system job.
+
+    Run when a worker starts (see ``worker.Dockerfile``); seeding a chain that
+    is already scheduled rewrites its pending run rather than adding one.
+    """
+
+    for job, every in _PERIODIC_JOBS:
+        schedule_periodic(job, every())
+
+
+def _enqueue_aggregations(tasks: List[BackgroundTask]) -> None:
+    """Enqueue newly opened FINAL_AGGREGATION windows once their rows are committed."""
+
+    for task in tasks:
+        enqueue_task(run_final_aggregation, task.id, at=datetime.fromisoformat(task.job_parameters["run_after"]))
+
+
+def run_quantitative_analysis(task_id: int) -> None:
+    """Score every Likert submission of ``job_parameters["evaluation_period_id"]``."""
+
+    db = SessionLocal()
+    try:
+        with tracked_task(db, task_id) as task:
+            period_id = int((task.job_parameters or {})["evaluation_period_id"])
+            summary = quantitative_analysis_service.score_evaluation_period(db, evaluation_period_id=period_id)
+            task.rows_total = summary.submissions_scored + summary.submissions_skipped
+            task.rows_processed = summary.submissions_scored
+            task.result_message = (
+                f"Scored {summary.submissions_scored} submissions; "
+                f"skipped {summary.submissions_skipped}."
+            )
+            aggregations = analysis_orchestrator_service.record_stage_completion(db, upstream_task=task)
+        _enqueue_aggregations(aggregations)
+    finally:
+        db.close()
+
+
+def run_qualitative_analysis(task_id: int) -> None:
+    """Run sentiment and keyword analysis over pending open-ended answers.
+
+    ``job_parameters["evaluation_period_id"]`` optionally restricts the run to one period.
+    """
+
+    db = SessionLocal()
+    try:
+        with tracked_task(db, task_id) as task:
+            period_id = (task.job_parameters or {}).get("evaluation_period_id")
+            summary = qualitative_analysis_service.analyze_pending_answers(
+                db,
+                evaluation_period_id=int(period_id) if period_id is not None else None,
+            )
+            task.rows_processed = summary.answers_processed
+            task.result_message = (
+                f"Analyzed {summary.answers_processed} answers; "
+                f"ran inference on {summary.texts_inferred} distinct texts; "
+                f"cache hit rate {summary.cache_metrics['hit_rate']:.1%}."
+            )
+            aggregations = analysis_orchestrator_service.record_stage_completion(db, upstream_task=task)
+        _enqueue_aggregations(aggregations)
+    finally:
+        db.close()
+
+
+def run_recycled_content_check(task_id: int) -> None:
+    """Flag submissions whose answers repeat the evaluator's earlier answers.
+
+    Checks ``job_parameters["submission_ids"]`` when given, otherwise every
+    submission of ``job_parameters["evaluation_period_id"]``.
+    """
+
+    db = SessionLocal()
+    try:
+        with tracked_task(db, task_id) as task:
+            params = task.job_parameters or {}
+            if params.get("submission_ids"):
+                summary = recycled_content_service.check_submissions(
+                    db,
+                    submission_ids=[int(submission_id) for submission_id in params["submission_ids"]],
+                )
+            else:
+                summary = recycled_content_service.check_evaluation_period(
+                    db,
+                    evaluation_period_id=int(params["evaluation_period_id"]),
+                )
+            task.rows_total = summary.submissions_checked
+            task.rows_processed = summary.submissions_checked
+            task.result_message = (
+                f"Checked {summary.submissions_checked} submissions; "
+                f"flagged {summary.submissions_flagged} for recycled content."
+            )
+    finally:
+        db.close()
+
+
+def run_final_aggregation(task_id: int) -> None:
+    """Normalize one cohort once its debounce window has closed.
+
+    A task whose window was extended by later triggers re-enqueues itself for the
+    new ``run_after``; a task that is no longer queued is ignored.
+    """
+
+    db = SessionLocal()
+    try:
+        claim = analysis_orchestrator_service.claim_final_aggregation(db, task_id)
+        if not claim.run_now:
+            db.commit()
+            if claim.defer_until is not None:
+                enqueue_task(run_final_aggregation, task_id, at=claim.defer_until)
+            return
+
+        with tracked_task(db, task_id) as task:
+            params = task.job_parameters or {}
+            summary = final_aggregation_service.aggregate_cohort(
+                db,
+                university_id=task.university_id,
+                evaluation_period_id=int(params["evaluation_period_id"]),
+                department_id=params.get("department_id"),
+            )
+            task.rows_total = summary.submissions_aggregated + summary.submissions_skipped
+            task.rows_processed = summary.submissions_aggregated
+            task.result_message = (
+                f"Aggregated {summary.submissions_aggregated} submissions from "
+                f"{params.get('trigger_count', 1)} coalesced triggers; "
+                f"skipped {summary.submissions_skipped} final snapshots."
+            )
+    finally:
+        db.close()
+
+
+def _run_csv_import_task(task_id: int, build_importer: Callable[[BackgroundTask], CsvImporter]) -> None:
+    """Run an import on its upload, or on the parsed artifact of ``job_parameters["validated_file_id"]``."""
+
+    db = SessionLocal()
+    try:
+        with tracked_task(db, task_id) as task:
+            path, open_source = import_source(task.job_parameters or {})
+            summary = run_csv_import(db, task, build_importer(task), path, open_source=open_source)
+            task.result_message = (
+                f"Imported {summary.rows_processed} rows ({summary.created} created, {summary.updated} updated, "
+                f"{summary.unchanged} unchanged); {summary.rows_failed} failed; "
+                f"{summary.rows_per_second:.0f} rows/s."
+            )
+            if summary.cancelled:
+                task.result_message += " Cancelled on request; rows of committed batches were kept."
+    finally:
+        db.close()
+
+
+def run_academic_structure_import(task_id: int) -> None:
+    """Import departments, programs and subjects from the CSV at ``job_parameters["file_path"]``."""
+
+    _run_csv_import_task(
+        task_id,
+        lambda task: bulk_import_service.AcademicStructureImporter(university_id=task.university_id),
+    )
+
+
+def run_user_import(task_id: int) -> None:
+    """Create the users listed in the CSV at ``job_parameters["file_path"]``.
+
+    ``job_parameters["password_mode"]`` is ``unverified`` (the default: no
+    password until the user follows a setup link) or ``school_id`` (active
+    accounts whose initial password is the school ID, hashed on every available
+    core; school IDs are printed on cards and rosters, so only request it
+    knowingly).
+    """
+
+    with password_hash_pool() as pool:
+        _run_csv_import_task(
+            task_id,
+            lambda task: bulk_import_service.UserImporter(
+                university_id=task.university_id,
+                password_mode=(task.job_parameters or {}).get(
+                    "password_mode", bulk_import_service.PASSWORD_MODE_UNVERIFIED
+                ),
+                hash_executor=pool,
+            ),
+        )
+
+
+def run_historical_evaluation_import(task_id: int) -> None:
+    """Import past evaluations from the CSV at ``job_parameters["file_path"]``.
+
+    Resumes from ``job_parameters["checkpoint"]`` when the task ran before and
+    crashed or was cancelled; enqueue the same task again to continue it.
+    """
+
+    db = SessionLocal()
+    try:
+        with tracked_task(db, task_id) as task:
+            path, open_source = import_source(task.job_parameters or {})
+            summary = historical_evaluation_import_service.import_historical_evaluations(
+                db,
+                task,
+                path,
+                open_source=open_source,
+            )
+            task.result_message = (
+                f"Merged {summary.answers_merged} answers of {summary.submissions_created} submissions; "
+                f"{summary.rows_failed} of {summary.rows_total} rows rejected."
+            )
+            if summary.resumed_from:
+                task.result_message += f" Resumed at the {summary.resumed_from} step."
+            if summary.cancelled:
+                task.result_message += " Cancelled on request; run the task again to resume it."
+    finally:
+        db.close()
+
+
+@_periodic(lambda: timedelta(seconds=settings.provisional_interval_seconds))
+def run_provisional_aggregation() -> None:
+    """Refresh ``provisional_aggregates`` from submissions past the high-water mark.
+
+    A periodic system job (every ``PROVISIONAL_INTERVAL_SECONDS``); it has no
+    ``BackgroundTask`` record and is safe to run again or concurrently (runs
+    serialize on the watermark row).
+    """
+
+    db = SessionLocal()
+    try:
+        provisional_aggregate_service.refresh_provisional_aggregates(db)
+    finally:
+        db.close()
+
+
+def run_cohort_statistics_rebuild(evaluation_period_id: int) -> None:
+    """Recompute one period's cohort statistics from its submissions' raw scores.
+
+    A system job for repairing drifted running statistics on demand; rerunning
+    it yields the same rows.
+    """
+
+    db = SessionLocal()
+    try:
+        cohort_statistics_service.rebuild_cohort_statistics(db, evaluation_period_id=evaluation_period_id)
+    finally:
+        db.close()
+
+
+def run_period_snapshot(university_id: int, evaluation_period_id: int) -> None:
+    """Export a finalized period's results to its columnar snapshot files.
+
+    A system job for rewriting one period on demand; new periods are exported
+    by ``run_pending_period_snapshots``. Rerunning it rewrites the same files.
+    It only reads, so it may run against a replica.
+    """
+
+    db = ReadSessionLocal()
+    try:
+        period_snapshot_service.write_period_snapshot(
+            db,
+            university_id=university_id,
+            evaluation_period_id=evaluation_period_id,
+        )
+    finally:
+        db.close()
+
+
+@_periodic(lambda: timedelta(hours=1))
+def run_pending_period_snapshots() -> None:
+    """Export every period whose aggregates are all locked as final and that has no snapshot yet.
+
+    A periodic system job, run on the hour; it only reads, so it runs against a
+    replica.
+    """
+
+    db = ReadSessionLocal()
+    try:
+        period_snapshot_service.write_pending_snapshots(db)
+    finally:
+        db.close()
+
+
+@_periodic(lambda: timedelta(days=1))
+def run_audit_partition_maintenance() -> None:
+    """Create the ``audit_logs`` partitions of the coming months.
+
+    A periodic system job, run daily at midnight UTC; it only adds partitions
+    that are missing, so reruns are no-ops.
+    """
+
+    db = SessionLocal()
+    try:
+        audit_log_archive_service.ensure_audit_partitions(db)
+    finally:
+        db.close()
+
+
+@_periodic(lambda: timedelta(days=1))
+def run_audit_log_archival() -> None:
+    """Move audit log months past the retention window to their archive files.
+
+    A periodic system job, run daily at midnight UTC; a month is removed from
+    the database only after its file is complete, so an interrupted run is
+    finished by the next one.
+    """
+
+    db = SessionLocal()
+    try:
+        audit_log_archive_service.archive_audit_logs(db)
+    finally:
+        db.close()
+
+
+@_periodic(lambda: timedelta(hours=1))
+def run_import_artifact_cleanup() -> None:
+    """Delete parsed import artifacts past ``IMPORT_ARTIFACT_TTL_HOURS``.
+
+    A periodic system job, run on the hour; it only touches files, so it needs
+    no session.
+    """
+
+    purge_expired_artifacts()
+
+
+__all__ = [
+    "schedule_periodic_jobs",
+    "run_quantitative_analysis",
+    "run_qualitative_analysis",
+    "run_recycled_content_check",
+    "run_final_aggregation",
+    "run_academic_structure_import",
+    "run_user_import",
+    "run_historical_evaluation_import",
+    "run_provisional_aggregation",
+    "run_cohort_statistics_rebuild",
+    "run_period_snapshot",
+    "run_pending_period_snapshots",
+    "run_audit_partition_maintenance",
+    "run_audit_log_archival",
+    "run_import_artifact_cleanup",
+]
@@ -0,0 +1,66 @@
+"""Shared pytest fixtures for the API test suite."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  # ensures model metadata is registered
+from src.db import Base
+from src.db.instrumentation import QueryStats, track_all_queries
+from src.repositories.loading import RAISELOAD_KEY
+
+
+@pytest.fixture()
+def db_engine() -> Iterator[Engine]:
+    """In-memory SQLite engine with the full schema created."""
+
+    engine = create_engine(
+        "sqlite://",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def db_session(db_engine: Engine) -> Iterator[Session]:
+    """Session bound to the in-memory test database.
+
+    Lazy loads that would query raise, so tests catch N+1 patterns; load what
+    you need with a profile from ``src.repositories.loading``.
+    """
+
+    with Session(db_engine, info={RAISELOAD_KEY: True}) as session:
+        yield session
+
+
+@pytest.fixture()
+def assert_max_queries() -> Callable[[int], ContextManager[QueryStats]]:
+    """Fail the test when the block issues more than ``limit`` SQL statements.
+
+    Counts statements from every thread, so it also covers requests made with
+    ``TestClient``::
+
+        with assert_max_queries(3):
+            client.get("/api/v1/...")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int) -> Iterator[QueryStats]:
+        with track_all_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"{stats.count} queries issued, at most {limit} expected:\n{stats.report()}"
+
+    return _assert_max_queries
@@ -0,0 +1,43 @@
+"""Tests for the async engine and session dependency."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.db import async_url
+
+
+def test_async_url_swaps_in_asyncio_drivers() -> None:
+    assert async_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+    assert async_url("mysql+pymysql://app:secret@db:3306/proficiency") == (
+        "mysql+aiomysql://app:secret@db:3306/proficiency"
+    )
+    with pytest.raises(ValueError):
+        async_url("oracle://db/proficiency")
+
+
+def test_async_session_runs_orm_queries(tmp_path) -> None:
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from src.db import Base
+    from src.models.identity import University
+
+    async def scenario() -> list[str]:
+        engine = create_async_engine(async_url(f"sqlite:///{tmp_path / 'async.db'}"))
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+            async with sessions() as db:
+                db.add(University(name="Async University"))
+                await db.commit()
+            async with sessions() as db:
+                return list(await db.scalars(select(University.name)))
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == ["Async University"]
@@ -0,0 +1,57 @@
+"""Tests for keyset pagination over append-only tables."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.identity import University
+from src.models.operations import AuditLog
+from src.repositories.audit_log_repository import audit_log_repository
+from src.repositories.keyset import InvalidCursorError, UnindexedSortError
+
+
+def test_pages_cover_every_row_once_and_cursors_are_bound_to_filters(db_session) -> None:
+    university = University(name="Keyset University")
+    db_session.add(university)
+    db_session.flush()
+    start = datetime(2026, 1, 1)
+    # Pairs of rows share a timestamp, so the id tie-breaker decides their order.
+    db_session.add_all(
+        AuditLog(
+            university_id=university.id,
+            action="LOGIN" if index % 3 else "EXPORT",
+            ip_address="127.0.0.1",
+            timestamp=start + timedelta(minutes=index // 2),
+        )
+        for index in range(23)
+    )
+    db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = audit_log_repository.list_page(db_session, university_id=university.id, cursor=cursor, limit=5)
+        seen.extend(page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+    assert len(seen) == 23
+    assert len({row.id for row in seen}) == 23
+    assert [(row.timestamp, row.id) for row in seen] == sorted(((r.timestamp, r.id) for r in seen), reverse=True)
+
+    first = audit_log_repository.list_page(db_session, university_id=university.id, limit=5)
+    with pytest.raises(InvalidCursorError):
+        audit_log_repository.list_page(
+            db_session, university_id=university.id, action="LOGIN", cursor=first.next_cursor, limit=5
+        )
+    with pytest.raises(InvalidCursorError):
+        audit_log_repository.list_page(db_session, university_id=university.id, cursor="not-a-cursor")
+
+
+def test_unindexed_or_nullable_sort_keys_are_refused(db_session) -> None:
+    with pytest.raises(UnindexedSortError):
+        audit_log_repository.paginate(db_session, sort="ip_address")
+    with pytest.raises(UnindexedSortError):
+        audit_log_repository.paginate(db_session, sort="actor_user_id")
+    assert audit_log_repository.paginate(db_session, sort="action").items == []
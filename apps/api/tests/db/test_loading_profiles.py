@@ -0,0 +1,45 @@
+"""Tests for named loading profiles and strict lazy loading."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from src.repositories.evaluation_submission_repository import evaluation_submission_repository
+from src.repositories.user_repository import user_repository
+from src.services.quantitative_analysis_service import score_evaluation_period
+from tests.factories import add_submission, seed_evaluation_period
+
+
+def test_profiles_load_in_bounded_queries_and_raise_on_anything_else(db_session, assert_max_queries) -> None:
+    fixture = seed_evaluation_period(db_session)
+    for values in ([5, 4, 3, 2], [4, 4, 4, 4], [1, 2, 3, 4]):
+        add_submission(db_session, fixture, likert_values=values, comment="Clear lectures")
+    db_session.commit()
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    period_id, evaluatee_id = fixture.period.id, fixture.evaluatees[0].id
+    db_session.expunge_all()
+
+    with assert_max_queries(1):
+        rows = evaluation_submission_repository.list_for_evaluatee(
+            db_session, evaluation_period_id=period_id, evaluatee_id=evaluatee_id
+        )
+        assert [row.evaluatee.id for row in rows] == [evaluatee_id] * 3
+        assert all(row.numerical_aggregate is not None and row.flag is None for row in rows)
+    with pytest.raises(InvalidRequestError):
+        rows[0].likert_answers
+
+    db_session.expunge_all()
+    with assert_max_queries(5):
+        detail = evaluation_submission_repository.get(db_session, rows[0].id)
+        assert len(detail.likert_answers) == 4
+        assert [answer.keywords for answer in detail.open_ended_answers] == [[]]
+        assert detail.subject_offering.subject.name
+    with pytest.raises(InvalidRequestError):
+        detail.evaluator
+
+    with assert_max_queries(3):
+        user = user_repository.get(db_session, evaluatee_id)
+        assert user.university.name and user.user_roles == []
+    with pytest.raises(ValueError, match="Unknown loading profile"):
+        user_repository.get(db_session, evaluatee_id, profile="submission_detail")
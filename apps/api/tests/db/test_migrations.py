@@ -16,7 +16,7 @@ from sqlalchemy.orm import Session
 from src.models.academic import Department, Program
 from src.models.identity import University
 
-HEAD_REVISION = "e7bc8b1da6f7"
+HEAD_REVISION = "9b4e27c1d5a3"
 
 
 @contextmanager
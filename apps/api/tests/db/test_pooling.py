@@ -0,0 +1,50 @@
+"""Tests for pool profiles and pool telemetry."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import exc, text
+
+from src.db import build_engine, pool_profile
+from src.db.pooling import PoolProfile, pool_status
+
+
+def test_profiles_come_from_settings() -> None:
+    api, worker = pool_profile("api"), pool_profile("worker")
+    assert api.pool_size > worker.pool_size
+    assert api.pool_timeout < worker.pool_timeout
+    with pytest.raises(ValueError):
+        pool_profile("batch")
+
+
+def test_pool_reports_occupancy_waits_and_timeouts(tmp_path) -> None:
+    profile = PoolProfile(
+        name="test",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_recycle=-1,
+        pre_ping="idle",
+        pre_ping_idle_seconds=0,
+    )
+    engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}", profile)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        held = engine.connect()
+        assert pool_status(engine)["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        held.close()
+        # Idle pre-ping runs on this checkout and finds the connection healthy.
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        status = pool_status(engine)
+        assert (status["size"], status["checked_out"], status["overflow"]) == (1, 0, 0)
+        assert (status["checkouts"], status["timeouts"], status["connects"]) == (3, 1, 1)
+        assert status["pre_ping_failures"] == 0
+        assert sum(status["wait_histogram"].values()) == 3
+        assert status["p95_wait_ms"] is not None
+    finally:
+        engine.dispose()
@@ -0,0 +1,47 @@
+"""Tests for per-request SQL instrumentation."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from src.api.middleware import sql_instrumentation_middleware
+from src.db.instrumentation import normalize_statement, track_queries
+from src.models.academic import Department
+from src.models.identity import University
+
+
+def test_lazy_load_loop_is_reported_as_repeated_statement(db_session, assert_max_queries) -> None:
+    university = University(name="Instrumented University")
+    db_session.add_all(Department(name=f"Department {index}", university=university) for index in range(6))
+    db_session.commit()
+    db_session.expire_all()
+
+    with track_queries() as stats:
+        for department in db_session.scalars(select(Department)):
+            assert department.university.name
+    assert stats.count == 2  # one lazy load; the rest hit the identity map
+    db_session.expire_all()
+
+    with pytest.raises(AssertionError, match="at most 1 expected"):
+        with assert_max_queries(1):
+            for department in db_session.scalars(select(Department)):
+                db_session.refresh(department)
+    with track_queries() as stats:
+        for department in db_session.scalars(select(Department)):
+            db_session.refresh(department)
+    ((pattern, count),) = stats.repeated(5)
+    assert count == 6 and pattern.startswith("SELECT departments.id")
+    assert normalize_statement("SELECT 1\n  FROM t WHERE id IN (?, ?,?)") == "SELECT 1 FROM t WHERE id IN (...)"
+
+
+def test_responses_carry_server_timing_header() -> None:
+    # SQL_INSTRUMENTATION is off by default, so wire the middleware into a bare app.
+    app = FastAPI()
+    app.middleware("http")(sql_instrumentation_middleware)
+    app.get("/health")(lambda: {"status": "ok"})
+    with TestClient(app) as client:
+        response = client.get("/health")
+    assert response.headers["Server-Timing"] == 'db;dur=0.0;desc="0 queries"'
@@ -0,0 +1,42 @@
+"""Tests for the flat dashboard read models."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.models.enums import EvaluationSubmissionStatus
+from src.repositories.read_model_repository import (
+    NumericalAggregateRow,
+    SubmissionRow,
+    read_model_repository,
+)
+from src.services.quantitative_analysis_service import score_evaluation_period
+from tests.factories import add_submission, seed_evaluation_period
+
+
+def test_read_models_are_slotted_rows_with_float_scores(db_session, assert_max_queries) -> None:
+    fixture = seed_evaluation_period(db_session, evaluatee_count=2)
+    first, second = fixture.evaluatees
+    for evaluatee, values in ((first, [5, 4, 3, 2]), (first, [4, 4, 4, 4]), (second, [1, 2, 3, 4])):
+        add_submission(db_session, fixture, likert_values=values, evaluatee=evaluatee)
+    db_session.commit()
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    period_id, first_id, second_id = fixture.period.id, first.id, second.id
+
+    with assert_max_queries(2):
+        submissions = read_model_repository.list_submissions(db_session, evaluation_period_id=period_id)
+        aggregates = read_model_repository.list_numerical_aggregates(
+            db_session, evaluation_period_id=period_id, evaluatee_ids=[first_id]
+        )
+
+    assert all(isinstance(row, SubmissionRow) for row in submissions)
+    assert [row.evaluatee_id for row in submissions] == [first_id, first_id, second_id]
+    assert submissions[0].status is EvaluationSubmissionStatus.SUBMITTED
+    assert not hasattr(submissions[0], "__dict__")
+
+    assert [type(row) for row in aggregates] == [NumericalAggregateRow, NumericalAggregateRow]
+    assert {row.evaluatee_id for row in aggregates} == {first_id}
+    assert all(type(row.quant_score_raw) is float and type(row.cohort_std_dev) is float for row in aggregates)
+    assert aggregates[0].quant_score_raw == pytest.approx(3.7)
+    assert type(aggregates[0].cohort_n) is int
+    assert read_model_repository.list_sentiment_aggregates(db_session, evaluation_period_id=period_id) == []
@@ -0,0 +1,65 @@
+"""Tests for read-replica routing and the read-your-writes guard."""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.db import Base
+from src.db.routing import (
+    READ_ONLY_KEY,
+    ReplicaSet,
+    RoutingSession,
+    StalenessGuard,
+    replica_reads,
+    set_session_user,
+)
+from src.models.identity import University
+
+
+def _factories(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(University.__table__.insert(), {"name": name})
+    options = {
+        "class_": RoutingSession,
+        "bind": primary,
+        "replicas": ReplicaSet([replica]),
+        "guard": StalenessGuard(60),
+    }
+    return sessionmaker(**options), sessionmaker(**options, info={READ_ONLY_KEY: 1})
+
+
+def _source(db) -> str:
+    return db.scalars(select(University.name).order_by(University.id).limit(1)).one()
+
+
+def test_reads_go_to_replica_until_the_session_or_user_writes(tmp_path) -> None:
+    write_sessions, read_sessions = _factories(tmp_path)
+
+    with read_sessions() as db:
+        assert _source(db) == "replica"
+        assert db.scalars(select(University.name).limit(1).with_for_update()).one() == "primary"
+        db.add(University(name="added"))
+        db.flush()
+        assert _source(db) == "primary"
+        db.rollback()
+        assert _source(db) == "replica"
+
+    with write_sessions() as db:
+        assert _source(db) == "primary"
+        with replica_reads(db):
+            assert _source(db) == "replica"
+        set_session_user(db, 7)
+        db.add(University(name="by user 7"))
+        db.commit()
+
+    with read_sessions() as db:
+        set_session_user(db, 7)
+        assert _source(db) == "primary"
+    with read_sessions() as db:
+        set_session_user(db, 8)
+        assert _source(db) == "replica"
@@ -0,0 +1,184 @@
+"""Helpers that seed a minimal, consistent evaluation dataset for tests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import count
+from typing import List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from src.models.academic import (
+    AssessmentPeriod,
+    Department,
+    SchoolTerm,
+    SchoolYear,
+    Subject,
+    SubjectOffering,
+)
+from src.models.enums import (
+    AssessmentPeriodName,
+    EvaluationAudience,
+    QuestionType,
+    SemesterTerm,
+)
+from src.models.evaluation_config import (
+    EvaluationCriterion,
+    EvaluationFormTemplate,
+    EvaluationPeriod,
+    EvaluationQuestion,
+    LikertScaleTemplate,
+)
+from src.models.evaluation_submission import (
+    EvaluationLikertAnswer,
+    EvaluationOpenEndedAnswer,
+    EvaluationSubmission,
+)
+from src.models.identity import University, User
+
+_sequence = count(1)
+
+
+@dataclass
+class EvaluationFixture:
+    """Handles to the rows created by ``seed_evaluation_period``."""
+
+    university: University
+    department: Department
+    period: EvaluationPeriod
+    offering: SubjectOffering
+    criteria: List[EvaluationCriterion]
+    likert_questions: List[EvaluationQuestion]
+    open_ended_question: EvaluationQuestion
+    evaluatees: List[User] = field(default_factory=list)
+
+
+def make_user(session: Session, university: University, **overrides) -> User:
+    """Create a user with unique identifiers."""
+
+    n = next(_sequence)
+    values = {
+        "school_id": f"S-{n:05d}",
+        "first_name": "Test",
+        "last_name": f"User{n}",
+        "email": f"user{n}@example.edu",
+        "password_hash": "x",
+    }
+    values.update(overrides)
+    user = User(university=university, **values)
+    session.add(user)
+    return user
+
+
+def seed_evaluation_period(
+    session: Session,
+    *,
+    criterion_weights: Sequence[float] = (60.0, 40.0),
+    questions_per_criterion: int = 2,
+    evaluatee_count: int = 1,
+) -> EvaluationFixture:
+    """Create a university with one active period, form, offering and evaluatees."""
+
+    n = next(_sequence)
+    university = University(name=f"University {n}")
+    department = Department(name=f"College {n}", university=university)
+    school_year = SchoolYear(year_start=2000 + n, year_end=2001 + n)
+    term = SchoolTerm(school_year=school_year, semester=SemesterTerm.FIRST)
+    assessment = session.query(AssessmentPeriod).filter_by(name=AssessmentPeriodName.MIDTERM).one_or_none()
+    if assessment is None:
+        assessment = AssessmentPeriod(name=AssessmentPeriodName.MIDTERM)
+    scale = LikertScaleTemplate(name=f"Scale {n}", point_values={"1": "Poor", "5": "Excellent"}, min_value=1, max_value=5)
+    form = EvaluationFormTemplate(
+        university=university,
+        name=f"Form {n}",
+        likert_scale_template=scale,
+        intended_for=EvaluationAudience.STUDENTS,
+    )
+
+    criteria: List[EvaluationCriterion] = []
+    likert_questions: List[EvaluationQuestion] = []
+    for index, weight in enumerate(criterion_weights):
+        criterion = EvaluationCriterion(form_template=form, name=f"Criterion {index}", weight=weight, order=index)
+        criteria.append(criterion)
+        for q in range(questions_per_criterion):
+            likert_questions.append(
+                EvaluationQuestion(
+                    form_template=form,
+                    criterion=criterion,
+                    question_text=f"Q{index}.{q}",
+                    question_type=QuestionType.LIKERT,
+                )
+            )
+    open_ended = EvaluationQuestion(
+        form_template=form,
+        question_text="Comments",
+        question_type=QuestionType.OPEN_ENDED,
+    )
+
+    period = EvaluationPeriod(
+        university=university,
+        school_term=term,
+        assessment_period=assessment,
+        student_form_template=form,
+        start_date_time=datetime(2025, 1, 1),
+        end_date_time=datetime(2025, 1, 31),
+    )
+    evaluatees = [make_user(session, university) for _ in range(evaluatee_count)]
+    subject = Subject(
+        university=university,
+        department=department,
+        edp_code=f"EDP-{n}",
+        subject_code=f"SUB-{n}",
+        name=f"Subject {n}",
+    )
+    offering = SubjectOffering(university=university, subject=subject, faculty=evaluatees[0], school_term=term)
+
+    session.add_all([period, offering, open_ended, *likert_questions])
+    session.flush()
+    return EvaluationFixture(
+        university=university,
+        department=department,
+        period=period,
+        offering=offering,
+        criteria=criteria,
+        likert_questions=likert_questions,
+        open_ended_question=open_ended,
+        evaluatees=evaluatees,
+    )
+
+
+def add_submission(
+    session: Session,
+    fixture: EvaluationFixture,
+    *,
+    likert_values: Sequence[Optional[int]],
+    comment: Optional[str] = None,
+    evaluatee: Optional[User] = None,
+    evaluator: Optional[User] = None,
+    submitted_at: Optional[datetime] = None,
+) -> EvaluationSubmission:
+    """Create a submission with answers aligned to ``fixture.likert_questions``."""
+
+    submission = EvaluationSubmission(
+        university=fixture.university,
+        evaluation_period=fixture.period,
+        evaluator=evaluator or make_user(session, fixture.university),
+        evaluatee=evaluatee or fixture.evaluatees[0],
+        subject_offering=fixture.offering,
+    )
+    if submitted_at is not None:
+        submission.submitted_at = submitted_at
+    submission.likert_answers = [
+        EvaluationLikertAnswer(question=question, answer_value=value)
+        for question, value in zip(fixture.likert_questions, likert_values)
+        if value is not None
+    ]
+    if comment is not None:
+        submission.open_ended_answers = [
+            EvaluationOpenEndedAnswer(question=fixture.open_ended_question, answer_text=comment)
+        ]
+    session.add(submission)
+    session.flush()
+    return submission
+
@@ -0,0 +1,106 @@
+"""Tests for FINAL_AGGREGATION fan-in and cohort aggregation."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import joinedload
+
+from src.core.config import settings
+from src.models.analysis import NumericalAggregate, OpenEndedSentiment, SentimentAggregate
+from src.models.enums import AnalysisPipelineStatus, BackgroundJobType, SentimentLabel
+from src.models.operations import BackgroundTask
+from src.services.analysis_orchestrator_service import claim_final_aggregation, record_stage_completion
+from src.services.final_aggregation_service import aggregate_cohort
+from src.services.quantitative_analysis_service import score_evaluation_period
+from tests.factories import add_submission, make_user, seed_evaluation_period
+
+T0 = datetime(2025, 1, 31, 12, 0, 0)
+
+
+def _upstream(db_session, fixture, job_type: BackgroundJobType) -> BackgroundTask:
+    task = BackgroundTask(
+        university=fixture.university,
+        job_type=job_type,
+        submitted_by=make_user(db_session, fixture.university),
+        job_parameters={"evaluation_period_id": fixture.period.id},
+    )
+    db_session.add(task)
+    db_session.flush()
+    return task
+
+
+def test_triggers_coalesce_into_one_debounced_run_per_cohort(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    quiet = [add_submission(db_session, fixture, likert_values=[v] * 4) for v in (2, 3, 5)]
+    commented = add_submission(db_session, fixture, likert_values=[4] * 4, comment="Clear lessons")
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+
+    quant = _upstream(db_session, fixture, BackgroundJobType.QUANTITATIVE_ANALYSIS)
+    created = record_stage_completion(db_session, upstream_task=quant, now=T0)
+    assert len(created) == 1
+    assert commented.analysis_status == AnalysisPipelineStatus.PENDING
+    assert {s.analysis_status for s in quiet} == {AnalysisPipelineStatus.QUANT_QUAL_COMPLETE}
+
+    db_session.add(
+        OpenEndedSentiment(
+            open_ended_answer_id=commented.open_ended_answers[0].id,
+            predicted_sentiment_label=SentimentLabel.POSITIVE,
+            predicted_sentiment_label_score=0.9,
+            positive_score=0.9,
+            neutral_score=0.05,
+            negative_score=0.05,
+            confidence=0.8,
+        )
+    )
+    qual = _upstream(db_session, fixture, BackgroundJobType.QUALITATIVE_ANALYSIS)
+    assert record_stage_completion(db_session, upstream_task=qual, now=T0 + timedelta(seconds=30)) == []
+
+    task = created[0]
+    debounce = timedelta(seconds=settings.final_aggregation_debounce_seconds)
+    assert task.job_type == BackgroundJobType.FINAL_AGGREGATION
+    assert task.job_parameters["department_id"] == fixture.department.id
+    assert task.job_parameters["trigger_count"] == 2
+    assert task.job_parameters["submissions_ready"] == 4
+    assert [entry["task_id"] for entry in task.job_parameters["upstream_tasks"]] == [quant.id, qual.id]
+    assert task.job_parameters["run_after"] == (T0 + timedelta(seconds=30) + debounce).isoformat()
+
+    deferred = claim_final_aggregation(db_session, task.id, now=T0 + timedelta(seconds=31))
+    assert not deferred.run_now
+    assert deferred.defer_until == T0 + timedelta(seconds=30) + debounce
+    assert claim_final_aggregation(db_session, task.id, now=T0 + timedelta(hours=1)).run_now
+
+
+def test_aggregate_cohort_writes_weighted_z_scores(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    for value in (2, 3, 5):
+        add_submission(db_session, fixture, likert_values=[value] * 4)
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    record_stage_completion(
+        db_session,
+        upstream_task=_upstream(db_session, fixture, BackgroundJobType.QUANTITATIVE_ANALYSIS),
+        now=T0,
+    )
+
+    summary = aggregate_cohort(
+        db_session,
+        university_id=fixture.university.id,
+        evaluation_period_id=fixture.period.id,
+        department_id=fixture.department.id,
+    )
+
+    aggregates = (
+        db_session.query(NumericalAggregate)
+        .options(joinedload(NumericalAggregate.submission))
+        .order_by(NumericalAggregate.quant_score_raw)
+        .all()
+    )
+    assert summary.submissions_aggregated == 3
+    assert [float(a.z_quant) for a in aggregates] == pytest.approx([-0.8729, -0.2182, 1.0911], abs=1e-4)
+    assert [float(a.final_score_60_40) for a in aggregates] == pytest.approx(
+        [0.6 * float(a.z_quant) for a in aggregates], abs=1e-4
+    )
+    assert {a.cohort_n for a in aggregates} == {3}
+    assert db_session.query(SentimentAggregate).count() == 0
+    assert {a.submission.analysis_status for a in aggregates} == {AnalysisPipelineStatus.AGGREGATION_COMPLETE}
@@ -0,0 +1,97 @@
+"""Tests for audit log archival and archive reads."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from sqlalchemy import func, select
+
+from src.core.config import settings
+from src.models.identity import University
+from src.models.operations import AuditLog
+from src.services import audit_log_archive_service
+from src.services.audit_log_archive_service import (
+    archive_audit_logs,
+    archived_months,
+    ensure_audit_partitions,
+    read_archived_audit_logs,
+)
+from src.worker import queue, tasks
+
+
+def test_months_past_retention_move_to_queryable_archive_files(db_session, monkeypatch, tmp_path) -> None:
+    storage = settings.model_copy(update={"storage_root": str(tmp_path), "audit_log_retention_months": 2})
+    monkeypatch.setattr(audit_log_archive_service, "settings", storage)
+    first, second = University(name="First"), University(name="Second")
+    db_session.add_all([first, second])
+    db_session.flush()
+    for university, month, action in (
+        (first, 1, "LOGIN"),
+        (first, 1, "EXPORT"),
+        (second, 1, "LOGIN"),
+        (first, 3, "LOGIN"),
+        (first, 4, "LOGIN"),
+        (first, 6, "LOGIN"),
+    ):
+        db_session.add(
+            AuditLog(
+                university_id=university.id,
+                action=action,
+                details={"month": month},
+                ip_address="127.0.0.1",
+                timestamp=datetime(2026, month, 15, 9, 30),
+            )
+        )
+    db_session.commit()
+
+    now = datetime(2026, 6, 20)
+    assert ensure_audit_partitions(db_session, now=now) == []  # SQLite has no partitions.
+    summary = archive_audit_logs(db_session, now=now)
+
+    assert summary.months_archived == ["2026-01", "2026-03"]
+    assert summary.rows_archived == 4
+    assert archived_months() == [date(2026, 1, 1), date(2026, 3, 1)]
+    remaining = db_session.scalars(select(AuditLog.timestamp).order_by(AuditLog.timestamp)).all()
+    assert [stamp.month for stamp in remaining] == [4, 6]
+    assert archive_audit_logs(db_session, now=now).rows_archived == 0
+
+    table = read_archived_audit_logs(university_id=first.id, since=datetime(2026, 1, 1), until=datetime(2026, 4, 1))
+    rows = table.to_pylist()
+    assert [row["timestamp"].month for row in rows] == [3, 1, 1]
+    assert {row["details"] for row in rows} == {'{"month": 3}', '{"month": 1}'}
+
+    logins = read_archived_audit_logs(
+        university_id=first.id,
+        since=datetime(2026, 1, 1),
+        until=datetime(2026, 2, 1),
+        action="LOGIN",
+        columns=["id", "action"],
+    )
+    assert logins.column_names == ["id", "action"]
+    assert logins.num_rows == 1
+    empty = read_archived_audit_logs(university_id=first.id, since=datetime(2025, 1, 1), until=datetime(2025, 6, 1))
+    assert empty is None
+    assert db_session.scalar(select(func.count()).select_from(AuditLog)) == 2
+
+
+def test_audit_jobs_are_seeded_for_the_next_midnight(monkeypatch) -> None:
+    scheduled = {}
+
+    class _Queue:
+        def enqueue_at(self, at, func, *, job_id):
+            scheduled[func] = (at, job_id)
+
+    monkeypatch.setattr(queue, "get_queue", _Queue)
+    monkeypatch.setattr(queue, "utcnow", lambda: datetime(2025, 3, 9, 17, 45))
+    tasks.schedule_periodic_jobs()
+
+    midnight = datetime(2025, 3, 10, tzinfo=UTC)
+    assert scheduled[tasks.run_audit_partition_maintenance] == (
+        midnight,
+        "run_audit_partition_maintenance-20250310000000",
+    )
+    assert scheduled[tasks.run_audit_log_archival] == (midnight, "run_audit_log_archival-20250310000000")
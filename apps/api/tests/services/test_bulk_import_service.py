@@ -0,0 +1,263 @@
+"""Tests for the streaming CSV importers."""
+
+from __future__ import annotations
+
+import csv
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.core import security
+from src.core.config import settings
+from src.core.security import InvalidTokenError, password_hash_pool, verify_password
+from src.models.academic import Department, DepartmentClosure, Program, SchoolTerm, SchoolYear, Subject
+from src.models.enums import BackgroundJobStatus, BackgroundJobType, SemesterTerm, UserStatus
+from src.models.identity import Role, University, User, UserRole
+from src.models.operations import BackgroundTask
+from src.services.account_setup_service import complete_password_setup, password_setup_token
+from src.services.bulk_import_service import PASSWORD_MODE_SCHOOL_ID, AcademicStructureImporter, UserImporter
+from src.worker import csv_import, import_artifacts, queue, tasks
+from src.worker.csv_import import ImportFileError, run_csv_import
+from src.worker.import_artifacts import (
+    artifact_path,
+    import_source,
+    open_artifact,
+    purge_expired_artifacts,
+    store_validated_file,
+)
+from src.worker.job_tracking import tracked_task
+from src.worker.key_resolver import PROGRAM, SCHOOL_TERM, USER, NaturalKeyResolver, school_term_key
+from tests.factories import make_user
+
+STRUCTURE = """record_type,department,parent_department,short_name,program_code,edp_code,subject_code,name
+department,College of Engineering,,COE,,,,
+department,Civil Engineering,College of Engineering,CE,,,,
+program,Civil Engineering,,,BSCE,,,BS Civil Engineering
+subject,Civil Engineering,,,,E-101,CE 101,Statics
+subject,Architecture,,,,E-102,AR 101,Design
+subject,Civil Engineering,,,,E-101,CE 102,Dynamics
+course,Civil Engineering,,,,,,
+"""
+
+
+@pytest.fixture()
+def storage(monkeypatch, tmp_path):
+    stored = settings.model_copy(update={"storage_root": str(tmp_path)})
+    monkeypatch.setattr(csv_import, "settings", stored)
+    monkeypatch.setattr(import_artifacts, "settings", stored)
+    return tmp_path
+
+
+def _task(db_session, job_type: BackgroundJobType) -> BackgroundTask:
+    university = University(name="Import University")
+    admin = make_user(db_session, university)
+    task = BackgroundTask(university=university, job_type=job_type, submitted_by=admin)
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def _import(db_session, task, importer, path, **kwargs):
+    with tracked_task(db_session, task.id) as tracked:
+        return run_csv_import(db_session, tracked, importer, path, **kwargs)
+
+
+def test_academic_structure_import_commits_batches_and_reports_failed_rows(db_session, storage) -> None:
+    task = _task(db_session, BackgroundJobType.ACADEMIC_STRUCTURE_IMPORT)
+    university_id = task.university_id
+    path = storage / "structure.csv"
+    path.write_text(STRUCTURE, encoding="utf-8")
+
+    summary = _import(db_session, task, AcademicStructureImporter(university_id=university_id), path, batch_size=3)
+
+    assert (summary.rows_processed, summary.rows_failed, summary.created) == (4, 3, 4)
+    assert summary.rows_per_second > 0
+    assert (task.status, task.rows_total, task.rows_processed, task.rows_failed, task.progress) == (
+        BackgroundJobStatus.COMPLETED_PARTIAL_FAILURE,
+        7,
+        4,
+        3,
+        100,
+    )
+    college, civil = db_session.scalars(select(Department).order_by(Department.id)).all()
+    assert (civil.parent_department_id, civil.short_name) == (college.id, "CE")
+    assert db_session.scalar(
+        select(DepartmentClosure.depth).where(
+            DepartmentClosure.ancestor_id == college.id,
+            DepartmentClosure.descendant_id == civil.id,
+        )
+    ) == 1
+    assert db_session.scalars(select(Program.program_code)).all() == ["BSCE"]
+    assert db_session.execute(select(Subject.edp_code, Subject.name)).all() == [("E-101", "Statics")]
+    with open(task.result_storage_path, newline="", encoding="utf-8") as report:
+        failed = {row["line"]: row["error"] for row in csv.DictReader(report)}
+    assert sorted(failed) == ["6", "7", "8"]
+    assert "Architecture" in failed["6"] and "listed earlier" in failed["7"] and "record_type" in failed["8"]
+
+    rerun = _task(db_session, BackgroundJobType.ACADEMIC_STRUCTURE_IMPORT)
+    path.write_text(STRUCTURE.replace("Statics", "Statics of Rigid Bodies"), encoding="utf-8")
+    summary = _import(db_session, rerun, AcademicStructureImporter(university_id=university_id), path)
+    assert (summary.created, summary.updated, summary.unchanged) == (0, 1, 3)
+    assert db_session.scalars(select(Subject.name)).all() == ["Statics of Rigid Bodies"]
+
+
+def test_user_import_hashes_school_ids_and_skips_existing_users(db_session, storage, monkeypatch) -> None:
+    monkeypatch.setattr(security, "settings", settings.model_copy(update={"password_bcrypt_rounds": 4}))
+    task = _task(db_session, BackgroundJobType.USER_IMPORT)
+    db_session.add_all([Role(name="Student"), Role(name="Faculty")])
+    db_session.commit()
+    path = storage / "users.csv"
+    path.write_text(
+        "school_id,first_name,last_name,email,role\n"
+        "2025-001,Ana,Reyes,Ana.Reyes@example.edu,Student\n"
+        "2025-002,Ben,Cruz,ben.cruz@example.edu,faculty\n"
+        "2025-003,Cai,Lim,not-an-email,Student\n"
+        "2025-004,Dan,Uy,dan@example.edu,Janitor\n",
+        encoding="utf-8",
+    )
+
+    importer = UserImporter(university_id=task.university_id, password_mode=PASSWORD_MODE_SCHOOL_ID)
+    summary = _import(db_session, task, importer, path, batch_size=2)
+    assert (summary.rows_processed, summary.rows_failed, summary.created) == (2, 2, 2)
+    ana = db_session.scalars(select(User).where(User.school_id == "2025-001")).one()
+    assert (ana.email, ana.status) == ("ana.reyes@example.edu", UserStatus.ACTIVE)
+    assert verify_password("2025-001", ana.password_hash)
+    role = db_session.scalar(select(Role.name).join(UserRole).where(UserRole.user_id == ana.id))
+    assert role == "Student"
+
+    rerun = _task(db_session, BackgroundJobType.USER_IMPORT)
+    importer = UserImporter(university_id=task.university_id, password_mode=PASSWORD_MODE_SCHOOL_ID)
+    summary = _import(db_session, rerun, importer, path)
+    assert (summary.created, summary.unchanged, summary.rows_failed) == (0, 2, 2)
+
+    path.write_text("school_id,first_name\n1,A\n", encoding="utf-8")
+    with pytest.raises(ImportFileError, match="email, role"):
+        _import(db_session, _task(db_session, BackgroundJobType.USER_IMPORT), UserImporter(university_id=1), path)
+
+
+def test_user_import_hashes_on_a_process_pool(db_session, storage, monkeypatch) -> None:
+    monkeypatch.setattr(security, "settings", settings.model_copy(update={"password_bcrypt_rounds": 4}))
+    task = _task(db_session, BackgroundJobType.USER_IMPORT)
+    db_session.add(Role(name="Student"))
+    db_session.commit()
+    path = storage / "users.csv"
+    path.write_text(
+        "school_id,first_name,last_name,email,role\n"
+        + "".join(f"P-{n},First,Last,s{n}@example.edu,Student\n" for n in range(6)),
+        encoding="utf-8",
+    )
+
+    with password_hash_pool(workers=2) as pool:
+        importer = UserImporter(
+            university_id=task.university_id,
+            password_mode=PASSWORD_MODE_SCHOOL_ID,
+            hash_executor=pool,
+        )
+        summary = _import(db_session, task, importer, path)
+
+    assert summary.created == 6
+    users = db_session.execute(select(User.school_id, User.password_hash).where(User.school_id.like("P-%"))).all()
+    assert all(verify_password(school_id, password_hash) for school_id, password_hash in users)
+
+
+def test_user_import_defaults_to_setup_links_instead_of_known_passwords(db_session, storage, monkeypatch) -> None:
+    keyed = settings.model_copy(update={"password_bcrypt_rounds": 4, "secret_key": "test-secret"})
+    monkeypatch.setattr(security, "settings", keyed)
+    task = _task(db_session, BackgroundJobType.USER_IMPORT)
+    db_session.add(Role(name="Student"))
+    db_session.commit()
+    path = storage / "users.csv"
+    path.write_text("school_id,first_name,last_name,email,role\n2025-001,Ana,Reyes,ana@example.edu,Student\n")
+
+    # Imported accounts get no known password unless the school_id mode is requested.
+    assert _import(db_session, task, UserImporter(university_id=task.university_id), path).created == 1
+    ana = db_session.scalars(select(User).where(User.school_id == "2025-001")).one()
+    assert ana.status == UserStatus.UNVERIFIED
+    assert not verify_password("2025-001", ana.password_hash)
+
+    token = password_setup_token(ana, now=datetime(2025, 6, 1))
+    with pytest.raises(InvalidTokenError, match="expired"):
+        complete_password_setup(db_session, token=token, password="correct horse", now=datetime(2025, 6, 5))
+    complete_password_setup(db_session, token=token, password="correct horse", now=datetime(2025, 6, 2))
+    assert ana.status == UserStatus.ACTIVE and verify_password("correct horse", ana.password_hash)
+    with pytest.raises(InvalidTokenError, match="already been used"):
+        complete_password_setup(db_session, token=token, password="again", now=datetime(2025, 6, 2))
+    with pytest.raises(InvalidTokenError, match="signature"):
+        complete_password_setup(db_session, token=token[:-2] + "AA", password="again", now=datetime(2025, 6, 2))
+
+
+def test_key_resolver_caches_catalogs_and_batches_user_lookups(db_session, assert_max_queries) -> None:
+    university = University(name="Resolver University")
+    users = [make_user(db_session, university) for _ in range(5)]
+    year = SchoolYear(year_start=2024, year_end=2025)
+    db_session.add_all([year, SchoolTerm(school_year=year, semester=SemesterTerm.FIRST)])
+    db_session.commit()
+    university_id = university.id
+    school_ids = {user.school_id: user.id for user in users}
+    term_id = db_session.scalar(select(SchoolTerm.id))
+
+    keys = NaturalKeyResolver(university_id=university_id, chunk_size=2)
+    with assert_max_queries(5):
+        assert keys.resolve(db_session, USER, [*school_ids, "missing"]) == school_ids
+        assert keys.get(db_session, SCHOOL_TERM, school_term_key("2024 - 2025", "1st Semester")) == term_id
+        assert keys.resolve(db_session, PROGRAM, ["BSCE", None]) == {}
+    with assert_max_queries(0):
+        assert keys.resolve(db_session, USER, school_ids) == school_ids
+        assert keys.get(db_session, SCHOOL_TERM, (2024, 2025, SemesterTerm.SECOND)) is None
+    assert keys.stats() == {"queries": 5, "hits": 8, "misses": 6}
+
+    new = make_user(db_session, university, school_id="N-1")
+    db_session.flush()
+    assert keys.refresh(db_session, USER, ["N-1"]) == {"N-1": new.id}
+    db_session.rollback()
+    with assert_max_queries(1):
+        assert keys.resolve(db_session, USER, ["N-1"]) == {}
+
+    with pytest.raises(ValueError, match="2024-2025"):
+        school_term_key("2024", "Summer")
+    with pytest.raises(ValueError, match="Semester 'Third'"):
+        school_term_key("2024-2025", "Third")
+
+
+def test_validated_file_artifact_replaces_parsing_at_process_time(db_session, storage) -> None:
+    upload = storage / "structure.csv"
+    upload.write_text(STRUCTURE, encoding="utf-8")
+    validated = store_validated_file(upload, AcademicStructureImporter.required_columns, batch_size=4)
+    assert (validated.rows, validated.reused, validated.columns[:2]) == (7, False, ("record_type", "department"))
+    again = store_validated_file(upload, AcademicStructureImporter.required_columns)
+    assert again.reused and again.file_id == validated.file_id
+    upload.unlink()
+
+    task = _task(db_session, BackgroundJobType.ACADEMIC_STRUCTURE_IMPORT)
+    path, open_source = import_source({"validated_file_id": validated.file_id})
+    assert (path, open_source) == (artifact_path(validated.file_id), open_artifact)
+    importer = AcademicStructureImporter(university_id=task.university_id)
+    summary = _import(db_session, task, importer, path, batch_size=3, open_source=open_source)
+    assert (summary.rows_processed, summary.rows_failed, summary.created) == (4, 3, 4)
+    with open(task.result_storage_path, newline="", encoding="utf-8") as report:
+        assert [row["line"] for row in csv.DictReader(report)] == ["6", "7", "8"]
+
+    assert purge_expired_artifacts() == 0
+    assert purge_expired_artifacts(now=datetime.utcnow() + timedelta(hours=settings.import_artifact_ttl_hours + 1)) == 1
+    assert list((storage / "import_artifacts").iterdir()) == []
+    with pytest.raises(ImportFileError, match="expired"):
+        with open_artifact(path, AcademicStructureImporter.required_columns):
+            pass
+    with pytest.raises(ImportFileError, match="Unknown"):
+        import_source({"validated_file_id": "../users.csv"})
+
+
+def test_artifact_cleanup_runs_hourly(storage, monkeypatch) -> None:
+    scheduled = []
+
+    class _Queue:
+        def enqueue_at(self, at, func, *, job_id):
+            scheduled.append((at, func, job_id))
+
+    monkeypatch.setattr(queue, "get_queue", _Queue)
+    monkeypatch.setattr(queue, "utcnow", lambda: datetime(2025, 3, 9, 17, 45))
+    tasks.run_import_artifact_cleanup()
+
+    next_hour = datetime(2025, 3, 9, 18, tzinfo=UTC)
+    assert scheduled == [(next_hour, tasks.run_import_artifact_cleanup, "run_import_artifact_cleanup-20250309180000")]
@@ -0,0 +1,174 @@
+"""Tests for incremental cohort statistics."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.models.academic import Department, FacultyDepartmentAffiliation
+from src.models.analysis import CohortStatistic, NumericalAggregate
+from src.models.enums import CohortGrouping, CohortMetric, EvaluationSubmissionStatus
+from src.services.cohort_statistics_service import (
+    CohortKey,
+    RunningStats,
+    get_cohort_stats,
+    merge_partial_states,
+    provisional_z_score,
+    rebuild_cohort_statistics,
+    record_submission_score,
+    retract_submission_score,
+)
+from src.services.quantitative_analysis_service import score_evaluation_period
+from src.services.submission_writer_service import change_submission_status
+from tests.factories import add_submission, seed_evaluation_period
+
+
+def test_running_stats_matches_numpy_after_add_remove_and_merge() -> None:
+    values = np.array([3.2, 4.8, 4.1, 2.9, 5.0, 3.7])
+
+    left = RunningStats.from_values(values[:4])
+    right = RunningStats.from_values(values[4:])
+    merged = left.merge(right).add(1.5).remove(1.5)
+
+    assert merged.n == values.size
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std_dev == pytest.approx(values.std(ddof=1))
+
+
+def test_z_score_is_zero_for_degenerate_cohorts() -> None:
+    assert RunningStats().z_score(4.0) == 0.0
+    assert RunningStats.from_values([4.0]).z_score(5.0) == 0.0
+    assert RunningStats.from_values([4.0, 4.0]).z_score(5.0) == 0.0
+
+
+def test_submission_scores_update_all_cohorts(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    first = add_submission(db_session, fixture, likert_values=[5, 5, 5, 5])
+    second = add_submission(db_session, fixture, likert_values=[3, 3, 3, 3])
+
+    record_submission_score(db_session, submission_id=first.id, metric=CohortMetric.QUANTITATIVE, value=4.5)
+    record_submission_score(db_session, submission_id=second.id, metric=CohortMetric.QUANTITATIVE, value=3.5)
+    db_session.commit()
+
+    department_key = CohortKey(
+        fixture.university.id,
+        fixture.period.id,
+        CohortGrouping.DEPARTMENT,
+        fixture.department.id,
+        CohortMetric.QUANTITATIVE,
+    )
+    assert db_session.query(CohortStatistic).count() == 3
+    assert get_cohort_stats(db_session, department_key).mean == pytest.approx(4.0)
+    assert provisional_z_score(db_session, department_key, 4.5) == pytest.approx(0.5 / np.std([4.5, 3.5], ddof=1))
+
+    retract_submission_score(db_session, submission_id=second.id, metric=CohortMetric.QUANTITATIVE, value=3.5)
+    merge_partial_states(db_session, {department_key: RunningStats.from_values([2.0, 3.0])})
+    db_session.commit()
+
+    stats = get_cohort_stats(db_session, department_key)
+    assert stats.n == 3
+    assert stats.mean == pytest.approx(np.mean([4.5, 2.0, 3.0]))
+    assert stats.variance == pytest.approx(np.var([4.5, 2.0, 3.0], ddof=1))
+
+
+def test_scoring_and_status_changes_keep_stored_cohorts_current(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    submissions = [add_submission(db_session, fixture, likert_values=[value] * 4) for value in (2, 3, 5)]
+    department_key = CohortKey(
+        fixture.university.id,
+        fixture.period.id,
+        CohortGrouping.DEPARTMENT,
+        fixture.department.id,
+        CohortMetric.QUANTITATIVE,
+    )
+
+    def assert_cohort(values) -> None:
+        stats = get_cohort_stats(db_session, department_key)
+        assert stats.n == len(values)
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.variance == pytest.approx(np.var(values, ddof=1))
+
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    assert_cohort([2.0, 3.0, 5.0])
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    assert_cohort([2.0, 3.0, 5.0])
+
+    # A replaced score moves instead of being counted twice: criterion 0 now averages 3.
+    submissions[0].likert_answers[0].answer_value = 4
+    db_session.commit()
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    assert_cohort([2.6, 3.0, 5.0])
+
+    change_submission_status(db_session, [submissions[2].id], EvaluationSubmissionStatus.INVALIDATED_FOR_RESUBMISSION)
+    assert_cohort([2.6, 3.0])
+    change_submission_status(db_session, [submissions[2].id], EvaluationSubmissionStatus.CANCELLED)
+    assert_cohort([2.6, 3.0])
+    change_submission_status(db_session, [submissions[2].id], EvaluationSubmissionStatus.PROCESSED)
+    assert_cohort([2.6, 3.0, 5.0])
+
+
+def _department_key(fixture, department_id: int) -> CohortKey:
+    return CohortKey(
+        fixture.university.id,
+        fixture.period.id,
+        CohortGrouping.DEPARTMENT,
+        department_id,
+        CohortMetric.QUANTITATIVE,
+    )
+
+
+def test_retraction_uses_the_department_the_score_was_counted_in(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    submissions = [add_submission(db_session, fixture, likert_values=[value] * 4) for value in (2, 5)]
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    original_key = _department_key(fixture, fixture.department.id)
+    assert get_cohort_stats(db_session, original_key).n == 2
+
+    # The evaluatee gets a home department after scoring; the score still sits in the original cohort.
+    moved_to = Department(name="Transferred", university=fixture.university)
+    db_session.add(moved_to)
+    db_session.add(
+        FacultyDepartmentAffiliation(
+            faculty=fixture.evaluatees[0],
+            department=moved_to,
+            school_term=fixture.period.school_term,
+            is_home_department=True,
+        )
+    )
+    db_session.commit()
+    moved_key = _department_key(fixture, moved_to.id)
+
+    change_submission_status(db_session, [submissions[1].id], EvaluationSubmissionStatus.INVALIDATED_FOR_RESUBMISSION)
+    assert get_cohort_stats(db_session, original_key) == RunningStats.from_values([2.0])
+    assert get_cohort_stats(db_session, moved_key).n == 0
+
+    change_submission_status(db_session, [submissions[1].id], EvaluationSubmissionStatus.PROCESSED)
+    assert get_cohort_stats(db_session, moved_key) == RunningStats.from_values([5.0])
+    aggregate = db_session.query(NumericalAggregate).filter_by(submission_id=submissions[1].id).one()
+    assert aggregate.cohort_department_id == moved_to.id
+
+
+def test_rebuild_recomputes_drifted_cohorts_from_scorable_submissions(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    submissions = [add_submission(db_session, fixture, likert_values=[value] * 4) for value in (2, 3, 5)]
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    submissions[2].status = EvaluationSubmissionStatus.CANCELLED
+    stale_key = _department_key(fixture, fixture.department.id + 1000)
+    merge_partial_states(
+        db_session,
+        {
+            _department_key(fixture, fixture.department.id): RunningStats.from_values([9.0]),
+            stale_key: RunningStats.from_values([1.0, 2.0]),
+        },
+    )
+    db_session.commit()
+
+    summary = rebuild_cohort_statistics(db_session, evaluation_period_id=fixture.period.id)
+
+    assert summary.scores_counted == 2
+    stats = get_cohort_stats(db_session, _department_key(fixture, fixture.department.id))
+    assert stats.n == 2
+    assert stats.mean == pytest.approx(np.mean([2.0, 3.0]))
+    assert stats.variance == pytest.approx(np.var([2.0, 3.0], ddof=1))
+    assert get_cohort_stats(db_session, stale_key).n == 0
+    assert rebuild_cohort_statistics(db_session, evaluation_period_id=fixture.period.id) == summary
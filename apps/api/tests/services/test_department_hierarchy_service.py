@@ -0,0 +1,115 @@
+"""Tests for the department closure table and subtree rollups."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.models.academic import DepartmentClosure, FacultyDepartmentAffiliation
+from src.models.analysis import NumericalAggregate
+from src.models.enums import EvaluationSubmissionStatus
+from src.services.department_hierarchy_service import (
+    create_department,
+    delete_department,
+    move_department,
+    rebuild_hierarchy,
+    summarize_subtrees,
+)
+from tests.factories import add_submission, seed_evaluation_period
+
+
+def _closure(db_session):
+    rows = db_session.query(DepartmentClosure).all()
+    return sorted((row.ancestor_id, row.descendant_id, row.depth) for row in rows)
+
+
+def test_closure_follows_create_move_and_delete(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    scope = {"university_id": fixture.university.id}
+    college = fixture.department
+    assert rebuild_hierarchy(db_session, **scope) == 1
+
+    engineering = create_department(db_session, **scope, name="Eng", parent_department_id=college.id)
+    civil = create_department(db_session, **scope, name="Civil", parent_department_id=engineering.id)
+    arts = create_department(db_session, **scope, name="Arts")
+    assert (college.id, civil.id, 2) in _closure(db_session)
+
+    with pytest.raises(ValueError):
+        move_department(db_session, department_id=engineering.id, parent_department_id=civil.id)
+
+    move_department(db_session, department_id=engineering.id, parent_department_id=arts.id)
+    moved = _closure(db_session)
+    assert (arts.id, civil.id, 2) in moved
+    assert not any(ancestor == college.id and descendant != college.id for ancestor, descendant, _ in moved)
+    assert rebuild_hierarchy(db_session, **scope) == len(moved)
+    assert _closure(db_session) == moved
+
+    delete_department(db_session, department_id=engineering.id)
+    assert civil.parent_department_id is None
+    assert _closure(db_session) == sorted(
+        [(college.id, college.id, 0), (civil.id, civil.id, 0), (arts.id, arts.id, 0)]
+    )
+
+
+def _seed_scored_subtree(db_session):
+    """A college with a child and a leaf department, each home to one evaluatee scored 2.0 and 4.0."""
+
+    fixture = seed_evaluation_period(db_session, evaluatee_count=2)
+    scope = {"university_id": fixture.university.id}
+    rebuild_hierarchy(db_session, **scope)
+    child = create_department(db_session, **scope, name="Child", parent_department_id=fixture.department.id)
+    leaf = create_department(db_session, **scope, name="Leaf", parent_department_id=child.id)
+
+    submissions = []
+    for evaluatee, department, score in zip(fixture.evaluatees, (child, leaf), (2.0, 4.0)):
+        db_session.add(
+            FacultyDepartmentAffiliation(
+                faculty=evaluatee,
+                department=department,
+                school_term=fixture.period.school_term,
+                is_home_department=True,
+            )
+        )
+        submissions.append(add_submission(db_session, fixture, likert_values=[4] * 4, evaluatee=evaluatee))
+        db_session.add(
+            NumericalAggregate(
+                submission=submissions[-1],
+                per_question_median_scores={},
+                per_criterion_average_scores={},
+                quant_score_raw=score,
+                z_quant=score - 3.0,
+                final_score_60_40=0.6 * (score - 3.0),
+                cohort_n=2,
+                cohort_mean=3.0,
+                cohort_std_dev=1.0,
+            )
+        )
+    db_session.flush()
+    return fixture, child, leaf, submissions
+
+
+def test_summarize_subtrees_rolls_up_home_departments(db_session) -> None:
+    fixture, child, leaf, _ = _seed_scored_subtree(db_session)
+
+    college, middle, bottom = summarize_subtrees(
+        db_session,
+        evaluation_period_id=fixture.period.id,
+        department_ids=[fixture.department.id, child.id, leaf.id],
+    )
+    assert (college.submission_count, college.evaluatee_count, college.average_quant_score_raw) == (2, 2, 3.0)
+    assert (middle.submission_count, middle.average_quant_score_raw) == (2, 3.0)
+    assert (bottom.submission_count, bottom.average_final_score) == (1, 0.6)
+
+
+def test_summarize_subtrees_leaves_out_invalidated_submissions(db_session) -> None:
+    fixture, child, leaf, submissions = _seed_scored_subtree(db_session)
+    submissions[0].status = EvaluationSubmissionStatus.INVALIDATED_FOR_RESUBMISSION
+    db_session.flush()
+
+    college, middle, bottom = summarize_subtrees(
+        db_session,
+        evaluation_period_id=fixture.period.id,
+        department_ids=[fixture.department.id, child.id, leaf.id],
+    )
+    assert (college.submission_count, college.evaluatee_count, college.average_quant_score_raw) == (1, 1, 4.0)
+    assert (middle.submission_count, middle.average_quant_score_raw) == (1, 4.0)
+    assert (bottom.submission_count, bottom.average_quant_score_raw) == (1, 4.0)
@@ -0,0 +1,59 @@
+"""Tests for the shared embedding stage."""
+
+from __future__ import annotations
+
+import zlib
+from typing import Sequence
+
+import numpy as np
+import pytest
+
+from src.models.analysis import OpenEndedKeyword, OpenEndedSentiment
+from src.models.enums import SentimentLabel
+from src.services.embedding_service import EmbeddingStage
+from src.services.keyword_extraction_service import EmbeddingKeywordExtractor
+from src.services.qualitative_analysis_service import analyze_pending_answers
+from src.services.qualitative_cache_service import QualitativeResultCache
+from src.services.sentiment_inference_service import EmbeddingSentimentHead, EmbeddingSentimentPredictor
+from tests.factories import add_submission, seed_evaluation_period
+
+_DIM = 16
+
+
+class SeededEncoder:
+    """Deterministic unit vectors per text; records every string it encodes."""
+
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        self.encoded.extend(texts)
+        rows = [np.random.default_rng(zlib.crc32(text.encode())).normal(size=_DIM) for text in texts]
+        matrix = np.stack(rows)
+        return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_keywords_and_sentiment_share_one_encoder_pass(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    for comment in ["clear lessons", "clear grading", "clear"]:
+        add_submission(db_session, fixture, likert_values=[4, 4, 4, 4], comment=comment)
+    db_session.commit()
+
+    encoder = SeededEncoder()
+    stage = EmbeddingStage(encoder, batch_size=2)
+    head = EmbeddingSentimentHead(np.zeros((_DIM, 3)), np.array([0.0, 0.0, 2.0]))
+
+    summary = analyze_pending_answers(
+        db_session,
+        predictor=EmbeddingSentimentPredictor(stage, head),
+        extractor=EmbeddingKeywordExtractor(stage, top_n=2, threshold=-1.0, analyzer=str.split),
+        cache=QualitativeResultCache(max_entries=10, model_version="test"),
+    )
+
+    assert summary.answers_processed == 3
+    assert sorted(encoder.encoded) == sorted(["clear lessons", "clear grading", "clear", "lessons", "grading"])
+    assert stage.texts_encoded == 5
+    sentiments = db_session.query(OpenEndedSentiment).all()
+    assert {s.predicted_sentiment_label for s in sentiments} == {SentimentLabel.POSITIVE}
+    exact = db_session.query(OpenEndedKeyword).filter_by(keyword="clear").all()
+    assert max(k.relevance_score for k in exact) == pytest.approx(1.0)
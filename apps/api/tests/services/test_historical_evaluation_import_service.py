@@ -0,0 +1,131 @@
+"""Tests for the staged historical evaluation import."""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from src.core.config import settings
+from src.models.enums import BackgroundJobStatus, BackgroundJobType
+from src.models.evaluation_submission import EvaluationLikertAnswer, EvaluationOpenEndedAnswer, EvaluationSubmission
+from src.models.operations import BackgroundTask, HistoricalEvaluationStagingRow
+from src.repositories.historical_import_staging_repository import historical_import_staging_repository
+from src.services import historical_evaluation_import_service
+from src.services.historical_evaluation_import_service import import_historical_evaluations
+from src.worker import csv_import
+from src.worker.job_tracking import tracked_task
+from tests.factories import make_user, seed_evaluation_period
+
+
+def _run(db_session, task_id, path, **kwargs):
+    with tracked_task(db_session, task_id) as task:
+        return import_historical_evaluations(db_session, task, path, batch_size=3, chunk_size=2, **kwargs)
+
+
+def test_historical_import_validates_in_sets_and_resumes_from_its_checkpoint(
+    db_session, monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setattr(csv_import, "settings", settings.model_copy(update={"storage_root": str(tmp_path)}))
+    fixture = seed_evaluation_period(db_session)
+    for order, question in enumerate([*fixture.likert_questions, fixture.open_ended_question], start=1):
+        question.order = order
+    year = fixture.period.school_term.school_year
+    school_year = f"{year.year_start}-{year.year_end}"
+    edp_code = fixture.offering.subject.edp_code
+    faculty = fixture.evaluatees[0].school_id
+    students = [make_user(db_session, fixture.university, school_id=f"H-{n}") for n in range(4)]
+    task = BackgroundTask(
+        university=fixture.university,
+        job_type=BackgroundJobType.HISTORICAL_EVALUATION_IMPORT,
+        submitted_by=students[0],
+        job_parameters={"file_path": "history.csv"},
+    )
+    db_session.add(task)
+    db_session.commit()
+    task_id, period_id = task.id, fixture.period.id
+
+    def row(student, question, answer, term=school_year, **extra):
+        return [term, "1st Semester", "midterm", student, faculty, edp_code, question, answer, extra.get("at", "")]
+
+    rows = [
+        *(row("H-0", question, value) for question, value in ((1, 5), (2, 4), (3, 4), (4, 3))),
+        row("H-0", 5, "Explains clearly."),
+        row("H-1", 1, 5),
+        row("H-1", 2, 9),
+        row("H-2", 1, 3),
+        row("H-2", 1, 4),
+        row("H-9", 1, 4),
+        row("H-3", 1, 2, term="2024"),
+        row("H-3", 1, 4, at="2020-06-01T08:00:00"),
+        row("H-3", 5, "Late but fair."),
+    ]
+    path = tmp_path / "history.csv"
+    with open(path, "w", newline="", encoding="utf-8") as upload:
+        writer = csv.writer(upload)
+        writer.writerow([*historical_evaluation_import_service.REQUIRED_COLUMNS, "submitted_at"])
+        writer.writerows(rows)
+
+    # Cancelled while loading: the committed batches stay staged behind a checkpoint.
+    checks = iter([False, False, True])
+    original = historical_evaluation_import_service.cancellation_requested
+
+    def cancel_third(db, task):
+        if original(db, task) or not next(checks, False):
+            return False
+        task.status = BackgroundJobStatus.CANCELLED
+        return True
+
+    monkeypatch.setattr(historical_evaluation_import_service, "cancellation_requested", cancel_third)
+    summary = _run(db_session, task_id, path)
+    task = db_session.get(BackgroundTask, task_id)
+    assert summary.cancelled and task.status == BackgroundJobStatus.CANCELLED
+    assert task.job_parameters["checkpoint"] == {"phase": "load", "line": 7}
+    assert db_session.scalar(select(func.count()).select_from(HistoricalEvaluationStagingRow)) == 6
+
+    # Crashed after the first merged chunk: the failure rolls back only the chunk in flight.
+    monkeypatch.setattr(historical_evaluation_import_service, "cancellation_requested", original)
+    merge_chunk = historical_import_staging_repository.merge_chunk
+    calls = []
+
+    def crash_second(db, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise RuntimeError("worker lost")
+        return merge_chunk(db, **kwargs)
+
+    monkeypatch.setattr(historical_import_staging_repository, "merge_chunk", crash_second)
+    with pytest.raises(RuntimeError, match="worker lost"):
+        _run(db_session, task_id, path)
+    task = db_session.get(BackgroundTask, task_id)
+    assert task.status == BackgroundJobStatus.FAILED
+    assert task.job_parameters["checkpoint"]["phase"] == "merge"
+    assert (task.rows_total, task.rows_failed, task.rows_processed) == (13, 6, 5)
+
+    monkeypatch.setattr(historical_import_staging_repository, "merge_chunk", merge_chunk)
+    summary = _run(db_session, task_id, path)
+    assert (summary.resumed_from, summary.submissions_created, summary.answers_merged) == ("merge", 1, 2)
+    task = db_session.get(BackgroundTask, task_id)
+    assert task.status == BackgroundJobStatus.COMPLETED_PARTIAL_FAILURE
+    assert task.job_parameters["checkpoint"] == {"phase": "done"}
+    assert task.rows_processed == 5 + 2
+    assert db_session.scalar(select(func.count()).select_from(HistoricalEvaluationStagingRow)) == 0
+
+    submissions = db_session.execute(
+        select(EvaluationSubmission.evaluator_id, EvaluationSubmission.submitted_at)
+        .where(EvaluationSubmission.evaluation_period_id == period_id)
+        .order_by(EvaluationSubmission.id)
+    ).all()
+    assert submissions == [(students[0].id, datetime(2025, 1, 31)), (students[3].id, datetime(2020, 6, 1, 8))]
+    assert db_session.scalar(select(func.count()).select_from(EvaluationLikertAnswer)) == 5
+    comments = db_session.scalars(select(EvaluationOpenEndedAnswer.answer_text).order_by(EvaluationOpenEndedAnswer.id))
+    assert comments.all() == ["Explains clearly.", "Late but fair."]
+
+    with open(task.result_storage_path, newline="", encoding="utf-8") as report:
+        rejected = {int(line["line"]): line["error"] for line in csv.DictReader(report)}
+    assert sorted(rejected) == [7, 8, 9, 10, 11, 12]
+    assert "Likert scale" in rejected[8] and "Another answer" in rejected[7]
+    assert "more than once" in rejected[10] and "Another answer" in rejected[9]
+    assert "school ID" in rejected[11] and "2024-2025" in rejected[12]
@@ -0,0 +1,94 @@
+"""Tests for columnar snapshots of finalized period results."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.core.config import settings
+from src.models.analysis import NumericalAggregate, SentimentAggregate
+from src.models.enums import EvaluationSubmissionStatus
+from src.services import period_snapshot_service
+from src.services.period_snapshot_service import (
+    PeriodNotFinalizedError,
+    read_period_snapshot,
+    write_pending_snapshots,
+    write_period_snapshot,
+)
+from tests.factories import add_submission, seed_evaluation_period
+
+
+def _aggregate(submission, raw: float, final: float) -> NumericalAggregate:
+    return NumericalAggregate(
+        submission=submission,
+        per_question_median_scores={},
+        per_criterion_average_scores={"1": raw},
+        quant_score_raw=raw,
+        z_quant=final,
+        final_score_60_40=final,
+        cohort_n=3,
+        cohort_mean=3.0,
+        cohort_std_dev=1.0,
+        is_final_snapshot=True,
+    )
+
+
+def test_finalized_period_round_trips_through_memory_mapped_parquet(db_session, monkeypatch, tmp_path) -> None:
+    storage = settings.model_copy(update={"storage_root": str(tmp_path)})
+    monkeypatch.setattr(period_snapshot_service, "settings", storage)
+    fixture = seed_evaluation_period(db_session, evaluatee_count=2)
+    first, second = fixture.evaluatees
+    scores = [(first, 4.0, 1.0), (first, 2.0, -1.0), (second, 3.0, 0.0)]
+    submissions = [add_submission(db_session, fixture, likert_values=[4] * 4, evaluatee=e) for e, _, _ in scores]
+    for submission, (_, raw, final) in zip(submissions, scores):
+        db_session.add(_aggregate(submission, raw, final))
+    # Cancelled submissions are neither exported nor waited for.
+    cancelled = add_submission(db_session, fixture, likert_values=[1] * 4, evaluatee=second)
+    cancelled.status = EvaluationSubmissionStatus.CANCELLED
+    open_aggregate = _aggregate(cancelled, 1.0, -2.0)
+    open_aggregate.is_final_snapshot = False
+    db_session.add(open_aggregate)
+    sentiment = SentimentAggregate(
+        submission=submissions[0],
+        average_positive_score=0.8,
+        average_neutral_score=0.1,
+        average_negative_score=0.1,
+        qual_score_raw=0.7,
+        z_qual=0.5,
+        is_final_snapshot=False,
+    )
+    db_session.add(sentiment)
+    db_session.commit()
+
+    ids = {"university_id": fixture.university.id, "evaluation_period_id": fixture.period.id}
+    with pytest.raises(PeriodNotFinalizedError):
+        write_period_snapshot(db_session, **ids)
+    assert write_pending_snapshots(db_session) == []
+    assert read_period_snapshot(**ids) is None
+
+    sentiment.is_final_snapshot = True
+    db_session.commit()
+    (summary,) = write_pending_snapshots(db_session, now=datetime(2025, 6, 1))
+    assert (summary.submissions_written, summary.evaluatees_written) == (3, 2)
+    assert write_pending_snapshots(db_session) == []
+
+    evaluatees = read_period_snapshot(**ids).to_pylist()
+    assert [(row["evaluatee_id"], row["submission_count"], row["average_final_score"]) for row in evaluatees] == [
+        (first.id, 2, 0.0),
+        (second.id, 1, 0.0),
+    ]
+    assert evaluatees[0]["qualitative_submission_count"] == 1
+    assert evaluatees[0]["average_qual_score_raw"] == pytest.approx(0.7)
+    assert evaluatees[0]["department_id"] == fixture.department.id
+
+    rows = read_period_snapshot(
+        **ids,
+        table="submissions",
+        columns=["submission_id", "quant_score_raw"],
+        filters=[("evaluatee_id", "=", first.id)],
+    )
+    assert rows.column_names == ["submission_id", "quant_score_raw"]
+    assert sorted(rows.column("quant_score_raw").to_pylist()) == [2.0, 4.0]
@@ -0,0 +1,110 @@
+"""Tests for the watermark-based provisional aggregates job."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.models.analysis import ProvisionalAggregate
+from src.models.enums import EvaluationSubmissionStatus
+from src.services import provisional_aggregate_service
+from src.services.provisional_aggregate_service import refresh_provisional_aggregates
+from src.services.quantitative_analysis_service import score_evaluation_period
+from src.services.submission_writer_service import change_submission_status
+from src.worker import queue, tasks
+from tests.factories import add_submission, seed_evaluation_period
+
+T0 = datetime(2025, 1, 10, 8, 0, 0)
+
+
+def _snapshot(db_session):
+    rows = db_session.query(ProvisionalAggregate).order_by(ProvisionalAggregate.evaluatee_id).all()
+    return [(r.evaluatee_id, r.submission_count, r.likert_value_sum, float(r.average_likert_score)) for r in rows]
+
+
+def test_refresh_reads_only_new_submissions_and_is_idempotent(db_session) -> None:
+    fixture = seed_evaluation_period(db_session, evaluatee_count=2)
+    first, second = fixture.evaluatees
+    add_submission(db_session, fixture, likert_values=[5, 5, 4, 4], evaluatee=first, submitted_at=T0)
+    add_submission(db_session, fixture, likert_values=[3, 3, 3, 3], evaluatee=first, submitted_at=T0)
+    add_submission(db_session, fixture, likert_values=[2, 2, 2, None], evaluatee=second, submitted_at=T0)
+    db_session.commit()
+
+    summary = refresh_provisional_aggregates(db_session, batch_size=2, now=T0 + timedelta(minutes=5))
+    assert (summary.submissions_read, summary.groups_refreshed) == (3, 2)
+    expected = [(first.id, 2, 30, 3.75), (second.id, 1, 6, 2.0)]
+    assert _snapshot(db_session) == expected
+
+    rerun = refresh_provisional_aggregates(db_session, now=T0 + timedelta(minutes=10))
+    assert rerun.submissions_read == 0
+    assert _snapshot(db_session) == expected
+
+    late = T0 + timedelta(minutes=20)
+    add_submission(db_session, fixture, likert_values=[1, 1, 1, 1], evaluatee=second, submitted_at=late)
+    db_session.commit()
+    unsettled = refresh_provisional_aggregates(db_session, now=late + timedelta(seconds=5))
+    assert unsettled.submissions_read == 0
+
+    summary = refresh_provisional_aggregates(db_session, now=late + timedelta(minutes=5))
+    assert (summary.submissions_read, summary.groups_refreshed) == (1, 1)
+    assert _snapshot(db_session)[1] == (second.id, 2, 10, pytest.approx(10 / 7, abs=1e-4))
+
+
+def test_scoring_and_status_changes_refresh_groups_behind_the_mark(db_session) -> None:
+    fixture = seed_evaluation_period(db_session, evaluatee_count=2)
+    first, second = fixture.evaluatees
+    add_submission(db_session, fixture, likert_values=[5, 5, 5, 5], evaluatee=first, submitted_at=T0)
+    dropped = add_submission(db_session, fixture, likert_values=[3, 3, 3, 3], evaluatee=first, submitted_at=T0)
+    only = add_submission(db_session, fixture, likert_values=[2, 2, 2, 2], evaluatee=second, submitted_at=T0)
+    db_session.commit()
+    refresh_provisional_aggregates(db_session, now=T0 + timedelta(minutes=5))
+
+    def scored():
+        rows = db_session.query(ProvisionalAggregate).order_by(ProvisionalAggregate.evaluatee_id).all()
+        return [(r.evaluatee_id, r.scored_submission_count, r.average_quant_score) for r in rows]
+
+    assert scored() == [(first.id, 0, None), (second.id, 0, None)]
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    db_session.expire_all()
+    assert scored() == [(first.id, 2, pytest.approx(4.0)), (second.id, 1, pytest.approx(2.0))]
+
+    change_submission_status(db_session, [dropped.id], EvaluationSubmissionStatus.INVALIDATED_FOR_RESUBMISSION)
+    change_submission_status(db_session, [only.id], EvaluationSubmissionStatus.CANCELLED)
+    db_session.expire_all()
+    assert _snapshot(db_session) == [(first.id, 1, 20, 5.0)]
+
+
+class _RecordingQueue:
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def enqueue_at(self, at, func, *, job_id):
+        self.scheduled.append((at, func, job_id))
+
+
+def test_periodic_jobs_land_on_boundaries_and_reschedule_after_failures(monkeypatch) -> None:
+    recorder = _RecordingQueue()
+    monkeypatch.setattr(queue, "get_queue", lambda: recorder)
+
+    job = tasks.run_provisional_aggregation
+    at = queue.schedule_periodic(job, timedelta(minutes=3), now=T0 + timedelta(seconds=70))
+    assert at == T0 + timedelta(minutes=3)
+    assert recorder.scheduled == [(at.replace(tzinfo=UTC), job, "run_provisional_aggregation-20250110080300")]
+
+    tasks.schedule_periodic_jobs()
+    assert job in [func for _, func, _ in recorder.scheduled[1:]]
+
+    class _Session:
+        def close(self) -> None:
+            pass
+
+    def fail(db):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(tasks, "SessionLocal", _Session)
+    monkeypatch.setattr(provisional_aggregate_service, "refresh_provisional_aggregates", fail)
+    recorder.scheduled.clear()
+    with pytest.raises(RuntimeError):
+        job()
+    assert [func for _, func, _ in recorder.scheduled] == [job]
@@ -0,0 +1,141 @@
+"""Tests for the cached qualitative analysis pipeline."""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+import pytest
+
+from src.models.analysis import (
+    CohortStatistic,
+    OpenEndedKeyword,
+    OpenEndedSentiment,
+    QualitativeResultCacheEntry,
+    SentimentAggregate,
+)
+from src.models.enums import CohortGrouping, CohortMetric, SentimentLabel
+from src.services.qualitative_analysis_service import analyze_pending_answers
+from src.services.qualitative_cache_service import (
+    LRUCache,
+    QualitativeResultCache,
+    content_hash,
+    normalize_answer_text,
+)
+from src.services.sentiment_inference_service import BatchedSentimentPredictor
+from tests.factories import add_submission, seed_evaluation_period
+
+
+class LengthParityModel:
+    """Positive for an odd number of words, negative otherwise."""
+
+    def __init__(self) -> None:
+        self.texts_seen = 0
+
+    def encode(self, texts: Sequence[str]) -> List[List[int]]:
+        self.texts_seen += len(texts)
+        return [[1] * len(text.split()) for text in texts]
+
+    def predict_encoded(self, input_ids: Sequence[Sequence[int]]) -> np.ndarray:
+        positive = np.array([0.8 if len(ids) % 2 else 0.1 for ids in input_ids])
+        return np.stack([0.9 - positive, np.full_like(positive, 0.1), positive], axis=1)
+
+
+class FirstWordExtractor:
+    def extract(self, texts: Sequence[str]) -> List[List[tuple]]:
+        return [[(text.split()[0].lower(), 0.75)] for text in texts]
+
+
+def _seed_comments(db_session, comments: Sequence[str]) -> None:
+    fixture = seed_evaluation_period(db_session)
+    for comment in comments:
+        add_submission(db_session, fixture, likert_values=[4, 4, 4, 4], comment=comment)
+    db_session.commit()
+
+
+def test_normalization_collapses_trivial_variants() -> None:
+    assert normalize_answer_text("  Good   TEACHER!! ") == "good teacher"
+    assert content_hash("  Good   TEACHER ") == content_hash("good teacher")
+    assert content_hash("Good teacher") != content_hash("Bad teacher")
+
+
+def test_cache_keys_keep_punctuation() -> None:
+    assert content_hash(":)") != content_hash(":(")
+    assert content_hash("A+") != content_hash("A-")
+    assert content_hash("!!!") != content_hash("")
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_repeated_comments_skip_inference(db_session) -> None:
+    _seed_comments(db_session, ["Good teacher", "  good TEACHER", "Very clear and organized lessons", "None"])
+    model = LengthParityModel()
+    cache = QualitativeResultCache(max_entries=10, model_version="test")
+
+    summary = analyze_pending_answers(
+        db_session,
+        predictor=BatchedSentimentPredictor(model, batch_size=2),
+        extractor=FirstWordExtractor(),
+        cache=cache,
+        collect_size=2,
+    )
+
+    assert summary.answers_processed == 4
+    assert summary.texts_inferred == 3
+    assert model.texts_seen == 3
+    assert db_session.query(QualitativeResultCacheEntry).count() == 3
+    sentiments = db_session.query(OpenEndedSentiment).order_by(OpenEndedSentiment.open_ended_answer_id).all()
+    assert [s.predicted_sentiment_label for s in sentiments] == [
+        SentimentLabel.NEGATIVE,
+        SentimentLabel.NEGATIVE,
+        SentimentLabel.POSITIVE,
+        SentimentLabel.POSITIVE,
+    ]
+    assert db_session.query(OpenEndedKeyword).filter_by(keyword="good").count() == 2
+
+    qual_raw = [float(a.qual_score_raw) for a in db_session.query(SentimentAggregate).order_by(SentimentAggregate.id)]
+    assert [raw < 0 for raw in qual_raw] == [True, True, False, False]
+    cohort = (
+        db_session.query(CohortStatistic)
+        .filter_by(grouping=CohortGrouping.DEPARTMENT, metric=CohortMetric.QUALITATIVE)
+        .one()
+    )
+    assert cohort.n == 4
+    assert cohort.mean == pytest.approx(np.mean(qual_raw))
+
+
+def test_persistent_tier_serves_a_cold_process(db_session) -> None:
+    _seed_comments(db_session, ["Good teacher"])
+    analyze_pending_answers(
+        db_session,
+        predictor=BatchedSentimentPredictor(LengthParityModel(), batch_size=4),
+        extractor=FirstWordExtractor(),
+        cache=QualitativeResultCache(max_entries=10, model_version="test"),
+    )
+    _seed_comments(db_session, ["GOOD teacher", "Good teacher"])
+    cold_model = LengthParityModel()
+    cold_cache = QualitativeResultCache(max_entries=10, model_version="test")
+
+    summary = analyze_pending_answers(
+        db_session,
+        predictor=BatchedSentimentPredictor(cold_model, batch_size=4),
+        extractor=FirstWordExtractor(),
+        cache=cold_cache,
+    )
+
+    assert summary.answers_processed == 2
+    assert cold_model.texts_seen == 0
+    assert summary.cache_metrics == {"memory_hits": 0, "persistent_hits": 1, "misses": 0, "hit_rate": 1.0}
+    assert db_session.query(OpenEndedKeyword).count() == 3
+    keyword = db_session.query(OpenEndedKeyword).first()
+    assert keyword.relevance_score == pytest.approx(0.75)
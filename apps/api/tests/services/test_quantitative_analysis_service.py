@@ -0,0 +1,155 @@
+"""Tests for the period-wide quantitative scoring engine."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from src.models.academic import FacultyDepartmentAffiliation
+from src.models.analysis import NumericalAggregate, NumericalAggregateItem
+from src.models.enums import AggregateItemType, EvaluationSubmissionStatus
+from src.repositories.numerical_aggregate_repository import numerical_aggregate_repository
+from src.services.department_hierarchy_service import rebuild_hierarchy
+from src.services.quantitative_analysis_service import (
+    LikertMatrix,
+    aggregate_items,
+    compute_quantitative_scores,
+    score_evaluation_period,
+)
+from tests.factories import add_submission, seed_evaluation_period
+
+
+def test_compute_scores_weights_criterion_means() -> None:
+    """Criterion averages are means of question medians, weighted by criterion weight."""
+
+    answers = [
+        (1, 10, 5), (1, 11, 3), (1, 20, 4), (1, 21, 4),
+        (2, 10, 2), (2, 20, 1),
+    ]
+    layout = [(10, 100, 60), (11, 100, 60), (20, 200, 40), (21, 200, 40), (30, None, None)]
+
+    matrix = LikertMatrix.from_rows(answers, layout)
+    scores = compute_quantitative_scores(matrix)
+
+    assert matrix.values.shape == (2, 5)
+    np.testing.assert_allclose(scores.criterion_averages, [[4.0, 4.0], [2.0, 1.0]])
+    np.testing.assert_allclose(scores.quant_score_raw, [4.0, 0.6 * 2.0 + 0.4 * 1.0])
+
+
+def test_compute_scores_renormalizes_missing_criteria() -> None:
+    """A criterion without answers is dropped from the weight total rather than counted as zero."""
+
+    matrix = LikertMatrix.from_rows([(1, 10, 3)], [(10, 100, 60), (20, 200, 40)])
+
+    scores = compute_quantitative_scores(matrix)
+
+    assert math.isnan(scores.criterion_averages[0, 1])
+    assert scores.quant_score_raw[0] == 3.0
+
+
+def test_score_evaluation_period_upserts_aggregates(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    first = add_submission(db_session, fixture, likert_values=[5, 3, 4, 4])
+    second = add_submission(db_session, fixture, likert_values=[2, None, 1, None])
+    db_session.commit()
+
+    summary = score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+
+    assert summary.submissions_scored == 2
+    rows = {
+        row.submission_id: row
+        for row in db_session.scalars(select(NumericalAggregate)).all()
+    }
+    q = [str(question.id) for question in fixture.likert_questions]
+    c = [str(criterion.id) for criterion in fixture.criteria]
+    assert rows[first.id].per_question_median_scores == {q[0]: 5.0, q[1]: 3.0, q[2]: 4.0, q[3]: 4.0}
+    assert rows[first.id].per_criterion_average_scores == {c[0]: 4.0, c[1]: 4.0}
+    assert float(rows[second.id].quant_score_raw) == 1.6
+
+    rows[first.id].is_final_snapshot = True
+    db_session.commit()
+    rerun = score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+
+    assert rerun.submissions_scored == 1
+    assert rerun.submissions_skipped == 1
+    assert db_session.query(NumericalAggregate).count() == 2
+
+
+def test_item_rows_mirror_score_maps_and_aggregate_in_sql(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    first = add_submission(db_session, fixture, likert_values=[5, 3, 4, 4])
+    add_submission(db_session, fixture, likert_values=[2, None, 1, None])
+    db_session.commit()
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+
+    q = [question.id for question in fixture.likert_questions]
+    medians = numerical_aggregate_repository.summarize_items(
+        db_session,
+        evaluation_period_id=fixture.period.id,
+        item_type=AggregateItemType.QUESTION_MEDIAN,
+    )
+    assert [(item_id, count, float(avg)) for item_id, count, avg, _, _ in medians] == [
+        (q[0], 2, 3.5),
+        (q[1], 1, 3.0),
+        (q[2], 2, 2.5),
+        (q[3], 1, 4.0),
+    ]
+
+    aggregate = db_session.scalars(
+        select(NumericalAggregate)
+        .where(NumericalAggregate.submission_id == first.id)
+        .options(selectinload(NumericalAggregate.items))
+    ).one()
+    stored = {(item.item_type, item.item_id): float(item.value) for item in aggregate.items}
+    assert stored == {
+        (item_type, item_id): value
+        for item_type, item_id, value in aggregate_items(
+            {
+                "per_question_median_scores": aggregate.per_question_median_scores,
+                "per_criterion_average_scores": aggregate.per_criterion_average_scores,
+            }
+        )
+    }
+    # Rescoring replaces the rows instead of duplicating them.
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    assert db_session.query(NumericalAggregateItem).count() == 10
+
+
+def test_item_drilldowns_leave_out_non_scorable_submissions(db_session) -> None:
+    fixture = seed_evaluation_period(db_session)
+    rebuild_hierarchy(db_session, university_id=fixture.university.id)
+    db_session.add(
+        FacultyDepartmentAffiliation(
+            faculty=fixture.evaluatees[0],
+            department=fixture.department,
+            school_term=fixture.period.school_term,
+            is_home_department=True,
+        )
+    )
+    add_submission(db_session, fixture, likert_values=[5, 5, 5, 5])
+    cancelled = add_submission(db_session, fixture, likert_values=[1, 1, 1, 1])
+    db_session.commit()
+    score_evaluation_period(db_session, evaluation_period_id=fixture.period.id)
+    cancelled.status = EvaluationSubmissionStatus.CANCELLED
+    db_session.flush()
+
+    c = [criterion.id for criterion in fixture.criteria]
+    averages = numerical_aggregate_repository.summarize_items(
+        db_session,
+        evaluation_period_id=fixture.period.id,
+        item_type=AggregateItemType.CRITERION_AVERAGE,
+    )
+    assert [(item_id, count, float(avg)) for item_id, count, avg, _, _ in averages] == [(c[0], 1, 5.0), (c[1], 1, 5.0)]
+    by_department = numerical_aggregate_repository.summarize_items_by_department(
+        db_session,
+        evaluation_period_id=fixture.period.id,
+        item_type=AggregateItemType.CRITERION_AVERAGE,
+        department_ids=[fixture.department.id],
+    )
+    assert [(item_id, count, float(avg)) for _, item_id, count, avg in by_department] == [
+        (c[0], 1, 5.0),
+        (c[1], 1, 5.0),
+    ]
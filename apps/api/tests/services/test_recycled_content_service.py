@@ -0,0 +1,65 @@
+"""Tests for the MinHash/LSH recycled-content check."""
+
+from __future__ import annotations
+
+from sqlalchemy import select, update
+
+from src.models.enums import FlagReason
+from src.models.evaluation_submission import FlaggedEvaluation
+from src.models.operations import UniversitySetting
+from src.services.recycled_content_service import (
+    SIMILARITY_THRESHOLD_SETTING,
+    check_submissions,
+    estimated_similarity,
+    minhash_signature,
+)
+from tests.factories import add_submission, make_user, seed_evaluation_period
+
+_COMMENT = "Explains every lesson clearly and always answers our questions during consultation hours."
+_EDITED = "Explains every lesson clearly and always answers our questions during her consultation hours."
+
+
+def test_signature_similarity_tracks_text_overlap() -> None:
+    base = minhash_signature(_COMMENT)
+
+    assert minhash_signature("Good teacher") is None
+    assert estimated_similarity(base, minhash_signature(_EDITED))[0] > 0.8
+    assert estimated_similarity(base, minhash_signature("The pacing was too fast and exams did not match."))[0] < 0.3
+
+
+def test_check_flags_only_same_evaluator_and_honours_threshold(db_session) -> None:
+    fixture = seed_evaluation_period(db_session, evaluatee_count=3)
+    evaluator = make_user(db_session, fixture.university)
+    first = add_submission(db_session, fixture, likert_values=[5] * 4, comment=_COMMENT, evaluator=evaluator)
+    copied = add_submission(
+        db_session,
+        fixture,
+        likert_values=[5] * 4,
+        comment=_EDITED,
+        evaluator=evaluator,
+        evaluatee=fixture.evaluatees[1],
+    )
+    other_student = add_submission(db_session, fixture, likert_values=[4] * 4, comment=_COMMENT)
+
+    db_session.add(
+        UniversitySetting(university=fixture.university, setting_name=SIMILARITY_THRESHOLD_SETTING, setting_value="0.999")
+    )
+    summary = check_submissions(db_session, submission_ids=[first.id, copied.id, other_student.id])
+    assert summary.submissions_flagged == 0
+
+    db_session.execute(update(UniversitySetting).values(setting_value="0.8"))
+    exact = add_submission(
+        db_session,
+        fixture,
+        likert_values=[5] * 4,
+        comment=_COMMENT,
+        evaluator=evaluator,
+        evaluatee=fixture.evaluatees[2],
+    )
+    summary = check_submissions(db_session, submission_ids=[first.id, copied.id, other_student.id, exact.id])
+
+    flags = {flag.submission_id: flag for flag in db_session.scalars(select(FlaggedEvaluation))}
+    assert summary.submissions_flagged == 2
+    assert set(flags) == {copied.id, exact.id}
+    assert flags[exact.id].flag_reason == FlagReason.RECYCLED_CONTENT
+    assert {match["matched_submission_id"] for match in flags[exact.id].flag_details["matches"]} == {first.id, copied.id}
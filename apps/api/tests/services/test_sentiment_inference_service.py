@@ -0,0 +1,41 @@
+"""Tests for micro-batched sentiment inference."""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from src.services.sentiment_inference_service import BatchedSentimentPredictor, length_buckets
+
+
+class KeywordModel:
+    """Deterministic stand-in classifier that records the batches it receives."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[int]] = []
+
+    def encode(self, texts: Sequence[str]) -> List[List[int]]:
+        return [[len(word) for word in text.split()] for text in texts]
+
+    def predict_encoded(self, input_ids: Sequence[Sequence[int]]) -> np.ndarray:
+        self.batches.append([len(ids) for ids in input_ids])
+        positive = np.array([1.0 if len(ids) % 2 else 0.0 for ids in input_ids])
+        return np.stack([1.0 - positive, np.zeros_like(positive), positive], axis=1) * 0.9 + 0.1 / 3
+
+
+def test_length_buckets_group_similar_lengths() -> None:
+    batches = length_buckets([9, 1, 5, 2, 8, 1], batch_size=2)
+
+    assert [batch.tolist() for batch in batches] == [[1, 5], [3, 2], [4, 0]]
+
+
+def test_predictor_preserves_input_order_across_buckets() -> None:
+    model = KeywordModel()
+    predictor = BatchedSentimentPredictor(model, batch_size=2)
+
+    probabilities = predictor.predict_probabilities(["a b c", "a", "a b", "a b c d"])
+
+    assert model.batches == [[1, 2], [3, 4]]
+    assert probabilities.argmax(axis=1).tolist() == [2, 2, 0, 0]
+
@@ -0,0 +1,53 @@
+"""Tests for the bulk submission write path."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import event, select
+
+from src.models.analysis import AnswerLSHBucket, AnswerMinHashSignature
+from src.models.evaluation_submission import EvaluationSubmission
+from src.repositories.loading import with_profile
+from src.services.recycled_content_service import BANDS
+from src.services.submission_writer_service import SubmissionDraft, write_submissions
+from tests.factories import make_user, seed_evaluation_period
+
+
+def test_burst_of_submissions_is_written_in_a_few_statements(db_session, db_engine) -> None:
+    fixture = seed_evaluation_period(db_session)
+    evaluators = [make_user(db_session, fixture.university) for _ in range(5)]
+    db_session.commit()
+
+    question_ids = [question.id for question in fixture.likert_questions]
+    drafts = [
+        SubmissionDraft(
+            university_id=fixture.university.id,
+            evaluation_period_id=fixture.period.id,
+            evaluator_id=evaluator.id,
+            evaluatee_id=fixture.evaluatees[0].id,
+            subject_offering_id=fixture.offering.id,
+            likert_answers={question_id: index % 5 + 1 for question_id in question_ids},
+            open_ended_answers={fixture.open_ended_question.id: f"Comment {index}: clear and organized lessons"} if index % 2 else {},
+            submitted_at=datetime(2025, 1, 30, 23, 59) if index == 2 else None,
+        )
+        for index, evaluator in enumerate(evaluators)
+    ]
+
+    statements = []
+    event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    ids = write_submissions(db_session, drafts)
+    # Two submission batches, Likert answers, open-ended answers, then their signatures
+    # and LSH buckets; indexing works from the drafts and reads nothing back.
+    assert [sql.lstrip().split()[0].upper() for sql in statements] == ["INSERT"] * 6
+
+    loaded = db_session.scalars(with_profile(select(EvaluationSubmission), EvaluationSubmission, "answers"))
+    saved = {submission.id: submission for submission in loaded}
+    assert [saved[submission_id].evaluator_id for submission_id in ids] == [e.id for e in evaluators]
+    assert saved[ids[2]].submitted_at == datetime(2025, 1, 30, 23, 59)
+    assert [len(saved[submission_id].likert_answers) for submission_id in ids] == [4] * 5
+    assert [a.answer_value for a in saved[ids[3]].likert_answers] == [4] * 4
+    assert [len(saved[submission_id].open_ended_answers) for submission_id in ids] == [0, 1, 0, 1, 0]
+    signatures = db_session.scalars(select(AnswerMinHashSignature.submission_id).order_by("submission_id"))
+    assert signatures.all() == [ids[1], ids[3]]
+    assert db_session.query(AnswerLSHBucket).count() == 2 * BANDS
@@ -7,3 +7,15 @@ def test_health_endpoint_returns_ok() -> None:
         response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_db_pool_endpoint_reports_primary_pool() -> None:
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+
+    with TestClient(app) as client:
+        response = client.get("/api/v1/health/db-pool")
+    assert response.status_code == 200
+    assert response.json()["profile"] == "api"
+    assert "primary" in response.json()["pools"]